@@ -0,0 +1,258 @@
+"""
+Benchmark de bout en bout du chatbot RAG (ChatbotCAN2025.ask)
+
+Rejoue un jeu de questions contre le chatbot avec un LLM local factice et
+déterministe (latence du premier token et débit en tokens configurables) :
+aucun appel à Groq. Mesure les percentiles p50/p95/p99 par étape (cache,
+embed, search, llm) et le débit (QPS) pour 1 à N clients concurrents.
+
+Le vectorstore utilisé est soit la version active, soit un index construit
+sur un corpus synthétique (--docs, voir synthetic_corpus.py).
+
+Usage:
+    python benchmarks/bench_rag.py --docs 10000 --embeddings hash --clients 1 2 4 8 --output bench_rag.json
+    python benchmarks/bench_rag.py --clients 1 4 --llm-latency-ms 300 --llm-tokens-per-s 200
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableLambda
+
+from src.rag.cache_manager import ResponseCache
+from src.rag.chatbot import ChatbotCAN2025
+from src.rag.config import RAGConfig
+
+STAGES = ("cache", "embed", "search", "llm", "total")
+
+DEFAULT_QUESTIONS = [
+    "Qui a marqué pour le Maroc contre les Comores ?",
+    "Quel est le score du match Égypte contre Zimbabwe ?",
+    "Quelles équipes ont participé à la CAN 2025 ?",
+    "Qui est le meilleur buteur du tournoi ?",
+    "Quand le Maroc joue-t-il son prochain match ?",
+    "Dans quels stades se joue la CAN 2025 ?",
+    "Quel est le parcours du Sénégal dans le tournoi ?",
+    "Combien de buts a marqué Mohamed Salah ?",
+    "Who won the match between Nigeria and Algeria?",
+    "Quand a lieu la finale de la CAN 2025 ?",
+]
+
+
+def make_fake_llm(first_token_ms: float, tokens_per_s: float, answer_tokens: int) -> RunnableLambda:
+    """
+    LLM factice : attend la latence d'un vrai modèle puis renvoie une réponse déterministe
+
+    Durée d'un appel = first_token_ms + answer_tokens / tokens_per_s
+    """
+    delay = first_token_ms / 1000 + answer_tokens / tokens_per_s
+
+    def generate(prompt) -> str:
+        text = prompt.to_string() if hasattr(prompt, 'to_string') else str(prompt)
+        time.sleep(delay)
+        words = text.split()
+        digest = int(hashlib.md5(text.encode('utf-8')).hexdigest(), 16)
+        return " ".join(words[(digest + i) % len(words)] for i in range(answer_tokens)) if words else ""
+
+    return RunnableLambda(generate)
+
+
+class HashEmbeddings(Embeddings):
+    """Embeddings déterministes par hachage des mots (sans modèle, pour isoler le reste du pipeline)"""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for word in text.lower().split():
+            digest = hashlib.md5(word.encode('utf-8')).digest()
+            vector[int.from_bytes(digest[:4], 'little') % self.dim] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 (rang le plus proche) et moyenne en millisecondes"""
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None, 'mean': None, 'count': 0}
+    ordered = sorted(values)
+
+    def rank(q):
+        return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 2)
+
+    return {
+        'p50': rank(0.50), 'p95': rank(0.95), 'p99': rank(0.99),
+        'mean': round(sum(ordered) / len(ordered), 2), 'count': len(ordered)
+    }
+
+
+def load_questions(path: Optional[Path]) -> List[str]:
+    """Questions depuis un fichier JSON (liste) ou texte (une par ligne)"""
+    if path is None:
+        return DEFAULT_QUESTIONS
+    text = path.read_text(encoding='utf-8')
+    if path.suffix == '.json':
+        data = json.loads(text)
+        return [q['question'] if isinstance(q, dict) else q for q in data]
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def run_clients(chatbot: ChatbotCAN2025, questions: List[str], clients: int, rounds: int,
+                use_cache: bool) -> Dict:
+    """Chaque client pose toutes les questions `rounds` fois ; retourne les statistiques"""
+    samples = {stage: [] for stage in STAGES}
+    errors = 0
+    lock = threading.Lock()
+
+    def client(client_id: int):
+        nonlocal errors
+        # Décalage par client : les clients ne posent pas la même question en même temps
+        order = questions[client_id % len(questions):] + questions[:client_id % len(questions)]
+        for _ in range(rounds):
+            for question in order:
+                start = time.perf_counter()
+                try:
+                    response = chatbot.ask(question, use_cache=use_cache)
+                except Exception:
+                    with lock:
+                        errors += 1
+                    continue
+                total = (time.perf_counter() - start) * 1000
+                with lock:
+                    samples['total'].append(total)
+                    for stage, duration in response.get('timings', {}).items():
+                        samples[stage[:-len('_ms')]].append(duration)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(client, range(clients)))
+    duration = time.perf_counter() - start
+
+    requests = len(samples['total'])
+    return {
+        'clients': clients,
+        'requests': requests,
+        'errors': errors,
+        'duration_s': round(duration, 3),
+        'qps': round(requests / duration, 2) if duration > 0 else None,
+        'stages': {stage: percentiles(samples[stage]) for stage in STAGES}
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent.parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du chatbot RAG avec LLM factice")
+    parser.add_argument('--questions', type=Path, default=None, help="Fichier de questions (.json ou .txt)")
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--rounds', type=int, default=3, help="Passes sur le jeu de questions par client")
+    parser.add_argument('--docs', type=int, default=None,
+                        help="Indexer un corpus synthétique de N documents (défaut: vectorstore actif)")
+    parser.add_argument('--embeddings', choices=['model', 'hash'], default='model',
+                        help="model: EMBEDDING_MODEL, hash: embeddings factices sans modèle")
+    parser.add_argument('--llm-latency-ms', type=float, default=200.0, help="Latence du premier token")
+    parser.add_argument('--llm-tokens-per-s', type=float, default=250.0)
+    parser.add_argument('--llm-answer-tokens', type=int, default=120)
+    parser.add_argument('--cache', action='store_true', help="Activer le cache de réponses")
+    parser.add_argument('--output', type=Path, default=None, help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    questions = load_questions(args.questions)
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_rag_"))
+    embeddings = HashEmbeddings() if args.embeddings == 'hash' else None
+
+    try:
+        config = RAGConfig
+        if args.docs:
+            from benchmarks.synthetic_corpus import SyntheticCorpus, SyntheticWorkspace
+
+            workspace = SyntheticWorkspace(work_dir / "workspace")
+            print(f"🏗️  Indexation d'un corpus synthétique de {args.docs} documents...")
+            SyntheticCorpus().write_combined_store(workspace.store_dir, args.docs)
+            vectorizer = workspace.vectorizer()
+            vectorizer.embeddings = embeddings
+            start = time.perf_counter()
+            vectorizer.create_vectorstore()
+            print(f"   ✅ Indexé en {time.perf_counter() - start:.1f}s")
+            config = workspace.rag_config()
+        # Le LLM factice remplace Groq : aucune clé nécessaire
+        config = type("BenchRAGConfig", (config,), {'GROQ_API_KEY': config.GROQ_API_KEY or "offline"})
+
+        llm = make_fake_llm(args.llm_latency_ms, args.llm_tokens_per_s, args.llm_answer_tokens)
+        chatbot = ChatbotCAN2025(config=config, load_existing=True, llm=llm, embeddings=embeddings)
+        chatbot.cache = ResponseCache(cache_dir=work_dir / "cache")
+
+        # Préchauffage : chargement paresseux du modèle, caches de Chroma
+        chatbot.ask(questions[0], use_cache=False)
+
+        results = []
+        print(f"\n{'Clients':>8} | {'QPS':>7} | " + " | ".join(f"{s + ' p50/p95/p99 (ms)':>32}" for s in STAGES[1:]))
+        print("-" * (20 + 35 * (len(STAGES) - 1)))
+        for clients in args.clients:
+            chatbot.cache.clear()
+            result = run_clients(chatbot, questions, clients, args.rounds, use_cache=args.cache)
+            results.append(result)
+            cells = []
+            for stage in STAGES[1:]:
+                p = result['stages'][stage]
+                cells.append(f"{p['p50']}/{p['p95']}/{p['p99']}" if p['count'] else "-")
+            print(f"{clients:>8} | {result['qps']:>7} | " + " | ".join(f"{c:>32}" for c in cells))
+
+        if args.output:
+            report = {
+                'commit': git_commit(),
+                'created_at': datetime.now().isoformat(),
+                'settings': {
+                    'questions': len(questions),
+                    'rounds': args.rounds,
+                    'docs': args.docs,
+                    'embeddings': args.embeddings if embeddings else config.EMBEDDING_MODEL,
+                    'top_k': config.TOP_K_RESULTS,
+                    'cache': args.cache,
+                    'llm_latency_ms': args.llm_latency_ms,
+                    'llm_tokens_per_s': args.llm_tokens_per_s,
+                    'llm_answer_tokens': args.llm_answer_tokens
+                },
+                'results': results
+            }
+            args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+            print(f"\n📁 Résultats sauvegardés dans : {args.output}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark de l'analyse de sentiment (YouTubeSentimentAnalyzer.analyze_comments)
+
+Génère des commentaires synthétiques de supporters (FR/EN/AR, emojis,
+longueurs variables) et mesure le débit en commentaires/s pour plusieurs
+tailles de lot. Taille de lot 1 = ancien comportement (un appel au modèle
+par commentaire). Le cache persistant est désactivé, sauf avec --cache :
+deux passes (à froid puis à chaud) sur un cache temporaire.
+
+Avec --pool-workers, les analyses passent par un pool de processus
+d'inférence et --sessions analyses concurrentes (comme plusieurs sessions
+Streamlit) le partagent ; le débit par worker est affiché.
+
+Usage:
+    python benchmarks/bench_sentiment.py --comments 2000 --batch-sizes 1 8 32 64
+    python benchmarks/bench_sentiment.py --comments 2000 --cache
+    python benchmarks/bench_sentiment.py --comments 2000 --pool-workers 8 --threads-per-worker 4 --sessions 1 4
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.config import SentimentConfig
+from src.sentiment.inference_pool import InferencePool
+from src.sentiment.sentiment_cache import SentimentCache
+from src.sentiment.youtube_analyzer import YouTubeSentimentAnalyzer
+
+FRAGMENTS = {
+    'fr': [
+        "Dima Maroc !", "Quel match incroyable", "L'arbitre était nul ce soir",
+        "Hakimi est le meilleur latéral du monde", "On mérite la victoire",
+        "Défense catastrophique en deuxième mi-temps", "Le stade était plein",
+        "Je suis déçu du résultat", "Bravo aux Lions de l'Atlas", "Rendez-vous en finale",
+    ],
+    'en': [
+        "What a goal!", "Morocco deserved to win", "Terrible refereeing",
+        "Best AFCON ever", "The atmosphere in Rabat was amazing",
+        "Poor finishing from the strikers", "Can't wait for the final",
+    ],
+    'ar': [
+        "ديما المغرب", "مباراة رائعة", "الحكم ظلمنا", "مبروك للمنتخب",
+        "أداء سيء في الدفاع", "أسود الأطلس",
+    ],
+}
+EMOJIS = ["🇲🇦", "🔥", "⚽", "😡", "😢", "👏", "🦁", "💪", ""]
+
+
+def synthetic_comments(n: int, seed: int = 42) -> List[Dict]:
+    """Commentaires de 1 à 12 fragments (longueurs très variables, comme sur YouTube)"""
+    rng = random.Random(seed)
+    comments = []
+    for i in range(n):
+        lang = rng.choices(list(FRAGMENTS), weights=[0.5, 0.2, 0.3])[0]
+        parts = [rng.choice(FRAGMENTS[lang]) for _ in range(rng.choice([1, 1, 1, 2, 2, 3, 5, 8, 12]))]
+        comments.append({
+            'text': ". ".join(parts) + " " + rng.choice(EMOJIS),
+            'author': f"supporter_{i}",
+            'likes': rng.randint(0, 500),
+            'time': f"il y a {rng.randint(1, 59)} minutes"
+        })
+    return comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du débit de l'analyse de sentiment")
+    parser.add_argument('--comments', type=int, default=2000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache', action='store_true', help="Mesurer le cache (passe à froid puis à chaud)")
+    parser.add_argument('--pool-workers', type=int, default=0, help="Processus d'inférence (0: modèle local)")
+    parser.add_argument('--threads-per-worker', type=int, default=None)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4],
+                        help="Analyses concurrentes à tester avec --pool-workers")
+    parser.add_argument('--output', type=Path, default=None, help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    import logging
+    logging.getLogger('src.sentiment.youtube_analyzer').setLevel(logging.WARNING)
+
+    comments = synthetic_comments(args.comments, args.seed)
+    config = type("BenchSentimentConfig", (SentimentConfig,), {'CACHE_ENABLED': False})
+    pool = InferencePool(args.pool_workers, args.threads_per_worker, config) if args.pool_workers else None
+    analyzer = YouTubeSentimentAnalyzer(config=config, pool=pool)
+    # Préchauffage : chargement paresseux des poids
+    analyzer.classify_texts([c['text'] for c in comments[:16]])
+
+    results = []
+    if pool:
+        # Préchauffage de tous les workers (chargement du modèle dans chaque processus)
+        analyzer.classify_texts([c['text'] for c in comments[:analyzer.batch_size * args.pool_workers * 2]])
+        print(f"\n{'Sessions':>9} | {'Durée (s)':>10} | {'Commentaires/s':>15}")
+        print("-" * 42)
+        for sessions in args.sessions:
+            # Textes distincts par session : pas de regroupement des doublons entre sessions
+            batches = [[dict(c, text=f"{c['text']} #{s}") for c in comments] for s in range(sessions)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=sessions) as executor:
+                list(executor.map(analyzer.analyze_comments, batches))
+            duration = time.perf_counter() - start
+            result = {
+                'sessions': sessions,
+                'duration_s': round(duration, 3),
+                'comments_per_s': round(sessions * len(comments) / duration, 1)
+            }
+            results.append(result)
+            print(f"{sessions:>9} | {result['duration_s']:>10.2f} | {result['comments_per_s']:>15.0f}")
+
+        pool_stats = pool.get_stats()
+        print(f"\n🏭 {pool_stats['workers']} workers × {pool_stats['threads_per_worker']} threads")
+        for pid, worker in sorted(pool_stats['per_worker'].items()):
+            print(f"   PID {pid:>7} : {worker['texts']:>7} textes, {worker['batches']:>5} lots, "
+                  f"{worker['texts_per_s']:>7.0f} textes/s")
+        results.append({'pool': pool_stats})
+        pool.shutdown()
+    elif args.cache:
+        cache_dir = Path(tempfile.mkdtemp(prefix="bench_sentiment_"))
+        analyzer.cache = SentimentCache(cache_dir / "cache.db", model_id=config.MODEL_NAME)
+        try:
+            print(f"\n{'Passe':>6} | {'Durée (s)':>10} | {'Commentaires/s':>15} | {'Doublons':>9} | {'Hit rate':>9}")
+            print("-" * 62)
+            for run in ("froid", "chaud"):
+                stats = analyzer.analyze_comments(comments)
+                result = dict(stats['throughput'], run=run, cache=stats['cache'])
+                results.append(result)
+                print(f"{run:>6} | {result['duration_s']:>10.2f} | {result['comments_per_s']:>15.0f} | "
+                      f"{stats['cache']['duplicates']:>9} | {stats['cache']['hit_rate']:>8.1f}%")
+        finally:
+            analyzer.cache.close()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    else:
+        baseline = None
+        print(f"\n{'Lot':>6} | {'Durée (s)':>10} | {'Commentaires/s':>15} | {'Accélération':>12}")
+        print("-" * 54)
+        for batch_size in args.batch_sizes:
+            analyzer.batch_size = batch_size
+            throughput = analyzer.analyze_comments(comments)['throughput']
+            baseline = baseline or throughput['duration_s']
+            result = dict(throughput, speedup=round(baseline / throughput['duration_s'], 2))
+            results.append(result)
+            print(f"{batch_size:>6} | {result['duration_s']:>10.2f} | {result['comments_per_s']:>15.0f} | "
+                  f"{result['speedup']:>11.2f}x")
+
+    if args.output:
+        report = {'comments': args.comments, 'model': analyzer.config.MODEL_NAME, 'results': results}
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\n📁 Résultats sauvegardés dans : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark des backends du modèle de sentiment : float32 vs int8 quantifié
+
+Sur un jeu fixe de commentaires synthétiques (bench_sentiment.py, graine
+fixe), mesure pour chaque backend :
+- latence d'un commentaire seul (p50/p95) et débit par lots
+- mémoire : taille des poids sérialisés et hausse de RSS au chargement
+- accord des labels avec le modèle float32 (référence)
+
+Usage:
+    python benchmarks/bench_sentiment_backends.py --comments 1000
+    python benchmarks/bench_sentiment_backends.py --model ./tiny-model --comments 200
+"""
+
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.bench_sentiment import synthetic_comments
+from src.pipeline.profiling import current_rss
+from src.sentiment.config import SentimentConfig
+from src.sentiment.inference import BACKENDS, load_pipeline, model_size_bytes, run_pipeline
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 2)
+
+
+def measure_backend(config, backend: str, texts: List[str], batch_size: int, single: int) -> Dict:
+    """Charger le backend, mesurer latence/débit/mémoire et retourner les labels"""
+    gc.collect()
+    rss_before = current_rss()
+    classifier = load_pipeline(config, backend)
+    rss_after = current_rss()
+
+    # Préchauffage
+    run_pipeline(classifier, texts[:batch_size], batch_size, config)
+
+    latencies = []
+    for text in texts[:single]:
+        start = time.perf_counter()
+        run_pipeline(classifier, [text], 1, config)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    predictions = run_pipeline(classifier, texts, batch_size, config)
+    duration = time.perf_counter() - start
+
+    result = {
+        'backend': backend,
+        'latency_p50_ms': _percentile(latencies, 0.50),
+        'latency_p95_ms': _percentile(latencies, 0.95),
+        'batch_duration_s': round(duration, 3),
+        'comments_per_s': round(len(texts) / duration, 1),
+        'weights_mb': round(model_size_bytes(classifier.model) / 1024 ** 2, 1),
+        'rss_increase_mb': round((rss_after - rss_before) / 1024 ** 2, 1) if rss_before and rss_after else None,
+        'labels': [p[0] if p else None for p in predictions]
+    }
+    del classifier
+    gc.collect()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark float32 vs int8 du modèle de sentiment")
+    parser.add_argument('--comments', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=SentimentConfig.BATCH_SIZE)
+    parser.add_argument('--single', type=int, default=100, help="Commentaires mesurés un par un (latence)")
+    parser.add_argument('--model', default=None, help="Modèle ou répertoire local (défaut: SentimentConfig.MODEL_NAME)")
+    parser.add_argument('--output', type=Path, default=None, help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    config = SentimentConfig
+    if args.model:
+        config = type("BenchSentimentConfig", (SentimentConfig,), {'MODEL_NAME': args.model})
+    texts = [c['text'] for c in synthetic_comments(args.comments, args.seed)]
+
+    results = [measure_backend(config, backend, texts, args.batch_size, args.single) for backend in BACKENDS]
+    reference = results[0]['labels']
+    for result in results:
+        labels = result.pop('labels')
+        result['agreement'] = round(sum(a == b for a, b in zip(labels, reference)) / len(reference), 4)
+
+    print(f"\n📊 {config.MODEL_NAME} — {len(texts)} commentaires\n")
+    print(f"{'Backend':<9} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | {'Comm./s':>8} | {'Poids (Mo)':>10} | "
+          f"{'RSS (Mo)':>9} | {'Accord':>7}")
+    print("-" * 82)
+    for r in results:
+        print(f"{r['backend']:<9} | {r['latency_p50_ms']:>9} | {r['latency_p95_ms']:>9} | {r['comments_per_s']:>8.0f} | "
+              f"{r['weights_mb']:>10} | {r['rss_increase_mb'] if r['rss_increase_mb'] is not None else '-':>9} | "
+              f"{r['agreement'] * 100:>6.1f}%")
+
+    if args.output:
+        report = {'model': config.MODEL_NAME, 'comments': len(texts), 'batch_size': args.batch_size, 'results': results}
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\n📁 Résultats sauvegardés dans : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark de la transformation parallèle (DataTransformer)
+
+Génère un corpus synthétique d'articles bruts (synthetic_corpus.py)
+répartis en plusieurs fichiers, puis mesure transform_all_files avec 1 à N processus.
+
+Usage:
+    python benchmarks/bench_transform.py --articles 100000 --files 32 --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.transform import DataTransformer
+from benchmarks.synthetic_corpus import SyntheticCorpus
+
+
+def run_once(raw_dir: Path, out_dir: Path, workers: int, mode: str) -> float:
+    """Transformer le corpus et retourner la durée en secondes"""
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+
+    transformer = DataTransformer()
+    transformer.raw_data_dir = raw_dir
+    transformer.transformed_dir = out_dir
+
+    start = time.perf_counter()
+    outputs = transformer.transform_all_files(workers=workers, mode=mode)
+    duration = time.perf_counter() - start
+
+    if len(outputs) != len(list(raw_dir.glob("*.json"))):
+        raise RuntimeError("Transformation incomplète")
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la transformation parallèle")
+    parser.add_argument('--articles', type=int, default=100_000)
+    parser.add_argument('--files', type=int, default=32)
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help="Nombres de processus à tester (défaut: 1, 2, 4... jusqu'au nombre de cœurs)")
+    parser.add_argument('--mode', choices=['auto', 'file', 'shard'], default='auto')
+    parser.add_argument('--output', type=Path, default=None, help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    workers_list = args.workers or sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i <= cpu_count], cpu_count})
+
+    # Logs de transformation trop verbeux pour un benchmark
+    import logging
+    logging.getLogger('src.pipeline.transform').setLevel(logging.WARNING)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_transform_"))
+    try:
+        raw_dir = work_dir / "raw"
+        print(f"🏗️  Génération de {args.articles} articles en {args.files} fichiers...")
+        SyntheticCorpus(duplicate_ratio=0).write_raw_files(raw_dir, args.articles, args.files)
+
+        results = []
+        baseline = None
+        print(f"\n{'Processus':>10} | {'Durée (s)':>10} | {'Articles/s':>11} | {'Accélération':>12}")
+        print("-" * 53)
+        for workers in workers_list:
+            duration = run_once(raw_dir, work_dir / "out", workers, args.mode)
+            baseline = baseline or duration
+            result = {
+                'workers': workers,
+                'duration_s': round(duration, 3),
+                'articles_per_s': round(args.articles / duration, 1),
+                'speedup': round(baseline / duration, 2)
+            }
+            results.append(result)
+            print(f"{workers:>10} | {result['duration_s']:>10.2f} | {result['articles_per_s']:>11.0f} | "
+                  f"{result['speedup']:>11.2f}x")
+
+        if args.output:
+            report = {
+                'articles': args.articles,
+                'files': args.files,
+                'mode': args.mode,
+                'cpu_count': cpu_count,
+                'results': results
+            }
+            args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+            print(f"\n📁 Résultats sauvegardés dans : {args.output}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+"""
+Générateur de corpus CAN 2025 synthétique pour les tests de charge
+
+Produit des documents réalistes (matchs, joueurs, infos tournoi, actualités)
+dans les formats exacts du pipeline :
+- articles bruts {metadata, articles} / partitions date=/source= (DataTransformer)
+- fichiers d'enrichissement {metadata, documents} (DatabaseEnricher)
+- dataset combiné {text, metadata, original_content} (VectorizerCAN2025)
+
+Taille (10k à 1M documents), taux de quasi-doublons et mélange de langues
+(fr/en/ar) sont paramétrables ; la génération est déterministe (graine).
+
+SyntheticWorkspace isole un répertoire de travail et fournit un
+DataTransformer, un DatabaseEnricher et un VectorizerCAN2025 qui le lisent
+et l'écrivent, sans toucher à data/.
+
+Usage:
+    python benchmarks/synthetic_corpus.py --docs 100000 --duplicate-ratio 0.1 \\
+        --languages fr=0.6,en=0.3,ar=0.1 --target all --output /tmp/can_synth
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.document_store import DocumentStore
+from src.pipeline.partitions import PartitionedDataset
+from src.pipeline.transform import DataTransformer
+
+TEAMS = [
+    "Maroc", "Sénégal", "Égypte", "Nigeria", "Algérie", "Côte d'Ivoire", "Cameroun", "Mali",
+    "Tunisie", "Ghana", "Afrique du Sud", "RD Congo", "Burkina Faso", "Guinée équatoriale",
+    "Gabon", "Angola", "Zambie", "Ouganda", "Bénin", "Mozambique", "Comores", "Tanzanie",
+    "Soudan", "Botswana"
+]
+PLAYERS = [
+    ("Achraf Hakimi", "Maroc", "défenseur"), ("Brahim Díaz", "Maroc", "milieu"),
+    ("Yassine Bounou", "Maroc", "gardien"), ("Sadio Mané", "Sénégal", "attaquant"),
+    ("Mohamed Salah", "Égypte", "attaquant"), ("Victor Osimhen", "Nigeria", "attaquant"),
+    ("Riyad Mahrez", "Algérie", "attaquant"), ("Sébastien Haller", "Côte d'Ivoire", "attaquant"),
+    ("André Onana", "Cameroun", "gardien"), ("Yves Bissouma", "Mali", "milieu"),
+    ("Ayoub El Kaabi", "Maroc", "attaquant"), ("Mohammed Kudus", "Ghana", "milieu")
+]
+STADIUMS = [
+    ("Stade Mohammed V", "Casablanca"), ("Complexe Prince Moulay Abdellah", "Rabat"),
+    ("Stade de Marrakech", "Marrakech"), ("Stade Adrar", "Agadir"),
+    ("Grand Stade de Tanger", "Tanger"), ("Stade de Fès", "Fès")
+]
+SOURCES = ["BBC Sport", "ESPN", "Wikipedia-FR", "Wikipedia-EN", "CAF Online", "Flashscore", "Hespress"]
+STAGES = ["phase de groupes", "huitièmes de finale", "quarts de finale", "demi-finales", "finale"]
+
+# Phrases par langue et par type de document ({team}, {player}... remplis au tirage)
+TEMPLATES = {
+    'fr': {
+        'match': [
+            "{home} s'impose {hs}-{as_} face à {away} au {stadium} de {city} en {stage}.",
+            "{player} ouvre le score à la {minute}e minute sur une frappe puissante.",
+            "Devant {attendance} spectateurs, {away} a longtemps résisté avant de céder.",
+            "L'entraîneur de {home} salue la solidité défensive de son équipe.",
+        ],
+        'player': [
+            "{player}, {position} de la sélection {team}, dispute sa {n}e CAN.",
+            "Auteur de {goals} buts dans le tournoi, {player} est l'un des hommes forts de {team}.",
+            "Son club salue la régularité de {player} depuis le début de la saison.",
+        ],
+        'tournament': [
+            "La CAN 2025 se déroule au Maroc du 21 décembre 2025 au 18 janvier 2026.",
+            "Le {stadium} de {city} accueillera {n} rencontres de la compétition.",
+            "Les 24 équipes sont réparties en 6 groupes de 4 ; la {stage} approche.",
+        ],
+        'news': [
+            "Conférence de presse : le sélectionneur de {team} annonce le groupe pour la {stage}.",
+            "Les supporters de {team} affluent vers {city} avant le choc contre {away}.",
+            "Blessé à l'entraînement, {player} reste incertain pour le prochain match.",
+        ],
+    },
+    'en': {
+        'match': [
+            "{home} beat {away} {hs}-{as_} at {stadium} in {city} in the {stage}.",
+            "{player} opened the scoring in the {minute}th minute with a powerful strike.",
+            "In front of {attendance} fans, {away} held firm for a long time before conceding.",
+            "The {home} coach praised his side's defensive discipline.",
+        ],
+        'player': [
+            "{player}, the {team} {position}, is playing his {n}th AFCON.",
+            "With {goals} goals in the tournament, {player} is one of {team}'s key men.",
+            "His club has praised {player}'s consistency throughout the season.",
+        ],
+        'tournament': [
+            "AFCON 2025 takes place in Morocco from 21 December 2025 to 18 January 2026.",
+            "{stadium} in {city} will host {n} matches of the competition.",
+            "The 24 teams are split into 6 groups of 4 as the {stage} approaches.",
+        ],
+        'news': [
+            "Press conference: the {team} coach names his squad for the {stage}.",
+            "{team} fans are pouring into {city} ahead of the clash with {away}.",
+            "Injured in training, {player} remains a doubt for the next match.",
+        ],
+    },
+    'ar': {
+        'match': [
+            "فاز {home} على {away} بنتيجة {hs}-{as_} في {stadium} بمدينة {city}.",
+            "سجل {player} الهدف الأول في الدقيقة {minute} بتسديدة قوية.",
+            "أمام {attendance} متفرج، صمد {away} طويلا قبل أن يستسلم.",
+            "مدرب {home} أشاد بالصلابة الدفاعية لفريقه.",
+        ],
+        'player': [
+            "{player} لاعب منتخب {team} يشارك في نسخته رقم {n} من كأس أفريقيا.",
+            "سجل {player} {goals} أهداف في البطولة وهو من أبرز لاعبي {team}.",
+        ],
+        'tournament': [
+            "تقام كأس أمم أفريقيا 2025 في المغرب من 21 دجنبر 2025 إلى 18 يناير 2026.",
+            "سيحتضن {stadium} في {city} عدد {n} مباريات في البطولة.",
+        ],
+        'news': [
+            "ندوة صحفية: مدرب {team} يعلن عن اللائحة قبل المباراة المقبلة.",
+            "جماهير {team} تتوافد على {city} قبل المواجهة ضد {away}.",
+            "الله يعطيك الصحة {player}، غادي يغيب على ماتش الجاي بسبب الإصابة.",
+        ],
+    },
+}
+
+KINDS = {
+    # type de document → (catégorie du pipeline, poids)
+    'match': ("match", 0.4),
+    'player': ("player", 0.2),
+    'tournament': ("tournament_info", 0.15),
+    'news': ("news", 0.25),
+}
+
+LANGUAGE_SUFFIX = {'fr': "FR", 'en': "EN", 'ar': "AR"}
+
+
+def parse_languages(spec: str) -> Dict[str, float]:
+    """"fr=0.6,en=0.3,ar=0.1" → {'fr': 0.6, 'en': 0.3, 'ar': 0.1}"""
+    languages = {}
+    for item in spec.split(','):
+        lang, _, weight = item.partition('=')
+        lang = lang.strip()
+        if lang not in TEMPLATES:
+            raise ValueError(f"Langue inconnue : {lang} (disponibles : {', '.join(TEMPLATES)})")
+        languages[lang] = float(weight or 1)
+    return languages
+
+
+class SyntheticCorpus:
+    """Générateur déterministe d'articles et de documents CAN 2025"""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        duplicate_ratio: float = 0.1,
+        languages: Optional[Dict[str, float]] = None,
+        start_date: str = "2025-12-21",
+        days: int = 29,
+        words: tuple = (80, 400)
+    ):
+        """
+        Args:
+            seed: Graine (même graine → même corpus)
+            duplicate_ratio: Part des articles qui sont des quasi-doublons d'un article précédent
+            languages: Poids par langue (défaut fr=0.6, en=0.3, ar=0.1)
+            start_date: Premier jour couvert
+            days: Nombre de jours couverts
+            words: Longueur du contenu en mots (min, max)
+        """
+        self.seed = seed
+        self.duplicate_ratio = duplicate_ratio
+        self.languages = languages or {'fr': 0.6, 'en': 0.3, 'ar': 0.1}
+        self.start_date = datetime.fromisoformat(start_date)
+        self.days = days
+        self.words = words
+
+    def _fill(self, rng: random.Random, template: str, home: str, away: str) -> str:
+        player, team, position = rng.choice(PLAYERS)
+        stadium, city = rng.choice(STADIUMS)
+        return template.format(
+            home=home, away=away, team=team, player=player, position=position,
+            stadium=stadium, city=city, stage=rng.choice(STAGES),
+            hs=rng.randint(0, 4), as_=rng.randint(0, 3), minute=rng.randint(1, 90),
+            attendance=f"{rng.randint(15, 69) * 1000:,}".replace(",", " "),
+            n=rng.randint(1, 8), goals=rng.randint(1, 6)
+        )
+
+    def _article(self, rng: random.Random, index: int) -> Dict:
+        kind = rng.choices(list(KINDS), weights=[w for _, w in KINDS.values()])[0]
+        lang = rng.choices(list(self.languages), weights=list(self.languages.values()))[0]
+        home, away = rng.sample(TEAMS, 2)
+        templates = TEMPLATES[lang][kind]
+        day = self.start_date + timedelta(days=rng.randrange(self.days))
+
+        sentences = []
+        target = rng.randint(*self.words)
+        length = 0
+        while length < target:
+            sentence = self._fill(rng, rng.choice(templates), home, away)
+            sentences.append(sentence)
+            length += sentence.count(" ") + 1
+
+        title = {
+            'match': f"{home} - {away}",
+            'player': f"Profil : {rng.choice(PLAYERS)[0]}",
+            'tournament': "CAN 2025 : infos tournoi",
+            'news': f"{home} : les dernières nouvelles",
+        }[kind]
+        return {
+            "id": f"synthetic_{index:07d}",
+            "title": f"{title} ({LANGUAGE_SUFFIX[lang]})",
+            "date": day.strftime("%Y-%m-%d"),
+            "source": rng.choice(SOURCES),
+            "link": f"https://example.com/can2025/{index}",
+            "category": KINDS[kind][0],
+            "content": " ".join(sentences),
+            "keywords": [home, away, kind, lang],
+            "fetched_at": (day + timedelta(hours=rng.randint(8, 23))).isoformat(),
+            "language": lang
+        }
+
+    @staticmethod
+    def _near_duplicate(rng: random.Random, original: Dict, index: int) -> Dict:
+        """Reprise d'un article par une autre source : quelques mots changent"""
+        words = original["content"].split(" ")
+        # ~1 mot sur 100 : similarité nettement au-dessus du seuil de dédoublonnage (0.8)
+        for _ in range(max(1, len(words) // 100)):
+            words[rng.randrange(len(words))] = rng.choice(("aujourd'hui", "hier", "today", "ce soir"))
+        return {
+            **original,
+            "id": f"synthetic_{index:07d}",
+            "source": rng.choice([s for s in SOURCES if s != original["source"]]),
+            "link": f"https://example.com/can2025/{index}",
+            "content": " ".join(words)
+        }
+
+    def iter_articles(self, n: int, stream: int = 0) -> Iterator[Dict]:
+        """
+        Articles bruts (format du scraper), quasi-doublons inclus
+
+        Args:
+            n: Nombre d'articles
+            stream: Flux aléatoire indépendant (ex: 1 pour l'enrichissement)
+        """
+        rng = random.Random(self.seed * 1000 + stream)
+        recent: List[Dict] = []
+        for index in range(n):
+            if recent and rng.random() < self.duplicate_ratio:
+                article = self._near_duplicate(rng, rng.choice(recent), index)
+            else:
+                article = self._article(rng, index)
+                # Fenêtre glissante : les doublons reprennent des articles récents
+                if len(recent) < 1000:
+                    recent.append(article)
+                else:
+                    recent[rng.randrange(1000)] = article
+            yield article
+
+    def iter_documents(self, n: int, batch_size: int = 1000) -> Iterator[Dict]:
+        """Documents du dataset combiné (transformés par DataTransformer)"""
+        transformer = DataTransformer(deduplicate=False)
+        articles = self.iter_articles(n)
+        while True:
+            batch = list(islice(articles, batch_size))
+            if not batch:
+                return
+            yield from transformer.transform_articles(batch)
+
+    def iter_enrichment_documents(self, n: int) -> Iterator[Dict]:
+        """Documents d'enrichissement {id, text, metadata}"""
+        for article in self.iter_articles(n, stream=1):
+            yield {
+                "id": f"enrich_{article['id']}",
+                "text": article["content"],
+                "metadata": {
+                    "category": article["category"],
+                    "source": "synthetic_enrichment",
+                    "date": article["date"],
+                    "keywords": article["keywords"],
+                    "title": article["title"]
+                }
+            }
+
+    def write_raw_files(self, raw_dir: Path, n: int, n_files: int) -> List[Path]:
+        """Écrire n articles en n_files fichiers JSON plats"""
+        raw_dir = Path(raw_dir)
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        articles = self.iter_articles(n)
+        per_file = -(-n // n_files)
+        paths = []
+        for file_idx in range(n_files):
+            batch = list(islice(articles, per_file))
+            if not batch:
+                break
+            path = raw_dir / f"can2025_synthetic_{file_idx:04d}.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"metadata": {"source": "synthetic"}, "articles": batch}, f, ensure_ascii=False)
+            paths.append(path)
+        return paths
+
+    def write_raw_partitions(self, raw_dir: Path, n: int, runs_per_day: int = 1,
+                             flush_every: int = 2000) -> List[Path]:
+        """
+        Écrire n articles en partitions date=/source= (un run par jour et par créneau)
+
+        Les runs sont écrits par blocs de flush_every articles : la mémoire
+        reste bornée même pour un million d'articles.
+        """
+        dataset = PartitionedDataset(raw_dir)
+        by_run: Dict[datetime, List[Dict]] = {}
+        paths = []
+        for article in self.iter_articles(n):
+            day = datetime.fromisoformat(article["date"])
+            slot = int(article["id"][-7:]) % runs_per_day
+            run_at = day + timedelta(hours=8 + slot)
+            batch = by_run.setdefault(run_at, [])
+            batch.append(article)
+            if len(batch) >= flush_every:
+                paths.extend(dataset.write_run(by_run.pop(run_at), run_at))
+
+        for run_at in sorted(by_run):
+            paths.extend(dataset.write_run(by_run.pop(run_at), run_at))
+        return paths
+
+    def write_enrichment(self, enrichment_dir: Path, n: int, per_file: int = 10000) -> List[Path]:
+        """Écrire n documents d'enrichissement en fichiers de per_file documents"""
+        enrichment_dir = Path(enrichment_dir)
+        enrichment_dir.mkdir(parents=True, exist_ok=True)
+        documents = self.iter_enrichment_documents(n)
+        paths = []
+        for file_idx in range(-(-n // per_file)):
+            path = enrichment_dir / f"synthetic_enrichment_{file_idx:04d}.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "metadata": {"source": "synthetic", "date": self.start_date.strftime("%Y-%m-%d")},
+                    "documents": list(islice(documents, per_file))
+                }, f, ensure_ascii=False)
+            paths.append(path)
+        return paths
+
+    def write_combined_store(self, store_dir: Path, n: int) -> DocumentStore:
+        """Écrire n documents dans un store combiné (entrée du vectorizer)"""
+        store = DocumentStore(store_dir)
+        store.clear()
+        store.append(self.iter_documents(n))
+        store.update_metadata(
+            creation_date=datetime.now().isoformat(),
+            description=f"Synthetic CAN 2025 corpus (seed {self.seed})"
+        )
+        return store
+
+
+class SyntheticWorkspace:
+    """Répertoire de travail isolé et étapes du pipeline pointées dessus"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.raw_dir = self.root / "daily_fetch"
+        self.transformed_dir = self.root / "transformed"
+        self.store_dir = self.transformed_dir / "combined_dataset"
+        self.enrichment_dir = self.root / "enrichment"
+        self.change_feed_file = self.transformed_dir / "change_feed.jsonl"
+        self.transformed_dir.mkdir(parents=True, exist_ok=True)
+
+    def transformer(self, deduplicate: bool = True):
+        """DataTransformer lisant raw_dir et écrivant le store du workspace"""
+        from src.pipeline.change_feed import ChangeFeed
+
+        transformer = DataTransformer(deduplicate=deduplicate)
+        transformer.raw_data_dir = self.raw_dir
+        transformer.transformed_dir = self.transformed_dir
+        transformer.store_dir = self.store_dir
+        transformer.dedup_state_file = self.transformed_dir / "dedup_signatures.json"
+        transformer.owned_ids_file = self.transformed_dir / "transform_ids.json"
+        transformer.change_feed = ChangeFeed(self.change_feed_file)
+        return transformer
+
+    def enricher(self):
+        """DatabaseEnricher lisant enrichment_dir et le store du workspace"""
+        from src.pipeline.change_feed import ChangeFeed
+        from src.pipeline.enrich_database import DatabaseEnricher
+        from src.pipeline.enrichment_journal import EnrichmentJournal
+
+        enricher = DatabaseEnricher()
+        enricher.enrichment_dir = self.enrichment_dir
+        enricher.transformed_dir = self.transformed_dir
+        enricher.combined_file = self.transformed_dir / "combined_dataset.json"
+        enricher.store_dir = self.store_dir
+        enricher.journal = EnrichmentJournal(self.transformed_dir / "enrichment_journal")
+        enricher.change_feed = ChangeFeed(self.change_feed_file)
+        return enricher
+
+    def rag_config(self):
+        """RAGConfig dont les chemins pointent vers le workspace"""
+        from src.rag.config import RAGConfig
+
+        return type("SyntheticRAGConfig", (RAGConfig,), {
+            'TRANSFORMED_DIR': self.transformed_dir,
+            'COMBINED_DATASET': self.transformed_dir / "combined_dataset.json",
+            'DOCUMENT_STORE_DIR': self.store_dir,
+            'CHANGE_FEED_FILE': self.change_feed_file,
+            'CHROMA_DB_DIR': self.root / "chroma_db",
+            'VECTORSTORE_VERSIONS_DIR': self.root / "chroma_versions",
+        })
+
+    def vectorizer(self):
+        """VectorizerCAN2025 indexant le store du workspace dans root/chroma_db"""
+        from src.rag.vectorizer import VectorizerCAN2025
+
+        return VectorizerCAN2025(config=self.rag_config(), persist_directory=self.root / "chroma_db")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de corpus CAN 2025 synthétique")
+    parser.add_argument('--docs', type=int, default=10_000, help="Nombre de documents (10k à 1M)")
+    parser.add_argument('--duplicate-ratio', type=float, default=0.1)
+    parser.add_argument('--languages', type=parse_languages, default=None, help="ex: fr=0.6,en=0.3,ar=0.1")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--target', choices=['raw', 'combined', 'enrichment', 'all'], default='raw',
+                        help="raw: partitions daily_fetch, combined: store du vectorizer, "
+                             "enrichment: fichiers d'enrichissement")
+    parser.add_argument('--output', type=Path, required=True, help="Répertoire du workspace")
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(seed=args.seed, duplicate_ratio=args.duplicate_ratio, languages=args.languages)
+    workspace = SyntheticWorkspace(args.output)
+
+    if args.target in ('raw', 'all'):
+        start = time.perf_counter()
+        parts = corpus.write_raw_partitions(workspace.raw_dir, args.docs)
+        print(f"✅ {args.docs} articles bruts, {len(parts)} partitions ({time.perf_counter() - start:.1f}s) "
+              f"→ {workspace.raw_dir}")
+    if args.target in ('combined', 'all'):
+        start = time.perf_counter()
+        store = corpus.write_combined_store(workspace.store_dir, args.docs)
+        print(f"✅ {len(store)} documents combinés ({time.perf_counter() - start:.1f}s) → {workspace.store_dir}")
+    if args.target in ('enrichment', 'all'):
+        start = time.perf_counter()
+        files = corpus.write_enrichment(workspace.enrichment_dir, max(1, args.docs // 10))
+        print(f"✅ {len(files)} fichiers d'enrichissement ({time.perf_counter() - start:.1f}s) "
+              f"→ {workspace.enrichment_dir}")
+
+
+if __name__ == "__main__":
+    main()
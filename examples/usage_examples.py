@@ -1,19 +1,26 @@
 """
 Exemple d'utilisation des données transformées pour le RAG
 """
+import heapq
 import json
+import sys
+from itertools import islice
 from pathlib import Path
 from collections import Counter
 
 # Chemins
 BASE_DIR = Path(__file__).resolve().parent.parent
-DATASET_PATH = BASE_DIR / "data" / "transformed" / "combined_dataset.json"
+sys.path.insert(0, str(BASE_DIR))
 
+from src.pipeline.document_store import DocumentStore
 
-def load_dataset():
-    """Charger le dataset combiné"""
-    with open(DATASET_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+STORE_DIR = BASE_DIR / "data" / "transformed" / "combined_dataset"
+LEGACY_DATASET_PATH = BASE_DIR / "data" / "transformed" / "combined_dataset.json"
+
+
+def load_dataset() -> DocumentStore:
+    """Ouvrir le dataset combiné (store JSONL, itéré à la demande)"""
+    return DocumentStore.open(STORE_DIR, legacy_json=LEGACY_DATASET_PATH)
 
 
 def example_basic_stats():
@@ -23,19 +30,21 @@ def example_basic_stats():
     print("=" * 70)
     
     dataset = load_dataset()
-    documents = dataset['documents']
     
-    print(f"\n✅ Total documents: {len(documents)}")
-    print(f"📅 Date de création: {dataset['metadata']['creation_date']}")
+    print(f"\n✅ Total documents: {len(dataset)}")
+    print(f"📅 Date de création: {dataset.metadata.get('creation_date', 'N/A')}")
+    
+    # Compter par catégorie et par source en un seul passage
+    categories = Counter()
+    sources = Counter()
+    for doc in dataset.iter_documents():
+        categories[doc['metadata'].get('category', 'unknown')] += 1
+        sources[doc['metadata'].get('source', 'unknown')] += 1
     
-    # Compter par catégorie
-    categories = Counter(doc['metadata']['category'] for doc in documents)
     print("\n📑 Par catégorie:")
     for cat, count in categories.items():
         print(f"  • {cat}: {count}")
     
-    # Compter par source
-    sources = Counter(doc['metadata']['source'] for doc in documents)
     print("\n📰 Par source:")
     for src, count in sources.items():
         print(f"  • {src}: {count}")
@@ -48,12 +57,11 @@ def example_filter_by_category():
     print("=" * 70)
     
     dataset = load_dataset()
-    documents = dataset['documents']
     
     # Filtrer les résultats de matchs
     match_results = [
-        doc for doc in documents 
-        if doc['metadata']['category'] == 'match_result'
+        doc for doc in dataset.iter_documents()
+        if doc['metadata'].get('category') == 'match_result'
     ]
     
     print(f"\n🏆 Résultats de matchs trouvés: {len(match_results)}")
@@ -62,7 +70,7 @@ def example_filter_by_category():
         meta = doc['metadata']
         print(f"\n{i}. {meta['title']}")
         print(f"   📅 Date: {meta['date']}")
-        print(f"   🔗 Lien: {meta['link']}")
+        print(f"   🔗 Lien: {meta.get('link', '')}")
 
 
 def example_search_by_team():
@@ -72,13 +80,12 @@ def example_search_by_team():
     print("=" * 70)
     
     dataset = load_dataset()
-    documents = dataset['documents']
     
     # Rechercher tous les articles sur le Maroc
     team = "Morocco"
     morocco_articles = [
-        doc for doc in documents 
-        if team in doc['text'] or team in str(doc['metadata']['keywords'])
+        doc for doc in dataset.iter_documents()
+        if team in doc['text'] or team in str(doc['metadata'].get('keywords', ''))
     ]
     
     print(f"\n🇲🇦 Articles mentionnant '{team}': {len(morocco_articles)}")
@@ -94,12 +101,11 @@ def example_search_by_player():
     print("=" * 70)
     
     dataset = load_dataset()
-    documents = dataset['documents']
     
     # Rechercher les articles mentionnant Salah
     player = "Salah"
     player_articles = [
-        doc for doc in documents 
+        doc for doc in dataset.iter_documents()
         if player in doc['text']
     ]
     
@@ -123,21 +129,20 @@ def example_get_latest_news():
     print("=" * 70)
     
     dataset = load_dataset()
-    documents = dataset['documents']
     
-    # Trier par date
-    sorted_docs = sorted(
-        documents, 
-        key=lambda x: x['metadata']['date'], 
-        reverse=True
+    # Garder les 5 plus récents sans trier tout le corpus
+    latest_docs = heapq.nlargest(
+        5,
+        dataset.iter_documents(),
+        key=lambda x: x['metadata'].get('date', '')
     )
     
     print("\n🆕 Les 5 dernières actualités:")
-    for i, doc in enumerate(sorted_docs[:5], 1):
+    for i, doc in enumerate(latest_docs, 1):
         meta = doc['metadata']
         print(f"\n{i}. {meta['title']}")
         print(f"   📅 {meta['date']}")
-        print(f"   📑 Catégorie: {meta['category']}")
+        print(f"   📑 Catégorie: {meta.get('category', 'N/A')}")
 
 
 def example_prepare_for_rag():
@@ -147,11 +152,10 @@ def example_prepare_for_rag():
     print("=" * 70)
     
     dataset = load_dataset()
-    documents = dataset['documents']
     
     # Format pour LangChain/LlamaIndex
     rag_documents = []
-    for doc in documents[:3]:  # Prendre les 3 premiers comme exemple
+    for doc in islice(dataset.iter_documents(), 3):  # Prendre les 3 premiers comme exemple
         rag_doc = {
             "page_content": doc['text'],  # Le texte pour la vectorisation
             "metadata": doc['metadata']    # Métadonnées pour le filtrage
@@ -171,7 +175,7 @@ def main():
     print("     EXEMPLES D'UTILISATION - DONNÉES CAN 2025")
     print("🏆" * 35 + "\n")
     
-    if not DATASET_PATH.exists():
+    if not load_dataset().exists():
         print("❌ Dataset non trouvé. Exécutez d'abord le pipeline:")
         print("   python -m src.pipeline.pipeline")
         return
@@ -12,12 +12,16 @@ load_dotenv()
 
 from src.rag.chatbot import ChatbotCAN2025
 from src.rag.config import RAGConfig
+from src.rag.refresher import VectorstoreRefresher
 from src.sentiment.youtube_analyzer import YouTubeSentimentAnalyzer
+from src.sentiment.job_queue import SentimentJobQueue
+from src.sentiment.config import SentimentConfig
 from src.sentiment.visualizer import (
     create_sentiment_pie_chart, 
     create_sentiment_bar_chart,
     create_wordcloud,
-    create_confidence_distribution
+    create_confidence_distribution,
+    create_sentiment_timeline
 )
 from src.summary.match_summarizer import MatchSummarizer
 from src.summary.exporters import PDFExporter, ImageExporter
@@ -214,6 +218,40 @@ def init_chatbot():
         return None
 
 
+@st.cache_resource
+def get_vectorstore_refresher():
+    """
+    Rafraîchisseur du vectorstore partagé par toutes les sessions
+
+    Un rafraîchissement récupère de nouvelles données (extraction puis
+    étapes impactées du pipeline) et n'est reconstruit que si la version
+    active n'intègre pas encore les changements. Le chatbot est abonné : il
+    recharge son retriever dès qu'une nouvelle version est activée.
+    """
+    from src.pipeline.auto_pipeline import AutoPipeline
+
+    refresher = VectorstoreRefresher(prepare=AutoPipeline().refresh_data)
+    chatbot = init_chatbot()
+    if chatbot is not None:
+        refresher.add_listener(chatbot.reload_vectorstore)
+    # init_chatbot vient d'exécuter le pipeline : pas de reconstruction si la version est à jour
+    if not refresher.is_current():
+        refresher.start()
+    return refresher
+
+
+@st.cache_resource
+def get_sentiment_analyzer():
+    """Analyseur de sentiment partagé (modèle chargé une seule fois)"""
+    return YouTubeSentimentAnalyzer()
+
+
+@st.cache_resource
+def get_sentiment_jobs():
+    """File de jobs multi-vidéos partagée par toutes les sessions (reprend les jobs interrompus)"""
+    return SentimentJobQueue(get_sentiment_analyzer())
+
+
 def display_sources(sources):
     """Affiche les sources de manière élégante et moderne dans un expander"""
     if sources:
@@ -300,6 +338,19 @@ def sentiment_page():
         )
         
         show_confidence = st.checkbox("Afficher la distribution des scores de confiance", value=False)
+        
+        timeline_window = st.select_slider(
+            "⏱️ Fenêtre de la courbe d'humeur",
+            options=list(SentimentConfig.TIMELINE_WINDOWS),
+            value=300,
+            format_func=lambda seconds: f"{seconds // 60} min"
+        )
+        
+        incremental = st.checkbox(
+            "🔁 Analyse incrémentale",
+            value=True,
+            help="Ne télécharger et n'analyser que les nouveaux commentaires depuis la dernière analyse de cette vidéo"
+        )
     
     # Bouton d'analyse
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -310,24 +361,37 @@ def sentiment_page():
     if analyze_button and url:
         try:
             # Initialisation de l'analyseur avec cache
-            @st.cache_resource
-            def get_analyzer():
-                return YouTubeSentimentAnalyzer()
+            analyzer = get_sentiment_analyzer()
             
-            analyzer = get_analyzer()
+            # Progress bar : téléchargement et analyse avancent ensemble
+            progress_bar = st.progress(0, text="📥 Téléchargement des commentaires...")
+            live_stats = st.empty()
             
-            # Progress bar
-            progress_bar = st.progress(0, text="Initialisation...")
+            def show_progress(progress):
+                pct = progress['percentages']
+                progress_bar.progress(
+                    min(progress['classified'] / max_comments, 1.0),
+                    text=f"📥 {progress['fetched']} récupérés · 🔍 {progress['classified']} analysés"
+                )
+                live_stats.caption(
+                    f"😊 {pct['positive']:.0f}% · 😐 {pct['neutral']:.0f}% · 😢 {pct['negative']:.0f}%"
+                )
             
-            # Étape 1: Extraction des commentaires
-            progress_bar.progress(20, text="📥 Téléchargement des commentaires...")
-            stats = analyzer.analyze_video(url, max_comments=max_comments)
+            stats = analyzer.analyze_video(url, max_comments=max_comments, progress_callback=show_progress,
+                                           incremental=incremental)
             
-            progress_bar.progress(100, text="✅ Analyse terminée!")
             progress_bar.empty()
+            live_stats.empty()
             
             # Résultats
             st.success(f"✅ {stats['total_comments']} commentaires analysés avec succès!")
+            if 'incremental' in stats:
+                st.caption(f"🔁 {stats['incremental']['new_comments']} nouveaux commentaires depuis la "
+                           f"dernière analyse ({stats['incremental']['known_comments']} déjà analysés)")
+            st.caption(f"⚡ {stats['throughput']['comments_per_s']:.0f} commentaires/s "
+                       f"(lots de {stats['throughput']['batch_size']}) · "
+                       f"📦 cache : {stats['cache']['hit_rate']:.0f}% · "
+                       f"{stats['cache']['duplicates']} doublons regroupés")
             
             # Métriques principales
             st.markdown("### 📈 Résultats Globaux")
@@ -371,6 +435,11 @@ def sentiment_page():
                 bar_fig = create_sentiment_bar_chart(stats)
                 st.plotly_chart(bar_fig, use_container_width=True)
             
+            # Courbe d'humeur au fil du match
+            timeline_fig = create_sentiment_timeline(stats, window=timeline_window)
+            if timeline_fig:
+                st.plotly_chart(timeline_fig, use_container_width=True)
+            
             # Distribution de confiance
             if show_confidence:
                 st.markdown("### 📉 Distribution des Scores de Confiance")
@@ -410,6 +479,23 @@ def sentiment_page():
                 else:
                     st.info("Aucun commentaire négatif trouvé")
             
+            st.markdown("---")
+            
+            # Nuages de mots : index de fréquences calculé une fois, images en cache par sentiment
+            st.markdown("### ☁️ Nuages de Mots")
+            words = stats['words']
+            tabs = st.tabs(["💬 Tous", "😊 Positifs", "😐 Neutres", "😢 Négatifs"])
+            for tab, sentiment in zip(tabs, [None, 'positive', 'neutral', 'negative']):
+                with tab:
+                    image = create_wordcloud(words, sentiment)
+                    if image:
+                        st.markdown(f'<img src="{image}" style="width: 100%;">', unsafe_allow_html=True)
+                    else:
+                        st.info("Pas assez de mots pour ce sentiment")
+                    emojis = words.top_emojis(sentiment, 10)
+                    if emojis:
+                        st.caption("Emojis : " + " · ".join(f"{emoji} {count}" for emoji, count in emojis))
+            
         except ValueError as e:
             st.error(f"❌ Erreur: {str(e)}")
             st.info("Vérifiez que l'URL est valide et que la vidéo contient des commentaires.")
@@ -420,6 +506,61 @@ def sentiment_page():
     
     elif analyze_button and not url:
         st.warning("⚠️ Veuillez entrer une URL YouTube")
+    
+    st.markdown("---")
+    sentiment_jobs_section(max_comments, incremental)
+
+
+STATUS_ICONS = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌"}
+
+
+def sentiment_jobs_section(max_comments: int, incremental: bool):
+    """Analyse de plusieurs vidéos en arrière-plan (file de jobs)"""
+    st.markdown("### 📋 Analyse de plusieurs vidéos")
+    
+    urls = st.text_area(
+        "🔗 URLs YouTube (une par ligne)",
+        placeholder="https://www.youtube.com/watch?v=...\nhttps://youtu.be/...",
+        help="Par exemple tous les résumés d'une journée de compétition"
+    )
+    if st.button("📥 Lancer l'analyse en arrière-plan"):
+        try:
+            job_id = get_sentiment_jobs().submit(urls.splitlines(), max_comments=max_comments,
+                                                 incremental=incremental)
+            st.session_state.sentiment_job_id = job_id
+        except ValueError as e:
+            st.warning(f"⚠️ {str(e)}")
+    
+    job_id = st.session_state.get("sentiment_job_id")
+    if job_id:
+        show_sentiment_job(job_id)
+
+
+@st.fragment(run_every=2)
+def show_sentiment_job(job_id: str):
+    """Statut du job, rafraîchi toutes les 2 secondes sans bloquer la page"""
+    job = get_sentiment_jobs().get_job(job_id)
+    if job is None:
+        return
+    
+    videos = job['videos']
+    finished = sum(video['status'] in ("done", "failed") for video in videos)
+    st.progress(finished / len(videos),
+                text=f"{STATUS_ICONS[job['status']]} Job {job_id} : {finished}/{len(videos)} vidéos terminées")
+    
+    for video in videos:
+        label = video['video_id'] or video['url']
+        if video['status'] == "done":
+            summary = video['summary']
+            pct = summary['percentages']
+            st.markdown(f"✅ **{label}** · {summary['total_comments']} commentaires · "
+                        f"😊 {pct['positive']:.0f}% · 😐 {pct['neutral']:.0f}% · 😢 {pct['negative']:.0f}%")
+        elif video['status'] == "failed":
+            st.markdown(f"❌ **{label}** · {video['error']}")
+        elif video['status'] == "running":
+            st.markdown(f"🔄 **{label}** · 📥 {video['fetched']} récupérés · 🔍 {video['classified']} analysés")
+        else:
+            st.markdown(f"⏳ **{label}** · en attente")
 
 
 def chatbot_page():
@@ -529,6 +670,26 @@ def chatbot_page():
             st.rerun()
 
 
+def refresh_sidebar():
+    """Version active du vectorstore et rafraîchissement manuel"""
+    st.markdown("### 🔄 Base de connaissances")
+    refresher = get_vectorstore_refresher()
+    status = refresher.status
+
+    st.caption(f"Version active : {status['current_version'] or 'aucune'}")
+    if status['state'] == 'running':
+        st.info("⏳ Rafraîchissement en cours...")
+    elif status['state'] == 'failed':
+        st.error(f"❌ Dernier rafraîchissement échoué : {status['last_error']}")
+    elif status['last_success']:
+        st.caption(f"Dernier rafraîchissement : {status['last_success'][:19].replace('T', ' ')} ({status['duration_s']} s)")
+
+    if st.button("🔄 Rafraîchir", use_container_width=True, disabled=refresher.is_running(),
+                 help="Récupérer les dernières actualités puis mettre à jour la base"):
+        refresher.start()
+        st.rerun()
+
+
 def main():
     """Fonction principale"""
     
@@ -543,6 +704,10 @@ def main():
         
         st.markdown("---")
         
+        refresh_sidebar()
+        
+        st.markdown("---")
+        
         # Informations
         st.markdown("### ℹ️ À propos")
         st.markdown("""
@@ -10,6 +10,8 @@ from datetime import datetime
 import logging
 import speech_recognition as sr
 
+from ..tracing import span, traced, set_attribute
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -133,7 +135,9 @@ class TTSEngine:
             audio_path = os.path.join(self.output_dir, f"audio_{text_hash}.mp3")
             
             # Si déjà généré, retourner directement
-            if os.path.exists(audio_path):
+            cached = os.path.exists(audio_path)
+            set_attribute("cached", cached)
+            if cached:
                 logger.info(f"♻️ Audio en cache: {audio_path}")
                 return audio_path
             
@@ -214,6 +218,7 @@ class AvatarController:
                 "error": f"Erreur microphone: {e}"
             }
     
+    @traced("avatar.process_question")
     def process_question(self, question: str) -> dict:
         """
         Traite une question et génère la réponse audio
@@ -228,13 +233,16 @@ class AvatarController:
             logger.info(f"❓ Question reçue: {question}")
             
             # 1. Rechercher dans l'historique
-            info_found = self.historique.search_info(question)
+            with span("avatar.search"):
+                info_found = self.historique.search_info(question)
             
             # 2. Générer réponse naturelle
-            response = self._generate_natural_response(question, info_found)
+            with span("avatar.generate"):
+                response = self._generate_natural_response(question, info_found)
             
             # 3. Synthétiser en audio
-            audio_path = self.tts.synthesize(response, lang="fr")
+            with span("avatar.tts", text_chars=len(response)):
+                audio_path = self.tts.synthesize(response, lang="fr")
             
             # 4. Calculer durée approximative
             words = len(response.split())
@@ -254,6 +262,7 @@ class AvatarController:
             
         except Exception as e:
             logger.error(f"❌ Erreur traitement question: {e}")
+            set_attribute("error", f"{type(e).__name__}: {e}")
             return {
                 "question": question,
                 "response": "Désolé, je n'ai pas pu traiter votre question.",
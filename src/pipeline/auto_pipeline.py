@@ -8,6 +8,11 @@ from pathlib import Path
 from typing import Tuple, Dict, Any
 from datetime import datetime
 
+from .config import DATA_DIR as RAW_DATA_DIR, PIPELINE_STATE_FILE, PIPELINE_LOCK_TIMEOUT
+from .daemon import RunLock
+from .dag import PipelineDAG, PipelineStage
+from .partitions import PartitionedDataset, ingest_file, PARTS_GLOB as RAW_PARTS_GLOB
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +23,50 @@ class AutoPipeline:
         """Initialiser le pipeline automatisé"""
         from ..rag.config import RAGConfig
         self.config = RAGConfig
+        self.raw_data_dir = RAW_DATA_DIR  # Répertoire lu par DataTransformer
+        self.enrichment_dir = self.config.DATA_DIR / "enrichment"
+        self.dag = self._build_dag()
+        self.lock = RunLock()  # Verrou partagé avec le démon : un seul run du DAG à la fois
+        self.lock_timeout = PIPELINE_LOCK_TIMEOUT
+        self.last_report = None
+    
+    def _build_dag(self) -> PipelineDAG:
+        """
+        Construire le DAG extract → transform → enrich → vectorize
+        
+        Chaque étape déclare ses entrées/sorties : elle est sautée si ses
+        entrées n'ont pas changé depuis son dernier succès.
+        """
+        store_dir = self.config.DOCUMENT_STORE_DIR
+        dag = PipelineDAG(PIPELINE_STATE_FILE)
+        dag.add_stage(PipelineStage(
+            "extract", self.run_extraction,
+            # Fichiers plats ou partitions : après migration, les plats peuvent avoir disparu
+            outputs=[[(self.raw_data_dir, "*.json"), (self.raw_data_dir, RAW_PARTS_GLOB)]],
+            label="Extraction"
+        ))
+        dag.add_stage(PipelineStage(
+            "transform", self.run_transformation,
+            inputs=[(self.raw_data_dir, "*.json"), (self.raw_data_dir, RAW_PARTS_GLOB)],
+            outputs=[store_dir / "header.json"],
+            depends_on=["extract"],
+            label="Transformation"
+        ))
+        dag.add_stage(PipelineStage(
+            "enrich", self.run_enrichment,
+            inputs=[(self.enrichment_dir, "*.json"), store_dir],
+            outputs=[store_dir / "header.json"],
+            depends_on=["transform"],
+            label="Enrichissement"
+        ))
+        dag.add_stage(PipelineStage(
+            "vectorize", self.run_vectorization,
+            inputs=[store_dir],
+            outputs=[self.config.VECTORSTORE_VERSIONS_DIR / "CURRENT"],
+            depends_on=["enrich"],
+            label="Vectorisation"
+        ))
+        return dag
         
     def check_data_status(self) -> Dict[str, Any]:
         """
@@ -26,48 +75,20 @@ class AutoPipeline:
         Returns:
             Dictionnaire avec le statut de chaque étape
         """
+        plan = self.dag.plan()
+        
         status = {
-            'raw_data_exists': False,
-            'transformed_data_exists': False,
-            'vectorstore_exists': False,
-            'needs_extraction': False,
-            'needs_transformation': False,
-            'needs_vectorization': False,
-            'ready': False
+            'raw_data_exists': PartitionedDataset(self.raw_data_dir).has_data(),
+            'transformed_data_exists': (self.config.DOCUMENT_STORE_DIR / "header.json").exists(),
+            'vectorstore_exists': self.config.vectorstore_versions().current_dir() is not None,
+            'needs_extraction': plan['extract']['needed'],
+            'needs_transformation': plan['transform']['needed'],
+            'needs_enrichment': plan['enrich']['needed'],
+            'needs_vectorization': plan['vectorize']['needed'],
+            'stages': plan,
+            'ready': not any(stage['needed'] for stage in plan.values())
         }
         
-        # Vérifier les données brutes
-        raw_dir = self.config.DATA_DIR / "raw"
-        if raw_dir.exists() and any(raw_dir.glob("*.json")):
-            status['raw_data_exists'] = True
-        
-        # Vérifier les données transformées
-        if self.config.COMBINED_DATASET.exists():
-            status['transformed_data_exists'] = True
-        
-        # Vérifier le vectorstore
-        if self.config.CHROMA_DB_DIR.exists():
-            chroma_files = list(self.config.CHROMA_DB_DIR.glob("**/*"))
-            if len(chroma_files) > 0:
-                status['vectorstore_exists'] = True
-        
-        # Déterminer les actions nécessaires
-        if not status['raw_data_exists']:
-            status['needs_extraction'] = True
-        
-        if not status['transformed_data_exists']:
-            status['needs_transformation'] = True
-        
-        if not status['vectorstore_exists']:
-            status['needs_vectorization'] = True
-        
-        # Prêt si tout existe
-        status['ready'] = (
-            status['raw_data_exists'] and 
-            status['transformed_data_exists'] and 
-            status['vectorstore_exists']
-        )
-        
         return status
     
     def run_extraction(self) -> bool:
@@ -85,6 +106,9 @@ class AutoPipeline:
             real_data_path = real_scraper.scrape_all()
             logger.info(f"✅ Données réelles extraites: {real_data_path}")
             
+            # Le scraper écrit dans data/raw, DataTransformer lit les partitions de data/daily_fetch
+            ingest_file(Path(real_data_path), PartitionedDataset(self.raw_data_dir))
+            
             # 2. Ajouter des données démo supplémentaires si nécessaire
             from ..pipeline.demo_scraper import save_demo_data
             demo_data_path = save_demo_data()
@@ -108,7 +132,7 @@ class AutoPipeline:
             transformer = DataTransformer()
             
             # Transformer tous les fichiers
-            transformed_files = transformer.transform_all_files()
+            transformed_files = transformer.transform_all_files(skip_unchanged=True)
             
             if not transformed_files:
                 logger.warning("⚠️ Aucun fichier transformé")
@@ -129,95 +153,124 @@ class AutoPipeline:
             logger.error(f"❌ Erreur lors de la transformation: {e}")
             return False
     
+    def run_enrichment(self) -> bool:
+        """
+        Exécuter l'enrichissement du dataset combiné (data/enrichment)
+        
+        Returns:
+            True si réussi, False sinon
+        """
+        logger.info("📚 Enrichissement du dataset combiné...")
+        try:
+            from ..pipeline.enrich_database import DatabaseEnricher
+            DatabaseEnricher().merge_and_save()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'enrichissement: {e}")
+            return False
+    
     def run_vectorization(self) -> bool:
         """
         Exécuter la vectorisation (création de ChromaDB)
         
+        Si une version est active, seuls les changements publiés dans le flux
+        CDC sont appliqués, dans une copie de cette version. Sinon l'index est
+        construit dans une nouvelle version. Dans les deux cas la nouvelle
+        version est ensuite activée : un chatbot déjà lancé continue de
+        servir l'ancienne version jusqu'à la bascule.
+        
         Returns:
             True si réussi, False sinon
         """
         logger.info("🔍 Vectorisation et création de ChromaDB...")
         try:
-            from ..rag.vectorizer import VectorizerCAN2025
-            vectorizer = VectorizerCAN2025()
-            vectorizer.create_vectorstore()
-            logger.info("✅ Vectorisation réussie")
+            from ..rag.refresher import VectorstoreRefresher
+            refresher = VectorstoreRefresher(config=self.config)
+            
+            # Chemin incrémental : rejouer le flux de changements dans une copie de la version active
+            if self.config.vectorstore_versions().current_version():
+                from .change_feed import FeedGapError
+                try:
+                    stats = refresher.sync()
+                    if stats is None:
+                        return False
+                    logger.info(f"✅ Vectorisation incrémentale réussie ({stats['upserted']} vectorisés, {stats['deleted']} supprimés)")
+                    return True
+                except FeedGapError as e:
+                    logger.info(f"↻ Reconstruction complète nécessaire : {e}")
+            
+            version = refresher.refresh()
+            if version is None:
+                return False
+            logger.info(f"✅ Vectorisation réussie (version {version})")
             return True
         except Exception as e:
             logger.error(f"❌ Erreur lors de la vectorisation: {e}")
             return False
     
-    def ensure_ready(self, force_refresh: bool = False) -> Tuple[bool, str]:
+    def ensure_ready(self, force_refresh: bool = False, refetch: bool = False) -> Tuple[bool, str]:
         """
         S'assurer que toutes les données sont prêtes
-        Exécute automatiquement les étapes manquantes
+        Exécute uniquement les étapes dont les entrées ont changé
         
         Args:
             force_refresh: Si True, force la régénération complète
+            refetch: Si True, relance l'extraction (nouvelles données) puis les étapes impactées
         
         Returns:
             Tuple (succès: bool, message: str)
         """
         logger.info("🚀 Vérification du pipeline de données...")
         
-        # Vérifier l'état actuel
-        status = self.check_data_status()
-        
-        if status['ready'] and not force_refresh:
-            logger.info("✅ Toutes les données sont prêtes")
-            return True, "Données prêtes"
-        
-        steps_completed = []
-        steps_failed = []
-        
-        # Étape 1: Extraction
-        if status['needs_extraction'] or force_refresh:
-            logger.info("📥 Étape 1/3: Extraction des données...")
-            if self.run_extraction():
-                steps_completed.append("Extraction")
-            else:
-                steps_failed.append("Extraction")
-                return False, "Échec de l'extraction des données"
-        else:
-            logger.info("✓ Données brutes déjà présentes")
+        # Le démon écrit le même store, journal et flux : attendre la fin de son cycle
+        if not self.lock.acquire(timeout=self.lock_timeout):
+            message = "Pipeline déjà en cours d'exécution par un autre processus"
+            logger.error(f"❌ {message}")
+            return False, message
+        try:
+            report = self.dag.run(force=force_refresh, rerun=["extract"] if refetch else [])
+        finally:
+            self.lock.release()
+        self.last_report = report
         
-        # Étape 2: Transformation
-        if status['needs_transformation'] or force_refresh:
-            logger.info("🔄 Étape 2/3: Transformation des données...")
-            if self.run_transformation():
-                steps_completed.append("Transformation")
-            else:
-                steps_failed.append("Transformation")
-                return False, "Échec de la transformation des données"
-        else:
-            logger.info("✓ Données transformées déjà présentes")
+        steps_completed = [
+            self.dag.stages[name].label
+            for name, stage in report['stages'].items() if stage['status'] == 'ran'
+        ]
+        timings = ", ".join(
+            f"{name}={stage['duration_s']:.1f}s"
+            for name, stage in report['stages'].items() if stage['status'] != 'skipped'
+        )
+        if timings:
+            logger.info(f"⏱️ Durées: {timings} (total {report['total_duration_s']:.1f}s)")
         
-        # Étape 3: Vectorisation
-        if status['needs_vectorization'] or force_refresh:
-            logger.info("🔍 Étape 3/3: Vectorisation (ChromaDB)...")
-            if self.run_vectorization():
-                steps_completed.append("Vectorisation")
-            else:
-                steps_failed.append("Vectorisation")
-                return False, "Échec de la vectorisation"
-        else:
-            logger.info("✓ ChromaDB déjà créée")
+        if not report['success']:
+            failed = self.dag.stages[report['failed_stage']].label
+            message = f"Échec de l'étape: {failed}"
+            logger.error(f"❌ {message}")
+            return False, message
         
-        # Résumé
         if steps_completed:
             message = f"Pipeline complété: {', '.join(steps_completed)}"
-            logger.info(f"✅ {message}")
         else:
-            message = "Toutes les données étaient déjà présentes"
-            logger.info(f"✅ {message}")
-        
-        if steps_failed:
-            message = f"Échecs: {', '.join(steps_failed)}"
-            logger.error(f"❌ {message}")
-            return False, message
+            message = "Données prêtes"
+        logger.info(f"✅ {message}")
         
         return True, message
     
+    def refresh_data(self):
+        """
+        Récupérer de nouvelles données et mettre à jour le vectorstore
+        
+        Étape de préparation du rafraîchissement de l'application (VectorstoreRefresher).
+        
+        Raises:
+            RuntimeError: si une étape du pipeline échoue
+        """
+        success, message = self.ensure_ready(refetch=True)
+        if not success:
+            raise RuntimeError(message)
+    
     def get_status_message(self) -> str:
         """
         Obtenir un message d'état lisible
@@ -235,6 +288,8 @@ class AutoPipeline:
             messages.append("❌ Extraction requise")
         if status['needs_transformation']:
             messages.append("❌ Transformation requise")
+        if status['needs_enrichment']:
+            messages.append("❌ Enrichissement requis")
         if status['needs_vectorization']:
             messages.append("❌ Vectorisation requise")
         
@@ -0,0 +1,187 @@
+"""
+Flux de changements (CDC) du dataset combiné
+
+La transformation et l'enrichissement ajoutent un événement par document
+modifié dans un petit journal JSONL durable :
+    {"seq": 42, "ts": "...", "op": "upsert|delete", "id": "...", "hash": "...", "source": "transform"}
+
+Les consommateurs (ex: le vectorizer) mémorisent le dernier numéro de
+séquence traité dans un curseur et ne relisent que les événements suivants.
+Le journal ne garde que les CHANGE_FEED_RETENTION derniers événements : un
+curseur plus ancien doit repartir d'une reconstruction complète.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from .config import CHANGE_FEED_FILE, CHANGE_FEED_RETENTION
+
+logger = logging.getLogger(__name__)
+
+
+class FeedGapError(Exception):
+    """Le curseur pointe avant le début du journal (événements compactés)"""
+
+
+def diff_hashes(before: Mapping[str, str], after: Mapping[str, str]) -> List[Dict[str, Any]]:
+    """
+    Changements entre deux états {id: hash} du store
+
+    Returns:
+        Événements {op, id, hash} (upserts puis suppressions)
+    """
+    events = [
+        {"op": "upsert", "id": doc_id, "hash": digest}
+        for doc_id, digest in after.items()
+        if before.get(doc_id) != digest
+    ]
+    events.extend(
+        {"op": "delete", "id": doc_id, "hash": None}
+        for doc_id in before
+        if doc_id not in after
+    )
+    return events
+
+
+class ChangeFeed:
+    """Journal append-only des documents ajoutés, modifiés et supprimés"""
+
+    def __init__(self, path: Path = CHANGE_FEED_FILE, retention: int = CHANGE_FEED_RETENTION):
+        """
+        Args:
+            path: Fichier JSONL du journal
+            retention: Nombre d'événements conservés lors de la troncature
+        """
+        self.path = Path(path)
+        self.retention = retention
+
+    def _read_bounds(self):
+        """Premier et dernier numéros de séquence (0, 0 si vide)"""
+        first = last = 0
+        if not self.path.exists():
+            return first, last
+        with open(self.path, 'rb') as f:
+            head = f.readline()
+            if not head.strip():
+                return first, last
+            first = json.loads(head)['seq']
+            # Lire seulement la fin du fichier pour trouver le dernier événement
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 65536))
+            lines = [line for line in f.read().splitlines() if line.strip()]
+            last = json.loads(lines[-1])['seq']
+        return first, last
+
+    @property
+    def head(self) -> int:
+        """Numéro de séquence du dernier événement"""
+        return self._read_bounds()[1]
+
+    def append(self, events: Iterable[Dict[str, Any]], source: str) -> int:
+        """
+        Ajouter des événements au journal
+
+        Args:
+            events: Dictionnaires {op, id, hash}
+            source: Étape émettrice (transform, enrich...)
+
+        Returns:
+            Nombre d'événements écrits
+        """
+        seq = self.head
+        ts = datetime.now().isoformat()
+        written = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for event in events:
+                seq += 1
+                f.write(json.dumps({
+                    "seq": seq,
+                    "ts": ts,
+                    "op": event['op'],
+                    "id": event['id'],
+                    "hash": event.get('hash'),
+                    "source": source
+                }, ensure_ascii=False) + "\n")
+                written += 1
+            f.flush()
+            os.fsync(f.fileno())
+
+        if written:
+            logger.info(f"📡 {written} changement(s) publié(s) par {source} (seq {seq})")
+            first, _ = self._read_bounds()
+            if seq - first + 1 > 2 * self.retention:
+                self.truncate()
+        return written
+
+    def read(self, after: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Itérer sur les événements postérieurs à un numéro de séquence
+
+        Raises:
+            FeedGapError: si des événements postérieurs au curseur ont été tronqués
+        """
+        first, last = self._read_bounds()
+        if last > after and first > after + 1:
+            raise FeedGapError(f"Événements {after + 1}..{first - 1} tronqués")
+        if last <= after:
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event['seq'] > after:
+                    yield event
+
+    def truncate(self) -> int:
+        """Ne conserver que les `retention` derniers événements"""
+        _, last = self._read_bounds()
+        keep_after = last - self.retention
+        if keep_after <= 0:
+            return 0
+
+        removed = 0
+        tmp_file = self.path.with_suffix('.tmp')
+        with open(self.path, 'r', encoding='utf-8') as src, open(tmp_file, 'w', encoding='utf-8') as dst:
+            for line in src:
+                if line.strip() and json.loads(line)['seq'] <= keep_after:
+                    removed += 1
+                    continue
+                dst.write(line)
+        os.replace(tmp_file, self.path)
+        logger.info(f"🗜️ Flux de changements tronqué : {removed} événements supprimés")
+        return removed
+
+
+class FeedCursor:
+    """Position d'un consommateur dans le flux de changements"""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Fichier JSON du curseur
+        """
+        self.path = Path(path)
+
+    @property
+    def position(self) -> Optional[int]:
+        """Dernier numéro de séquence traité (None si jamais initialisé)"""
+        if not self.path.exists():
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)['seq']
+
+    def commit(self, seq: int):
+        """Enregistrer atomiquement la position"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"seq": seq, "updated_at": datetime.now().isoformat()}, f)
+        os.replace(tmp_file, self.path)
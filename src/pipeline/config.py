@@ -9,6 +9,54 @@ DATA_DIR = BASE_DIR / "data" / "daily_fetch"
 # Create data directory if it doesn't exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Combined dataset (JSONL document store, see document_store.py)
+TRANSFORMED_DIR = BASE_DIR / "data" / "transformed"
+COMBINED_STORE_DIR = TRANSFORMED_DIR / "combined_dataset"
+LEGACY_COMBINED_JSON = TRANSFORMED_DIR / "combined_dataset.json"
+TRANSFORM_OWNED_IDS_FILE = TRANSFORMED_DIR / "transform_ids.json"  # IDs written by the transform step
+
+# Pipeline DAG state (input fingerprints + stage timings, see dag.py)
+PIPELINE_STATE_FILE = BASE_DIR / "data" / "pipeline_state.json"
+
+# Near-duplicate detection (MinHash + LSH, see dedup.py)
+DEDUP_STATE_FILE = TRANSFORMED_DIR / "dedup_signatures.json"
+DEDUP_THRESHOLD = 0.8  # estimated Jaccard similarity
+DEDUP_NUM_PERM = 128
+DEDUP_BANDS = 16  # 16 bands x 8 rows -> candidates from ~0.7 similarity
+DEDUP_SHINGLE_SIZE = 3  # words per shingle
+
+# Enrichment delta journal (see enrichment_journal.py)
+ENRICHMENT_JOURNAL_DIR = TRANSFORMED_DIR / "enrichment_journal"
+JOURNAL_RETENTION_DAYS = 30  # point-in-time restore horizon after compaction
+JOURNAL_COMPACT_EVERY = 5000  # compact once this many entries are past the horizon
+
+# Change data capture feed: transform/enrich -> vectorizer (see change_feed.py)
+CHANGE_FEED_FILE = TRANSFORMED_DIR / "change_feed.jsonl"
+CHANGE_FEED_RETENTION = 100000  # events kept; older cursors fall back to a full rebuild
+
+# Pipeline daemon: fetch -> transform -> index on a schedule (see daemon.py)
+DAEMON_MATCH_INTERVAL = 5 * 60  # seconds between runs around match kick-offs
+DAEMON_IDLE_INTERVAL = 60 * 60  # seconds between runs otherwise
+DAEMON_MAX_BACKOFF = 6 * 60 * 60  # cap for the exponential backoff after failed fetches
+DAEMON_MATCH_HOURS = (13, 24)  # local hours treated as match time when no fixture file exists
+DAEMON_MATCH_WINDOW = (-30, 150)  # minutes around a kick-off treated as match time
+TOURNAMENT_DATES = ("2025-12-21", "2026-01-18")
+MATCH_SCHEDULE_FILE = BASE_DIR / "data" / "match_schedule.json"  # optional {"matches": [{"kickoff": ISO}]}
+DAEMON_LOCK_FILE = BASE_DIR / "data" / "pipeline_daemon.lock"
+DAEMON_LOCK_STALE_AFTER = 2 * 60 * 60  # seconds before a lock no longer refreshed by its holder is ignored
+PIPELINE_LOCK_TIMEOUT = 15 * 60  # seconds the app waits for a daemon cycle before giving up
+DAEMON_RUN_LOG = BASE_DIR / "data" / "logs" / "pipeline_runs.jsonl"
+DAEMON_STATE_FILE = BASE_DIR / "data" / "pipeline_daemon_state.json"
+
+# Stage profiling (see profiling.py); PIPELINE_PROFILE=1 enables it for any entry point
+PROFILE_ENABLED = os.getenv("PIPELINE_PROFILE", "0") == "1"
+PROFILE_REPORTS_DIR = BASE_DIR / "data" / "logs" / "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.05  # seconds between RSS samples while a stage runs
+
+# Parallel transform (process pool, see transform.py)
+TRANSFORM_WORKERS = int(os.getenv("TRANSFORM_WORKERS", "0")) or (os.cpu_count() or 1)
+TRANSFORM_SHARD_SIZE = 2000  # articles per task when a single file is split across workers
+
 # News sources for CAN 2025
 NEWS_SOURCES = {
     "cafonline_afcon": {
@@ -50,6 +98,15 @@ NEWS_SOURCES = {
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
+
+# Per-domain adaptive rate limiting + circuit breaker (see rate_limiter.py)
+RATE_LIMIT_INITIAL = 0.67  # requests/second per domain at start (~1.5s spacing)
+RATE_LIMIT_MIN = 0.05
+RATE_LIMIT_MAX = 2.0
+RATE_LIMIT_BURST = 2  # bucket capacity
+RATE_LIMIT_LATENCY_TARGET = 2.0  # seconds; slower responses reduce the rate
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures before a domain is skipped
+BREAKER_COOLDOWN = 300  # seconds before a half-open trial request
 DELAY_BETWEEN_REQUESTS = 2  # seconds
 
 # Data storage settings
@@ -0,0 +1,345 @@
+"""
+Démon du pipeline : fetch → transform → index en continu
+
+Chaque cycle scrape les sources, ne partitionne le résultat dans daily_fetch
+que s'il a changé, puis exécute le DAG d'AutoPipeline (seules les étapes dont
+les entrées ont changé tournent ; la vectorisation rejoue le flux CDC).
+
+- Fréquence : toutes les 5 min autour des matchs, toutes les heures sinon
+- Verrou fichier : deux cycles ne se chevauchent jamais (plusieurs démons, cron...)
+- Backoff exponentiel quand les sources échouent
+- Journal JSONL structuré : durées et nombre de documents par étape
+
+Usage:
+    python -m src.pipeline.daemon            # boucle infinie
+    python -m src.pipeline.daemon --once     # un seul cycle (cron)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import signal
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import (
+    DAEMON_MATCH_INTERVAL, DAEMON_IDLE_INTERVAL, DAEMON_MAX_BACKOFF,
+    DAEMON_MATCH_HOURS, DAEMON_MATCH_WINDOW, TOURNAMENT_DATES, MATCH_SCHEDULE_FILE,
+    DAEMON_LOCK_FILE, DAEMON_LOCK_STALE_AFTER, DAEMON_RUN_LOG, DAEMON_STATE_FILE
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MatchSchedule:
+    """Détermine si l'on est en période de match"""
+
+    def __init__(self, schedule_file: Path = MATCH_SCHEDULE_FILE):
+        """
+        Args:
+            schedule_file: JSON optionnel {"matches": [{"kickoff": "2026-01-18T20:00:00"}, ...]}
+        """
+        self.kickoffs: List[datetime] = []
+        if Path(schedule_file).exists():
+            with open(schedule_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.kickoffs = sorted(datetime.fromisoformat(m['kickoff']) for m in data.get('matches', []))
+            logger.info(f"📅 {len(self.kickoffs)} matchs chargés depuis {Path(schedule_file).name}")
+
+        self.tournament_start = datetime.fromisoformat(TOURNAMENT_DATES[0])
+        self.tournament_end = datetime.fromisoformat(TOURNAMENT_DATES[1]) + timedelta(days=1)
+
+    def is_match_time(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now()
+        if self.kickoffs:
+            before, after = (timedelta(minutes=m) for m in DAEMON_MATCH_WINDOW)
+            return any(kickoff + before <= now <= kickoff + after for kickoff in self.kickoffs)
+
+        # Sans calendrier : créneaux horaires habituels pendant le tournoi
+        start_hour, end_hour = DAEMON_MATCH_HOURS
+        return self.tournament_start <= now < self.tournament_end and start_hour <= now.hour < end_hour
+
+
+class RunLock:
+    """
+    Verrou fichier empêchant deux exécutions simultanées du pipeline (multi-processus)
+
+    Le détenteur rafraîchit la date du fichier pendant qu'il tourne : seul
+    un verrou dont le processus est mort finit par être considéré abandonné.
+    """
+
+    def __init__(self, path: Path = DAEMON_LOCK_FILE, stale_after: float = DAEMON_LOCK_STALE_AFTER):
+        self.path = Path(path)
+        self.stale_after = stale_after
+        self.acquired = False
+        self._heartbeat: Optional[threading.Thread] = None
+        self._released = threading.Event()
+
+    def acquire(self, timeout: float = 0) -> bool:
+        """
+        Prendre le verrou
+
+        Args:
+            timeout: Secondes d'attente si le verrou est détenu (0 : pas d'attente)
+        """
+        deadline = time.monotonic() + timeout
+        while not self._try_acquire():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+        return True
+
+    def _try_acquire(self) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    age = time.time() - self.path.stat().st_mtime
+                except FileNotFoundError:
+                    continue  # Libéré entre-temps
+                if age < self.stale_after:
+                    return False
+                # Processus mort sans libérer le verrou
+                logger.warning(f"⚠️ Verrou abandonné depuis {age:.0f}s, suppression")
+                self.path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"pid": os.getpid(), "acquired_at": datetime.now().isoformat()}, f)
+            self.acquired = True
+            self._start_heartbeat()
+            return True
+        return False
+
+    def _start_heartbeat(self):
+        """Toucher le fichier régulièrement tant que le verrou est détenu"""
+        self._released.clear()
+
+        def beat():
+            while not self._released.wait(self.stale_after / 4):
+                try:
+                    os.utime(self.path)
+                except FileNotFoundError:
+                    return
+
+        self._heartbeat = threading.Thread(target=beat, name="run-lock-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def release(self):
+        if self.acquired:
+            self._released.set()
+            self._heartbeat.join()
+            self.path.unlink(missing_ok=True)
+            self.acquired = False
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class PipelineDaemon:
+    """Boucle planifiée fetch → transform → index"""
+
+    def __init__(self, pipeline=None, schedule: Optional[MatchSchedule] = None,
+                 run_log: Path = DAEMON_RUN_LOG, state_file: Path = DAEMON_STATE_FILE):
+        """
+        Args:
+            pipeline: AutoPipeline (créé par défaut)
+            schedule: Calendrier des matchs
+            run_log: Journal JSONL des cycles
+            state_file: État persistant (échecs consécutifs, empreinte du dernier fetch)
+        """
+        if pipeline is None:
+            from .auto_pipeline import AutoPipeline
+            pipeline = AutoPipeline()
+        self.pipeline = pipeline
+        self.schedule = schedule or MatchSchedule()
+        self.run_log = Path(run_log)
+        self.state_file = Path(state_file)
+        self.state = self._load_state()
+        self.lock = RunLock()
+        self._stop = threading.Event()
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_file.exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {"consecutive_failures": 0, "last_fetch_hash": None}
+
+    def _save_state(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    @staticmethod
+    def _articles_hash(articles: List[Dict[str, Any]]) -> str:
+        """Empreinte du contenu scrapé (sans les horodatages de scraping)"""
+        digest = hashlib.sha1()
+        for article in articles:
+            for field in ('source', 'title', 'content'):
+                digest.update(str(article.get(field, '')).encode('utf-8'))
+                digest.update(b'\0')
+        return digest.hexdigest()
+
+    def fetch(self) -> Dict[str, Any]:
+        """
+        Scraper les sources et publier le fichier s'il contient du nouveau
+
+        Returns:
+            {articles, new_file, fallback_used}
+        """
+        from .real_scraper import CANRealScraper
+
+        path = Path(CANRealScraper().scrape_all())
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        articles = data.get('articles', [])
+        fallback_used = data.get('metadata', {}).get('fallback_used', not articles)
+        fetch_hash = self._articles_hash(articles)
+        new_file = not fallback_used and fetch_hash != self.state.get('last_fetch_hash')
+
+        if new_file:
+            from .partitions import PartitionedDataset, ingest_file
+            ingest_file(path, PartitionedDataset(self.pipeline.raw_data_dir))
+            self.state['last_fetch_hash'] = fetch_hash
+
+        return {'articles': len(articles), 'new_file': new_file, 'fallback_used': fallback_used}
+
+    def _store_size(self) -> Optional[int]:
+        from .document_store import DocumentStore
+        store = DocumentStore(self.pipeline.config.DOCUMENT_STORE_DIR)
+        return len(store) if store.exists() else None
+
+    def run_once(self) -> Dict[str, Any]:
+        """Exécuter un cycle et l'ajouter au journal"""
+        from .change_feed import ChangeFeed
+
+        record = {
+            'run_id': uuid.uuid4().hex[:12],
+            'started_at': datetime.now().isoformat(),
+            'mode': 'match' if self.schedule.is_match_time() else 'idle',
+            'status': 'success',
+            'stages': {},
+            'documents': {},
+            'error': None
+        }
+        start = time.perf_counter()
+
+        with self.lock as acquired:
+            if not acquired:
+                logger.info("⏳ Un autre cycle est en cours, cycle ignoré")
+                record['status'] = 'skipped_locked'
+                self._write_record(record, start)
+                return record
+
+            # 1. Fetch (les échecs de sources déclenchent le backoff)
+            stage_start = time.perf_counter()
+            try:
+                fetch = self.fetch()
+                failed = fetch['fallback_used']
+                record['stages']['fetch'] = {'status': 'failed' if failed else 'ran', **fetch}
+            except Exception as e:
+                logger.error(f"❌ Fetch en échec : {e}")
+                failed = True
+                record['error'] = f"fetch: {e}"
+                record['stages']['fetch'] = {'status': 'failed'}
+            record['stages']['fetch']['duration_s'] = round(time.perf_counter() - stage_start, 3)
+            self.state['consecutive_failures'] = self.state['consecutive_failures'] + 1 if failed else 0
+
+            # 2. Transform → enrich → index (étapes à jour sautées)
+            feed = ChangeFeed()
+            feed_before = feed.head
+            report = self.pipeline.dag.run()
+            record['stages'].update(report['stages'])
+
+            record['documents'] = {
+                'fetched_articles': record['stages']['fetch'].get('articles', 0),
+                'store_total': self._store_size(),
+                'changes_published': feed.head - feed_before
+            }
+
+            if not report['success']:
+                record['status'] = 'failed'
+                record['error'] = record['error'] or f"étape en échec: {report['failed_stage']}"
+            elif failed:
+                record['status'] = 'degraded'
+
+            self._save_state()
+
+        self._write_record(record, start)
+        return record
+
+    def _write_record(self, record: Dict[str, Any], start: float):
+        record['finished_at'] = datetime.now().isoformat()
+        record['duration_s'] = round(time.perf_counter() - start, 3)
+        record['next_run_in_s'] = self.next_interval()
+        self.run_log.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.run_log, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        logger.info(
+            f"📝 Cycle {record['run_id']} : {record['status']} en {record['duration_s']:.1f}s, "
+            f"prochain dans {record['next_run_in_s']}s"
+        )
+
+    def next_interval(self, now: Optional[datetime] = None) -> int:
+        """Délai avant le prochain cycle (backoff exponentiel après des échecs)"""
+        base = DAEMON_MATCH_INTERVAL if self.schedule.is_match_time(now) else DAEMON_IDLE_INTERVAL
+        failures = self.state.get('consecutive_failures', 0)
+        if failures:
+            return min(base * 2 ** failures, max(base, DAEMON_MAX_BACKOFF))
+        return base
+
+    def stop(self, *_):
+        logger.info("🛑 Arrêt demandé, fin après le cycle en cours")
+        self._stop.set()
+
+    def run_forever(self, max_runs: Optional[int] = None):
+        """Boucle principale (SIGINT/SIGTERM arrêtent proprement)"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        runs = 0
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.exception(f"❌ Cycle en erreur : {e}")
+            runs += 1
+            if max_runs is not None and runs >= max_runs:
+                break
+            self._stop.wait(self.next_interval())
+
+
+def main():
+    """Point d'entrée du démon"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description="Démon du pipeline CAN 2025")
+    parser.add_argument('--once', action='store_true', help="Exécuter un seul cycle puis quitter")
+    parser.add_argument('--max-runs', type=int, default=None, help="Nombre maximum de cycles")
+    args = parser.parse_args()
+
+    daemon = PipelineDaemon()
+    if args.once:
+        record = daemon.run_once()
+        raise SystemExit(0 if record['status'] in ('success', 'degraded', 'skipped_locked') else 1)
+    daemon.run_forever(max_runs=args.max_runs)
+
+
+if __name__ == "__main__":
+    main()
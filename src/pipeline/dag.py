@@ -0,0 +1,262 @@
+"""
+Exécuteur DAG du pipeline de données piloté par empreintes
+
+Chaque étape déclare ses entrées et ses sorties. Une étape n'est relancée
+que si l'empreinte de ses entrées a changé depuis son dernier succès, si
+une de ses sorties manque, ou si une étape amont vient d'échouer/tourner
+en mode forcé. Les durées de chaque étape sont enregistrées.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..tracing import traced, span
+
+logger = logging.getLogger(__name__)
+
+# Une entrée/sortie est un chemin (fichier ou répertoire), un couple (répertoire, motif glob)
+# ou une liste d'alternatives : en sortie, la liste est présente si l'une d'elles l'est
+PathSpec = Any
+
+
+def _expand(spec: PathSpec) -> List[Path]:
+    """Lister les fichiers correspondant à une spécification de chemin"""
+    if isinstance(spec, list):
+        return [path for alternative in spec for path in _expand(alternative)]
+    if isinstance(spec, tuple):
+        directory, pattern = spec
+        directory = Path(directory)
+        return sorted(p for p in directory.glob(pattern) if p.is_file()) if directory.exists() else []
+
+    path = Path(spec)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.is_file())
+    return [path] if path.exists() else []
+
+
+def fingerprint(specs: Sequence[PathSpec]) -> str:
+    """
+    Empreinte d'un ensemble de fichiers (chemin, taille, mtime)
+
+    Ne lit pas le contenu des fichiers : le calcul reste rapide même pour
+    des milliers de fichiers.
+    """
+    digest = hashlib.sha1()
+    for spec in specs:
+        for path in _expand(spec):
+            stat = path.stat()
+            digest.update(f"{path}\t{stat.st_size}\t{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _spec_exists(spec: PathSpec) -> bool:
+    return bool(_expand(spec))
+
+
+class PipelineStage:
+    """Étape du pipeline avec entrées/sorties déclarées"""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], bool],
+        inputs: Sequence[PathSpec] = (),
+        outputs: Sequence[PathSpec] = (),
+        depends_on: Sequence[str] = (),
+        label: Optional[str] = None
+    ):
+        """
+        Args:
+            name: Identifiant de l'étape
+            run: Fonction exécutant l'étape (retourne True si réussie)
+            inputs: Fichiers/répertoires lus par l'étape
+            outputs: Fichiers/répertoires produits (l'étape tourne s'ils manquent)
+            depends_on: Étapes à exécuter avant celle-ci
+            label: Nom lisible pour les messages
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.depends_on = list(depends_on)
+        self.label = label or name
+
+
+class PipelineDAG:
+    """Exécuteur de DAG avec saut des étapes à jour"""
+
+    def __init__(self, state_file: Path):
+        """
+        Args:
+            state_file: Fichier JSON conservant les empreintes et durées du dernier succès
+        """
+        self.state_file = Path(state_file)
+        self.stages: Dict[str, PipelineStage] = {}
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠️ État du pipeline illisible, réinitialisation: {e}")
+        return {"stages": {}, "runs": []}
+
+    def _save_state(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def add_stage(self, stage: PipelineStage) -> 'PipelineDAG':
+        """Ajouter une étape (les dépendances doivent déjà être déclarées)"""
+        for dependency in stage.depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"Dépendance inconnue pour {stage.name}: {dependency}")
+        self.stages[stage.name] = stage
+        return self
+
+    def topological_order(self) -> List[PipelineStage]:
+        """Étapes dans l'ordre d'exécution"""
+        ordered, visited = [], set()
+
+        def visit(name):
+            if name in visited:
+                return
+            visited.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            ordered.append(self.stages[name])
+
+        for name in self.stages:
+            visit(name)
+        return ordered
+
+    def stage_status(self, stage: PipelineStage) -> Tuple[bool, str]:
+        """
+        Déterminer si une étape doit tourner
+
+        Returns:
+            Tuple (doit_tourner, raison)
+        """
+        missing = [str(spec) for spec in stage.outputs if not _spec_exists(spec)]
+        if missing:
+            return True, f"sortie manquante: {missing[0]}"
+
+        # Étape source (ex: scraping) : pas d'entrée locale à comparer
+        if not stage.inputs:
+            return False, "sorties présentes"
+
+        previous = self.state['stages'].get(stage.name)
+        if previous is None:
+            return True, "jamais exécutée"
+
+        if fingerprint(stage.inputs) != previous.get('input_fingerprint'):
+            return True, "entrées modifiées"
+
+        return False, "à jour"
+
+    def plan(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculer les étapes à exécuter sans rien lancer
+
+        Une étape en aval d'une étape à exécuter est aussi marquée à exécuter.
+        """
+        plan = {}
+        for stage in self.topological_order():
+            if force:
+                needed, reason = True, "rafraîchissement forcé"
+            else:
+                needed, reason = self.stage_status(stage)
+                upstream = [d for d in stage.depends_on if plan[d]['needed']]
+                if not needed and upstream:
+                    needed, reason = True, f"étape amont à exécuter: {upstream[0]}"
+            plan[stage.name] = {'needed': needed, 'reason': reason, 'label': stage.label}
+        return plan
+
+    @traced("pipeline.run")
+    def run(self, force: bool = False, rerun: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Exécuter le DAG en sautant les étapes à jour
+
+        Args:
+            force: Si True, exécute toutes les étapes
+            rerun: Étapes à relancer même à jour (leurs étapes aval suivent)
+
+        Returns:
+            Rapport {success, stages: {nom: {status, reason, duration_s}}, total_duration_s}
+        """
+        report = {
+            'started_at': datetime.now().isoformat(),
+            'success': True,
+            'stages': {},
+            'failed_stage': None
+        }
+        run_start = time.perf_counter()
+        ran = set()
+        rerun = set(rerun)
+
+        for stage in self.topological_order():
+            if not report['success']:
+                report['stages'][stage.name] = {'status': 'blocked', 'reason': 'étape amont en échec', 'duration_s': 0.0}
+                continue
+
+            if force:
+                needed, reason = True, "rafraîchissement forcé"
+            elif stage.name in rerun:
+                needed, reason = True, "relance demandée"
+            else:
+                needed, reason = self.stage_status(stage)
+                upstream = [d for d in stage.depends_on if d in ran]
+                if not needed and upstream:
+                    needed, reason = True, f"étape amont exécutée: {upstream[0]}"
+
+            if not needed:
+                logger.info(f"✓ {stage.label}: à jour, étape sautée")
+                report['stages'][stage.name] = {'status': 'skipped', 'reason': reason, 'duration_s': 0.0}
+                continue
+
+            logger.info(f"▶️ {stage.label} ({reason})...")
+            stage_start = time.perf_counter()
+            try:
+                with span(f"pipeline.stage.{stage.name}", reason=reason):
+                    success = bool(stage.run())
+            except Exception as e:
+                logger.error(f"❌ {stage.label}: {e}")
+                success = False
+            duration = round(time.perf_counter() - stage_start, 3)
+
+            report['stages'][stage.name] = {
+                'status': 'ran' if success else 'failed',
+                'reason': reason,
+                'duration_s': duration
+            }
+
+            if not success:
+                report['success'] = False
+                report['failed_stage'] = stage.name
+                logger.error(f"❌ {stage.label} en échec après {duration:.2f}s")
+                continue
+
+            ran.add(stage.name)
+            # Empreinte calculée après exécution : une étape qui modifie ses
+            # propres entrées (ex: enrichissement) n'est pas relancée au run suivant
+            self.state['stages'][stage.name] = {
+                'input_fingerprint': fingerprint(stage.inputs),
+                'last_success': datetime.now().isoformat(),
+                'duration_s': duration
+            }
+            logger.info(f"✅ {stage.label} terminé en {duration:.2f}s")
+
+        report['total_duration_s'] = round(time.perf_counter() - run_start, 3)
+        self.state['runs'] = (self.state.get('runs', []) + [report])[-20:]
+        self._save_state()
+        return report
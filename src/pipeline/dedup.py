@@ -0,0 +1,219 @@
+"""
+Détection des quasi-doublons entre runs de scraping (MinHash + LSH)
+
+Les articles re-scrapés d'un jour à l'autre ont presque le même texte mais
+des IDs différents. Chaque document reçoit une signature MinHash ; un index
+LSH par bandes ne compare un document qu'aux candidats partageant au moins
+une bande, ce qui évite la comparaison de toutes les paires (coût
+sous-quadratique). Les signatures sont persistées entre les runs.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import DEDUP_THRESHOLD, DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_SHINGLE_SIZE
+from .document_store import content_hash
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class NearDuplicateDetector:
+    """
+    Détecteur de quasi-doublons MinHash/LSH
+
+    Features:
+    - Signatures MinHash sur des shingles de mots
+    - Index LSH (bandes) pour trouver les candidats sans comparaison globale
+    - Cache persistant des signatures (pas de recalcul entre les runs)
+    - Statistiques de dédoublonnage (ratio)
+    """
+
+    def __init__(
+        self,
+        state_file: Optional[Path] = None,
+        threshold: float = DEDUP_THRESHOLD,
+        num_perm: int = DEDUP_NUM_PERM,
+        bands: int = DEDUP_BANDS,
+        shingle_size: int = DEDUP_SHINGLE_SIZE,
+        seed: int = 42
+    ):
+        """
+        Args:
+            state_file: Fichier JSON de persistance des signatures (optionnel)
+            threshold: Similarité de Jaccard estimée à partir de laquelle deux documents sont doublons
+            num_perm: Nombre de permutations MinHash
+            bands: Nombre de bandes LSH (num_perm doit être divisible par bands)
+            shingle_size: Nombre de mots par shingle
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm doit être divisible par bands")
+
+        self.state_file = Path(state_file) if state_file else None
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+        self._buckets: Dict[tuple, List[str]] = {}
+        self._signatures: Dict[str, List[int]] = {}  # doc_id -> signature (index courant)
+        self._cache: Dict[str, List[int]] = {}  # content hash -> signature (persisté)
+        self._cache_used: Dict[str, List[int]] = {}
+
+        self.seen = 0
+        self.duplicates = 0
+        self.cache_hits = 0
+
+        self._load_state()
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size
+        }
+
+    def _load_state(self):
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            # Des paramètres différents rendent les signatures incomparables
+            if state.get('params') == self._params():
+                self._cache = state.get('signatures', {})
+                logger.info(f"📂 {len(self._cache)} signatures MinHash rechargées")
+        except Exception as e:
+            logger.warning(f"⚠️ État de dédoublonnage illisible, recalcul complet: {e}")
+
+    def save(self):
+        """Persister les signatures des documents vus pendant ce run"""
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"params": self._params(), "signatures": self._cache_used}, f)
+        os.replace(tmp_file, self.state_file)
+
+    # ------------------------------------------------------------------
+    # MinHash
+    # ------------------------------------------------------------------
+
+    def _shingles(self, text: str) -> set:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if len(tokens) < self.shingle_size:
+            return {' '.join(tokens)} if tokens else set()
+        return {
+            ' '.join(tokens[i:i + self.shingle_size])
+            for i in range(len(tokens) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> List[int]:
+        """Calculer la signature MinHash d'un texte"""
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in self._shingles(text)]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+            for a, b in self._perms
+        ]
+
+    def _cached_signature(self, text: str) -> List[int]:
+        key = content_hash({"text": text})
+        sig = self._cache.get(key)
+        if sig is None:
+            sig = self.signature(text)
+        else:
+            self.cache_hits += 1
+        self._cache_used[key] = sig
+        return sig
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Similarité de Jaccard estimée entre deux signatures"""
+        equal = sum(1 for a, b in zip(sig_a, sig_b) if a == b)
+        return equal / len(sig_a)
+
+    # ------------------------------------------------------------------
+    # Index LSH
+    # ------------------------------------------------------------------
+
+    def _band_keys(self, sig: List[int]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (band, tuple(sig[start:start + self.rows]))
+
+    def find_duplicate(self, sig: List[int]) -> Optional[str]:
+        """
+        Chercher un document indexé quasi identique
+
+        Returns:
+            ID du document le plus similaire au-dessus du seuil, ou None
+        """
+        candidates = set()
+        for key in self._band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+
+        best_id, best_score = None, self.threshold
+        for candidate in candidates:
+            score = self.similarity(sig, self._signatures[candidate])
+            if score >= best_score:
+                best_id, best_score = candidate, score
+        return best_id
+
+    def add(self, doc_id: str, sig: List[int]):
+        """Ajouter une signature à l'index LSH"""
+        self._signatures[doc_id] = sig
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, []).append(doc_id)
+
+    def check(self, doc_id: str, text: str) -> Optional[str]:
+        """
+        Vérifier un document et l'indexer s'il est nouveau
+
+        Les documents doivent être présentés du plus récent au plus ancien :
+        le premier vu est conservé, les versions plus anciennes sont écartées.
+
+        Returns:
+            ID du document conservé dont celui-ci est un doublon, ou None
+        """
+        self.seen += 1
+        sig = self._cached_signature(text)
+        duplicate_of = self.find_duplicate(sig)
+        if duplicate_of is not None:
+            self.duplicates += 1
+            return duplicate_of
+        self.add(doc_id, sig)
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques du dédoublonnage"""
+        return {
+            'documents_seen': self.seen,
+            'duplicates_removed': self.duplicates,
+            'documents_kept': self.seen - self.duplicates,
+            'dedup_ratio': round(self.duplicates / self.seen, 4) if self.seen else 0.0,
+            'signature_cache_hits': self.cache_hits,
+            'threshold': self.threshold
+        }
@@ -0,0 +1,410 @@
+"""
+Stockage documentaire en streaming pour le dataset combiné
+Remplace le gros fichier combined_dataset.json par des shards JSON Lines
+
+Structure sur disque :
+    combined_dataset/
+        header.json          # métadonnées + liste des shards (petit fichier)
+        part-00000.jsonl     # un enregistrement par ligne
+        part-00000.idx       # index "id<TAB>offset<TAB>hash<TAB>op" du shard
+
+Chaque ligne d'un shard est un enregistrement {op, id, hash, doc}.
+Un "put" sur un ID existant masque l'ancien enregistrement (le dernier gagne),
+un "delete" écrit une pierre tombale. compact() réécrit uniquement les
+enregistrements vivants.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEADER_FILE = "header.json"
+SHARD_PREFIX = "part-"
+STORE_FORMAT = "can2025-docstore"
+STORE_VERSION = 1
+DEFAULT_SHARD_SIZE = 10000
+
+
+def document_id(doc: Dict[str, Any]) -> str:
+    """
+    Retourne l'ID stable d'un document
+
+    L'ID peut être à la racine (fichiers d'enrichissement) ou dans
+    metadata.id (fichiers transformés). Les articles scrapés sans ID
+    reçoivent un ID dérivé du hash de leur texte.
+    """
+    doc_id = doc.get('id') or doc.get('metadata', {}).get('id')
+    if doc_id:
+        return str(doc_id)
+    digest = hashlib.sha1(doc.get('text', '').encode('utf-8')).hexdigest()[:16]
+    return f"doc_{digest}"
+
+
+def content_hash(doc: Dict[str, Any]) -> str:
+    """Hash du contenu d'un document (détection des modifications)"""
+    payload = json.dumps(doc, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class DocumentStore:
+    """
+    Store de documents JSONL shardé
+
+    Features:
+    - Ajout incrémental (upsert) sans réécrire le dataset
+    - Itération paresseuse (générateurs, mémoire constante)
+    - Accès direct par ID via un index chargé à la demande
+    """
+
+    def __init__(self, root: Path, shard_size: int = DEFAULT_SHARD_SIZE):
+        """
+        Args:
+            root: Répertoire du store
+            shard_size: Nombre maximum d'enregistrements par shard
+        """
+        self.root = Path(root)
+        self.shard_size = shard_size
+        self._header = None
+        self._index = None  # id -> (shard, offset, hash)
+
+    # ------------------------------------------------------------------
+    # En-tête
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        """Vérifier si le store a déjà été créé"""
+        return (self.root / HEADER_FILE).exists()
+
+    @property
+    def header(self) -> Dict[str, Any]:
+        if self._header is None:
+            header_file = self.root / HEADER_FILE
+            if header_file.exists():
+                with open(header_file, 'r', encoding='utf-8') as f:
+                    self._header = json.load(f)
+            else:
+                self._header = {
+                    "format": STORE_FORMAT,
+                    "version": STORE_VERSION,
+                    "shard_size": self.shard_size,
+                    "metadata": {},
+                    "shards": [],
+                    "live_documents": 0,
+                    "dead_records": 0,
+                    "updated_at": None
+                }
+        return self._header
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Métadonnées du dataset (équivalent de l'ancien champ 'metadata')"""
+        return self.header['metadata']
+
+    def update_metadata(self, **fields):
+        """Mettre à jour les métadonnées et persister l'en-tête"""
+        self.header['metadata'].update(fields)
+        self._save_header()
+
+    def _save_header(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.header['updated_at'] = datetime.now().isoformat()
+        self.header['metadata']['total_documents'] = self.header['live_documents']
+        tmp_file = self.root / f"{HEADER_FILE}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.header, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.root / HEADER_FILE)
+
+    def __len__(self) -> int:
+        return self.header['live_documents']
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _shard_path(self, shard: int) -> Path:
+        return self.root / f"{SHARD_PREFIX}{shard:05d}.jsonl"
+
+    def _index_path(self, shard: int) -> Path:
+        return self.root / f"{SHARD_PREFIX}{shard:05d}.idx"
+
+    def _load_index(self) -> Dict[str, Tuple[int, int, str]]:
+        """Charger l'index id -> position (uniquement les IDs, pas les documents)"""
+        if self._index is None:
+            index = {}
+            for shard in range(len(self.header['shards'])):
+                index_path = self._index_path(shard)
+                if not index_path.exists():
+                    continue
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        doc_id, offset, digest, op = line.rstrip('\n').split('\t')
+                        if op == 'delete':
+                            index.pop(doc_id, None)
+                        else:
+                            index[doc_id] = (shard, int(offset), digest)
+            self._index = index
+        return self._index
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._load_index()
+
+    def ids(self) -> Iterator[str]:
+        """Itérer sur les IDs des documents vivants"""
+        return iter(list(self._load_index().keys()))
+
+    def hashes(self) -> Dict[str, str]:
+        """Copie de l'index ID -> hash du contenu (documents vivants)"""
+        return {doc_id: entry[2] for doc_id, entry in self._load_index().items()}
+
+    def get_hash(self, doc_id: str) -> Optional[str]:
+        """Hash du contenu d'un document (None si absent)"""
+        entry = self._load_index().get(doc_id)
+        return entry[2] if entry else None
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def _write_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Ajouter des enregistrements à la fin du dernier shard"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        index = self._load_index()
+        shards = self.header['shards']
+        if not shards:
+            shards.append({"name": self._shard_path(0).name, "records": 0})
+
+        written = 0
+        shard = len(shards) - 1
+        data_file = open(self._shard_path(shard), 'ab')
+        index_file = open(self._index_path(shard), 'a', encoding='utf-8')
+        try:
+            for record in records:
+                if shards[shard]['records'] >= self.shard_size:
+                    data_file.close()
+                    index_file.close()
+                    shard += 1
+                    shards.append({"name": self._shard_path(shard).name, "records": 0})
+                    data_file = open(self._shard_path(shard), 'ab')
+                    index_file = open(self._index_path(shard), 'a', encoding='utf-8')
+
+                doc_id = record['id']
+                previous = index.get(doc_id)
+                offset = data_file.tell()
+                data_file.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+                index_file.write(f"{doc_id}\t{offset}\t{record.get('hash', '')}\t{record['op']}\n")
+                shards[shard]['records'] += 1
+
+                if record['op'] == 'delete':
+                    index.pop(doc_id, None)
+                    self.header['live_documents'] -= 1
+                    # La pierre tombale et l'ancien enregistrement sont morts
+                    self.header['dead_records'] += 2
+                else:
+                    index[doc_id] = (shard, offset, record['hash'])
+                    if previous:
+                        self.header['dead_records'] += 1
+                    else:
+                        self.header['live_documents'] += 1
+                written += 1
+        finally:
+            data_file.close()
+            index_file.close()
+
+        self._save_header()
+        return written
+
+    def append(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Ajouter (ou remplacer) des documents
+
+        Un document dont l'ID existe déjà avec le même contenu est ignoré.
+
+        Args:
+            documents: Itérable de documents (peut être un générateur)
+
+        Returns:
+            Nombre de documents écrits
+        """
+        index = self._load_index()
+
+        def records():
+            for doc in documents:
+                doc_id = document_id(doc)
+                digest = content_hash(doc)
+                current = index.get(doc_id)
+                if current and current[2] == digest:
+                    continue
+                yield {"op": "put", "id": doc_id, "hash": digest, "doc": doc}
+
+        return self._write_records(records())
+
+    def delete(self, doc_ids: Iterable[str]) -> int:
+        """
+        Supprimer des documents par ID (pierres tombales)
+
+        Returns:
+            Nombre de documents supprimés
+        """
+        index = self._load_index()
+        # Un ID répété ne doit produire qu'une pierre tombale
+        targets = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id in index]
+        return self._write_records({"op": "delete", "id": doc_id} for doc_id in targets)
+
+    def clear(self):
+        """Supprimer tout le contenu du store (en conservant les métadonnées)"""
+        metadata = dict(self.metadata)
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        self._header = None
+        self._index = {}
+        self.header['metadata'] = metadata
+        self._save_header()
+
+    def compact(self) -> int:
+        """
+        Réécrire le store avec uniquement les documents vivants
+
+        Returns:
+            Nombre d'enregistrements morts supprimés
+        """
+        dead = self.header['dead_records']
+        if dead == 0:
+            return 0
+
+        logger.info(f"🗜️ Compaction du store ({dead} enregistrements morts)...")
+        tmp_root = self.root.with_name(self.root.name + ".compact")
+        if tmp_root.exists():
+            shutil.rmtree(tmp_root)
+
+        compacted = DocumentStore(tmp_root, shard_size=self.shard_size)
+        compacted.header['metadata'] = dict(self.metadata)
+        compacted._index = {}
+        compacted._write_records(
+            {"op": "put", "id": doc_id, "hash": content_hash(doc), "doc": doc}
+            for doc_id, doc in self.iter_items()
+        )
+
+        old_root = self.root.with_name(self.root.name + ".old")
+        os.replace(self.root, old_root)
+        os.replace(tmp_root, self.root)
+        shutil.rmtree(old_root)
+
+        self._header = None
+        self._index = None
+        logger.info(f"✅ Compaction terminée: {len(self)} documents")
+        return dead
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def _iter_records(self) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        for shard in range(len(self.header['shards'])):
+            shard_path = self._shard_path(shard)
+            if not shard_path.exists():
+                continue
+            with open(shard_path, 'rb') as f:
+                offset = f.tell()
+                line = f.readline()
+                while line:
+                    yield shard, offset, json.loads(line)
+                    offset = f.tell()
+                    line = f.readline()
+
+    def iter_items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Itérer paresseusement sur les couples (id, document) vivants
+
+        Sans enregistrement mort, aucun index n'est chargé : la mémoire
+        utilisée reste constante quelle que soit la taille du corpus.
+        """
+        check_liveness = self.header['dead_records'] > 0
+        index = self._load_index() if check_liveness else None
+
+        for shard, offset, record in self._iter_records():
+            if record['op'] != 'put':
+                continue
+            if check_liveness:
+                entry = index.get(record['id'])
+                if not entry or entry[0] != shard or entry[1] != offset:
+                    continue
+            yield record['id'], record['doc']
+
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        """Itérer paresseusement sur les documents vivants"""
+        for _, doc in self.iter_items():
+            yield doc
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_documents()
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Accès direct à un document par son ID (seek dans le shard)
+
+        Returns:
+            Le document ou None si absent
+        """
+        entry = self._load_index().get(doc_id)
+        if entry is None:
+            return None
+        shard, offset, _ = entry
+        with open(self._shard_path(shard), 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())['doc']
+
+    def get_many(self, doc_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Récupérer plusieurs documents par ID (les absents sont ignorés)"""
+        documents = []
+        for doc_id in doc_ids:
+            doc = self.get(doc_id)
+            if doc is not None:
+                documents.append(doc)
+        return documents
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_json(cls, json_path: Path, root: Path, shard_size: int = DEFAULT_SHARD_SIZE) -> 'DocumentStore':
+        """
+        Migrer un ancien fichier combined_dataset.json vers le format JSONL
+
+        Args:
+            json_path: Fichier JSON monolithique {metadata, documents}
+            root: Répertoire du nouveau store
+        """
+        logger.info(f"🔄 Migration de {Path(json_path).name} vers le format JSONL...")
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        store = cls(root, shard_size=shard_size)
+        store.clear()
+        store.header['metadata'] = dict(data.get('metadata', {}))
+        store.header['metadata']['migrated_from'] = Path(json_path).name
+        store.append(data.get('documents', []))
+        logger.info(f"✅ Migration terminée: {len(store)} documents dans {root}")
+        return store
+
+    @classmethod
+    def open(cls, root: Path, legacy_json: Optional[Path] = None,
+             shard_size: int = DEFAULT_SHARD_SIZE) -> 'DocumentStore':
+        """
+        Ouvrir le store, en migrant l'ancien fichier JSON si nécessaire
+
+        Args:
+            root: Répertoire du store
+            legacy_json: Ancien combined_dataset.json (migré une seule fois)
+        """
+        store = cls(root, shard_size=shard_size)
+        if not store.exists() and legacy_json is not None and Path(legacy_json).exists():
+            store = cls.from_json(legacy_json, root, shard_size=shard_size)
+        return store
@@ -7,6 +7,16 @@ import json
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+from .config import (
+    TRANSFORMED_DIR, COMBINED_STORE_DIR, LEGACY_COMBINED_JSON,
+    ENRICHMENT_JOURNAL_DIR, CHANGE_FEED_FILE
+)
+from .document_store import DocumentStore, document_id, content_hash
+from .enrichment_journal import EnrichmentJournal
+from .change_feed import ChangeFeed, diff_hashes
+from .profiling import profiled, count_items
 
 # Configuration du logging
 logging.basicConfig(
@@ -21,155 +31,203 @@ class DatabaseEnricher:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent.parent
         self.enrichment_dir = self.project_root / "data" / "enrichment"
-        self.transformed_dir = self.project_root / "data" / "transformed"
-        self.combined_file = self.transformed_dir / "combined_dataset.json"
-        
-    def load_existing_data(self):
-        """Charger les données existantes du fichier combiné"""
-        logger.info(f"📂 Chargement des données existantes : {self.combined_file}")
-        
-        if not self.combined_file.exists():
-            logger.warning("⚠️  Aucun fichier combiné existant, création d'un nouveau")
-            return {
-                "metadata": {
-                    "source": "combined",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "version": "1.0"
-                },
-                "documents": []
-            }
-        
-        with open(self.combined_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        logger.info(f"✅ {len(data['documents'])} documents existants chargés")
-        return data
+        self.transformed_dir = TRANSFORMED_DIR
+        self.combined_file = LEGACY_COMBINED_JSON
+        self.store_dir = COMBINED_STORE_DIR
+        self.journal = EnrichmentJournal(ENRICHMENT_JOURNAL_DIR)
+        self.change_feed = ChangeFeed(CHANGE_FEED_FILE)
+        
+    def load_existing_data(self) -> DocumentStore:
+        """
+        Ouvrir le store du dataset combiné
+        
+        Les documents ne sont pas chargés en mémoire : seul l'index des IDs
+        est lu lors de la déduplication.
+        """
+        logger.info(f"📂 Ouverture du dataset combiné : {self.store_dir}")
+        
+        store = DocumentStore.open(self.store_dir, legacy_json=self.combined_file)
+        if not store.exists():
+            logger.warning("⚠️  Aucun dataset combiné existant, création d'un nouveau")
+            store.update_metadata(
+                source="combined",
+                date=datetime.now().strftime("%Y-%m-%d"),
+                version="1.0"
+            )
+        
+        logger.info(f"✅ {len(store)} documents existants")
+        return store
     
-    def load_enrichment_files(self):
-        """Charger tous les fichiers JSON du dossier enrichment"""
+    def load_enrichment_files(self) -> Tuple[Dict[str, List[Dict]], Set[str]]:
+        """
+        Charger tous les fichiers JSON du dossier enrichment
+        
+        Returns:
+            (documents par fichier chargé, fichiers illisibles)
+        """
         logger.info(f"📂 Recherche de fichiers d'enrichissement dans : {self.enrichment_dir}")
         
         if not self.enrichment_dir.exists():
             logger.error(f"❌ Dossier introuvable : {self.enrichment_dir}")
-            return []
+            return {}, {self.enrichment_dir.name}
         
-        enrichment_files = list(self.enrichment_dir.glob("*.json"))
+        enrichment_files = sorted(self.enrichment_dir.glob("*.json"))
         logger.info(f"📄 {len(enrichment_files)} fichiers trouvés")
         
-        all_documents = []
+        loaded, failed = {}, set()
         for file_path in enrichment_files:
             logger.info(f"   📥 Chargement : {file_path.name}")
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     documents = data.get('documents', [])
-                    all_documents.extend(documents)
+                    loaded[file_path.name] = documents
                     logger.info(f"      ✅ {len(documents)} documents ajoutés")
             except Exception as e:
+                failed.add(file_path.name)
                 logger.error(f"      ❌ Erreur : {e}")
         
-        logger.info(f"✅ Total : {len(all_documents)} nouveaux documents chargés")
-        return all_documents
+        total = sum(len(documents) for documents in loaded.values())
+        logger.info(f"✅ Total : {total} nouveaux documents chargés")
+        return loaded, failed
     
-    def remove_duplicates(self, existing_docs, new_docs):
-        """Supprimer les doublons basés sur l'ID"""
-        logger.info("🔄 Suppression des doublons...")
-        
-        # Construire le set d'IDs existants
-        existing_ids = set()
-        for doc in existing_docs:
-            # L'ID peut être dans metadata.id ou directement dans le doc
-            if 'metadata' in doc and 'id' in doc['metadata']:
-                existing_ids.add(doc['metadata']['id'])
-            elif 'id' in doc:
-                existing_ids.add(doc['id'])
-        
-        logger.info(f"   📊 {len(existing_ids)} IDs existants")
-        
-        unique_new_docs = []
-        duplicates = 0
-        
-        for doc in new_docs:
-            # Récupérer l'ID du nouveau document
-            doc_id = doc.get('id') or doc.get('metadata', {}).get('id')
-            
-            if doc_id and doc_id not in existing_ids:
-                unique_new_docs.append(doc)
-                existing_ids.add(doc_id)
+    def compute_delta(self, store, loaded, failed=()):
+        """
+        Comparer les documents d'enrichissement au store
+        
+        Args:
+            store: Store du dataset combiné
+            loaded: Documents par fichier d'enrichissement chargé
+            failed: Fichiers illisibles (leurs documents ne sont jamais supprimés)
+        
+        Returns:
+            Liste de changements {op: add|change|remove, id, doc?, prev?, source?}
+        """
+        logger.info("🔄 Calcul des changements...")
+        
+        tracked = self.journal.tracked_ids()
+        incoming = {}
+        for source, documents in loaded.items():
+            for doc in documents:
+                incoming[document_id(doc)] = (source, doc)  # Le dernier fichier lu gagne
+        
+        changes = []
+        unchanged = 0
+        for doc_id, (source, doc) in incoming.items():
+            current_hash = store.get_hash(doc_id)
+            if current_hash is None:
+                changes.append({'op': 'add', 'id': doc_id, 'doc': doc, 'source': source})
+            elif current_hash != content_hash(doc):
+                change = {'op': 'change', 'id': doc_id, 'doc': doc, 'source': source}
+                if doc_id not in tracked:
+                    # Première modification d'un document antérieur au journal
+                    change['prev'] = store.get(doc_id)
+                changes.append(change)
             else:
-                duplicates += 1
+                unchanged += 1
+        
+        # Documents ajoutés par un enrichissement précédent et retirés des fichiers.
+        # Si un fichier est illisible, seuls les documents d'un fichier relu sont supprimés.
+        sources = self.journal.sources()
+        kept = 0
+        for doc_id, present in tracked.items():
+            if present and doc_id not in incoming and doc_id in store:
+                if failed and sources.get(doc_id) not in loaded:
+                    kept += 1
+                    continue
+                changes.append({'op': 'remove', 'id': doc_id})
+        if kept:
+            logger.warning(f"   ⚠️  {kept} suppressions ignorées : fichiers illisibles ({', '.join(sorted(failed))})")
         
-        logger.info(f"   ✅ {len(unique_new_docs)} documents uniques")
-        if duplicates > 0:
-            logger.info(f"   ⚠️  {duplicates} doublons ignorés")
+        counts = {op: sum(1 for c in changes if c['op'] == op) for op in ('add', 'change', 'remove')}
+        logger.info(f"   ✅ {counts['add']} ajouts, {counts['change']} modifications, {counts['remove']} suppressions")
+        if unchanged > 0:
+            logger.info(f"   ⚠️  {unchanged} documents inchangés ignorés")
         
-        return unique_new_docs
+        return changes
     
+    @profiled("merge_and_save")
     def merge_and_save(self):
-        """Fusionner les données existantes avec les nouvelles et sauvegarder"""
+        """
+        Appliquer les changements d'enrichissement au dataset combiné
+        
+        Seul le delta est écrit : d'abord dans le journal (restauration
+        possible à une date donnée), puis dans le store.
+        """
         logger.info("🚀 Démarrage de l'enrichissement de la base de données")
         logger.info("=" * 60)
         
         # Charger les données
-        existing_data = self.load_existing_data()
-        new_documents = self.load_enrichment_files()
+        store = self.load_existing_data()
+        loaded, failed = self.load_enrichment_files()
         
-        if not new_documents:
+        if not any(loaded.values()) and not self.journal.tracked_ids():
             logger.warning("⚠️  Aucun nouveau document à ajouter")
             return
         
-        # Supprimer les doublons
-        unique_new_docs = self.remove_duplicates(
-            existing_data['documents'], 
-            new_documents
-        )
+        changes = self.compute_delta(store, loaded, failed)
         
-        if not unique_new_docs:
+        if not changes:
             logger.warning("⚠️  Tous les documents sont déjà présents")
             return
         
-        # Fusionner
-        logger.info("🔄 Fusion des données...")
-        existing_data['documents'].extend(unique_new_docs)
+        # Journal d'abord : un run interrompu reste rejouable
+        existing_count = len(store)
+        count_items(len(changes))
+        self.journal.record(changes)
         
-        # Mettre à jour les métadonnées
-        existing_data['metadata']['date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        existing_data['metadata']['last_enrichment'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        existing_data['metadata']['total_documents'] = len(existing_data['documents'])
+        logger.info(f"💾 Application du delta dans : {self.store_dir}")
+        store.append(c['doc'] for c in changes if c['op'] != 'remove')
+        store.delete(c['id'] for c in changes if c['op'] == 'remove')
+        self.change_feed.append((
+            {'op': 'delete', 'id': c['id']} if c['op'] == 'remove'
+            else {'op': 'upsert', 'id': c['id'], 'hash': content_hash(c['doc'])}
+            for c in changes
+        ), source="enrich")
         
-        # Sauvegarder
-        logger.info(f"💾 Sauvegarde dans : {self.combined_file}")
-        self.transformed_dir.mkdir(parents=True, exist_ok=True)
+        # Mettre à jour les métadonnées
+        store.update_metadata(
+            date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            last_enrichment=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
         
-        with open(self.combined_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_data, f, ensure_ascii=False, indent=2)
+        self.journal.maybe_compact()
         
         logger.info("✅ Base de données enrichie avec succès!")
         logger.info("=" * 60)
         logger.info(f"📊 STATISTIQUES FINALES :")
-        logger.info(f"   • Documents existants : {len(existing_data['documents']) - len(unique_new_docs)}")
-        logger.info(f"   • Nouveaux documents : {len(unique_new_docs)}")
-        logger.info(f"   • TOTAL : {len(existing_data['documents'])}")
+        logger.info(f"   • Documents existants : {existing_count}")
+        logger.info(f"   • Changements appliqués : {len(changes)}")
+        logger.info(f"   • TOTAL : {len(store)}")
+        logger.info(f"   • Entrées du journal : {len(self.journal)}")
         logger.info("=" * 60)
         
-        # Créer un backup
-        backup_file = self.transformed_dir / f"combined_dataset_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_data, f, ensure_ascii=False, indent=2)
-        logger.info(f"💾 Backup créé : {backup_file.name}")
+        return store
+    
+    def restore(self, as_of):
+        """
+        Restaurer les documents d'enrichissement à leur état à une date
         
-        return existing_data
+        Args:
+            as_of: Date ISO (ex: "2026-01-05T12:00:00")
+        """
+        store = self.load_existing_data()
+        before = store.hashes()
+        stats = self.journal.restore(store, as_of)
+        self.change_feed.append(diff_hashes(before, store.hashes()), source="restore")
+        store.update_metadata(date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        return stats
     
     def get_statistics(self):
         """Afficher les statistiques par catégorie"""
         logger.info("\n📊 STATISTIQUES PAR CATÉGORIE :")
         logger.info("=" * 60)
         
-        data = self.load_existing_data()
+        store = self.load_existing_data()
         categories = {}
         
-        for doc in data['documents']:
-            category = doc['metadata'].get('category', 'non_classé')
+        for doc in store.iter_documents():
+            category = doc.get('metadata', {}).get('category', 'non_classé')
             categories[category] = categories.get(category, 0) + 1
         
         for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
@@ -180,12 +238,31 @@ class DatabaseEnricher:
 
 def main():
     """Point d'entrée principal"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Enrichissement du dataset combiné")
+    parser.add_argument('--restore', metavar='DATE',
+                        help="Restaurer l'enrichissement à une date ISO (rejoue le journal)")
+    parser.add_argument('--compact', action='store_true',
+                        help="Compacter le journal au-delà de l'horizon de rétention")
+    args = parser.parse_args()
+    
+    enricher = DatabaseEnricher()
+    
+    if args.restore:
+        stats = enricher.restore(args.restore)
+        print(f"\n⏪ Restauration : {stats['restored']} documents restaurés, {stats['deleted']} supprimés\n")
+        return
+    
+    if args.compact:
+        removed = enricher.journal.compact()
+        print(f"\n🗜️ Journal compacté : {removed} entrées fusionnées\n")
+        return
+    
     print("\n" + "=" * 60)
     print("🚀 ENRICHISSEMENT DE LA BASE DE DONNÉES ChromaDB")
     print("=" * 60 + "\n")
     
-    enricher = DatabaseEnricher()
-    
     # Fusionner et sauvegarder
     enricher.merge_and_save()
     
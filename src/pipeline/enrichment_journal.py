@@ -0,0 +1,253 @@
+"""
+Journal des deltas d'enrichissement (append-only)
+
+Chaque run de DatabaseEnricher n'écrit que ses changements :
+    {"seq": 12, "ts": "...", "op": "add|change|remove", "id": "...",
+     "hash": "...", "doc": {...}, "prev": {...}, "source": "..."}
+
+- "doc" : nouvel état du document (absent pour remove)
+- "source" : fichier d'enrichissement d'où vient le document
+- "prev" : état avant la première entrée du journal pour cet ID
+  (permet de revenir avant l'enrichissement sans copie complète)
+
+La restauration à une date rejoue le journal jusqu'à cette date. La
+compaction fusionne les entrées plus anciennes que l'horizon de rétention
+en une entrée par document ; la restauration n'est plus possible avant
+cet horizon.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .config import ENRICHMENT_JOURNAL_DIR, JOURNAL_RETENTION_DAYS, JOURNAL_COMPACT_EVERY
+from .document_store import DocumentStore, content_hash
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "journal.jsonl"
+STATE_FILE = "state.json"
+
+_MISSING = object()
+
+
+def _as_timestamp(value: Union[str, datetime]) -> str:
+    return value.isoformat() if isinstance(value, datetime) else datetime.fromisoformat(value).isoformat()
+
+
+class EnrichmentJournal:
+    """Journal append-only des documents ajoutés, modifiés et supprimés"""
+
+    def __init__(self, root: Path = ENRICHMENT_JOURNAL_DIR):
+        """
+        Args:
+            root: Répertoire du journal (journal.jsonl + state.json)
+        """
+        self.root = Path(root)
+        self.journal_file = self.root / JOURNAL_FILE
+        self.state_file = self.root / STATE_FILE
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_file.exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {"last_seq": 0, "entries": 0, "compacted_until": None}
+
+    def _save_state(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def __len__(self) -> int:
+        return self.state['entries']
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Itérer sur les entrées dans l'ordre d'écriture"""
+        if not self.journal_file.exists():
+            return
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def tracked_ids(self) -> Dict[str, bool]:
+        """IDs gérés par l'enrichissement → présent (True) ou supprimé (False)"""
+        present = {}
+        for entry in self.iter_entries():
+            present[entry['id']] = entry['op'] != 'remove'
+        return present
+
+    def last_hashes(self) -> Dict[str, Optional[str]]:
+        """Hash du dernier état journalisé de chaque ID (None si supprimé)"""
+        hashes = {}
+        for entry in self.iter_entries():
+            hashes[entry['id']] = entry.get('hash')
+        return hashes
+
+    def sources(self) -> Dict[str, str]:
+        """Fichier d'enrichissement d'origine de chaque ID (dernier connu)"""
+        sources = {}
+        for entry in self.iter_entries():
+            if entry.get('source'):
+                sources[entry['id']] = entry['source']
+        return sources
+
+    def state_at(self, as_of: Union[str, datetime]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        État des documents journalisés à une date donnée
+
+        Returns:
+            Dictionnaire ID → document (None si le document n'existait pas)
+        """
+        as_of = _as_timestamp(as_of)
+        horizon = self.state.get('compacted_until')
+        if horizon and as_of < horizon:
+            raise ValueError(f"Journal compacté jusqu'au {horizon} : restauration antérieure impossible")
+
+        states: Dict[str, Any] = {}
+        for entry in self.iter_entries():
+            doc_id = entry['id']
+            if doc_id not in states:
+                states[doc_id] = entry.get('prev')  # État avant le journal
+            if entry['ts'] <= as_of:
+                states[doc_id] = entry.get('doc')
+        return states
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def record(self, changes: Iterable[Dict[str, Any]]) -> int:
+        """
+        Ajouter des changements au journal
+
+        Un ajout ou une modification vers l'état déjà journalisé pour cet ID
+        (document réécrit à l'identique dans le store) n'ajoute pas d'entrée.
+
+        Args:
+            changes: Dictionnaires {op, id, doc?, prev?, source?}
+
+        Returns:
+            Nombre d'entrées écrites
+        """
+        ts = datetime.now().isoformat()
+        seq = self.state['last_seq']
+        last_hashes = self.last_hashes()
+        written = 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            for change in changes:
+                doc = change.get('doc')
+                digest = content_hash(doc) if doc is not None else None
+                if digest is not None and last_hashes.get(change['id']) == digest:
+                    continue
+                seq += 1
+                entry = {
+                    "seq": seq,
+                    "ts": ts,
+                    "op": change['op'],
+                    "id": change['id'],
+                    "hash": digest,
+                }
+                if doc is not None:
+                    entry['doc'] = doc
+                if change.get('prev', _MISSING) is not _MISSING:
+                    entry['prev'] = change['prev']
+                if change.get('source'):
+                    entry['source'] = change['source']
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                written += 1
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.state['last_seq'] = seq
+        self.state['entries'] += written
+        self._save_state()
+        return written
+
+    def compact(self, before: Union[str, datetime, None] = None) -> int:
+        """
+        Fusionner les entrées antérieures à une date en une entrée par document
+
+        Args:
+            before: Horizon de compaction (par défaut maintenant - JOURNAL_RETENTION_DAYS)
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        if before is None:
+            before = datetime.now() - timedelta(days=JOURNAL_RETENTION_DAYS)
+        before = _as_timestamp(before)
+
+        folded: Dict[str, Dict[str, Any]] = {}
+        recent: List[Dict[str, Any]] = []
+        for entry in self.iter_entries():
+            if entry['ts'] >= before:
+                recent.append(entry)
+                continue
+            previous = folded.get(entry['id'])
+            if previous is not None and 'prev' in previous:
+                entry = dict(entry, prev=previous['prev'])
+            folded[entry['id']] = entry
+
+        if not folded:
+            return 0
+
+        kept = sorted(folded.values(), key=lambda e: e['seq']) + recent
+        removed = self.state['entries'] - len(kept)
+
+        tmp_file = self.journal_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for entry in kept:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_file, self.journal_file)
+
+        self.state['entries'] = len(kept)
+        horizon = self.state.get('compacted_until')
+        self.state['compacted_until'] = max(horizon, before) if horizon else before
+        self._save_state()
+
+        logger.info(f"🗜️ Journal compacté : {removed} entrées fusionnées")
+        return removed
+
+    def maybe_compact(self) -> int:
+        """Compacter si assez d'entrées dépassent l'horizon de rétention"""
+        horizon = (datetime.now() - timedelta(days=JOURNAL_RETENTION_DAYS)).isoformat()
+        expired = sum(1 for entry in self.iter_entries() if entry['ts'] < horizon)
+        if expired < JOURNAL_COMPACT_EVERY:
+            return 0
+        return self.compact(horizon)
+
+    def restore(self, store: DocumentStore, as_of: Union[str, datetime]) -> Dict[str, int]:
+        """
+        Restaurer les documents journalisés du store à leur état à une date
+
+        Les documents non journalisés (issus de la transformation) ne sont pas modifiés.
+
+        Returns:
+            Statistiques {restored, deleted}
+        """
+        states = self.state_at(as_of)
+        to_write, to_delete = [], []
+        for doc_id, doc in states.items():
+            if doc is None:
+                if doc_id in store:
+                    to_delete.append(doc_id)
+            elif store.get_hash(doc_id) != content_hash(doc):
+                to_write.append(doc)
+
+        restored = store.append(to_write)
+        deleted = store.delete(to_delete)
+        logger.info(f"⏪ Restauration au {_as_timestamp(as_of)} : {restored} restaurés, {deleted} supprimés")
+        return {'restored': restored, 'deleted': deleted}
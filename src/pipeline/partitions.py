@@ -0,0 +1,294 @@
+"""
+Stockage partitionné par date et par source
+
+    data/daily_fetch/
+        date=2026-01-05/
+            source=bbc-sport/
+                part-00000.jsonl    # un article (ou document) par ligne
+                part-00001.jsonl    # run suivant du même jour
+            source=wikipedia-fr/
+                ...
+
+Les lecteurs filtrent sur les noms de répertoires (plage de dates, sources)
+sans ouvrir les partitions exclues. L'heure de modification d'un fichier
+part est celle du run de scraping : elle ordonne les runs entre eux.
+
+Migration des anciens fichiers JSON plats :
+    python -m src.pipeline.partitions migrate [--remove-originals] [--dry-run]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import unicodedata
+from datetime import datetime, date as date_type
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DATE_PREFIX = "date="
+SOURCE_PREFIX = "source="
+PART_PREFIX = "part-"
+PART_SUFFIX = ".jsonl"
+MIGRATION_MANIFEST = "_migrated.json"
+PARTS_GLOB = f"{DATE_PREFIX}*/{SOURCE_PREFIX}*/{PART_PREFIX}*{PART_SUFFIX}"
+
+_RUN_TIMESTAMP = re.compile(r'(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})')
+
+DateLike = Union[str, date_type, datetime, None]
+
+
+def source_slug(source: Optional[str]) -> str:
+    """Nom de partition d'une source ("BBC Sport" → "bbc-sport")"""
+    text = unicodedata.normalize('NFKD', source or '').encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+    return slug or "unknown"
+
+
+def record_source(record: Dict[str, Any]) -> Optional[str]:
+    """Source d'un article brut ou d'un document transformé (dans ses métadonnées)"""
+    return record.get('source') or record.get('metadata', {}).get('source')
+
+
+def _as_date(value: DateLike) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (date_type, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def run_time(path: Path) -> datetime:
+    """Date du run d'un fichier : horodatage du nom (fichiers plats) ou mtime (parts)"""
+    match = _RUN_TIMESTAMP.search(path.name)
+    if match:
+        return datetime.strptime("{} {}:{}:{}".format(*match.groups()), "%Y-%m-%d %H:%M:%S")
+    return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def read_part(path: Path) -> Iterator[Dict[str, Any]]:
+    """Lire un fichier part JSONL ligne par ligne"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class PartitionedDataset:
+    """Jeu de données partitionné date=/source=/part-N.jsonl"""
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Répertoire racine (ex: data/daily_fetch)
+        """
+        self.root = Path(root)
+
+    def partition_dir(self, date: DateLike, source: str) -> Path:
+        return self.root / f"{DATE_PREFIX}{_as_date(date)}" / f"{SOURCE_PREFIX}{source_slug(source)}"
+
+    def write(self, records: Iterable[Dict[str, Any]], date: DateLike, source: str,
+              run_at: Optional[datetime] = None) -> Optional[Path]:
+        """
+        Écrire un nouveau fichier part dans une partition
+
+        Args:
+            records: Articles ou documents
+            date: Date de la partition
+            source: Source (convertie en slug)
+            run_at: Date du run (fixe l'heure de modification du fichier)
+
+        Returns:
+            Chemin du fichier part (None si aucun enregistrement)
+        """
+        partition = self.partition_dir(date, source)
+        partition.mkdir(parents=True, exist_ok=True)
+        part_number = sum(1 for p in partition.glob(f"{PART_PREFIX}*{PART_SUFFIX}"))
+        path = partition / f"{PART_PREFIX}{part_number:05d}{PART_SUFFIX}"
+
+        tmp_file = path.with_suffix('.tmp')
+        written = 0
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                written += 1
+        if not written:
+            tmp_file.unlink()
+            return None
+        os.replace(tmp_file, path)
+
+        if run_at is not None:
+            timestamp = run_at.timestamp()
+            os.utime(path, (timestamp, timestamp))
+        return path
+
+    def write_run(self, items: Sequence[Dict[str, Any]], run_at: datetime) -> List[Path]:
+        """Écrire les enregistrements d'un run, une partition par source"""
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            by_source.setdefault(source_slug(record_source(item)), []).append(item)
+
+        paths = []
+        for source, records in sorted(by_source.items()):
+            path = self.write(records, run_at, source, run_at=run_at)
+            if path:
+                paths.append(path)
+        return paths
+
+    def iter_partitions(self, start: DateLike = None, end: DateLike = None,
+                        sources: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, str, Path]]:
+        """
+        Partitions correspondant aux filtres (seuls les noms de répertoires sont lus)
+
+        Yields:
+            (date, source, répertoire) par date puis source croissantes
+        """
+        if not self.root.exists():
+            return
+        start, end = _as_date(start), _as_date(end)
+        wanted = {source_slug(s) for s in sources} if sources else None
+
+        for date_dir in sorted(self.root.glob(f"{DATE_PREFIX}*")):
+            day = date_dir.name[len(DATE_PREFIX):]
+            if (start and day < start) or (end and day > end):
+                continue
+            for source_dir in sorted(date_dir.glob(f"{SOURCE_PREFIX}*")):
+                source = source_dir.name[len(SOURCE_PREFIX):]
+                if wanted is None or source in wanted:
+                    yield day, source, source_dir
+
+    def files(self, start: DateLike = None, end: DateLike = None,
+              sources: Optional[Iterable[str]] = None) -> List[Path]:
+        """Fichiers part des partitions sélectionnées"""
+        return [
+            path
+            for _, _, partition in self.iter_partitions(start, end, sources)
+            for path in sorted(partition.glob(f"{PART_PREFIX}*{PART_SUFFIX}"))
+        ]
+
+    def read(self, start: DateLike = None, end: DateLike = None,
+             sources: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Itérer sur les enregistrements des partitions sélectionnées"""
+        for path in self.files(start, end, sources):
+            yield from read_part(path)
+
+    def mirror_path(self, part: Path, source_root: Path) -> Path:
+        """Chemin équivalent dans ce jeu de données d'un part d'un autre jeu"""
+        return self.root / Path(part).relative_to(source_root)
+
+    def migrated_names(self) -> Set[str]:
+        """Noms des fichiers plats déjà convertis en partitions (manifeste de migration)"""
+        manifest_path = self.root / MIGRATION_MANIFEST
+        if not manifest_path.exists():
+            return set()
+        return set(json.loads(manifest_path.read_text(encoding='utf-8')))
+
+    def legacy_files(self, pattern: str = "*.json") -> List[Path]:
+        """
+        Anciens fichiers JSON plats encore présents à la racine
+
+        Le manifeste et les fichiers déjà migrés (dont les données sont dans
+        les partitions) sont exclus.
+        """
+        if not self.root.exists():
+            return []
+        excluded = self.migrated_names() | {MIGRATION_MANIFEST}
+        return sorted(path for path in self.root.glob(pattern) if path.name not in excluded)
+
+    def has_data(self) -> bool:
+        """Au moins un fichier part ou un ancien fichier plat"""
+        return self.root.exists() and (any(self.root.glob(PARTS_GLOB)) or bool(self.legacy_files()))
+
+
+def ingest_file(path: Path, dataset: PartitionedDataset, items_key: str = 'articles') -> List[Path]:
+    """
+    Partitionner un fichier JSON plat ({metadata, <items_key>: [...]})
+
+    La date de partition est celle du run (nom du fichier ou mtime), la
+    source celle de chaque enregistrement.
+
+    Returns:
+        Fichiers part écrits
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return dataset.write_run(data.get(items_key, []), run_time(Path(path)))
+
+
+def migrate_flat_files(files: Iterable[Path], dataset: PartitionedDataset, items_key: str,
+                       remove_originals: bool = False, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Convertir des fichiers JSON plats en partitions (voir ingest_file)
+
+    Returns:
+        Statistiques {files, records, parts, skipped}
+    """
+    stats = {'files': 0, 'records': 0, 'parts': 0, 'skipped': 0}
+    manifest_path = dataset.root / MIGRATION_MANIFEST
+    migrated = dataset.migrated_names()
+
+    for path in files:
+        if path.name == MIGRATION_MANIFEST:
+            continue
+        # Relancer la migration ne duplique pas les fichiers déjà convertis
+        if path.name in migrated:
+            stats['skipped'] += 1
+            if remove_originals and not dry_run:
+                path.unlink()
+            continue
+        stats['files'] += 1
+
+        if dry_run:
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f).get(items_key, [])
+            stats['records'] += len(items)
+            stats['parts'] += len({source_slug(record_source(item)) for item in items})
+            logger.info(f"🔎 {path.name}: {len(items)} enregistrements → date={run_time(path):%Y-%m-%d}")
+            continue
+
+        parts = ingest_file(path, dataset, items_key)
+        records = sum(1 for part in parts for _ in read_part(part))
+        stats['records'] += records
+        stats['parts'] += len(parts)
+        logger.info(f"📦 {path.name}: {records} enregistrements migrés")
+        migrated.add(path.name)
+        manifest_path.write_text(json.dumps(sorted(migrated), indent=2), encoding='utf-8')
+        if remove_originals:
+            path.unlink()
+    return stats
+
+
+def main():
+    """Outil de migration des répertoires plats vers le format partitionné"""
+    from .config import BASE_DIR
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Partitions date=/source= des données CAN 2025")
+    sub = parser.add_subparsers(dest='command', required=True)
+    migrate = sub.add_parser('migrate', help="Migrer data/raw, data/daily_fetch et data/transformed")
+    migrate.add_argument('--remove-originals', action='store_true', help="Supprimer les fichiers plats migrés")
+    migrate.add_argument('--dry-run', action='store_true', help="Afficher le plan sans rien écrire")
+    args = parser.parse_args()
+
+    data_dir = BASE_DIR / "data"
+    targets = [
+        # (fichiers plats, jeu partitionné, clé des enregistrements)
+        (sorted((data_dir / "raw").glob("*.json")), PartitionedDataset(data_dir / "raw"), 'articles'),
+        (sorted((data_dir / "daily_fetch").glob("*.json")), PartitionedDataset(data_dir / "daily_fetch"), 'articles'),
+        (sorted((data_dir / "transformed").glob("transformed_*.json")),
+         PartitionedDataset(data_dir / "transformed" / "partitions"), 'documents'),
+    ]
+    for files, dataset, items_key in targets:
+        if not files:
+            continue
+        stats = migrate_flat_files(files, dataset, items_key,
+                                   remove_originals=args.remove_originals, dry_run=args.dry_run)
+        print(f"✅ {dataset.root}: {stats['files']} fichier(s), {stats['records']} enregistrements, "
+              f"{stats['parts']} part(s), {stats['skipped']} déjà migré(s)")
+
+
+if __name__ == "__main__":
+    main()
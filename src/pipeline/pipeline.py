@@ -3,6 +3,7 @@ import logging
 from pathlib import Path
 # from .demo_scraper import save_demo_data  # DÉSACTIVÉ - Contient données fictives
 from .transform import DataTransformer
+from .partitions import PartitionedDataset
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,7 +32,7 @@ def run_complete_pipeline():
     
     # Vérifier que des données existent
     data_dir = Path(__file__).parent.parent.parent / "data" / "daily_fetch"
-    if not data_dir.exists() or not list(data_dir.glob("*.json")):
+    if not PartitionedDataset(data_dir).has_data():
         print("\n❌ ERREUR: Aucune donnée brute trouvée!")
         print("💡 Exécutez d'abord: python -m src.pipeline.real_scraper")
         return
@@ -91,7 +92,7 @@ def run_complete_pipeline():
     print(f"\n📂 Données disponibles:")
     print(f"  • Brutes: data/daily_fetch/")
     print(f"  • Transformées: data/transformed/")
-    print(f"  • Dataset combiné: data/transformed/combined_dataset.json")
+    print(f"  • Dataset combiné: data/transformed/combined_dataset/ (JSONL)")
     print("\n🚀 Prochaine étape: Implémenter le système RAG avec ChromaDB")
 
 
@@ -0,0 +1,380 @@
+"""
+Profilage des étapes du pipeline : temps, CPU, mémoire et débit
+
+Les étapes coûteuses (scrape_all, transform_all_files, create_combined_dataset,
+merge_and_save, create_vectorstore) sont décorées par @profiled. Le décorateur
+ne coûte presque rien tant qu'aucune session de profilage n'est active.
+
+Par étape :
+- wall_s / cpu_s : temps écoulé et temps CPU (y compris les processus
+  enfants terminés pendant l'étape, ex: workers de transformation)
+- peak_rss_mb : pic de mémoire résidente échantillonné pendant l'étape
+- items / items_per_s : éléments traités et débit (articles scrapés, fichiers
+  transformés, documents combinés, changements enrichis, documents vectorisés)
+- read_bytes / written_bytes : octets lus/écrits par le processus (/proc)
+
+Usage:
+    PIPELINE_PROFILE=1 python -m src.pipeline.transform     # n'importe quel point d'entrée
+    python -m src.pipeline.profiling run [--force]           # DAG complet profilé
+    python -m src.pipeline.profiling compare OLD.json NEW.json
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import platform
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from ..tracing import span
+from .config import PROFILE_ENABLED, PROFILE_REPORTS_DIR, PROFILE_SAMPLE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+_PROC_STATM = Path("/proc/self/statm")
+_PROC_IO = Path("/proc/self/io")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_current: Optional["PipelineProfiler"] = None
+_local = threading.local()
+
+
+def current_rss() -> Optional[int]:
+    """Mémoire résidente actuelle du processus en octets (None si indisponible)"""
+    try:
+        return int(_PROC_STATM.read_text().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    if resource is not None:
+        # Pic depuis le démarrage : Ko sous Linux, octets sous macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if platform.system() == "Darwin" else peak * 1024
+    return None
+
+
+def io_counters() -> Optional[Dict[str, int]]:
+    """Octets lus/écrits par le processus via read()/write() (Linux uniquement)"""
+    try:
+        fields = dict(line.split(": ") for line in _PROC_IO.read_text().splitlines())
+        return {'read': int(fields['rchar']), 'written': int(fields['wchar'])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class _RssSampler(threading.Thread):
+    """Échantillonne la mémoire résidente pour en garder le pic"""
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            rss = current_rss()
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+
+    def stop(self) -> Optional[int]:
+        self._stop_event.set()
+        self.join()
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+        return self.peak
+
+
+def count_items(n: int):
+    """Ajouter des éléments traités à l'étape profilée en cours (sans effet sinon)"""
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1]['items'] = (stack[-1]['items'] or 0) + n
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / (1024 * 1024), 1) if value is not None else None
+
+
+class PipelineProfiler:
+    """Session de profilage : collecte les mesures des étapes et écrit le rapport"""
+
+    def __init__(self, label: str = "pipeline", reports_dir: Path = PROFILE_REPORTS_DIR,
+                 sample_interval: float = PROFILE_SAMPLE_INTERVAL):
+        """
+        Args:
+            label: Nom du run (ex: version du scraper) repris dans le rapport
+            reports_dir: Répertoire des rapports JSON
+            sample_interval: Intervalle d'échantillonnage de la mémoire (secondes)
+        """
+        self.label = label
+        self.reports_dir = Path(reports_dir)
+        self.sample_interval = sample_interval
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now()
+        self.stages: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "PipelineProfiler":
+        global _current
+        self._previous = _current
+        _current = self
+        return self
+
+    def __exit__(self, *exc):
+        global _current
+        _current = self._previous
+
+    def measure(self, stage: str, func: Callable, args, kwargs,
+                items: Optional[Callable[[Any], int]] = None):
+        """Exécuter une fonction en mesurant ses ressources"""
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+
+        record = {
+            'stage': stage,
+            'parent': stack[-1]['stage'] if stack else None,
+            'started_at': datetime.now().isoformat(),
+            'status': 'success',
+            'items': None
+        }
+        stack.append(record)
+
+        sampler = _RssSampler(self.sample_interval)
+        sampler.start()
+        io_before = io_counters()
+        times_before = os.times()
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            if items is not None and result is not None:
+                record['items'] = items(result)
+            return result
+        except BaseException:
+            record['status'] = 'failed'
+            raise
+        finally:
+            wall = time.perf_counter() - start
+            times_after = os.times()
+            io_after = io_counters()
+            peak = sampler.stop()
+            stack.pop()
+
+            record['wall_s'] = round(wall, 4)
+            record['cpu_s'] = round(
+                (times_after.user - times_before.user) + (times_after.system - times_before.system), 4
+            )
+            record['children_cpu_s'] = round(
+                (times_after.children_user - times_before.children_user)
+                + (times_after.children_system - times_before.children_system), 4
+            )
+            record['peak_rss_mb'] = _mb(peak)
+            if io_before and io_after:
+                record['read_bytes'] = io_after['read'] - io_before['read']
+                record['written_bytes'] = io_after['written'] - io_before['written']
+            else:
+                record['read_bytes'] = record['written_bytes'] = None
+            record['items_per_s'] = round(record['items'] / wall, 1) if record['items'] and wall > 0 else None
+
+            with self._lock:
+                self.stages.append(record)
+            logger.info(
+                f"⏱️ {stage} : {wall:.2f}s, CPU {record['cpu_s'] + record['children_cpu_s']:.2f}s, "
+                f"pic RSS {record['peak_rss_mb']} Mo, {record['items'] if record['items'] is not None else '?'} éléments"
+            )
+
+    def report(self) -> Dict[str, Any]:
+        """Rapport JSON du run"""
+        top_level = [s for s in self.stages if s['parent'] is None]
+        peaks = [s['peak_rss_mb'] for s in self.stages if s['peak_rss_mb'] is not None]
+        return {
+            'run_id': self.run_id,
+            'label': self.label,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'host': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count()
+            },
+            'stages': self.stages,
+            'totals': {
+                'wall_s': round(sum(s['wall_s'] for s in top_level), 4),
+                'cpu_s': round(sum(s['cpu_s'] + s['children_cpu_s'] for s in top_level), 4),
+                'peak_rss_mb': max(peaks) if peaks else None
+            }
+        }
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Écrire le rapport JSON (data/logs/profiles/profile_<date>_<label>.json par défaut)"""
+        if path is None:
+            self.reports_dir.mkdir(parents=True, exist_ok=True)
+            path = self.reports_dir / f"profile_{self.started_at:%Y-%m-%d_%H-%M-%S}_{self.label}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        logger.info(f"📊 Rapport de profilage : {path}")
+        return Path(path)
+
+
+def profiled(stage: str, items: Optional[Callable[[Any], int]] = None):
+    """
+    Décorateur : mesurer une étape quand une session de profilage est active
+
+    Args:
+        stage: Nom de l'étape dans le rapport
+        items: Nombre d'éléments traités à partir du résultat (sinon count_items())
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _current or _session_from_env()
+            with span(f"pipeline.{stage}"):
+                if profiler is None:
+                    return func(*args, **kwargs)
+                return profiler.measure(stage, func, args, kwargs, items)
+        return wrapper
+    return decorator
+
+
+def _session_from_env() -> Optional[PipelineProfiler]:
+    """Session implicite (PIPELINE_PROFILE=1) : rapport écrit à la sortie du processus"""
+    global _current
+    if not PROFILE_ENABLED:
+        return None
+    _current = PipelineProfiler(label=os.getenv("PIPELINE_PROFILE_LABEL", "pipeline"))
+    atexit.register(lambda profiler=_current: print(format_summary(profiler.report(), profiler.save())))
+    return _current
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if abs(value) < 1024 or unit == "Go":
+            return f"{value:.0f} {unit}" if unit == "o" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def format_summary(report: Dict[str, Any], path: Optional[Path] = None) -> str:
+    """Résumé lisible d'un rapport"""
+    lines = [
+        "=" * 100,
+        f"📊 PROFIL DU PIPELINE — {report['label']} ({report['started_at'][:19]})",
+        "=" * 100,
+        f"{'Étape':<28}{'Durée':>9}{'CPU':>9}{'Pic RSS':>10}{'Éléments':>10}{'Élém/s':>10}{'Lu':>12}{'Écrit':>12}",
+        "-" * 100
+    ]
+    for s in report['stages']:
+        name = ("  " if s['parent'] else "") + s['stage'] + (" ❌" if s['status'] != 'success' else "")
+        lines.append(
+            f"{name:<28}{s['wall_s']:>8.2f}s{s['cpu_s'] + s['children_cpu_s']:>8.2f}s"
+            f"{(str(s['peak_rss_mb']) + ' Mo') if s['peak_rss_mb'] is not None else '-':>10}"
+            f"{s['items'] if s['items'] is not None else '-':>10}"
+            f"{s['items_per_s'] if s['items_per_s'] is not None else '-':>10}"
+            f"{_format_bytes(s['read_bytes']):>12}{_format_bytes(s['written_bytes']):>12}"
+        )
+    totals = report['totals']
+    lines.append("-" * 100)
+    lines.append(f"{'TOTAL':<28}{totals['wall_s']:>8.2f}s{totals['cpu_s']:>8.2f}s"
+                 f"{(str(totals['peak_rss_mb']) + ' Mo') if totals['peak_rss_mb'] is not None else '-':>10}")
+    if path:
+        lines.append(f"📁 {path}")
+    return "\n".join(lines)
+
+
+def compare_reports(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Comparer deux rapports étape par étape
+
+    Args:
+        threshold: Hausse relative (durée ou mémoire) signalée comme régression
+
+    Returns:
+        Lignes {stage, metric, old, new, change, regression}
+    """
+    def by_stage(report):
+        stages = {}
+        for s in report['stages']:
+            stages.setdefault(s['stage'], s)  # Premier appel si l'étape est répétée
+        return stages
+
+    old_stages, new_stages = by_stage(old), by_stage(new)
+    rows = []
+    for stage in [s for s in new_stages if s in old_stages]:
+        for metric in ('wall_s', 'peak_rss_mb', 'items_per_s'):
+            before, after = old_stages[stage].get(metric), new_stages[stage].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            # Un débit qui baisse est une régression, une durée ou une mémoire qui monte aussi
+            worse = -change if metric == 'items_per_s' else change
+            rows.append({
+                'stage': stage, 'metric': metric, 'old': before, 'new': after,
+                'change': round(change, 3), 'regression': worse > threshold
+            })
+    return rows
+
+
+def main():
+    """Exécuter le pipeline profilé ou comparer deux rapports"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Profilage du pipeline CAN 2025")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="Exécuter le DAG du pipeline avec profilage")
+    run.add_argument('--label', default="pipeline", help="Nom du run (ex: version du scraper)")
+    run.add_argument('--force', action='store_true', help="Exécuter toutes les étapes, même à jour")
+
+    show = sub.add_parser('show', help="Afficher un rapport")
+    show.add_argument('report', type=Path)
+
+    compare = sub.add_parser('compare', help="Comparer deux rapports")
+    compare.add_argument('old', type=Path)
+    compare.add_argument('new', type=Path)
+    compare.add_argument('--threshold', type=float, default=0.2, help="Hausse relative signalée (défaut 0.2)")
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        # Sous `python -m`, ce module est __main__ : @profiled lit la session
+        # active dans src.pipeline.profiling, c'est donc celle-là qu'il faut ouvrir
+        from .auto_pipeline import AutoPipeline
+        from .profiling import PipelineProfiler
+        with PipelineProfiler(label=args.label) as profiler:
+            AutoPipeline().dag.run(force=args.force)
+        print(format_summary(profiler.report(), profiler.save()))
+        return
+
+    if args.command == 'show':
+        with open(args.report, 'r', encoding='utf-8') as f:
+            print(format_summary(json.load(f), args.report))
+        return
+
+    with open(args.old, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+    rows = compare_reports(old, new, args.threshold)
+    print(f"📊 {old['label']} → {new['label']}")
+    for row in rows:
+        flag = "⚠️ " if row['regression'] else "   "
+        print(f"{flag}{row['stage']:<28}{row['metric']:<14}{row['old']:>12} → {row['new']:<12}{row['change']:+.0%}")
+    if any(row['regression'] for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Limitation de débit adaptative par domaine + disjoncteur pour le scraping
+
+- Seau à jetons par domaine : le débit augmente doucement tant que le site
+  répond vite (additif) et est divisé par deux sur 429/503 ou latence élevée
+  (multiplicatif). L'en-tête Retry-After est respecté.
+- Disjoncteur par domaine : après plusieurs échecs consécutifs le domaine
+  est ignoré pendant un délai, puis une requête d'essai est autorisée.
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import timezone
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .config import (
+    RATE_LIMIT_INITIAL, RATE_LIMIT_MIN, RATE_LIMIT_MAX, RATE_LIMIT_BURST,
+    RATE_LIMIT_LATENCY_TARGET, BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN, MAX_RETRIES
+)
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = {429, 503}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Le domaine est temporairement ignoré après trop d'échecs"""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Convertir un en-tête Retry-After (secondes ou date HTTP) en délai en secondes"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now if now is not None else time.time()
+    return max(0.0, retry_at.timestamp() - now)
+
+
+class AdaptiveTokenBucket:
+    """Seau à jetons dont le débit s'adapte aux réponses du serveur (AIMD)"""
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_INITIAL,
+        capacity: float = RATE_LIMIT_BURST,
+        min_rate: float = RATE_LIMIT_MIN,
+        max_rate: float = RATE_LIMIT_MAX,
+        latency_target: float = RATE_LIMIT_LATENCY_TARGET,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.latency_target = latency_target
+        self.clock = clock
+        self.tokens = 1.0  # Pas de rafale à froid
+        self.updated = clock()
+        self.blocked_until = 0.0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Réserver un jeton
+
+        Returns:
+            Délai à attendre avant d'envoyer la requête (secondes)
+        """
+        self._refill()
+        wait = max(0.0, self.blocked_until - self.clock())
+        self.tokens -= 1.0
+        if self.tokens < 0:
+            wait = max(wait, -self.tokens / self.rate)
+        return wait
+
+    def on_success(self, latency: float):
+        if latency > self.latency_target:
+            self.rate = max(self.min_rate, self.rate * 0.75)
+        else:
+            self.rate = min(self.max_rate, self.rate + 0.1 * self.rate + 0.01)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        self.rate = max(self.min_rate, self.rate / 2)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, self.clock() + retry_after)
+
+
+class CircuitBreaker:
+    """Disjoncteur closed → open → half-open"""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        # En half-open, un seul échec suffit à rouvrir
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = self.clock()
+
+
+class PoliteSession:
+    """
+    Session HTTP respectueuse : débit adaptatif et disjoncteur par domaine
+
+    Remplace la combinaison Retry(urllib3) + time.sleep fixe.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: int = MAX_RETRIES,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.clock = clock
+        self._buckets: Dict[str, AdaptiveTokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _domain_state(self, domain: str):
+        with self._lock:
+            if domain not in self._buckets:
+                self._buckets[domain] = AdaptiveTokenBucket(clock=self.clock)
+                self._breakers[domain] = CircuitBreaker(clock=self.clock)
+            return self._buckets[domain], self._breakers[domain]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET avec limitation de débit, retries et disjoncteur
+
+        Raises:
+            CircuitOpenError: si le domaine est temporairement ignoré
+            requests.RequestException: si toutes les tentatives échouent
+        """
+        domain = urlparse(url).netloc
+        bucket, breaker = self._domain_state(domain)
+
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"{domain} ignoré après {breaker.failures} échecs consécutifs")
+
+            with self._lock:
+                wait = bucket.reserve()
+            if wait > 0:
+                self.sleep(wait)
+
+            start = self.clock()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                breaker.record_failure()
+                with self._lock:
+                    bucket.on_throttle()
+                if attempt == self.max_retries:
+                    raise
+                self.sleep(self._backoff(attempt))
+                continue
+            latency = self.clock() - start
+
+            if response.status_code in RETRY_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if response.status_code in THROTTLE_STATUSES:
+                    logger.info(f"🐢 {domain} : HTTP {response.status_code}, ralentissement")
+                    with self._lock:
+                        bucket.on_throttle(retry_after)
+                    # Toujours limité après tous les essais : la source compte comme en échec
+                    if attempt == self.max_retries:
+                        breaker.record_failure()
+                else:
+                    breaker.record_failure()
+                if attempt == self.max_retries:
+                    return response
+                if response.status_code not in THROTTLE_STATUSES or retry_after is None:
+                    self.sleep(self._backoff(attempt))
+                continue
+
+            breaker.record_success()
+            with self._lock:
+                bucket.on_success(latency)
+            return response
+
+        return response
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """1s, 2s, 4s... avec gigue"""
+        return (2 ** attempt) * (0.5 + random.random())
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """Débit courant et état du disjoncteur par domaine"""
+        return {
+            domain: {
+                'rate_per_s': round(self._buckets[domain].rate, 3),
+                'circuit': self._breakers[domain].state,
+                'failures': self._breakers[domain].failures
+            }
+            for domain in self._buckets
+        }
@@ -4,7 +4,7 @@ Meilleures pratiques de scraping web:
 - Retry logic avec backoff exponentiel
 - Headers appropriés pour Wikipedia
 - Gestion d'erreurs robuste
-- Rate limiting respectueux
+- Rate limiting adaptatif par domaine (Retry-After, 429/503) + disjoncteur
 - Parsing structuré et optimisé
 - Cache des requêtes
 - Validation des données
@@ -17,11 +17,11 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import time
 import os
 from dotenv import load_dotenv
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from .rate_limiter import PoliteSession, CircuitOpenError
+from .profiling import profiled, count_items
 
 load_dotenv()
 
@@ -52,23 +52,15 @@ class CANRealScraper:
         # Session avec retry automatique
         self.session = self._create_session()
         
-    def _create_session(self) -> requests.Session:
-        """Crée une session HTTP avec retry logic et timeout"""
-        session = requests.Session()
-        
-        # Stratégie de retry: 3 tentatives avec backoff exponentiel
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,  # 1s, 2s, 4s
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "HEAD"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+    def _create_session(self) -> PoliteSession:
+        """
+        Crée une session HTTP avec débit adaptatif et disjoncteur par domaine
         
-        return session
+        Le débit de chaque domaine démarre à ~1 requête / 1.5s, accélère si
+        le site répond vite et ralentit sur 429/503 (Retry-After respecté).
+        Un domaine qui échoue plusieurs fois de suite est ignoré un moment.
+        """
+        return PoliteSession(headers=self.headers)
     
     def _fetch_url(self, url: str, timeout: int = 15) -> Optional[requests.Response]:
         """
@@ -84,7 +76,6 @@ class CANRealScraper:
         try:
             response = self.session.get(
                 url, 
-                headers=self.headers, 
                 timeout=timeout,
                 allow_redirects=True
             )
@@ -92,6 +83,8 @@ class CANRealScraper:
             logger.debug(f"✅ Fetch réussi: {url} (Status: {response.status_code})")
             return response
             
+        except CircuitOpenError as e:
+            logger.warning(f"⛔ {e}")
         except requests.exceptions.Timeout:
             logger.error(f"⏱️ Timeout lors de l'accès à {url}")
         except requests.exceptions.ConnectionError:
@@ -343,9 +336,6 @@ class CANRealScraper:
                 else:
                     logger.warning(f"⚠️ Aucun contenu extrait de {source['name']}")
                 
-                # Rate limiting: respecter Wikipedia (1-2 secondes entre requêtes)
-                time.sleep(1.5)
-                
             except Exception as e:
                 logger.error(f"❌ Erreur scraping {source['name']}: {type(e).__name__} - {e}")
                 continue
@@ -419,8 +409,6 @@ class CANRealScraper:
                             articles.append(article)
                             logger.info(f"✅ Article BBC ajouté: {title[:50]}...")
                 
-                time.sleep(1.5)
-                
                 if articles:
                     break  # Si on a des articles, pas besoin d'essayer les autres URLs
                     
@@ -498,8 +486,6 @@ class CANRealScraper:
                                 articles.append(article)
                                 logger.info(f"✅ Match ESPN ajouté: {title[:50]}...")
                 
-                time.sleep(1.5)
-                
                 if articles:
                     break
                     
@@ -677,6 +663,7 @@ Source: Confédération Africaine de Football (CAF) et organisateurs officiels."
         logger.info(f"✅ {len(articles)} article de secours ajouté (informations officielles uniquement)")
         return articles
     
+    @profiled("scrape_all")
     def scrape_all(self) -> str:
         """
         Récupère toutes les données et les sauvegarde
@@ -720,7 +707,8 @@ Source: Confédération Africaine de Football (CAF) et organisateurs officiels."
         logger.info(f"⚡ FlashScore: {len(flashscore_articles)} articles")
         
         # 5. Fallback UNIQUEMENT si tous les scrapers échouent
-        if len(all_articles) == 0:
+        fallback_used = len(all_articles) == 0
+        if fallback_used:
             logger.error("❌ Aucune donnée scrapée, utilisation du fallback")
             fallback_articles = self.scrape_fallback_data()
             all_articles.extend(fallback_articles)
@@ -732,6 +720,7 @@ Source: Confédération Africaine de Football (CAF) et organisateurs officiels."
         filepath = self.data_dir / filename
         
         # Calculer statistiques
+        count_items(len(all_articles))
         total_chars = sum(len(article['content']) for article in all_articles)
         avg_quality = sum(article.get('quality_score', 0) for article in all_articles) / len(all_articles) if all_articles else 0
         
@@ -747,6 +736,7 @@ Source: Confédération Africaine de Football (CAF) et organisateurs officiels."
                 "scraper_version": "6.0 - Multi-Source",
                 "scraped_at": datetime.now().isoformat(),
                 "total_articles": len(all_articles),
+                "fallback_used": fallback_used,
                 "total_characters": total_chars,
                 "average_quality_score": round(avg_quality, 2),
                 "sources": list(sources_stats.keys()),
@@ -759,7 +749,7 @@ Source: Confédération Africaine de Football (CAF) et organisateurs officiels."
                     "FlashScore: Real-time match results",
                     "Retry logic with exponential backoff",
                     "Data validation and quality scoring",
-                    "Rate limiting (1.5s between requests)"
+                    "Adaptive per-domain rate limiting + circuit breaker"
                 ]
             },
             "articles": all_articles
@@ -778,6 +768,8 @@ Source: Confédération Africaine de Football (CAF) et organisateurs officiels."
         for source, count in sources_stats.items():
             logger.info(f"     - {source}: {count} articles")
         logger.info(f"📁 Fichier: {filepath.name}")
+        for domain, state in self.session.stats().items():
+            logger.info(f"   • {domain}: {state['rate_per_s']} req/s, circuit {state['circuit']}")
         logger.info("=" * 80)
         
         return str(filepath)
@@ -802,7 +794,7 @@ def main():
     print("  ✅ Timeouts configurables (15s)")
     print("  ✅ Extraction structurée par source")
     print("  ✅ Validation des données (longueur, mots-clés)")
-    print("  ✅ Rate limiting (1.5s entre requêtes)")
+    print("  ✅ Rate limiting adaptatif par domaine + disjoncteur")
     print("  ✅ Gestion d'erreurs robuste")
     print("  ✅ Quality scoring")
     print("\n⚠️  100% DONNÉES RÉELLES - Aucune donnée fictive")
@@ -1,10 +1,20 @@
 """Transform extracted data for RAG system"""
 import json
 import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-from .config import BASE_DIR
+from typing import List, Dict, Optional, Iterator
+from .config import (
+    BASE_DIR, COMBINED_STORE_DIR, LEGACY_COMBINED_JSON, DEDUP_STATE_FILE,
+    TRANSFORM_OWNED_IDS_FILE, TRANSFORM_WORKERS, TRANSFORM_SHARD_SIZE
+)
+from .document_store import DocumentStore, document_id
+from .dedup import NearDuplicateDetector
+from .change_feed import ChangeFeed, diff_hashes
+from .partitions import PartitionedDataset, PART_SUFFIX, read_part, run_time
+from .profiling import profiled, count_items
 
 # Setup logging
 logging.basicConfig(
@@ -22,12 +32,50 @@ TRANSFORMED_DATA_DIR = DATA_DIR / "transformed"
 TRANSFORMED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _transform_shard(articles: List[Dict]) -> List[Dict]:
+    """Process pool task: transform a shard of articles (order preserved)"""
+    return DataTransformer().transform_articles(articles)
+
+
+def _transform_file_task(input_file: str, raw_data_dir: str, transformed_dir: str) -> Optional[str]:
+    """Process pool task: transform a whole file in the worker"""
+    transformer = DataTransformer()
+    transformer.raw_data_dir = Path(raw_data_dir)
+    transformer.transformed_dir = Path(transformed_dir)
+    output_path = transformer.transform_file(Path(input_file))
+    return str(output_path) if output_path else None
+
+
 class DataTransformer:
     """Transform raw JSON data into RAG-ready format"""
     
-    def __init__(self):
+    def __init__(self, deduplicate: bool = True):
+        """
+        Args:
+            deduplicate: Collapse near-duplicate documents across scrape runs
+        """
         self.raw_data_dir = RAW_DATA_DIR
         self.transformed_dir = TRANSFORMED_DATA_DIR
+        self.store_dir = COMBINED_STORE_DIR
+        self.owned_ids_file = TRANSFORM_OWNED_IDS_FILE
+        self.deduplicate = deduplicate
+        self.dedup_state_file = DEDUP_STATE_FILE
+        self.last_dedup_stats = None
+        self.change_feed = ChangeFeed()
+    
+    @property
+    def raw_dataset(self) -> PartitionedDataset:
+        """Raw articles partitioned by date=/source= (see partitions.py)"""
+        return PartitionedDataset(self.raw_data_dir)
+    
+    @property
+    def transformed_dataset(self) -> PartitionedDataset:
+        """Transformed documents, same partitions as the raw articles"""
+        return PartitionedDataset(self.transformed_dir / "partitions")
+    
+    def open_store(self) -> DocumentStore:
+        """Ouvrir le store du dataset combiné (migre l'ancien JSON si besoin)"""
+        return DocumentStore.open(self.store_dir, legacy_json=LEGACY_COMBINED_JSON)
         
     def transform_article(self, article: Dict) -> Dict:
         """
@@ -95,29 +143,64 @@ class DataTransformer:
         
         return "\n".join(parts)
     
-    def transform_file(self, input_file: Path) -> Optional[Path]:
-        """Transform a single JSON file"""
+    def transform_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Transform a list of articles in memory, skipping the ones that fail (order preserved)"""
+        transformed_articles = []
+        for idx, article in enumerate(articles):
+            try:
+                transformed_articles.append(self.transform_article(article))
+            except Exception as e:
+                logger.error(f"❌ Erreur transformation article {idx}: {e}")
+        return transformed_articles
+    
+    def transform_file(self, input_file: Path, executor: Optional[Executor] = None) -> Optional[Path]:
+        """
+        Transform a single JSON file
+        
+        Args:
+            input_file: Raw JSON file ({metadata, articles})
+            executor: Optional process pool; large files are split into
+                shards of TRANSFORM_SHARD_SIZE articles, merged back in order
+        """
         try:
             logger.info(f"📥 Transformation du fichier: {input_file.name}")
             
-            # Read raw data
-            with open(input_file, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            # Read raw data (JSONL partition part or legacy flat JSON file)
+            if input_file.suffix == PART_SUFFIX:
+                raw_data = {"articles": list(read_part(input_file))}
+            else:
+                with open(input_file, 'r', encoding='utf-8') as f:
+                    raw_data = json.load(f)
             
             articles = raw_data.get('articles', [])
             if not articles:
                 logger.warning(f"⚠️ Aucun article trouvé dans {input_file.name}")
                 return None
             
-            # Transform each article
-            transformed_articles = []
-            for idx, article in enumerate(articles):
-                try:
-                    transformed = self.transform_article(article)
-                    transformed_articles.append(transformed)
-                except Exception as e:
-                    logger.error(f"❌ Erreur transformation article {idx}: {e}")
-                    continue
+            # Transform each article (split into shards when a pool is given)
+            if executor is not None and len(articles) > TRANSFORM_SHARD_SIZE:
+                shards = [
+                    articles[i:i + TRANSFORM_SHARD_SIZE]
+                    for i in range(0, len(articles), TRANSFORM_SHARD_SIZE)
+                ]
+                transformed_articles = []
+                for shard_result in executor.map(_transform_shard, shards):
+                    transformed_articles.extend(shard_result)
+            else:
+                transformed_articles = self.transform_articles(articles)
+            
+            output_path = self._output_path(input_file)
+            
+            if input_file.suffix == PART_SUFFIX:
+                # Mirror partition: one document per line, same run time as the raw part
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    for doc in transformed_articles:
+                        f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+                run_at = input_file.stat().st_mtime
+                os.utime(output_path, (run_at, run_at))
+                logger.info(f"✅ Transformation réussie: {len(transformed_articles)} documents")
+                return output_path
             
             # Create transformed data structure
             transformed_data = {
@@ -131,9 +214,6 @@ class DataTransformer:
             }
             
             # Save transformed data
-            output_filename = f"transformed_{input_file.stem}.json"
-            output_path = self.transformed_dir / output_filename
-            
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(transformed_data, f, ensure_ascii=False, indent=2)
             
@@ -146,102 +226,269 @@ class DataTransformer:
             logger.error(f"❌ Erreur lors de la transformation: {e}")
             return None
     
-    def transform_all_files(self) -> List[Path]:
-        """Transform all JSON files in the raw data directory"""
+    def _output_path(self, input_file: Path) -> Path:
+        if input_file.suffix == PART_SUFFIX:
+            return self.transformed_dataset.mirror_path(input_file, self.raw_data_dir)
+        return self.transformed_dir / f"transformed_{input_file.stem}.json"
+    
+    def list_raw_files(self, start=None, end=None, sources=None) -> List[Path]:
+        """
+        Raw files to transform, pruned by partition
+        
+        Args:
+            start, end: Inclusive date range (YYYY-MM-DD, date or datetime)
+            sources: Source names or slugs
+        
+        Returns:
+            Partition parts, plus legacy flat JSON files within the date range
+            (legacy files carry no source partition, so a source filter skips them)
+        """
+        files = self.raw_dataset.files(start, end, sources)
+        if not sources:
+            files += [
+                path for path in self.raw_dataset.legacy_files()
+                if self._in_range(run_time(path), start, end)
+            ]
+        return files
+    
+    def list_transformed_files(self, start=None, end=None, sources=None) -> List[Path]:
+        """Transformed files (partition parts + legacy transformed_*.json), pruned by partition"""
+        files = self.transformed_dataset.files(start, end, sources)
+        if not sources:
+            migrated = self.transformed_dataset.migrated_names()
+            files += [
+                path for path in self.transformed_dir.glob("transformed_*.json")
+                if path.name not in migrated and self._in_range(run_time(path), start, end)
+            ]
+        return files
+    
+    @staticmethod
+    def _in_range(run_at: datetime, start, end) -> bool:
+        day = run_at.strftime("%Y-%m-%d")
+        return (start is None or day >= str(start)[:10]) and (end is None or day <= str(end)[:10])
+    
+    def iter_documents(self, start=None, end=None, sources=None) -> Iterator[Dict]:
+        """Stream transformed documents, reading only the selected partitions"""
+        return self._iter_transformed_documents(self.list_transformed_files(start, end, sources), [])
+    
+    def _is_up_to_date(self, input_file: Path) -> bool:
+        """True if the transformed file exists and is newer than the raw file"""
+        output_path = self._output_path(input_file)
+        return output_path.exists() and output_path.stat().st_mtime_ns >= input_file.stat().st_mtime_ns
+    
+    @profiled("transform_all_files", items=len)
+    def transform_all_files(
+        self,
+        workers: Optional[int] = None,
+        mode: str = "auto",
+        skip_unchanged: bool = False,
+        start=None,
+        end=None,
+        sources=None
+    ) -> List[Path]:
+        """
+        Transform all JSON files in the raw data directory
+        
+        Args:
+            workers: Number of worker processes (default TRANSFORM_WORKERS, 1 = sequential)
+            mode: "file" (one task per file), "shard" (files split into article
+                shards) or "auto" (per file when there are enough files to keep
+                every worker busy, per shard otherwise)
+            skip_unchanged: Reuse transformed files that are newer than their raw file
+            start, end, sources: Only transform the matching partitions
+        
+        Returns:
+            Transformed file paths: reused ones first, then new ones in input order
+        """
         logger.info("🔄 Début de la transformation de tous les fichiers...")
         
-        json_files = list(self.raw_data_dir.glob("*.json"))
+        json_files = self.list_raw_files(start, end, sources)
         
         if not json_files:
             logger.warning(f"⚠️ Aucun fichier JSON trouvé dans {self.raw_data_dir}")
             return []
         
+        up_to_date = []
+        if skip_unchanged:
+            up_to_date = [self._output_path(f) for f in json_files if self._is_up_to_date(f)]
+            json_files = [f for f in json_files if not self._is_up_to_date(f)]
+            if up_to_date:
+                logger.info(f"✓ {len(up_to_date)} fichier(s) déjà transformé(s), ignoré(s)")
+            if not json_files:
+                return up_to_date
+        
+        workers = workers or TRANSFORM_WORKERS
+        if mode == "auto":
+            mode = "file" if len(json_files) >= workers else "shard"
+        
         logger.info(f"📂 {len(json_files)} fichier(s) trouvé(s)")
         
-        transformed_files = []
-        for json_file in json_files:
-            output_path = self.transform_file(json_file)
-            if output_path:
-                transformed_files.append(output_path)
+        if workers <= 1:
+            outputs = [self.transform_file(json_file) for json_file in json_files]
+        else:
+            logger.info(f"⚙️ Transformation parallèle: {workers} processus (mode {mode})")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                if mode == "file":
+                    # map() returns results in submission order
+                    outputs = [
+                        Path(output) if output else None
+                        for output in executor.map(
+                            _transform_file_task,
+                            [str(f) for f in json_files],
+                            [str(self.raw_data_dir)] * len(json_files),
+                            [str(self.transformed_dir)] * len(json_files)
+                        )
+                    ]
+                else:
+                    outputs = [self.transform_file(json_file, executor=executor) for json_file in json_files]
+        
+        transformed_files = [output for output in outputs if output]
         
         logger.info(f"✅ Transformation terminée: {len(transformed_files)}/{len(json_files)} fichiers")
         
-        return transformed_files
+        return up_to_date + transformed_files
     
+    def _iter_transformed_documents(self, transformed_files: List[Path], all_metadata: List[Dict]) -> Iterator[Dict]:
+        """Lire les fichiers transformés un par un (un seul fichier en mémoire)"""
+        for file_path in transformed_files:
+            if file_path.suffix == PART_SUFFIX:
+                all_metadata.append({'original_file': str(file_path.relative_to(self.transformed_dataset.root))})
+                yield from read_part(file_path)
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.error(f"❌ Erreur lecture {file_path.name}: {e}")
+                continue
+            all_metadata.append(data.get('metadata', {}))
+            yield from data.get('documents', [])
+    
+    def _iter_unique_documents(self, documents: Iterator[Dict], detector: NearDuplicateDetector) -> Iterator[Dict]:
+        """Drop near-duplicates of documents already kept (newest first)"""
+        for doc in documents:
+            text = doc.get('original_content') or doc.get('text', '')
+            duplicate_of = detector.check(document_id(doc), text)
+            if duplicate_of is not None:
+                logger.debug(f"🧹 Quasi-doublon ignoré: {doc.get('metadata', {}).get('title', '')} (≈ {duplicate_of})")
+                continue
+            yield doc
+    
+    @profiled("create_combined_dataset")
     def create_combined_dataset(self) -> Optional[Path]:
         """
         Create a single combined dataset from all transformed files
         Useful for loading all data at once into the RAG system
+        
+        The dataset is written as a JSONL document store (see document_store.py)
+        and streamed file by file, so memory does not grow with the corpus.
+        Files are read newest run first so that, when deduplication is on,
+        the newest version of each near-duplicate group is the one kept.
+        
+        Documents are upserted (unchanged ones are not rewritten) and only the
+        IDs this step wrote last time and no longer produces are deleted, so
+        documents added by enrich_database survive a transform run.
         """
         logger.info("📦 Création du dataset combiné...")
         
-        transformed_files = list(self.transformed_dir.glob("transformed_*.json"))
+        transformed_files = sorted(
+            self.list_transformed_files(),
+            key=run_time,
+            reverse=True
+        )
         
         if not transformed_files:
             logger.warning("⚠️ Aucun fichier transformé trouvé")
             return None
         
-        all_documents = []
         all_metadata = []
+        documents = self._iter_transformed_documents(transformed_files, all_metadata)
         
-        for file_path in transformed_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    documents = data.get('documents', [])
-                    all_documents.extend(documents)
-                    all_metadata.append(data.get('metadata', {}))
-            except Exception as e:
-                logger.error(f"❌ Erreur lecture {file_path.name}: {e}")
-                continue
+        detector = None
+        if self.deduplicate:
+            detector = NearDuplicateDetector(state_file=self.dedup_state_file)
+            documents = self._iter_unique_documents(documents, detector)
         
-        # Create combined dataset
-        combined_data = {
-            "metadata": {
-                "total_documents": len(all_documents),
-                "creation_date": datetime.now().isoformat(),
-                "source_files": [m.get('original_file', '') for m in all_metadata],
-                "description": "Combined dataset for RAG system - CAN 2025 News"
-            },
-            "documents": all_documents
+        store = DocumentStore(self.store_dir)
+        previous_hashes = store.hashes() if store.exists() else {}
+        previous_owned = self._load_owned_ids(previous_hashes)
+        
+        owned_ids = set()
+        
+        def track(docs: Iterator[Dict]) -> Iterator[Dict]:
+            for doc in docs:
+                owned_ids.add(document_id(doc))
+                yield doc
+        
+        store.append(track(documents))
+        store.delete(sorted(previous_owned - owned_ids))
+        self._save_owned_ids(owned_ids)
+        
+        # Publish what actually changed for incremental consumers (vectorizer)
+        self.change_feed.append(diff_hashes(previous_hashes, store.hashes()), source="transform")
+        
+        metadata = {
+            "creation_date": datetime.now().isoformat(),
+            "source_files": [m.get('original_file', '') for m in all_metadata],
+            "description": "Combined dataset for RAG system - CAN 2025 News"
         }
         
-        # Save combined dataset
-        output_path = self.transformed_dir / "combined_dataset.json"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(combined_data, f, ensure_ascii=False, indent=2)
+        if detector is not None:
+            detector.save()
+            self.last_dedup_stats = detector.get_stats()
+            metadata["dedup"] = self.last_dedup_stats
+            logger.info(
+                f"🧹 Dédoublonnage: {self.last_dedup_stats['duplicates_removed']} quasi-doublon(s) "
+                f"sur {self.last_dedup_stats['documents_seen']} documents "
+                f"(ratio {self.last_dedup_stats['dedup_ratio']:.1%})"
+            )
         
-        logger.info(f"✅ Dataset combiné créé: {len(all_documents)} documents")
-        logger.info(f"📁 Sauvegardé dans: {output_path}")
+        store.update_metadata(**metadata)
+        count_items(len(store))
         
-        return output_path
+        logger.info(f"✅ Dataset combiné créé: {len(store)} documents")
+        logger.info(f"📁 Sauvegardé dans: {self.store_dir}")
+        
+        return self.store_dir
+    
+    def _load_owned_ids(self, previous_hashes: Dict[str, str]) -> set:
+        """IDs written by the previous transform run"""
+        if not self.owned_ids_file.exists():
+            # Store built before ownership was tracked: the transform used to own everything
+            return set(previous_hashes)
+        with open(self.owned_ids_file, 'r', encoding='utf-8') as f:
+            return set(json.load(f))
+    
+    def _save_owned_ids(self, owned_ids: set):
+        self.owned_ids_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.owned_ids_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(sorted(owned_ids), f)
+        os.replace(tmp_file, self.owned_ids_file)
     
     def get_statistics(self) -> Dict:
         """Get statistics about transformed data"""
         stats = {
-            "raw_files": len(list(self.raw_data_dir.glob("*.json"))),
-            "transformed_files": len(list(self.transformed_dir.glob("transformed_*.json"))),
+            "raw_files": len(self.list_raw_files()),
+            "transformed_files": len(self.list_transformed_files()),
             "total_documents": 0,
             "categories": {},
             "sources": {}
         }
         
-        # Read combined dataset if exists
-        combined_file = self.transformed_dir / "combined_dataset.json"
-        if combined_file.exists():
-            with open(combined_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                documents = data.get('documents', [])
-                stats['total_documents'] = len(documents)
+        # Parcourir le dataset combiné en streaming
+        store = self.open_store()
+        if store.exists():
+            stats['total_documents'] = len(store)
+            
+            # Count by category and source
+            for doc in store.iter_documents():
+                metadata = doc.get('metadata', {})
+                category = metadata.get('category', 'unknown')
+                source = metadata.get('source', 'unknown')
                 
-                # Count by category and source
-                for doc in documents:
-                    metadata = doc.get('metadata', {})
-                    category = metadata.get('category', 'unknown')
-                    source = metadata.get('source', 'unknown')
-                    
-                    stats['categories'][category] = stats['categories'].get(category, 0) + 1
-                    stats['sources'][source] = stats['sources'].get(source, 0) + 1
+                stats['categories'][category] = stats['categories'].get(category, 0) + 1
+                stats['sources'][source] = stats['sources'].get(source, 0) + 1
         
         return stats
 
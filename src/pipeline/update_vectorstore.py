@@ -13,6 +13,7 @@ sys.path.insert(0, str(project_root))
 
 from src.rag.vectorizer import VectorizerCAN2025
 from src.rag.config import RAGConfig
+from src.rag.refresher import VectorstoreRefresher
 
 # Configuration du logging
 logging.basicConfig(
@@ -22,8 +23,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def update_vectorstore():
-    """Mettre à jour le vectorstore avec les nouvelles données"""
+def update_vectorstore(keep: int = None):
+    """
+    Mettre à jour le vectorstore avec les nouvelles données
+    
+    Args:
+        keep: Nombre de versions conservées (par défaut RAGConfig.VECTORSTORE_RETENTION)
+    """
+    if keep is not None:
+        RAGConfig.VECTORSTORE_RETENTION = keep
+
     print("\n" + "=" * 70)
     print("🚀 MISE À JOUR DU VECTORSTORE ChromaDB")
     print("=" * 70 + "\n")
@@ -33,40 +42,24 @@ def update_vectorstore():
         logger.info("🔧 Initialisation du vectorizer...")
         vectorizer = VectorizerCAN2025()
         
-        # Vérifier que le fichier combiné existe
-        if not RAGConfig.COMBINED_DATASET.exists():
-            logger.error(f"❌ Fichier combiné introuvable : {RAGConfig.COMBINED_DATASET}")
-            logger.error("   Exécutez d'abord : python src/pipeline/enrich_database.py")
+        # Vérifier que le dataset combiné existe
+        store = vectorizer.open_document_store()
+        if not store.exists():
+            logger.error(f"❌ Dataset combiné introuvable : {RAGConfig.DOCUMENT_STORE_DIR}")
+            logger.error("   Exécutez d'abord : python -m src.pipeline.enrich_database")
             return False
         
-        # Charger les documents
-        logger.info("📂 Chargement des documents depuis le fichier combiné...")
-        documents = vectorizer.load_documents()
-        logger.info(f"✅ {len(documents)} documents chargés")
-        
-        # Sauvegarder l'ancien vectorstore si il existe
-        if RAGConfig.CHROMA_DB_DIR.exists():
-            logger.info("⚠️  Un vectorstore existe déjà")
-            response = input("   Voulez-vous le remplacer ? (o/N) : ")
-            if response.lower() != 'o':
-                logger.info("❌ Opération annulée")
-                return False
-            
-            # Créer un backup
-            import shutil
-            from datetime import datetime
-            backup_dir = RAGConfig.CHROMA_DB_DIR.parent / f"chroma_db_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            logger.info(f"💾 Création d'un backup : {backup_dir.name}")
-            shutil.copytree(RAGConfig.CHROMA_DB_DIR, backup_dir)
-            
-            # Supprimer l'ancien
-            logger.info("🗑️  Suppression de l'ancien vectorstore...")
-            shutil.rmtree(RAGConfig.CHROMA_DB_DIR)
+        logger.info(f"✅ {len(store)} documents dans le dataset combiné")
         
-        # Créer le nouveau vectorstore
-        logger.info("\n🔄 Création du nouveau vectorstore...")
+        # Construire la nouvelle version à côté de l'active puis basculer :
+        # aucune interaction, l'ancienne version reste disponible pour rollback
+        logger.info("\n🔄 Construction d'une nouvelle version du vectorstore...")
         logger.info("   ⏳ Cela peut prendre quelques minutes...")
-        vectorizer.create_vectorstore(documents)
+        refresher = VectorstoreRefresher()
+        version = refresher.refresh()
+        if version is None:
+            return False
+        vectorizer = VectorizerCAN2025(persist_directory=refresher.versions.root / version)
         
         # Tester la recherche
         logger.info("\n🔍 Test de recherche sémantique...")
@@ -87,8 +80,8 @@ def update_vectorstore():
         logger.info("📊 STATISTIQUES DU VECTORSTORE :")
         stats = vectorizer.get_stats()
         logger.info(f"   • Nombre de documents : {stats['total_documents']}")
-        logger.info(f"   • Taille sur disque : {stats['size_mb']:.2f} MB")
-        logger.info(f"   • Emplacement : {RAGConfig.CHROMA_DB_DIR}")
+        logger.info(f"   • Version active : {version}")
+        logger.info(f"   • Emplacement : {vectorizer.persist_directory}")
         logger.info("=" * 70)
         
         print("\n✅ VECTORSTORE MIS À JOUR AVEC SUCCÈS!")
@@ -103,9 +96,34 @@ def update_vectorstore():
         return False
 
 
+def rollback_vectorstore(version: str = None) -> bool:
+    """Réactiver une version précédente du vectorstore"""
+    versions = RAGConfig.vectorstore_versions()
+    try:
+        activated = versions.rollback(version)
+    except (ValueError, FileNotFoundError) as e:
+        logger.error(f"❌ Rollback impossible : {e}")
+        return False
+    logger.info(f"✅ Version active : {activated}")
+    logger.info(f"   Versions disponibles : {', '.join(versions.list_versions())}")
+    return True
+
+
 def main():
     """Point d'entrée principal"""
-    success = update_vectorstore()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Mise à jour du vectorstore CAN 2025")
+    parser.add_argument('--keep', type=int, default=None,
+                        help="Nombre de versions conservées pour rollback")
+    parser.add_argument('--rollback', nargs='?', const='', default=None, metavar='VERSION',
+                        help="Réactiver une version précédente (par défaut la précédente)")
+    args = parser.parse_args()
+    
+    if args.rollback is not None:
+        sys.exit(0 if rollback_vectorstore(args.rollback or None) else 1)
+    
+    success = update_vectorstore(keep=args.keep)
     
     if success:
         print("\n" + "=" * 70)
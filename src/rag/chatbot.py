@@ -4,6 +4,8 @@ Utilise ChromaDB et LangChain pour répondre aux questions
 """
 
 import logging
+import threading
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -13,11 +15,11 @@ from langchain_community.vectorstores import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 
 from .config import RAGConfig
 from .vectorizer import VectorizerCAN2025
 from .cache_manager import ResponseCache
+from ..tracing import span, set_attribute
 
 # Configuration du logging
 logging.basicConfig(
@@ -29,23 +31,27 @@ logger = logging.getLogger(__name__)
 class ChatbotCAN2025:
     """Chatbot RAG pour répondre aux questions sur la CAN 2025"""
     
-    def __init__(self, config: RAGConfig = None, load_existing: bool = True):
+    def __init__(self, config: RAGConfig = None, load_existing: bool = True, llm=None, embeddings=None):
         """
         Initialiser le chatbot
         
         Args:
             config: Configuration RAG
             load_existing: Si True, charge un vectorstore existant, sinon en crée un nouveau
+            llm: Modèle de langage à utiliser à la place de Groq (ex: LLM factice des benchmarks)
+            embeddings: Modèle d'embeddings déjà chargé (sinon HuggingFace)
         """
         self.config = config or RAGConfig
         self.vectorizer = VectorizerCAN2025(config=self.config)
-        self.llm = None
+        self.vectorizer.embeddings = embeddings
+        self.llm = llm
         self.qa_chain = None
         self.conversation_history = []
         self.cache = ResponseCache(ttl_hours=24)  # Cache 24h
+        self._reload_lock = threading.Lock()
         
         # Charger ou créer le vectorstore
-        if load_existing and self.config.CHROMA_DB_DIR.exists():
+        if load_existing and self.vectorizer.persist_directory.exists():
             logger.info("📂 Chargement du vectorstore existant...")
             self.vectorizer.load_vectorstore()
         else:
@@ -60,6 +66,10 @@ class ChatbotCAN2025:
     
     def _initialize_llm(self):
         """Initialiser le modèle de langage Groq (gratuit et ultra-rapide!)"""
+        if self.llm is not None:
+            logger.info("🤖 LLM fourni par l'appelant, Groq non utilisé")
+            return
+        
         logger.info(f"🤖 Initialisation du LLM Groq : {self.config.LLM_MODEL}")
         
         self.llm = ChatGroq(
@@ -84,19 +94,51 @@ class ChatbotCAN2025:
         # Créer le template de prompt
         prompt = ChatPromptTemplate.from_template(self.config.QUERY_PROMPT)
         
-        # Créer la chaîne RAG moderne
-        def format_docs(docs):
-            return "\n\n".join(doc.page_content for doc in docs)
-        
-        self.qa_chain = (
-            {"context": self.retriever | format_docs, "question": RunnablePassthrough()}
-            | prompt
-            | self.llm
-            | StrOutputParser()
-        )
+        # Chaîne de génération : le contexte est fourni par ask(), la recherche
+        # n'est donc faite qu'une fois par question
+        self.qa_chain = prompt | self.llm | StrOutputParser()
         
         logger.info("✅ Chaîne RAG initialisée")
     
+    def reload_vectorstore(self, persist_directory: Optional[Path] = None):
+        """
+        Recharger à chaud le vectorstore (après une bascule de version)
+        
+        Le nouveau retriever est construit à côté de l'ancien puis échangé :
+        les questions en cours terminent avec l'ancienne version.
+        
+        Args:
+            persist_directory: Répertoire de la version (par défaut la version active)
+        """
+        target = Path(persist_directory) if persist_directory else self.config.active_chroma_dir()
+        with self._reload_lock:
+            if target == self.vectorizer.persist_directory:
+                return
+            
+            logger.info(f"🔀 Rechargement du vectorstore : {target}")
+            vectorizer = VectorizerCAN2025(config=self.config, persist_directory=target)
+            vectorizer.embeddings = self.vectorizer.embeddings  # Réutiliser le modèle chargé
+            vectorizer.load_vectorstore()
+            
+            previous = self.vectorizer
+            self.vectorizer = vectorizer
+            try:
+                self._initialize_qa_chain()
+            except Exception:
+                self.vectorizer = previous
+                raise
+            # Les réponses en cache proviennent de l'ancien index
+            self.cache.clear()
+    
+    def _check_vectorstore_version(self):
+        """Recharger si le pointeur de version a changé (lecture d'un petit fichier)"""
+        active = self.config.active_chroma_dir()
+        if active != self.vectorizer.persist_directory:
+            try:
+                self.reload_vectorstore(active)
+            except Exception as e:
+                logger.warning(f"⚠️ Rechargement impossible, version précédente conservée : {e}")
+    
     def ask(self, question: str, verbose: bool = False, use_cache: bool = True) -> Dict[str, Any]:
         """
         Poser une question au chatbot
@@ -111,21 +153,52 @@ class ChatbotCAN2025:
         """
         logger.info(f"❓ Question : {question}")
         
+        self._check_vectorstore_version()
+        
+        with span("chatbot.ask", question_chars=len(question), use_cache=use_cache) as ask_span:
+            response = self._answer(question, use_cache, verbose)
+            ask_span.set_attribute('num_sources', response.get('num_sources', 0))
+            return response
+    
+    def _answer(self, question: str, use_cache: bool, verbose: bool) -> Dict[str, Any]:
+        """Étapes de ask() (cache, embed, search, llm), chacune dans un span"""
+        # Durée de chaque étape en millisecondes (cache, embed, search, llm)
+        timings = {}
+        
         # Vérifier le cache d'abord
         if use_cache:
-            cached_response = self.cache.get(question)
+            with span("chatbot.cache") as s:
+                cached_response = self.cache.get(question)
+            timings['cache_ms'] = s.duration_ms
             if cached_response:
                 logger.info("📦 Réponse récupérée du cache")
                 if verbose:
                     print("\n💨 [CACHE HIT] Réponse instantanée!")
+                cached_response['timings'] = timings
+                set_attribute('cache_hit', True)
                 return cached_response
         
         try:
+            # Même version pour la recherche et la génération, même si une bascule survient
+            vectorizer, qa_chain = self.vectorizer, self.qa_chain
+            
             # Récupérer les documents pertinents
-            source_documents = self.retriever.invoke(question)
+            with span("chatbot.embed") as s:
+                query_embedding = vectorizer.embeddings.embed_query(question)
+            timings['embed_ms'] = s.duration_ms
+            
+            with span("chatbot.search", k=self.config.TOP_K_RESULTS) as s:
+                source_documents = vectorizer.vectorstore.similarity_search_by_vector(
+                    query_embedding, k=self.config.TOP_K_RESULTS
+                )
+            timings['search_ms'] = s.duration_ms
             
-            # Exécuter la chaîne RAG
-            answer = self.qa_chain.invoke(question)
+            # Générer la réponse à partir des documents trouvés
+            context = "\n\n".join(doc.page_content for doc in source_documents)
+            with span("chatbot.llm", model=self.config.LLM_MODEL, context_chars=len(context)) as s:
+                answer = qa_chain.invoke({"context": context, "question": question})
+                s.set_attribute("answer_chars", len(answer))
+            timings['llm_ms'] = s.duration_ms
             
             # Formater la réponse
             response = {
@@ -134,7 +207,8 @@ class ChatbotCAN2025:
                 'sources': [],
                 'timestamp': datetime.now().isoformat(),
                 'model': self.config.LLM_MODEL,
-                'num_sources': len(source_documents)
+                'num_sources': len(source_documents),
+                'timings': timings
             }
             
             # Ajouter les sources
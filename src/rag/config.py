@@ -16,8 +16,13 @@ class RAGConfig:
     BASE_DIR = Path(__file__).parent.parent.parent
     DATA_DIR = BASE_DIR / "data"
     TRANSFORMED_DIR = DATA_DIR / "transformed"
-    COMBINED_DATASET = TRANSFORMED_DIR / "combined_dataset.json"
-    CHROMA_DB_DIR = BASE_DIR / "chroma_db"
+    COMBINED_DATASET = TRANSFORMED_DIR / "combined_dataset.json"  # Ancien format (migré automatiquement)
+    DOCUMENT_STORE_DIR = TRANSFORMED_DIR / "combined_dataset"  # Store JSONL shardé
+    CHANGE_FEED_FILE = TRANSFORMED_DIR / "change_feed.jsonl"  # Changements publiés par transform/enrich
+    CHROMA_DB_DIR = BASE_DIR / "chroma_db"  # Ancien vectorstore non versionné
+    VECTORSTORE_VERSIONS_DIR = BASE_DIR / "chroma_versions"  # Versions + pointeur CURRENT
+    VECTORSTORE_RETENTION = int(os.getenv("VECTORSTORE_RETENTION", "3"))  # Versions conservées pour rollback
+    GOLDEN_QUESTIONS_FILE = DATA_DIR / "eval" / "golden_questions.json"  # Questions → IDs attendus (retrieval_eval.py)
     
     # Groq Configuration (API GRATUITE!)
     GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
@@ -42,6 +47,7 @@ class RAGConfig:
     CHUNK_SIZE = 1000  # Taille des chunks pour le découpage de texte
     CHUNK_OVERLAP = 200  # Chevauchement entre chunks
     TOP_K_RESULTS = 3  # Nombre de documents à récupérer
+    EMBEDDING_BATCH_SIZE = 256  # Documents vectorisés par lot
     MAX_TOKENS = 500  # Tokens maximum pour la réponse
     
     # Prompt Template
@@ -80,11 +86,26 @@ Réponse :"""
             errors.append("❌ GROQ_API_KEY n'est pas définie dans les variables d'environnement")
             errors.append("   👉 Obtenir gratuitement sur : https://console.groq.com/keys")
         
-        if not cls.COMBINED_DATASET.exists():
-            errors.append(f"❌ Dataset combiné introuvable : {cls.COMBINED_DATASET}")
+        if not (cls.DOCUMENT_STORE_DIR / "header.json").exists() and not cls.COMBINED_DATASET.exists():
+            errors.append(f"❌ Dataset combiné introuvable : {cls.DOCUMENT_STORE_DIR}")
         
         return errors
     
+    @classmethod
+    def vectorstore_versions(cls):
+        """Gestionnaire des versions du vectorstore"""
+        from .vectorstore_versions import VectorstoreVersions
+        return VectorstoreVersions(
+            cls.VECTORSTORE_VERSIONS_DIR,
+            legacy_dir=cls.CHROMA_DB_DIR,
+            retention=cls.VECTORSTORE_RETENTION
+        )
+    
+    @classmethod
+    def active_chroma_dir(cls) -> Path:
+        """Répertoire du vectorstore actif (version courante ou ancien chroma_db)"""
+        return cls.vectorstore_versions().current_dir() or cls.CHROMA_DB_DIR
+    
     @classmethod
     def print_config(cls):
         """Afficher la configuration actuelle"""
@@ -92,7 +113,8 @@ Réponse :"""
         print("⚙️  CONFIGURATION RAG - CAN 2025 CHATBOT")
         print("="*60)
         print(f"\n📂 Chemins :")
-        print(f"   Dataset        : {cls.COMBINED_DATASET}")
+        print(f"   Dataset        : {cls.DOCUMENT_STORE_DIR}")
+        print(f"   Vectorstore    : {cls.active_chroma_dir()}")
         print(f"\n🤖 Modèles :")
         print(f"   Embeddings     : {cls.EMBEDDING_MODEL}")
         print(f"   LLM (Groq)     : {cls.LLM_MODEL}")
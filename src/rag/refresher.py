@@ -0,0 +1,231 @@
+"""
+Rafraîchissement du vectorstore en arrière-plan (blue/green)
+
+Le nouvel index est construit dans un répertoire versionné pendant que le
+chatbot continue de répondre avec l'ancien. Une fois la construction
+vérifiée, le pointeur de version est basculé atomiquement et les
+chatbots abonnés rechargent leur retriever à chaud. La synchronisation
+incrémentale (flux de changements) suit le même chemin : elle est appliquée
+à une copie de la version active, jamais à la version servie.
+"""
+
+import logging
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import RAGConfig
+
+logger = logging.getLogger(__name__)
+
+
+class VectorstoreRefresher:
+    """Reconstruit le vectorstore dans une nouvelle version puis bascule dessus"""
+
+    def __init__(
+        self,
+        config: RAGConfig = None,
+        prepare: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Args:
+            config: Configuration RAG
+            prepare: Fonction exécutée avant la construction (ex: pipeline de données)
+        """
+        self.config = config or RAGConfig
+        self.versions = self.config.vectorstore_versions()
+        self.prepare = prepare
+        self._listeners: List[Callable[[Path], Any]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._status: Dict[str, Any] = {
+            'state': 'idle',
+            'current_version': self.versions.current_version(),
+            'last_success': None,
+            'last_error': None,
+            'duration_s': None
+        }
+
+    def add_listener(self, callback: Callable[[Path], Any]):
+        """Enregistrer une fonction appelée avec le répertoire de la nouvelle version"""
+        self._listeners.append(callback)
+
+    @property
+    def status(self) -> Dict[str, Any]:
+        """État du dernier rafraîchissement"""
+        return dict(self._status, current_version=self.versions.current_version(),
+                    versions=self.versions.list_versions())
+
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    def _cursor_position(self, version: str) -> Optional[int]:
+        from ..pipeline.change_feed import FeedCursor
+        return FeedCursor(self.versions.root / version / "feed_cursor.json").position
+
+    def is_current(self) -> bool:
+        """La version active a-t-elle déjà intégré tout le flux de changements ?"""
+        from ..pipeline.change_feed import ChangeFeed
+
+        current = self.versions.current_version()
+        if current is None:
+            return False
+        position = self._cursor_position(current)
+        return position is not None and position >= ChangeFeed(self.config.CHANGE_FEED_FILE).head
+
+    def _build_version(self) -> Path:
+        """Construire l'index complet dans un nouveau répertoire de version"""
+        from .vectorizer import VectorizerCAN2025
+
+        version_dir = self.versions.new_version_dir()
+        try:
+            vectorizer = VectorizerCAN2025(config=self.config, persist_directory=version_dir)
+            vectorstore = vectorizer.create_vectorstore()
+            count = vectorstore._collection.count()
+            if count == 0:
+                raise ValueError("Le nouvel index est vide")
+            logger.info(f"✅ Version {version_dir.name} construite : {count} documents")
+            return version_dir
+        except Exception:
+            # Une version incomplète ne doit jamais pouvoir être activée
+            shutil.rmtree(version_dir, ignore_errors=True)
+            raise
+
+    def refresh(self) -> Optional[str]:
+        """
+        Rafraîchir le vectorstore de manière synchrone
+
+        Returns:
+            Nom de la version active, ou None si un rafraîchissement est déjà en cours
+        """
+        if not self._lock.acquire(blocking=False):
+            logger.info("⏳ Rafraîchissement déjà en cours")
+            return None
+
+        start = time.perf_counter()
+        self._status.update(state='running', last_error=None)
+        try:
+            previous = self.versions.current_version()
+            if self.prepare is not None:
+                self.prepare()
+
+            # Le pipeline a pu vectoriser lui-même les changements : pas de reconstruction
+            current = self.versions.current_version()
+            if self.is_current():
+                logger.info(f"✓ Version {current} à jour avec le flux de changements")
+                if current != previous:
+                    self._notify(self.versions.root / current)
+                self._status.update(state='idle', last_success=datetime.now().isoformat())
+                return current
+
+            version_dir = self._build_version()
+            self._swap(version_dir, current)
+
+            self._status.update(state='idle', last_success=datetime.now().isoformat())
+            return version_dir.name
+        except Exception as e:
+            logger.error(f"❌ Rafraîchissement du vectorstore échoué : {e}")
+            self._status.update(state='failed', last_error=str(e))
+            raise
+        finally:
+            self._status['duration_s'] = round(time.perf_counter() - start, 2)
+            self._lock.release()
+
+    def sync(self) -> Optional[Dict[str, int]]:
+        """
+        Appliquer le flux de changements sans toucher à la version active
+
+        Le flux est rejoué dans une copie de la version active, qui est
+        ensuite activée : les chatbots continuent de lire l'ancienne version
+        pendant la vectorisation, puis rechargent la nouvelle.
+
+        Returns:
+            Statistiques {upserted, deleted, seq}, ou None si un rafraîchissement est déjà en cours
+
+        Raises:
+            FeedGapError: si aucun curseur n'est utilisable (reconstruction complète nécessaire)
+        """
+        from ..pipeline.change_feed import FeedGapError
+        from .vectorizer import VectorizerCAN2025
+
+        if not self._lock.acquire(blocking=False):
+            logger.info("⏳ Rafraîchissement déjà en cours")
+            return None
+
+        start = time.perf_counter()
+        version_dir = None
+        try:
+            current = self.versions.current_version()
+            if current is None:
+                raise FeedGapError("Aucune version active")
+            position = self._cursor_position(current)
+            if position is None:
+                raise FeedGapError(f"Aucun curseur pour la version {current}")
+            if self.is_current():
+                logger.info("✓ Vectorstore à jour avec le flux de changements")
+                return {'upserted': 0, 'deleted': 0, 'seq': position}
+
+            self._status.update(state='running', last_error=None)
+            version_dir = self.versions.clone(current)
+            stats = VectorizerCAN2025(config=self.config, persist_directory=version_dir).sync_from_feed()
+            self._swap(version_dir, current)
+
+            self._status.update(state='idle', last_success=datetime.now().isoformat())
+            return stats
+        except FeedGapError:
+            if version_dir is not None:
+                shutil.rmtree(version_dir, ignore_errors=True)
+            self._status['state'] = 'idle'
+            raise
+        except Exception as e:
+            if version_dir is not None:
+                shutil.rmtree(version_dir, ignore_errors=True)
+            logger.error(f"❌ Synchronisation du vectorstore échouée : {e}")
+            self._status.update(state='failed', last_error=str(e))
+            raise
+        finally:
+            self._status['duration_s'] = round(time.perf_counter() - start, 2)
+            self._lock.release()
+
+    def start(self) -> bool:
+        """
+        Lancer le rafraîchissement dans un thread d'arrière-plan
+
+        Returns:
+            False si un rafraîchissement est déjà en cours
+        """
+        if self.is_running():
+            return False
+
+        def target():
+            try:
+                self.refresh()
+            except Exception:
+                pass  # Erreur déjà journalisée et exposée dans status
+
+        self._thread = threading.Thread(target=target, name="vectorstore-refresher", daemon=True)
+        self._thread.start()
+        return True
+
+    def rollback(self, version: Optional[str] = None) -> str:
+        """Revenir à une version précédente et notifier les chatbots"""
+        activated = self.versions.rollback(version)
+        self._notify(self.versions.root / activated)
+        return activated
+
+    def _swap(self, version_dir: Path, previous: Optional[str]):
+        """Activer une version, prévenir les chatbots, puis supprimer les anciennes versions"""
+        self.versions.activate(version_dir.name)
+        self._notify(version_dir)
+        # Les chatbots qui n'ont pas pu recharger lisent encore la version précédente
+        self.versions.prune(keep=[previous] if previous else [])
+
+    def _notify(self, version_dir: Path):
+        for callback in self._listeners:
+            try:
+                callback(version_dir)
+            except Exception as e:
+                logger.warning(f"⚠️ Rechargement à chaud échoué : {e}")
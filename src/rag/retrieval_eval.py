@@ -0,0 +1,297 @@
+"""
+Évaluation de la recherche : rappel, MRR et latence par configuration
+
+Compare plusieurs configurations du retriever (k, filtres de métadonnées,
+recherche dense / lexicale BM25 / hybride, index ou modèle d'embeddings)
+sur un fichier de questions de référence :
+
+    [{"question": "Qui est Achraf Hakimi ?", "expected_ids": ["joueur_hakimi_001"]}, ...]
+
+Pour chaque configuration : recall@k moyen, MRR, latence p50/p95 par
+question, puis un tableau comparatif (compromis vitesse / qualité).
+
+Usage:
+    python -m src.rag.retrieval_eval --k 1 3 5 --modes dense lexical hybrid
+    python -m src.rag.retrieval_eval --configs configs.json --output eval.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import re
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import RAGConfig
+
+logger = logging.getLogger(__name__)
+
+MODES = ("dense", "lexical", "hybrid")
+RRF_K = 60  # Constante de la fusion par rangs réciproques
+
+
+def recall_at_k(retrieved: Sequence[str], expected: Iterable[str], k: int) -> float:
+    """Part des documents attendus présents dans les k premiers résultats"""
+    expected = set(expected)
+    if not expected:
+        return 0.0
+    return len(expected & set(retrieved[:k])) / len(expected)
+
+
+def reciprocal_rank(retrieved: Sequence[str], expected: Iterable[str]) -> float:
+    """1 / rang du premier document attendu (0 s'il est absent)"""
+    expected = set(expected)
+    for rank, doc_id in enumerate(retrieved, 1):
+        if doc_id in expected:
+            return 1.0 / rank
+    return 0.0
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = RRF_K) -> List[str]:
+    """Fusionner plusieurs classements (score = somme des 1 / (k + rang))"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])
+
+
+def tokenize(text: str) -> List[str]:
+    """Mots en minuscules sans accents (l'arabe est conservé tel quel)"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.findall(r"\w{2,}", text)
+
+
+class BM25Index:
+    """Index lexical BM25 en mémoire sur le texte des documents"""
+
+    def __init__(self, documents: Iterable[Tuple[str, str, Dict[str, Any]]], k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            documents: Triplets (id, texte, métadonnées)
+        """
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.term_freqs: List[Counter] = []
+        self.lengths: List[int] = []
+        doc_freq: Counter = Counter()
+
+        for doc_id, text, metadata in documents:
+            terms = Counter(tokenize(text))
+            self.ids.append(doc_id)
+            self.metadatas.append(metadata)
+            self.term_freqs.append(terms)
+            self.lengths.append(sum(terms.values()))
+            doc_freq.update(terms.keys())
+
+        n = len(self.ids)
+        self.avg_length = sum(self.lengths) / n if n else 0.0
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def search(self, query: str, k: int, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        """IDs des k documents les mieux classés (filtrés par égalité de métadonnées)"""
+        terms = [t for t in tokenize(query) if t in self.idf]
+        scored = []
+        for i, freqs in enumerate(self.term_freqs):
+            if where and any(self.metadatas[i].get(key) != value for key, value in where.items()):
+                continue
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / (self.avg_length or 1))
+            score = sum(
+                self.idf[t] * freqs[t] * (self.k1 + 1) / (freqs[t] + norm)
+                for t in terms if t in freqs
+            )
+            if score > 0:
+                scored.append((score, i))
+        scored.sort(reverse=True)
+        return [self.ids[i] for _, i in scored[:k]]
+
+
+def chroma_filter(where: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Filtre d'égalité {clé: valeur} au format Chroma ($and si plusieurs clés)"""
+    if not where or len(where) == 1:
+        return where or None
+    return {"$and": [{key: value} for key, value in where.items()]}
+
+
+def load_golden(path: Path) -> List[Dict[str, Any]]:
+    """Questions de référence {question, expected_ids[, filter]}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    items = data['questions'] if isinstance(data, dict) else data
+    for item in items:
+        if not item.get('expected_ids'):
+            raise ValueError(f"Question sans documents attendus : {item.get('question')}")
+    return items
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 2)
+
+
+class RetrievalEvaluator:
+    """Exécute les questions de référence sur différentes configurations"""
+
+    def __init__(self, golden: List[Dict[str, Any]], config: RAGConfig = None):
+        self.golden = golden
+        self.config = config or RAGConfig
+        self._vectorizers: Dict[Tuple[str, str], Any] = {}
+        self._bm25: Optional[BM25Index] = None
+
+    def _vectorizer(self, persist_directory: Optional[str], embedding_model: Optional[str]):
+        """Vectorizer chargé (mis en cache par index et modèle d'embeddings)"""
+        from .vectorizer import VectorizerCAN2025
+
+        key = (persist_directory or "", embedding_model or "")
+        if key not in self._vectorizers:
+            config = self.config
+            if embedding_model:
+                config = type("EvalRAGConfig", (config,), {'EMBEDDING_MODEL': embedding_model})
+            vectorizer = VectorizerCAN2025(config=config, persist_directory=persist_directory)
+            vectorizer.load_vectorstore()
+            self._vectorizers[key] = vectorizer
+        return self._vectorizers[key]
+
+    def _bm25_index(self) -> BM25Index:
+        """Index BM25 construit une fois sur le dataset combiné (sans modèle d'embeddings)"""
+        if self._bm25 is None:
+            from ..pipeline.document_store import DocumentStore
+
+            store = DocumentStore.open(self.config.DOCUMENT_STORE_DIR, legacy_json=self.config.COMBINED_DATASET)
+            start = time.perf_counter()
+            self._bm25 = BM25Index(
+                (doc_id, doc.get('text', ''), doc.get('metadata', {}))
+                for doc_id, doc in store.iter_items()
+            )
+            logger.info(f"📇 Index BM25 : {len(self._bm25.ids)} documents ({time.perf_counter() - start:.1f}s)")
+        return self._bm25
+
+    def _search(self, setting: Dict[str, Any], question: str, where: Optional[Dict[str, Any]]) -> List[str]:
+        k = setting['k']
+        mode = setting.get('mode', 'dense')
+
+        def dense(n):
+            vectorizer = self._vectorizer(setting.get('persist_directory'), setting.get('embedding_model'))
+            docs = vectorizer.vectorstore.similarity_search(question, k=n, filter=chroma_filter(where))
+            return [doc.metadata.get('id') for doc in docs]
+
+        if mode == 'dense':
+            return dense(k)
+        if mode == 'lexical':
+            return self._bm25_index().search(question, k, where)
+        # Hybride : les deux listes de candidats sont fusionnées par rang
+        candidates = setting.get('candidates', max(2 * k, 10))
+        fused = reciprocal_rank_fusion([dense(candidates), self._bm25_index().search(question, candidates, where)])
+        return fused[:k]
+
+    def evaluate(self, setting: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Évaluer une configuration
+
+        Args:
+            setting: {name, k, mode, filter, candidates, persist_directory, embedding_model}
+
+        Returns:
+            Métriques agrégées et détail par question
+        """
+        k = setting['k']
+        mode = setting.get('mode', 'dense')
+        if mode not in MODES:
+            raise ValueError(f"Mode inconnu : {mode} (disponibles : {', '.join(MODES)})")
+
+        # Préchauffage : chargement du modèle et de l'index hors mesure
+        self._search(setting, self.golden[0]['question'], None)
+
+        per_query = []
+        for item in self.golden:
+            where = item.get('filter') or setting.get('filter')
+            start = time.perf_counter()
+            retrieved = self._search(setting, item['question'], where)
+            latency = (time.perf_counter() - start) * 1000
+            per_query.append({
+                'question': item['question'],
+                'retrieved': retrieved,
+                'recall': recall_at_k(retrieved, item['expected_ids'], k),
+                'rr': reciprocal_rank(retrieved, item['expected_ids']),
+                'latency_ms': round(latency, 2)
+            })
+
+        latencies = [q['latency_ms'] for q in per_query]
+        return {
+            'name': setting.get('name') or f"{mode}@{k}",
+            'mode': mode,
+            'k': k,
+            'filter': setting.get('filter'),
+            'embedding_model': setting.get('embedding_model') or self.config.EMBEDDING_MODEL,
+            'recall_at_k': round(sum(q['recall'] for q in per_query) / len(per_query), 4),
+            'mrr': round(sum(q['rr'] for q in per_query) / len(per_query), 4),
+            'latency_p50_ms': _percentile(latencies, 0.50),
+            'latency_p95_ms': _percentile(latencies, 0.95),
+            'queries': per_query
+        }
+
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    """Tableau comparatif des configurations"""
+    lines = [
+        f"{'Configuration':<28}{'Mode':<9}{'k':>3}{'Recall@k':>10}{'MRR':>8}{'p50 (ms)':>10}{'p95 (ms)':>10}",
+        "-" * 78
+    ]
+    for r in results:
+        lines.append(
+            f"{r['name']:<28}{r['mode']:<9}{r['k']:>3}{r['recall_at_k']:>10.3f}{r['mrr']:>8.3f}"
+            f"{r['latency_p50_ms']:>10}{r['latency_p95_ms']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Évaluer les configurations et afficher le tableau comparatif"""
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Évaluation rappel/latence de la recherche CAN 2025")
+    parser.add_argument('--golden', type=Path, default=RAGConfig.GOLDEN_QUESTIONS_FILE)
+    parser.add_argument('--k', type=int, nargs='+', default=[RAGConfig.TOP_K_RESULTS])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=['dense'])
+    parser.add_argument('--filter', action='append', default=[], metavar="CLE=VALEUR",
+                        help="Filtre de métadonnées appliqué à toutes les questions (ex: category=joueurs_maroc)")
+    parser.add_argument('--configs', type=Path, default=None,
+                        help="Fichier JSON de configurations (remplace --k/--modes)")
+    parser.add_argument('--output', type=Path, default=None, help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    golden = load_golden(args.golden)
+    where = dict(item.split('=', 1) for item in args.filter) or None
+
+    if args.configs:
+        with open(args.configs, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    else:
+        settings = [{'mode': mode, 'k': k, 'filter': where} for mode in args.modes for k in args.k]
+
+    evaluator = RetrievalEvaluator(golden)
+    results = []
+    for setting in settings:
+        result = evaluator.evaluate(setting)
+        results.append(result)
+        print(f"✅ {result['name']} : recall@{result['k']}={result['recall_at_k']:.3f}, MRR={result['mrr']:.3f}")
+
+    print(f"\n📊 {len(golden)} questions de référence ({args.golden.name})\n")
+    print(format_table(results))
+
+    if args.output:
+        args.output.write_text(json.dumps({'golden': str(args.golden), 'results': results},
+                                          ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n📁 Résultats sauvegardés dans : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,10 @@ Module de vectorisation pour le Chatbot CAN 2025
 Transforme les documents JSON en embeddings et les stocke dans ChromaDB
 """
 
-import json
 import logging
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Iterable
 from datetime import datetime
 
 import chromadb
@@ -16,6 +16,9 @@ from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 
 from .config import RAGConfig
+from ..pipeline.document_store import DocumentStore
+from ..pipeline.change_feed import ChangeFeed, FeedCursor, FeedGapError
+from ..pipeline.profiling import profiled, count_items
 
 # Configuration du logging
 logging.basicConfig(
@@ -27,14 +30,16 @@ logger = logging.getLogger(__name__)
 class VectorizerCAN2025:
     """Classe pour vectoriser et stocker les documents CAN 2025"""
     
-    def __init__(self, config: RAGConfig = None):
+    def __init__(self, config: RAGConfig = None, persist_directory: Path = None):
         """
         Initialiser le vectorizer
         
         Args:
             config: Configuration RAG (utilise RAGConfig par défaut)
+            persist_directory: Répertoire ChromaDB (par défaut la version active)
         """
         self.config = config or RAGConfig
+        self.persist_directory = Path(persist_directory) if persist_directory else self.config.active_chroma_dir()
         self.embeddings = None
         self.vectorstore = None
         
@@ -59,64 +64,80 @@ class VectorizerCAN2025:
             )
             logger.info("✅ Embeddings initialisés (100% gratuit!)")
     
+    def open_document_store(self) -> DocumentStore:
+        """Ouvrir le store du dataset combiné (migre l'ancien JSON si besoin)"""
+        return DocumentStore.open(
+            self.config.DOCUMENT_STORE_DIR,
+            legacy_json=self.config.COMBINED_DATASET
+        )
+    
+    @staticmethod
+    def to_langchain_document(doc_id: str, doc: Dict[str, Any]) -> Document:
+        """
+        Convertir un document du dataset en Document LangChain
+        
+        Gère les deux formats de documents :
+        - Format 1: {text, metadata: {id, category, ...}}
+        - Format 2: {id, text, metadata: {category, ...}}
+        """
+        text = doc.get('text', '')
+        metadata = doc.get('metadata', {})
+        
+        return Document(
+            page_content=text,
+            metadata={
+                'id': doc_id,
+                'category': metadata.get('category', 'unknown'),
+                'source': metadata.get('source', 'unknown'),
+                'date': metadata.get('date', ''),
+                'keywords': ', '.join(metadata.get('keywords', [])) if isinstance(metadata.get('keywords', []), list) else metadata.get('keywords', ''),
+                'title': metadata.get('title', ''),
+                # Ajouter les métadonnées spécifiques selon la catégorie
+                **{k: v for k, v in metadata.items() 
+                   if k not in ['id', 'category', 'source', 'date', 'keywords', 'title'] and isinstance(v, (str, int, float, bool))}
+            }
+        )
+    
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Itérer paresseusement sur les documents du dataset combiné
+        
+        Returns:
+            Générateur de documents LangChain
+        """
+        store = self.open_document_store()
+        if not store.exists():
+            logger.error(f"❌ Dataset introuvable : {self.config.DOCUMENT_STORE_DIR}")
+            raise FileNotFoundError(str(self.config.DOCUMENT_STORE_DIR))
+        
+        for doc_id, doc in store.iter_items():
+            yield self.to_langchain_document(doc_id, doc)
+    
     def load_documents(self) -> List[Document]:
         """
-        Charger les documents depuis le fichier JSON combiné
+        Charger tous les documents depuis le dataset combiné
+        
+        Préférer iter_documents() pour les gros corpus.
         
         Returns:
             Liste de documents LangChain
         """
-        logger.info(f"📂 Chargement des documents depuis : {self.config.COMBINED_DATASET}")
-        
-        try:
-            with open(self.config.COMBINED_DATASET, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            documents = []
-            for i, doc in enumerate(data['documents']):
-                # Gérer différents formats de documents
-                # Format 1: {text, metadata: {id, category, ...}}
-                # Format 2: {id, text, metadata: {category, ...}}
-                
-                text = doc.get('text', '')
-                metadata = doc.get('metadata', {})
-                
-                # Récupérer l'ID (peut être dans metadata ou à la racine)
-                doc_id = doc.get('id') or metadata.get('id') or f"doc_{i}"
-                
-                # Créer un Document LangChain
-                langchain_doc = Document(
-                    page_content=text,
-                    metadata={
-                        'id': doc_id,
-                        'category': metadata.get('category', 'unknown'),
-                        'source': metadata.get('source', 'unknown'),
-                        'date': metadata.get('date', ''),
-                        'keywords': ', '.join(metadata.get('keywords', [])) if isinstance(metadata.get('keywords', []), list) else metadata.get('keywords', ''),
-                        'title': metadata.get('title', ''),
-                        # Ajouter les métadonnées spécifiques selon la catégorie
-                        **{k: v for k, v in metadata.items() 
-                           if k not in ['id', 'category', 'source', 'date', 'keywords', 'title'] and isinstance(v, (str, int, float, bool))}
-                    }
-                )
-                documents.append(langchain_doc)
-            
-            logger.info(f"✅ {len(documents)} documents chargés")
-            return documents
-            
-        except FileNotFoundError:
-            logger.error(f"❌ Fichier introuvable : {self.config.COMBINED_DATASET}")
-            raise
-        except json.JSONDecodeError as e:
-            logger.error(f"❌ Erreur de parsing JSON : {e}")
-            raise
+        logger.info(f"📂 Chargement des documents depuis : {self.config.DOCUMENT_STORE_DIR}")
+        documents = list(self.iter_documents())
+        logger.info(f"✅ {len(documents)} documents chargés")
+        return documents
     
-    def create_vectorstore(self, documents: List[Document] = None) -> Chroma:
+    @profiled("create_vectorstore")
+    def create_vectorstore(self, documents: Iterable[Document] = None, rebuild: bool = False) -> Chroma:
         """
         Créer ou charger le vectorstore ChromaDB
         
+        Les documents sont vectorisés par lots de EMBEDDING_BATCH_SIZE afin
+        que la mémoire reste constante quelle que soit la taille du corpus.
+        
         Args:
-            documents: Liste de documents à vectoriser (si None, charge depuis JSON)
+            documents: Documents à vectoriser (si None, itère le dataset combiné)
+            rebuild: Si True, vide la collection existante avant de vectoriser
         
         Returns:
             Vectorstore Chroma
@@ -124,28 +145,57 @@ class VectorizerCAN2025:
         # Initialiser les embeddings
         self._initialize_embeddings()
         
-        # Charger les documents si non fournis
+        # Itérer le dataset si aucun document n'est fourni
+        feed_position = None
         if documents is None:
-            documents = self.load_documents()
+            # Position du flux avant lecture : les changements ultérieurs seront rejoués
+            feed_position = self.change_feed().head
+            documents = self.iter_documents()
         
         # Créer le répertoire ChromaDB si nécessaire
-        self.config.CHROMA_DB_DIR.mkdir(parents=True, exist_ok=True)
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
         
-        logger.info(f"🔄 Création du vectorstore ChromaDB : {self.config.CHROMA_DB_DIR}")
-        logger.info(f"📊 Vectorisation de {len(documents)} documents...")
+        logger.info(f"🔄 Création du vectorstore ChromaDB : {self.persist_directory}")
         
         try:
             # Créer le vectorstore avec ChromaDB
-            self.vectorstore = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                persist_directory=str(self.config.CHROMA_DB_DIR),
+            self.vectorstore = Chroma(
+                persist_directory=str(self.persist_directory),
+                embedding_function=self.embeddings,
                 collection_name=self.config.COLLECTION_NAME,
                 collection_metadata=self.config.COLLECTION_METADATA
             )
             
+            if rebuild:
+                logger.info("🗑️  Réinitialisation de la collection existante...")
+                self.vectorstore.delete_collection()
+                self.vectorstore = Chroma(
+                    persist_directory=str(self.persist_directory),
+                    embedding_function=self.embeddings,
+                    collection_name=self.config.COLLECTION_NAME,
+                    collection_metadata=self.config.COLLECTION_METADATA
+                )
+            
+            total = 0
+            iterator = iter(documents)
+            while True:
+                batch = list(islice(iterator, self.config.EMBEDDING_BATCH_SIZE))
+                if not batch:
+                    break
+                self.vectorstore.add_documents(
+                    batch,
+                    ids=[doc.metadata['id'] for doc in batch]
+                )
+                total += len(batch)
+                count_items(len(batch))
+                logger.info(f"   ⏳ {total} documents vectorisés...")
+            
+            if feed_position is not None:
+                self.feed_cursor().commit(feed_position)
+            
+            logger.info(f"📊 {total} documents vectorisés")
             logger.info("✅ Vectorstore créé et persisté avec succès")
-            logger.info(f"📁 Emplacement : {self.config.CHROMA_DB_DIR}")
+            logger.info(f"📁 Emplacement : {self.persist_directory}")
             
             return self.vectorstore
             
@@ -153,6 +203,77 @@ class VectorizerCAN2025:
             logger.error(f"❌ Erreur lors de la création du vectorstore : {e}")
             raise
     
+    def change_feed(self) -> ChangeFeed:
+        """Flux de changements publié par la transformation et l'enrichissement"""
+        return ChangeFeed(self.config.CHANGE_FEED_FILE)
+    
+    def feed_cursor(self) -> FeedCursor:
+        """Curseur du flux, propre à chaque version du vectorstore"""
+        return FeedCursor(self.persist_directory / "feed_cursor.json")
+    
+    def sync_from_feed(self) -> Dict[str, int]:
+        """
+        Appliquer au vectorstore les changements publiés depuis le curseur
+        
+        Seuls les documents ajoutés/modifiés sont re-vectorisés ; les
+        documents supprimés sont retirés de la collection. La collection de
+        persist_directory est modifiée sur place : pour ne pas toucher à la
+        version servie par les chatbots, passer par VectorstoreRefresher.sync()
+        qui l'applique à une copie puis bascule dessus.
+        
+        Returns:
+            Statistiques {upserted, deleted, seq}
+        
+        Raises:
+            FeedGapError: si le curseur est absent ou trop ancien (reconstruction complète nécessaire)
+        """
+        cursor = self.feed_cursor()
+        position = cursor.position
+        if position is None:
+            raise FeedGapError(f"Aucun curseur pour {self.persist_directory}")
+        
+        # Seul le dernier événement de chaque document compte
+        latest = {}
+        last_seq = position
+        for event in self.change_feed().read(after=position):
+            latest[event['id']] = event
+            last_seq = event['seq']
+        
+        stats = {'upserted': 0, 'deleted': 0, 'seq': last_seq}
+        if not latest:
+            logger.info("✓ Vectorstore à jour avec le flux de changements")
+            return stats
+        
+        if self.vectorstore is None:
+            self.load_vectorstore()
+        
+        store = self.open_document_store()
+        upsert_ids = [doc_id for doc_id, event in latest.items() if event['op'] == 'upsert']
+        delete_ids = [doc_id for doc_id, event in latest.items() if event['op'] == 'delete']
+        
+        for start in range(0, len(upsert_ids), self.config.EMBEDDING_BATCH_SIZE):
+            batch_ids = upsert_ids[start:start + self.config.EMBEDDING_BATCH_SIZE]
+            batch = [
+                self.to_langchain_document(doc_id, doc)
+                for doc_id, doc in zip(batch_ids, map(store.get, batch_ids))
+                if doc is not None
+            ]
+            if batch:
+                # Chroma fait un upsert sur les IDs existants
+                self.vectorstore.add_documents(batch, ids=[doc.metadata['id'] for doc in batch])
+                stats['upserted'] += len(batch)
+        
+        if delete_ids:
+            self.vectorstore.delete(ids=delete_ids)
+            stats['deleted'] = len(delete_ids)
+        
+        cursor.commit(last_seq)
+        logger.info(
+            f"📡 Flux appliqué jusqu'à seq {last_seq} : "
+            f"{stats['upserted']} vectorisés, {stats['deleted']} supprimés"
+        )
+        return stats
+    
     def load_vectorstore(self) -> Chroma:
         """
         Charger un vectorstore existant
@@ -162,15 +283,15 @@ class VectorizerCAN2025:
         """
         self._initialize_embeddings()
         
-        if not self.config.CHROMA_DB_DIR.exists():
-            logger.error(f"❌ Vectorstore introuvable : {self.config.CHROMA_DB_DIR}")
+        if not self.persist_directory.exists():
+            logger.error(f"❌ Vectorstore introuvable : {self.persist_directory}")
             raise FileNotFoundError("Vectorstore n'existe pas. Exécutez create_vectorstore() d'abord.")
         
-        logger.info(f"📂 Chargement du vectorstore existant : {self.config.CHROMA_DB_DIR}")
+        logger.info(f"📂 Chargement du vectorstore existant : {self.persist_directory}")
         
         try:
             self.vectorstore = Chroma(
-                persist_directory=str(self.config.CHROMA_DB_DIR),
+                persist_directory=str(self.persist_directory),
                 embedding_function=self.embeddings,
                 collection_name=self.config.COLLECTION_NAME
             )
@@ -248,7 +369,7 @@ class VectorizerCAN2025:
             'categories': categories,
             'collection_name': self.config.COLLECTION_NAME,
             'embedding_model': self.config.EMBEDDING_MODEL,
-            'persist_directory': str(self.config.CHROMA_DB_DIR)
+            'persist_directory': str(self.persist_directory)
         }
         
         logger.info("\n📊 STATISTIQUES VECTORSTORE")
@@ -297,7 +418,7 @@ def main():
         results = vectorizer.test_search(query, k=2)
     
     print("\n✅ VECTORISATION TERMINÉE AVEC SUCCÈS!\n")
-    print(f"📁 Vectorstore sauvegardé dans : {RAGConfig.CHROMA_DB_DIR}")
+    print(f"📁 Vectorstore sauvegardé dans : {vectorizer.persist_directory}")
     print(f"📊 {stats['total_documents']} documents indexés\n")
 
 
@@ -0,0 +1,145 @@
+"""
+Gestion des versions du vectorstore (déploiement blue/green)
+
+Chaque reconstruction de l'index est écrite dans un répertoire versionné :
+    chroma_versions/
+        v20260110_153000/    # ancienne version (rollback possible)
+        v20260110_160500/    # version active
+        CURRENT              # pointeur vers la version active
+
+La bascule se fait en remplaçant atomiquement le fichier CURRENT : un
+lecteur voit toujours soit l'ancienne soit la nouvelle version complète.
+"""
+
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = "CURRENT"
+VERSION_PREFIX = "v"
+
+
+class VectorstoreVersions:
+    """Répertoires versionnés du vectorstore + pointeur de version active"""
+
+    def __init__(self, root: Path, legacy_dir: Optional[Path] = None, retention: int = 3):
+        """
+        Args:
+            root: Répertoire contenant les versions
+            legacy_dir: Ancien répertoire chroma_db non versionné (utilisé s'il n'y a pas de version)
+            retention: Nombre de versions conservées (active comprise)
+        """
+        self.root = Path(root)
+        self.legacy_dir = Path(legacy_dir) if legacy_dir else None
+        self.retention = max(1, retention)
+
+    @property
+    def pointer_file(self) -> Path:
+        return self.root / POINTER_FILE
+
+    def current_version(self) -> Optional[str]:
+        """Nom de la version active (None si aucune)"""
+        try:
+            version = self.pointer_file.read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def current_dir(self) -> Optional[Path]:
+        """Répertoire de la version active (ou l'ancien chroma_db)"""
+        version = self.current_version()
+        if version and (self.root / version).exists():
+            return self.root / version
+        if self.legacy_dir and self.legacy_dir.exists():
+            return self.legacy_dir
+        return None
+
+    def list_versions(self) -> List[str]:
+        """Versions disponibles, de la plus ancienne à la plus récente"""
+        if not self.root.exists():
+            return []
+        return sorted(
+            p.name for p in self.root.iterdir()
+            if p.is_dir() and p.name.startswith(VERSION_PREFIX)
+        )
+
+    def new_version_dir(self) -> Path:
+        """Créer le répertoire d'une nouvelle version (non activée)"""
+        version = f"{VERSION_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        path = self.root / version
+        path.mkdir(parents=True, exist_ok=False)
+        return path
+
+    def clone(self, version: str) -> Path:
+        """Copier une version dans un nouveau répertoire (non activé)"""
+        path = self.new_version_dir()
+        shutil.copytree(self.root / version, path, dirs_exist_ok=True)
+        return path
+
+    def activate(self, version: str):
+        """
+        Basculer atomiquement sur une version
+
+        Args:
+            version: Nom du répertoire de version
+        """
+        if not (self.root / version).is_dir():
+            raise FileNotFoundError(f"Version introuvable : {version}")
+        tmp_file = self.root / f"{POINTER_FILE}.tmp"
+        tmp_file.write_text(version, encoding='utf-8')
+        os.replace(tmp_file, self.pointer_file)
+        logger.info(f"🔀 Version active du vectorstore : {version}")
+
+    def rollback(self, version: Optional[str] = None) -> str:
+        """
+        Revenir à une version précédente
+
+        Args:
+            version: Version cible (par défaut celle qui précède la version active)
+
+        Returns:
+            Version activée
+        """
+        if version is None:
+            versions = self.list_versions()
+            current = self.current_version()
+            older = [v for v in versions if current is None or v < current]
+            if not older:
+                raise ValueError("Aucune version antérieure disponible pour le rollback")
+            version = older[-1]
+        self.activate(version)
+        return version
+
+    def prune(self, keep: Iterable[str] = ()) -> List[str]:
+        """
+        Supprimer les versions au-delà de la limite de rétention
+
+        La version active n'est jamais supprimée.
+
+        Args:
+            keep: Versions à conserver en plus (ex: celle encore ouverte par les chatbots)
+
+        Returns:
+            Versions supprimées
+        """
+        current = self.current_version()
+        versions = self.list_versions()
+        keep = set(versions[-self.retention:]) | set(keep)
+        if current:
+            keep.add(current)
+
+        removed = []
+        for version in versions:
+            if version in keep:
+                continue
+            shutil.rmtree(self.root / version, ignore_errors=True)
+            removed.append(version)
+
+        if removed:
+            logger.info(f"🗑️ {len(removed)} ancienne(s) version(s) supprimée(s)")
+        return removed
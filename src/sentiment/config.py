@@ -0,0 +1,48 @@
+"""
+Configuration de l'analyse de sentiment des commentaires YouTube
+"""
+
+import os
+from pathlib import Path
+
+
+class SentimentConfig:
+    """Configuration centralisée de l'analyse de sentiment"""
+
+    # Chemins
+    BASE_DIR = Path(__file__).parent.parent.parent
+    CACHE_DB = BASE_DIR / "cache" / "sentiment_cache.db"  # (modèle, hash du texte) -> sentiment
+    VIDEO_STATE_DIR = BASE_DIR / "data" / "sentiment_state"  # Un état JSON par vidéo (analyse incrémentale)
+
+    # Modèle multilingue (FR/EN/AR) : positive, negative, neutral
+    MODEL_NAME = os.getenv("SENTIMENT_MODEL", "cardiffnlp/twitter-xlm-roberta-base-sentiment-multilingual")
+    BACKEND = os.getenv("SENTIMENT_BACKEND", "float32")  # float32, ou int8 (quantification dynamique, CPU)
+    MAX_LENGTH = 512  # Tokens maximum par commentaire (troncature)
+    MAX_CHARS = 512  # Caractères conservés avant tokenisation
+
+    # Inférence par lots : commentaires triés par longueur pour limiter le padding
+    BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+
+    # Téléchargement et classification en flux (streaming.py)
+    STREAM_QUEUE_SIZE = 256  # Commentaires en attente maximum (le téléchargement attend au-delà)
+    STREAM_WORKERS = 1  # Threads de classification
+    STREAM_BATCH_TIMEOUT = 0.2  # Secondes d'attente maximum pour compléter un micro-lot
+
+    # Cache persistant par commentaire (sentiment_cache.py)
+    CACHE_ENABLED = os.getenv("SENTIMENT_CACHE", "1") == "1"
+
+    # Ré-analyse incrémentale (video_state.py)
+    STOP_AFTER_SEEN = 20  # Commentaires déjà vus consécutifs avant d'arrêter le téléchargement
+
+    # Courbe d'humeur (timeline.py) : fenêtres proposées, en secondes
+    TIMELINE_WINDOWS = (60, 300, 900)
+
+    # Pool de processus d'inférence (inference_pool.py) ; 0 = modèle dans le processus courant
+    POOL_WORKERS = int(os.getenv("SENTIMENT_POOL_WORKERS", "0"))
+    POOL_THREADS_PER_WORKER = int(os.getenv("SENTIMENT_POOL_THREADS", "0"))  # 0 = cœurs / workers
+
+    # File de jobs multi-vidéos (job_queue.py)
+    JOBS_DIR = BASE_DIR / "data" / "sentiment_jobs"  # Un checkpoint JSON par job + résultats par vidéo
+    JOB_DOWNLOAD_WORKERS = int(os.getenv("SENTIMENT_JOB_WORKERS", "2"))  # Vidéos téléchargées en même temps
+    INFERENCE_SLOTS = int(os.getenv("SENTIMENT_INFERENCE_SLOTS", "0"))  # Passes du modèle simultanées (0 = auto)
+    JOB_CHECKPOINT_INTERVAL = 2.0  # Secondes minimum entre deux checkpoints de progression
@@ -0,0 +1,131 @@
+"""
+Inférence du modèle de sentiment : chargement et passes par lots
+
+Partagé par YouTubeSentimentAnalyzer (inférence dans le processus) et par
+les workers d'InferencePool (un modèle par processus).
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+from transformers import pipeline
+
+from .config import SentimentConfig
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("float32", "int8")
+
+
+def length_buckets(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """
+    Regrouper des indices en lots de longueurs voisines
+
+    Args:
+        lengths: Longueur (en tokens) de chaque texte
+        batch_size: Taille maximale d'un lot
+
+    Returns:
+        Lots d'indices, triés par longueur croissante
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def normalize_label(label: str) -> str:
+    # Le modèle cardiffnlp retourne directement: positive, negative, neutral
+    label = label.lower()
+    return label if label in ('positive', 'negative') else 'neutral'
+
+
+def quantize_dynamic_int8(model):
+    """Couches linéaires en int8 (poids quantifiés, activations quantifiées à la volée)"""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_pipeline(config: SentimentConfig = SentimentConfig, backend: Optional[str] = None):
+    """
+    Pipeline transformers de classification du sentiment
+
+    Args:
+        config: Configuration (MODEL_NAME, MAX_LENGTH)
+        backend: "float32" ou "int8" (défaut: config.BACKEND)
+    """
+    backend = backend or config.BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu : {backend} (disponibles : {', '.join(BACKENDS)})")
+
+    # Modèle plus précis pour l'analyse de sentiment (FR/EN/AR)
+    # cardiffnlp/twitter-xlm-roberta-base-sentiment est plus précis que nlptown
+    classifier = pipeline(
+        "sentiment-analysis",
+        model=config.MODEL_NAME,
+        truncation=True,
+        max_length=config.MAX_LENGTH
+    )
+    if backend == "int8":
+        classifier.model = quantize_dynamic_int8(classifier.model)
+        logger.info("⚡ Modèle de sentiment quantifié en int8")
+    return classifier
+
+
+def model_id(config: SentimentConfig = SentimentConfig, backend: Optional[str] = None) -> str:
+    """Identifiant du modèle pour le cache (les résultats int8 peuvent différer)"""
+    backend = backend or config.BACKEND
+    return config.MODEL_NAME if backend == "float32" else f"{config.MODEL_NAME}:{backend}"
+
+
+def model_size_bytes(model) -> int:
+    """Taille des poids sérialisés (inclut les poids int8 empaquetés)"""
+    import io
+    import torch
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def run_pipeline(classifier, texts: List[str], batch_size: int,
+                 config: SentimentConfig = SentimentConfig) -> List[Optional[Tuple[str, float]]]:
+    """
+    Passe du modèle par lots de longueurs voisines
+
+    Args:
+        classifier: Pipeline de load_pipeline()
+        texts: Textes à classifier
+        batch_size: Textes par passe du modèle
+
+    Returns:
+        (sentiment, confidence) par texte, None pour un texte en erreur
+        (un lot en erreur est repris texte par texte)
+    """
+    results: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+    if not texts:
+        return results
+
+    clipped = [text[:config.MAX_CHARS] for text in texts]
+    lengths = [
+        len(ids) for ids in classifier.tokenizer(
+            clipped, truncation=True, max_length=config.MAX_LENGTH
+        )['input_ids']
+    ]
+
+    for bucket in length_buckets(lengths, batch_size):
+        batch = [clipped[j] for j in bucket]
+        try:
+            outputs = classifier(batch, batch_size=len(batch))
+        except Exception as e:
+            logger.debug(f"⚠️ Erreur analyse du lot, reprise texte par texte: {e}")
+            outputs = []
+            for text in batch:
+                try:
+                    outputs.extend(classifier([text], batch_size=1))
+                except Exception as e:
+                    logger.debug(f"⚠️ Erreur analyse: {e}")
+                    outputs.append(None)
+
+        for j, output in zip(bucket, outputs):
+            if output is not None:
+                results[j] = (normalize_label(output['label']), output['score'])
+
+    return results
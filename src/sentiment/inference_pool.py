@@ -0,0 +1,158 @@
+"""
+Pool de processus d'inférence pour le modèle de sentiment
+
+N processus chargent chacun le modèle une fois (initializer) et consomment
+une file de lots commune (ProcessPoolExecutor). Chaque analyse découpe ses
+textes en lots de longueurs voisines et les soumet au pool : une analyse
+utilise plusieurs cœurs, et plusieurs sessions Streamlit se partagent les
+mêmes workers au lieu de se bloquer sur un seul modèle.
+
+Chaque worker limite torch à `threads_per_worker` threads (défaut :
+cœurs / workers) pour éviter la sur-souscription du CPU.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .config import SentimentConfig
+
+logger = logging.getLogger(__name__)
+
+# État d'un processus worker (initialisé par _init_worker)
+_worker_classifier = None
+_worker_config = None
+
+
+def _init_worker(settings: Dict, threads: int, backend: str):
+    """Charger le modèle une fois par processus, avec `threads` threads torch"""
+    global _worker_classifier, _worker_config
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    import torch
+    torch.set_num_threads(threads)
+
+    from .inference import load_pipeline
+    _worker_config = type("WorkerSentimentConfig", (SentimentConfig,), settings)
+    _worker_classifier = load_pipeline(_worker_config, backend)
+
+
+def _classify_batch(texts: List[str], batch_size: int) -> Tuple[int, List[Optional[Tuple[str, float]]], float]:
+    """Exécuté dans un worker : (pid, résultats, secondes d'inférence)"""
+    from .inference import run_pipeline
+    start = time.perf_counter()
+    results = run_pipeline(_worker_classifier, texts, batch_size, _worker_config)
+    return os.getpid(), results, time.perf_counter() - start
+
+
+class InferencePool:
+    """Workers d'inférence partagés (un modèle par processus)"""
+
+    def __init__(self, workers: int, threads_per_worker: Optional[int] = None,
+                 config: SentimentConfig = SentimentConfig, backend: Optional[str] = None):
+        """
+        Args:
+            workers: Nombre de processus
+            threads_per_worker: Threads torch par processus (défaut: cœurs / workers)
+            config: Configuration du modèle (MODEL_NAME, MAX_LENGTH, MAX_CHARS)
+            backend: "float32" ou "int8" (défaut: config.BACKEND)
+        """
+        self.workers = workers
+        self.backend = backend or config.BACKEND
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        settings = {
+            'MODEL_NAME': config.MODEL_NAME,
+            'MAX_LENGTH': config.MAX_LENGTH,
+            'MAX_CHARS': config.MAX_CHARS
+        }
+        # spawn : pas de fork d'un processus qui a déjà initialisé torch
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings, self.threads_per_worker, self.backend)
+        )
+        self._stats: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+        logger.info(f"🏭 Pool d'inférence : {workers} processus × {self.threads_per_worker} threads")
+
+    def classify(self, texts: List[str], batch_size: int) -> List[Optional[Tuple[str, float]]]:
+        """
+        Classifier des textes sur les workers
+
+        Les textes sont triés par longueur puis découpés en lots de
+        `batch_size`, soumis en parallèle ; les résultats sont remis dans
+        l'ordre d'entrée.
+
+        Returns:
+            (sentiment, confidence) par texte, None pour un lot en erreur
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        chunks = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+        futures = [
+            self._executor.submit(_classify_batch, [texts[i] for i in chunk], batch_size)
+            for chunk in chunks
+        ]
+
+        results: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+        for chunk, future in zip(chunks, futures):
+            pid, predictions, busy = future.result()
+            self._record(pid, len(chunk), busy)
+            for i, prediction in zip(chunk, predictions):
+                results[i] = prediction
+        return results
+
+    def _record(self, pid: int, texts: int, busy: float):
+        with self._lock:
+            stats = self._stats.setdefault(pid, {'batches': 0, 'texts': 0, 'busy_s': 0.0})
+            stats['batches'] += 1
+            stats['texts'] += texts
+            stats['busy_s'] += busy
+
+    def get_stats(self) -> Dict:
+        """Débit par worker (textes / seconde d'inférence) et total"""
+        with self._lock:
+            per_worker = {
+                pid: {
+                    'batches': s['batches'],
+                    'texts': s['texts'],
+                    'busy_s': round(s['busy_s'], 3),
+                    'texts_per_s': round(s['texts'] / s['busy_s'], 1) if s['busy_s'] else 0.0
+                }
+                for pid, s in self._stats.items()
+            }
+        return {
+            'workers': self.workers,
+            'threads_per_worker': self.threads_per_worker,
+            'backend': self.backend,
+            'texts': sum(s['texts'] for s in per_worker.values()),
+            'per_worker': per_worker
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_shared_pools: Dict[str, InferencePool] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(config: SentimentConfig = SentimentConfig, backend: Optional[str] = None) -> InferencePool:
+    """Pool unique du processus par backend (partagé par toutes les sessions et analyses)"""
+    backend = backend or config.BACKEND
+    with _shared_lock:
+        if backend not in _shared_pools:
+            pool = InferencePool(
+                config.POOL_WORKERS,
+                threads_per_worker=config.POOL_THREADS_PER_WORKER or None,
+                config=config,
+                backend=backend
+            )
+            atexit.register(pool.shutdown)
+            _shared_pools[backend] = pool
+        return _shared_pools[backend]
@@ -0,0 +1,269 @@
+"""
+File de jobs d'analyse de sentiment multi-vidéos
+
+Un job regroupe plusieurs URLs (par exemple tous les résumés d'une journée
+de compétition). Les vidéos sont analysées en arrière-plan par
+YouTubeSentimentAnalyzer.analyze_video :
+- au plus `download_workers` vidéos téléchargées en même temps
+- les passes du modèle sont bornées par l'analyseur (inference_slots)
+
+Chaque job est checkpointé dans data/sentiment_jobs/<job_id>.json (état
+et progression de chaque vidéo) et le résultat complet de chaque vidéo
+terminée dans data/sentiment_jobs/<job_id>/<video_id>.json. Au
+redémarrage, les vidéos en attente ou interrompues sont remises en file ;
+une vidéo interrompue repart du début, mais ses commentaires déjà
+classifiés sont retrouvés dans le cache des sentiments.
+
+L'interface soumet un job puis interroge get_job() au lieu de bloquer.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import SentimentConfig
+from .results import SentimentResults, sentiment_entries
+from .word_index import WordFrequencyIndex
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def job_status(videos: List[Dict]) -> str:
+    """Statut d'un job à partir de celui de ses vidéos"""
+    statuses = {video['status'] for video in videos}
+    if statuses <= {DONE, FAILED}:
+        return DONE
+    if statuses == {QUEUED}:
+        return QUEUED
+    return RUNNING
+
+
+def _summary(stats: Dict) -> Dict:
+    """Résumé d'une analyse conservé dans le checkpoint du job"""
+    return {
+        'total_comments': stats['total_comments'],
+        'percentages': {s: round(stats[s]['percentage'], 1) for s in ('positive', 'neutral', 'negative')},
+        'comments_per_s': stats['throughput']['comments_per_s']
+    }
+
+
+class SentimentJobQueue:
+    """Jobs d'analyse multi-vidéos en arrière-plan, reprenables après redémarrage"""
+
+    def __init__(self, analyzer, jobs_dir: Optional[Path] = None, download_workers: Optional[int] = None,
+                 config: SentimentConfig = SentimentConfig, resume: bool = True):
+        """
+        Args:
+            analyzer: YouTubeSentimentAnalyzer partagé par toutes les vidéos
+            jobs_dir: Répertoire des checkpoints (défaut: SentimentConfig.JOBS_DIR)
+            download_workers: Vidéos analysées en même temps (défaut: SentimentConfig.JOB_DOWNLOAD_WORKERS)
+            config: Configuration (intervalle de checkpoint)
+            resume: Remettre en file les vidéos non terminées des jobs existants
+        """
+        self.analyzer = analyzer
+        self.jobs_dir = Path(jobs_dir or config.JOBS_DIR)
+        self.download_workers = download_workers or config.JOB_DOWNLOAD_WORKERS
+        self.checkpoint_interval = config.JOB_CHECKPOINT_INTERVAL
+
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.download_workers, thread_name_prefix="sentiment-job")
+
+        self._load_jobs()
+        if resume:
+            self.resume()
+
+    # ------------------------------------------------------------------
+    # Soumission et consultation
+    # ------------------------------------------------------------------
+
+    def submit(self, urls: List[str], max_comments: int = 500, incremental: bool = True) -> str:
+        """
+        Créer un job et mettre ses vidéos en file
+
+        Les URLs invalides sont marquées en échec, les doublons ignorés.
+
+        Returns:
+            Identifiant du job
+        """
+        videos, seen = [], set()
+        for url in (u.strip() for u in urls):
+            if not url:
+                continue
+            try:
+                video_id = self.analyzer.extract_video_id(url)
+            except ValueError as e:
+                videos.append(self._new_video(url, None, status=FAILED, error=str(e)))
+                continue
+            if video_id not in seen:
+                seen.add(video_id)
+                videos.append(self._new_video(url, video_id))
+        if not videos:
+            raise ValueError("Aucune URL YouTube à analyser")
+
+        now = datetime.now()
+        job = {
+            'job_id': f"{now.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}",
+            'created_at': now.isoformat(),
+            'updated_at': now.isoformat(),
+            'status': job_status(videos),
+            'options': {'max_comments': max_comments, 'incremental': incremental},
+            'videos': videos
+        }
+        with self._lock:
+            self._jobs[job['job_id']] = job
+            self._checkpoint(job)
+
+        for index, video in enumerate(videos):
+            if video['status'] == QUEUED:
+                self._executor.submit(self._run_video, job['job_id'], index)
+        logger.info(f"📋 Job {job['job_id']} : {len(seen)} vidéos en file")
+        return job['job_id']
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Copie de l'état du job (statut et progression par vidéo)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+
+    def list_jobs(self, limit: Optional[int] = None) -> List[Dict]:
+        """Jobs du plus récent au plus ancien"""
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda job: job['created_at'], reverse=True)
+            return copy.deepcopy(jobs[:limit])
+
+    def get_result(self, job_id: str, video_id: str) -> Optional[Dict]:
+        """Statistiques complètes d'une vidéo terminée (celles d'analyze_video)"""
+        path = self._result_path(job_id, video_id)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        if 'results' in stats:
+            stats['results'] = SentimentResults.from_dict(stats['results'])
+            stats.update(sentiment_entries(stats['results']))
+        if 'words' in stats:
+            stats['words'] = WordFrequencyIndex.from_dict(stats['words'])
+        return stats
+
+    def resume(self) -> int:
+        """
+        Remettre en file les vidéos en attente ou interrompues
+
+        Returns:
+            Nombre de vidéos remises en file
+        """
+        pending = []
+        with self._lock:
+            for job in self._jobs.values():
+                for index, video in enumerate(job['videos']):
+                    if video['status'] in (QUEUED, RUNNING):
+                        video.update(status=QUEUED, fetched=0, classified=0)
+                        pending.append((job['job_id'], index))
+        for job_id, index in pending:
+            self._executor.submit(self._run_video, job_id, index)
+        if pending:
+            logger.info(f"🔁 {len(pending)} vidéos reprises après redémarrage")
+        return len(pending)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------------
+
+    def _run_video(self, job_id: str, index: int):
+        with self._lock:
+            job = self._jobs[job_id]
+            video = job['videos'][index]
+            video.update(status=RUNNING, started_at=datetime.now().isoformat())
+            self._checkpoint(job)
+        options = job['options']
+        last_checkpoint = time.monotonic()
+
+        def on_progress(progress: Dict):
+            nonlocal last_checkpoint
+            with self._lock:
+                video.update(fetched=progress['fetched'], classified=progress['classified'],
+                             percentages=progress['percentages'])
+                if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                    self._checkpoint(job)
+                    last_checkpoint = time.monotonic()
+
+        try:
+            stats = self.analyzer.analyze_video(
+                video['url'],
+                max_comments=options['max_comments'],
+                progress_callback=on_progress,
+                incremental=options['incremental']
+            )
+            self._save_result(job_id, video['video_id'], stats)
+            update = {'status': DONE, 'summary': _summary(stats)}
+        except Exception as e:
+            logger.error(f"❌ Job {job_id}, vidéo {video['video_id']} : {e}")
+            update = {'status': FAILED, 'error': str(e)}
+
+        with self._lock:
+            video.update(update, finished_at=datetime.now().isoformat())
+            self._checkpoint(job)
+            if job['status'] == DONE:
+                failed = sum(v['status'] == FAILED for v in job['videos'])
+                logger.info(f"✅ Job {job_id} terminé ({len(job['videos']) - failed} vidéos, {failed} échecs)")
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _new_video(url: str, video_id: Optional[str], status: str = QUEUED, error: Optional[str] = None) -> Dict:
+        return {'url': url, 'video_id': video_id, 'status': status, 'fetched': 0, 'classified': 0,
+                'percentages': None, 'summary': None, 'error': error, 'started_at': None, 'finished_at': None}
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _result_path(self, job_id: str, video_id: str) -> Path:
+        return self.jobs_dir / job_id / f"{video_id}.json"
+
+    def _load_jobs(self):
+        if not self.jobs_dir.exists():
+            return
+        for path in self.jobs_dir.glob("*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+                self._jobs[job['job_id']] = job
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"⚠️ Checkpoint de job illisible ignoré ({path.name}) : {e}")
+
+    def _checkpoint(self, job: Dict):
+        """Écriture atomique du job (appelé sous self._lock)"""
+        job['status'] = job_status(job['videos'])
+        job['updated_at'] = datetime.now().isoformat()
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        path = self._job_path(job['job_id'])
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, path)
+
+    def _save_result(self, job_id: str, video_id: str, stats: Dict):
+        path = self._result_path(job_id, video_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            # Colonnes compactes plutôt que la liste des commentaires par sentiment
+            json.dump(stats, f, ensure_ascii=False,
+                      default=lambda value: value.to_dict() if hasattr(value, 'to_dict') else str(value))
+        os.replace(tmp_file, path)
@@ -0,0 +1,211 @@
+"""
+Résultats d'une analyse de sentiment en colonnes
+
+Au lieu de listes de dictionnaires (un par commentaire, recopiés dans
+chaque liste par sentiment), une analyse garde une colonne NumPy par
+champ numérique (label, confiance, likes, horodatage) et les chaînes
+(textes, auteurs, dates affichées) dans un magasin internalisé : un texte
+répété (spam, « Dima Maroc 🇲🇦 ») n'est stocké qu'une fois.
+
+Pourcentages, top N par likes (np.argpartition) et histogrammes de
+confiance sont calculés sur les colonnes. La vue dictionnaire historique
+(stats['positive']['comments']) n'est construite qu'au premier accès.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .timeline import SENTIMENTS, SENTIMENT_INDEX
+
+
+class TextStore:
+    """Chaînes internalisées : chaque valeur distincte stockée une fois, référencée par un entier"""
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = values or []
+        self._ids: Dict[str, int] = {value: i for i, value in enumerate(self.values)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[i]
+
+    def add(self, value: Optional[str]) -> int:
+        value = value or ''
+        i = self._ids.get(value)
+        if i is None:
+            i = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+class SentimentResults:
+    """Commentaires classifiés d'une analyse, une colonne par champ"""
+
+    def __init__(self, labels: np.ndarray, confidences: np.ndarray, likes: np.ndarray, times: np.ndarray,
+                 text_ids: np.ndarray, author_ids: np.ndarray, time_ids: np.ndarray,
+                 cids: List[Optional[str]], strings: TextStore):
+        """
+        Args:
+            labels: Indice du sentiment dans SENTIMENTS (int8)
+            confidences: Scores de confiance (float64)
+            likes: Likes (int64)
+            times: Horodatages Unix, NaN si inconnus (float64)
+            text_ids, author_ids, time_ids: Indices dans `strings` (int32)
+            cids: Identifiants YouTube des commentaires
+            strings: Magasin des chaînes internalisées
+        """
+        self.labels = labels
+        self.confidences = confidences
+        self.likes = likes
+        self.times = times
+        self.text_ids = text_ids
+        self.author_ids = author_ids
+        self.time_ids = time_ids
+        self.cids = cids
+        self.strings = strings
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def from_comments(cls, comments: Iterable[Dict]) -> 'SentimentResults':
+        """Construire les colonnes depuis des commentaires classifiés (dictionnaires)"""
+        comments = list(comments)
+        strings = TextStore()
+        return cls(
+            labels=np.fromiter((SENTIMENT_INDEX[c['sentiment']] for c in comments), dtype=np.int8, count=len(comments)),
+            confidences=np.fromiter((c['confidence'] for c in comments), dtype=np.float64, count=len(comments)),
+            likes=np.fromiter((c.get('likes') or 0 for c in comments), dtype=np.int64, count=len(comments)),
+            times=np.asarray([c.get('time_parsed') for c in comments], dtype=np.float64).reshape(-1),
+            text_ids=np.fromiter((strings.add(c.get('text')) for c in comments), dtype=np.int32, count=len(comments)),
+            author_ids=np.fromiter((strings.add(c.get('author')) for c in comments), dtype=np.int32, count=len(comments)),
+            time_ids=np.fromiter((strings.add(c.get('time')) for c in comments), dtype=np.int32, count=len(comments)),
+            cids=[c.get('cid') for c in comments],
+            strings=strings
+        )
+
+    # ------------------------------------------------------------------
+    # Agrégats
+    # ------------------------------------------------------------------
+
+    def counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.labels, minlength=len(SENTIMENTS))
+        return {sentiment: int(counts[i]) for i, sentiment in enumerate(SENTIMENTS)}
+
+    def percentages(self) -> Dict[str, float]:
+        total = len(self)
+        return {sentiment: (count / total * 100) if total > 0 else 0
+                for sentiment, count in self.counts().items()}
+
+    def indices(self, sentiment: Optional[str] = None) -> np.ndarray:
+        """Positions des commentaires d'un sentiment (tous si None)"""
+        if sentiment is None:
+            return np.arange(len(self))
+        return np.flatnonzero(self.labels == SENTIMENT_INDEX[sentiment])
+
+    def confidences_of(self, sentiment: str) -> np.ndarray:
+        return self.confidences[self.labels == SENTIMENT_INDEX[sentiment]]
+
+    def confidence_histogram(self, bins: int = 10) -> Dict[str, np.ndarray]:
+        """Nombre de commentaires par tranche de confiance [0, 1], par sentiment"""
+        return {
+            sentiment: np.histogram(self.confidences_of(sentiment), bins=bins, range=(0.0, 1.0))[0]
+            for sentiment in SENTIMENTS
+        }
+
+    def top_indices(self, sentiment: Optional[str] = None, n: int = 5) -> np.ndarray:
+        """Positions des n commentaires les plus aimés, par likes décroissants"""
+        candidates = self.indices(sentiment)
+        if n <= 0 or not len(candidates):
+            return candidates[:0]
+        if n < len(candidates):
+            candidates = candidates[np.argpartition(-self.likes[candidates], n - 1)[:n]]
+        return candidates[np.argsort(-self.likes[candidates], kind='stable')]
+
+    # ------------------------------------------------------------------
+    # Vue dictionnaire (interface et exports)
+    # ------------------------------------------------------------------
+
+    def comment(self, i: int) -> Dict:
+        """Commentaire i sous forme de dictionnaire"""
+        timestamp = self.times[i]
+        return {
+            'cid': self.cids[i],
+            'text': self.strings[self.text_ids[i]],
+            'author': self.strings[self.author_ids[i]],
+            'likes': int(self.likes[i]),
+            'time': self.strings[self.time_ids[i]],
+            'time_parsed': None if np.isnan(timestamp) else float(timestamp),
+            'sentiment': SENTIMENTS[self.labels[i]],
+            'confidence': float(self.confidences[i])
+        }
+
+    def top(self, sentiment: Optional[str] = None, n: int = 5) -> List[Dict]:
+        """Top n commentaires par likes"""
+        return [self.comment(i) for i in self.top_indices(sentiment, n)]
+
+    def comments(self, sentiment: Optional[str] = None) -> List[Dict]:
+        """Commentaires d'un sentiment, les plus aimés d'abord"""
+        candidates = self.indices(sentiment)
+        order = candidates[np.argsort(-self.likes[candidates], kind='stable')]
+        return [self.comment(i) for i in order]
+
+    def texts(self, sentiment: Optional[str] = None) -> List[str]:
+        return [self.strings[i] for i in self.text_ids[self.indices(sentiment)]]
+
+    def to_dict(self) -> Dict:
+        """Forme JSON compacte (colonnes + chaînes internalisées)"""
+        return {
+            'sentiments': list(SENTIMENTS),
+            'labels': self.labels.tolist(),
+            'confidences': np.round(self.confidences, 4).tolist(),
+            'likes': self.likes.tolist(),
+            'times': [None if np.isnan(t) else t for t in self.times.tolist()],
+            'text_ids': self.text_ids.tolist(),
+            'author_ids': self.author_ids.tolist(),
+            'time_ids': self.time_ids.tolist(),
+            'cids': self.cids,
+            'strings': self.strings.values
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SentimentResults':
+        return cls(
+            labels=np.asarray(data['labels'], dtype=np.int8),
+            confidences=np.asarray(data['confidences'], dtype=np.float64),
+            likes=np.asarray(data['likes'], dtype=np.int64),
+            times=np.asarray(data['times'], dtype=np.float64).reshape(-1),
+            text_ids=np.asarray(data['text_ids'], dtype=np.int32),
+            author_ids=np.asarray(data['author_ids'], dtype=np.int32),
+            time_ids=np.asarray(data['time_ids'], dtype=np.int32),
+            cids=data['cids'],
+            strings=TextStore(data['strings'])
+        )
+
+
+class SentimentEntry(dict):
+    """{count, percentage} d'un sentiment ; 'comments' construit au premier accès"""
+
+    def __init__(self, results: SentimentResults, sentiment: str, count: int, percentage: float):
+        super().__init__(count=count, percentage=percentage)
+        self._results = results
+        self._sentiment = sentiment
+
+    def __missing__(self, key):
+        if key != 'comments':
+            raise KeyError(key)
+        comments = self['comments'] = self._results.comments(self._sentiment)
+        return comments
+
+
+def sentiment_entries(results: SentimentResults) -> Dict[str, SentimentEntry]:
+    """Entrées stats['positive'|'negative'|'neutral'] adossées aux colonnes"""
+    counts = results.counts()
+    percentages = results.percentages()
+    return {
+        sentiment: SentimentEntry(results, sentiment, counts[sentiment], percentages[sentiment])
+        for sentiment in SENTIMENTS
+    }
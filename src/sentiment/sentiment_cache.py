@@ -0,0 +1,124 @@
+"""
+Cache persistant des sentiments par commentaire (SQLite)
+
+Clé : (identifiant du modèle, hash du texte normalisé) -> (sentiment, score).
+Les commentaires copiés-collés ("Dima Maghrib 🇲🇦") et les vidéos
+ré-analysées ne repassent pas par le modèle. Lectures et écritures se font
+par lots (une requête pour tout un micro-lot).
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+SQL_VARIABLES = 500  # Paramètres maximum par requête IN (...)
+
+
+def normalize_text(text: str) -> str:
+    """Forme canonique d'un commentaire : NFKC, minuscules, espaces compactés (emojis conservés)"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+def text_hash(text: str) -> str:
+    """Hash MD5 du texte normalisé"""
+    return hashlib.md5(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """
+    Table SQLite (model, text_hash) -> (label, score)
+
+    Features:
+    - Lectures et écritures groupées
+    - Plusieurs modèles dans la même base (clé incluant le modèle)
+    - Statistiques d'utilisation (hit rate)
+    - Utilisable depuis plusieurs threads (connexion protégée par un verrou)
+    """
+
+    def __init__(self, db_path: Path, model_id: str):
+        """
+        Args:
+            db_path: Fichier SQLite
+            model_id: Identifiant du modèle (un changement de modèle invalide le cache)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.model_id = model_id
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiments ("
+            " model TEXT NOT NULL, text_hash TEXT NOT NULL, label TEXT NOT NULL, score REAL NOT NULL,"
+            " PRIMARY KEY (model, text_hash)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+        logger.info(f"📦 Cache de sentiment : {self.db_path} ({len(self)} entrées pour {model_id})")
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, Tuple[str, float]]:
+        """Résultats connus parmi les hashes demandés"""
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, Tuple[str, float]] = {}
+        with self._lock:
+            for i in range(0, len(hashes), SQL_VARIABLES):
+                chunk = hashes[i:i + SQL_VARIABLES]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, label, score FROM sentiments "
+                    f"WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [self.model_id, *chunk]
+                )
+                found.update((h, (label, score)) for h, label, score in rows)
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def set_many(self, entries: Iterable[Tuple[str, Tuple[str, float]]]):
+        """Enregistrer des résultats [(hash, (label, score))] en une transaction"""
+        rows = [(self.model_id, h, label, score) for h, (label, score) in entries]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiments (model, text_hash, label, score) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM sentiments WHERE model = ?", (self.model_id,)
+            ).fetchone()[0]
+
+    def clear(self):
+        """Supprimer les entrées du modèle courant"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sentiments WHERE model = ?", (self.model_id,))
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict:
+        """Statistiques d'utilisation"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total * 100, 1) if total else 0.0,
+            'model': self.model_id,
+            'db_path': str(self.db_path)
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,172 @@
+"""
+Pipeline producteur/consommateur : téléchargement et classification en parallèle
+
+Un thread de récupération remplit une file bornée avec les commentaires au
+fil du téléchargement ; des threads de classification la vident par
+micro-lots. Le téléchargement (I/O réseau) et l'inférence (CPU) se
+recouvrent, et la progression est remontée au thread appelant :
+
+    results = stream_classify(
+        analyzer.iter_comments(video_id, 500),
+        analyzer.classify_texts,
+        on_progress=lambda p: bar.progress(p['classified'] / 500)
+    )
+
+Le callback est toujours appelé dans le thread appelant (compatible
+Streamlit, qui refuse les mises à jour depuis d'autres threads).
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SENTIMENTS = ('positive', 'negative', 'neutral')
+_END = object()
+
+
+def progress_snapshot(fetched: int, classified: int, counts: Dict[str, int], done: bool = False) -> Dict:
+    """État de la progression : compteurs et pourcentages courants"""
+    return {
+        'fetched': fetched,
+        'classified': classified,
+        'counts': dict(counts),
+        'percentages': {
+            sentiment: (counts[sentiment] / classified * 100) if classified else 0.0
+            for sentiment in SENTIMENTS
+        },
+        'done': done
+    }
+
+
+def stream_classify(
+    comments: Iterable[Dict],
+    classify: Callable[[List[str]], List[Tuple[str, float]]],
+    micro_batch: int = 32,
+    queue_size: int = 256,
+    workers: int = 1,
+    batch_timeout: float = 0.2,
+    on_progress: Optional[Callable[[Dict], None]] = None
+) -> List[Dict]:
+    """
+    Classifier des commentaires pendant leur téléchargement
+
+    Args:
+        comments: Itérable de commentaires {'text', ...} (ex: générateur de téléchargement)
+        classify: Fonction textes -> [(sentiment, confidence)] dans le même ordre
+        micro_batch: Commentaires maximum par appel à classify
+        queue_size: Taille de la file (le téléchargement attend si elle est pleine)
+        workers: Threads de classification
+        batch_timeout: Attente maximale (s) pour compléter un micro-lot
+        on_progress: Appelé après chaque micro-lot avec progress_snapshot()
+
+    Returns:
+        Commentaires enrichis de 'sentiment' et 'confidence', dans l'ordre de récupération
+    """
+    items: queue.Queue = queue.Queue(maxsize=queue_size)
+    events: queue.Queue = queue.Queue()
+    results: Dict[int, Dict] = {}
+    errors: List[BaseException] = []
+    stop = threading.Event()
+    fetched = 0
+
+    def put(item) -> bool:
+        # Attente bornée pour pouvoir s'arrêter si un consommateur a échoué
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        nonlocal fetched
+        try:
+            for index, comment in enumerate(comments):
+                if not put((index, comment)):
+                    return
+                fetched = index + 1
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            for _ in range(workers):
+                put(_END)
+
+    def take(timeout: Optional[float] = None):
+        # None : file vide après le délai, ou arrêt demandé
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not stop.is_set():
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                return None
+            try:
+                return items.get(timeout=wait)
+            except queue.Empty:
+                continue
+        return None
+
+    def consume():
+        finished = False
+        while not finished:
+            first = take()
+            if first is None or first is _END:
+                break
+            batch = [first]
+            deadline = time.monotonic() + batch_timeout
+            while len(batch) < micro_batch:
+                item = take(deadline - time.monotonic())
+                if item is None:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                batch.append(item)
+
+            try:
+                predictions = classify([comment['text'] for _, comment in batch])
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+                break
+            events.put([
+                (index, {**comment, 'sentiment': sentiment, 'confidence': confidence})
+                for (index, comment), (sentiment, confidence) in zip(batch, predictions)
+            ])
+        events.put(_END)
+
+    threads = [threading.Thread(target=produce, name="comments-fetch", daemon=True)]
+    threads += [threading.Thread(target=consume, name=f"comments-classify-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Le thread appelant agrège les résultats et publie la progression
+    counts = {sentiment: 0 for sentiment in SENTIMENTS}
+    running = workers
+    try:
+        while running:
+            event = events.get()
+            if event is _END:
+                running -= 1
+                continue
+            for index, result in event:
+                results[index] = result
+                counts[result['sentiment']] += 1
+            if on_progress:
+                on_progress(progress_snapshot(fetched, len(results), counts))
+    finally:
+        # Arrête aussi les threads si le callback lève (ex: rerun Streamlit)
+        stop.set()
+
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+    if on_progress:
+        on_progress(progress_snapshot(fetched, len(results), counts, done=True))
+    logger.info(f"✅ {len(results)} commentaires récupérés et classifiés en flux")
+    return [results[index] for index in sorted(results)]
@@ -0,0 +1,211 @@
+"""
+Agrégation temporelle du sentiment : courbe d'humeur pendant un match
+
+Les commentaires classifiés sont comptés par intervalle de `resolution`
+secondes (1 minute par défaut) dans deux tableaux NumPy compacts : nombre
+de commentaires et somme des confiances, par intervalle et par sentiment.
+L'ajout d'un lot est vectorisé (np.add.at) ; les séries sur des fenêtres
+de 1, 5 ou 15 minutes sont calculées à partir de ces tableaux par sommes
+cumulées, sans relire les commentaires.
+
+Seuls les intervalles des `horizon` secondes précédant le commentaire le
+plus récent sont conservés : un vieux commentaire isolé n'étire pas les
+tableaux (ni l'état JSON de la vidéo) sur des mois.
+
+Usage:
+    timeline = SentimentTimeline()
+    timeline.add_comments(classified)
+    series = timeline.series(window=300)  # fenêtres glissantes de 5 minutes
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+SENTIMENTS = ('positive', 'negative', 'neutral')
+SENTIMENT_INDEX = {sentiment: i for i, sentiment in enumerate(SENTIMENTS)}
+
+DEFAULT_HORIZON = 48 * 3600  # secondes couvertes par la courbe avant le commentaire le plus récent
+
+
+class SentimentTimeline:
+    """Compteurs et confiances par intervalle de temps et par sentiment"""
+
+    def __init__(self, resolution: int = 60, origin: Optional[int] = None,
+                 counts: Optional[np.ndarray] = None, confidence_sums: Optional[np.ndarray] = None,
+                 horizon: int = DEFAULT_HORIZON):
+        """
+        Args:
+            resolution: Durée d'un intervalle en secondes
+            origin: Premier intervalle (timestamp // resolution), None si vide
+            counts: Commentaires par intervalle et sentiment (intervalles × 3)
+            confidence_sums: Somme des confiances par intervalle et sentiment
+            horizon: Durée conservée avant le commentaire le plus récent (secondes)
+        """
+        self.resolution = resolution
+        self.horizon = horizon
+        self.max_buckets = max(1, horizon // resolution)
+        self.origin = origin
+        self._counts = np.zeros((0, len(SENTIMENTS)), dtype=np.int32) if counts is None else counts
+        self._confidence = (np.zeros(self._counts.shape, dtype=np.float64)
+                            if confidence_sums is None else confidence_sums)
+        self._size = len(self._counts)
+        self._trim()  # État enregistré avant l'horizon
+
+    def __len__(self) -> int:
+        """Nombre de commentaires agrégés"""
+        return int(self._counts[:self._size].sum())
+
+    @property
+    def buckets(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_comments(cls, comments: Iterable[Dict], resolution: int = 60) -> 'SentimentTimeline':
+        timeline = cls(resolution)
+        timeline.add_comments(comments)
+        return timeline
+
+    def add_comments(self, comments: Iterable[Dict]) -> int:
+        """Ajouter des commentaires classifiés {time_parsed, sentiment, confidence}"""
+        comments = list(comments)
+        return self.add(
+            [c.get('time_parsed') for c in comments],
+            [c['sentiment'] for c in comments],
+            [c.get('confidence', 0.0) for c in comments]
+        )
+
+    def add(self, timestamps: List[Optional[float]], sentiments: List[str], confidences: List[float]) -> int:
+        """
+        Ajouter un lot de commentaires
+
+        Args:
+            timestamps: Horodatages Unix (None : commentaire ignoré)
+            sentiments: 'positive', 'negative' ou 'neutral'
+            confidences: Scores de confiance
+
+        Returns:
+            Nombre de commentaires agrégés
+        """
+        codes = np.fromiter((SENTIMENT_INDEX.get(s, SENTIMENT_INDEX['neutral']) for s in sentiments),
+                            dtype=np.int64, count=len(sentiments))
+        return self.add_codes(timestamps, codes, confidences)
+
+    def add_codes(self, timestamps, codes, confidences) -> int:
+        """Comme add(), avec les sentiments déjà codés (indices dans SENTIMENTS, ex. SentimentResults.labels)"""
+        times = np.asarray(timestamps, dtype=np.float64)
+        valid = ~np.isnan(times)
+        if not valid.any():
+            return 0
+
+        buckets = np.floor(times[valid] / self.resolution).astype(np.int64)
+        codes = np.asarray(codes, dtype=np.int64)[valid]
+        scores = np.asarray(confidences, dtype=np.float64)[valid]
+
+        # Commentaires hors horizon (avant le plus récent, déjà agrégé ou de ce lot) ignorés
+        last = int(buckets.max())
+        if self.origin is not None:
+            last = max(last, self.origin + self._size - 1)
+        recent = buckets > last - self.max_buckets
+        if not recent.any():
+            return 0
+        if not recent.all():
+            buckets, codes, scores = buckets[recent], codes[recent], scores[recent]
+
+        self._ensure_range(int(buckets.min()), int(buckets.max()))
+        rows = buckets - self.origin
+        np.add.at(self._counts, (rows, codes), 1)
+        np.add.at(self._confidence, (rows, codes), scores)
+        return len(rows)
+
+    def _ensure_range(self, first: int, last: int):
+        """Étendre les tableaux pour couvrir les intervalles [first, last]"""
+        if self.origin is None:
+            self.origin = first
+        if first < self.origin:
+            # Commentaire plus ancien que l'origine : décaler vers la gauche
+            shift = self.origin - first
+            self._counts = np.concatenate([np.zeros((shift, len(SENTIMENTS)), self._counts.dtype), self._counts])
+            self._confidence = np.concatenate([np.zeros((shift, len(SENTIMENTS))), self._confidence])
+            self._size += shift
+            self.origin = first
+
+        needed = last - self.origin + 1
+        if needed > len(self._counts):
+            # Capacité doublée : ajouts amortis en O(1) pendant un direct
+            capacity = max(needed, 2 * len(self._counts), 16)
+            counts = np.zeros((capacity, len(SENTIMENTS)), self._counts.dtype)
+            confidence = np.zeros((capacity, len(SENTIMENTS)))
+            counts[:self._size] = self._counts[:self._size]
+            confidence[:self._size] = self._confidence[:self._size]
+            self._counts, self._confidence = counts, confidence
+        self._size = max(self._size, needed)
+        self._trim()
+
+    def _trim(self):
+        """Oublier les intervalles sortis de l'horizon"""
+        if self._size > self.max_buckets:
+            shift = self._size - self.max_buckets
+            self._counts, self._confidence = self._counts[shift:], self._confidence[shift:]
+            self._size -= shift
+            self.origin += shift
+
+    def series(self, window: int = 60, rolling: bool = True) -> Dict:
+        """
+        Série temporelle du sentiment
+
+        Args:
+            window: Taille de la fenêtre en secondes (multiple de resolution)
+            rolling: Fenêtre glissante à chaque intervalle (sinon fenêtres disjointes)
+
+        Returns:
+            {time, total, counts, percentages, mean_confidence} ; tableaux NumPy,
+            `time` = début du dernier intervalle de la fenêtre (timestamp Unix)
+        """
+        width = max(1, window // self.resolution)
+        counts = self._counts[:self._size]
+        confidence = self._confidence[:self._size]
+
+        if rolling:
+            cumulative_counts = np.vstack([np.zeros((1, len(SENTIMENTS))), np.cumsum(counts, axis=0)])
+            cumulative_confidence = np.vstack([np.zeros((1, len(SENTIMENTS))), np.cumsum(confidence, axis=0)])
+            ends = np.arange(1, self._size + 1)
+            starts = np.maximum(ends - width, 0)
+            window_counts = cumulative_counts[ends] - cumulative_counts[starts]
+            window_confidence = cumulative_confidence[ends] - cumulative_confidence[starts]
+            rows = ends - 1
+        else:
+            padded = -self._size % width
+            window_counts = np.pad(counts, ((0, padded), (0, 0))).reshape(-1, width, len(SENTIMENTS)).sum(axis=1)
+            window_confidence = np.pad(confidence, ((0, padded), (0, 0))).reshape(-1, width, len(SENTIMENTS)).sum(axis=1)
+            rows = np.arange(0, self._size, width)
+
+        total = window_counts.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            percentages = np.where(total[:, None] > 0, window_counts / total[:, None] * 100, 0.0)
+            mean_confidence = np.where(window_counts > 0, window_confidence / window_counts, np.nan)
+
+        return {
+            'time': ((self.origin or 0) + rows) * self.resolution,
+            'total': total.astype(np.int64),
+            'counts': {s: window_counts[:, i].astype(np.int64) for i, s in enumerate(SENTIMENTS)},
+            'percentages': {s: percentages[:, i] for i, s in enumerate(SENTIMENTS)},
+            'mean_confidence': {s: mean_confidence[:, i] for i, s in enumerate(SENTIMENTS)}
+        }
+
+    def to_dict(self) -> Dict:
+        """Forme JSON compacte (une ligne [positive, negative, neutral] par intervalle)"""
+        return {
+            'resolution': self.resolution,
+            'horizon': self.horizon,
+            'origin': self.origin,
+            'counts': self._counts[:self._size].tolist(),
+            'confidence_sums': np.round(self._confidence[:self._size], 4).tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SentimentTimeline':
+        counts = np.asarray(data['counts'], dtype=np.int32).reshape(-1, len(SENTIMENTS))
+        confidence = np.asarray(data['confidence_sums'], dtype=np.float64).reshape(-1, len(SENTIMENTS))
+        return cls(data['resolution'], origin=data['origin'], counts=counts, confidence_sums=confidence,
+                   horizon=data.get('horizon', DEFAULT_HORIZON))
@@ -0,0 +1,185 @@
+"""
+État persistant par vidéo pour la ré-analyse incrémentale
+
+Pendant un match, la même vidéo est ré-analysée toutes les quelques
+minutes. L'état d'une vidéo mémorise les commentaires déjà classifiés
+(identifiants, commentaires enrichis), l'horodatage du plus récent et les
+compteurs agrégés : un rafraîchissement ne télécharge et ne classifie que
+les nouveaux commentaires, puis les fusionne.
+
+Un fichier JSON par vidéo : data/sentiment_state/<video_id>.json. Les
+analyses concurrentes d'une même vidéo (file de jobs) fusionnent leurs
+commentaires sous un verrou propre à la vidéo.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .timeline import SENTIMENTS, SentimentTimeline
+
+logger = logging.getLogger(__name__)
+
+# Un verrou par fichier d'état, partagé par toutes les instances de VideoStateStore
+_video_locks: Dict[Path, threading.Lock] = {}
+_video_locks_guard = threading.Lock()
+
+
+def comment_key(comment: Dict) -> str:
+    """Identifiant d'un commentaire (cid YouTube, sinon auteur + texte)"""
+    return comment.get('cid') or f"{comment.get('author', '')}:{comment.get('text', '')}"
+
+
+class VideoState:
+    """Commentaires déjà traités et agrégats d'une vidéo"""
+
+    def __init__(self, video_id: str, comments: Optional[List[Dict]] = None,
+                 latest_time: Optional[float] = None, runs: int = 0, updated_at: Optional[str] = None,
+                 timeline: Optional[SentimentTimeline] = None):
+        self.video_id = video_id
+        self.comments: List[Dict] = comments or []
+        self.latest_time = latest_time
+        self.runs = runs
+        self.updated_at = updated_at
+        self.seen_ids: Set[str] = {comment_key(c) for c in self.comments}
+        self.counts = {sentiment: 0 for sentiment in SENTIMENTS}
+        for comment in self.comments:
+            self.counts[comment['sentiment']] += 1
+        # Courbe d'humeur, mise à jour avec les seuls nouveaux commentaires
+        self.timeline = timeline or SentimentTimeline.from_comments(self.comments)
+
+    def is_seen(self, comment: Dict) -> bool:
+        return comment_key(comment) in self.seen_ids
+
+    def merge(self, classified: Iterable[Dict]) -> int:
+        """
+        Ajouter des commentaires classifiés (les doublons sont ignorés)
+
+        Returns:
+            Nombre de commentaires ajoutés
+        """
+        added = []
+        for comment in classified:
+            key = comment_key(comment)
+            if key in self.seen_ids:
+                continue
+            self.seen_ids.add(key)
+            self.comments.append(comment)
+            added.append(comment)
+            self.counts[comment['sentiment']] += 1
+            timestamp = comment.get('time_parsed')
+            if timestamp is not None and (self.latest_time is None or timestamp > self.latest_time):
+                self.latest_time = timestamp
+        self.timeline.add_comments(added)
+        self.runs += 1
+        self.updated_at = datetime.now().isoformat()
+        return len(added)
+
+    def by_sentiment(self) -> Dict[str, List[Dict]]:
+        """Commentaires regroupés par sentiment, les plus aimés d'abord"""
+        results = {sentiment: [] for sentiment in SENTIMENTS}
+        for comment in sorted(self.comments, key=lambda c: c.get('likes', 0), reverse=True):
+            results[comment['sentiment']].append(comment)
+        return results
+
+    def to_dict(self) -> Dict:
+        return {
+            'video_id': self.video_id,
+            'updated_at': self.updated_at,
+            'runs': self.runs,
+            'latest_time': self.latest_time,
+            'counts': self.counts,
+            'timeline': self.timeline.to_dict(),
+            'comments': self.comments
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'VideoState':
+        return cls(
+            data['video_id'],
+            comments=data.get('comments', []),
+            latest_time=data.get('latest_time'),
+            runs=data.get('runs', 0),
+            updated_at=data.get('updated_at'),
+            timeline=SentimentTimeline.from_dict(data['timeline']) if data.get('timeline') else None
+        )
+
+
+class VideoStateStore:
+    """Un fichier JSON d'état par vidéo"""
+
+    def __init__(self, state_dir: Path):
+        self.state_dir = Path(state_dir)
+
+    def _path(self, video_id: str) -> Path:
+        return self.state_dir / f"{video_id}.json"
+
+    def _lock(self, video_id: str) -> threading.Lock:
+        path = self._path(video_id).resolve()
+        with _video_locks_guard:
+            return _video_locks.setdefault(path, threading.Lock())
+
+    def load(self, video_id: str) -> VideoState:
+        """État de la vidéo (vide si jamais analysée ou fichier illisible)"""
+        path = self._path(video_id)
+        if not path.exists():
+            return VideoState(video_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return VideoState.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ État illisible pour {video_id}, nouvelle analyse complète : {e}")
+            return VideoState(video_id)
+
+    def save(self, state: VideoState):
+        """Écriture atomique de l'état"""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(state.video_id)
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_file, path)
+
+    def update(self, video_id: str, classified: Iterable[Dict]) -> Tuple[VideoState, int]:
+        """
+        Fusionner des commentaires classifiés dans l'état enregistré
+
+        L'état est relu depuis le disque sous le verrou de la vidéo : deux
+        analyses concurrentes cumulent leurs commentaires au lieu que la
+        dernière écriture efface l'autre.
+
+        Returns:
+            (état fusionné et enregistré, nombre de commentaires ajoutés)
+        """
+        with self._lock(video_id):
+            state = self.load(video_id)
+            added = state.merge(classified)
+            self.save(state)
+        return state, added
+
+    def delete(self, video_id: str):
+        """Oublier une vidéo (la prochaine analyse repart de zéro)"""
+        self._path(video_id).unlink(missing_ok=True)
+
+
+def unseen(comments: Iterable[Dict], state: VideoState, stop_after_seen: int) -> Iterator[Dict]:
+    """
+    Commentaires pas encore traités d'un flux trié du plus récent au plus ancien
+
+    Le flux s'arrête après `stop_after_seen` commentaires déjà vus consécutifs
+    (tolère un commentaire épinglé ou un ordre légèrement instable).
+    """
+    consecutive = 0
+    for comment in comments:
+        if state.is_seen(comment):
+            consecutive += 1
+            if consecutive >= stop_after_seen:
+                logger.info(f"⏹️ Commentaires déjà analysés atteints ({len(state.seen_ids)} connus)")
+                return
+            continue
+        consecutive = 0
+        yield comment
@@ -6,9 +6,20 @@ import plotly.graph_objects as go
 import plotly.express as px
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
-from typing import Dict, List
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 import io
 import base64
+import threading
+
+from .timeline import SentimentTimeline
+from .word_index import WordFrequencyIndex
+
+# Images des nuages de mots déjà rendues, par (analyse, sentiment)
+WORDCLOUD_CACHE_SIZE = 64
+_wordcloud_cache: "OrderedDict[Tuple[str, Optional[str]], Optional[str]]" = OrderedDict()
+_wordcloud_lock = threading.Lock()
 
 
 def create_sentiment_pie_chart(stats: Dict) -> go.Figure:
@@ -97,25 +108,38 @@ def create_sentiment_bar_chart(stats: Dict) -> go.Figure:
     return fig
 
 
-def create_wordcloud(comments: List[Dict], sentiment: str = None) -> str:
+def create_wordcloud(source: Union[WordFrequencyIndex, List[Dict]], sentiment: str = None) -> str:
     """
-    Crée un nuage de mots à partir des commentaires
+    Crée un nuage de mots à partir de l'index de fréquences d'une analyse
+    
+    L'image est mise en cache par (analyse, sentiment) : changer de filtre
+    ne re-tokenise rien et ne redessine qu'une fois par sentiment.
     
     Args:
-        comments: Liste des commentaires
+        source: Index de l'analyse (stats['words']) ou liste des commentaires
         sentiment: Filtrer par sentiment ('positive', 'negative', 'neutral')
         
     Returns:
         Image base64 du nuage de mots
     """
-    # Filtrer par sentiment si spécifié
-    if sentiment:
-        comments = [c for c in comments if c.get('sentiment') == sentiment]
+    index = source if isinstance(source, WordFrequencyIndex) else WordFrequencyIndex.from_comments(source)
+    key = (index.fingerprint(), sentiment or None)
+    with _wordcloud_lock:
+        if key in _wordcloud_cache:
+            _wordcloud_cache.move_to_end(key)
+            return _wordcloud_cache[key]
     
-    # Combiner tous les textes
-    text = ' '.join([c['text'] for c in comments])
-    
-    if not text.strip():
+    image = _render_wordcloud(index.frequencies(sentiment, top=100))
+    with _wordcloud_lock:
+        _wordcloud_cache[key] = image
+        if len(_wordcloud_cache) > WORDCLOUD_CACHE_SIZE:
+            _wordcloud_cache.popitem(last=False)
+    return image
+
+
+def _render_wordcloud(frequencies: Dict[str, int]) -> Optional[str]:
+    """Image base64 d'un nuage de mots (None sans mots)"""
+    if not frequencies:
         return None
     
     # Créer le nuage de mots
@@ -127,7 +151,7 @@ def create_wordcloud(comments: List[Dict], sentiment: str = None) -> str:
         max_words=100,
         relative_scaling=0.5,
         min_font_size=10
-    ).generate(text)
+    ).generate_from_frequencies(frequencies)
     
     # Convertir en image base64
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -156,30 +180,18 @@ def create_confidence_distribution(stats: Dict) -> go.Figure:
     Returns:
         Figure Plotly
     """
-    all_comments = (
-        stats['positive']['comments'] +
-        stats['neutral']['comments'] +
-        stats['negative']['comments']
-    )
-    
-    sentiments = []
-    confidences = []
-    
-    for comment in all_comments:
-        sentiments.append(comment['sentiment'].capitalize())
-        confidences.append(comment['confidence'])
+    # Colonne des confiances (stats['results']), filtrée par sentiment sans copie de commentaires
+    results = stats['results']
     
     fig = go.Figure()
     
-    for sentiment, color in [('Positive', '#2ecc71'), ('Neutral', '#95a5a6'), ('Negative', '#e74c3c')]:
-        sentiment_confidences = [
-            conf for sent, conf in zip(sentiments, confidences) if sent == sentiment
-        ]
+    for sentiment, color in [('positive', '#2ecc71'), ('neutral', '#95a5a6'), ('negative', '#e74c3c')]:
+        sentiment_confidences = results.confidences_of(sentiment)
         
-        if sentiment_confidences:
+        if len(sentiment_confidences):
             fig.add_trace(go.Box(
                 y=sentiment_confidences,
-                name=sentiment,
+                name=sentiment.capitalize(),
                 marker_color=color,
                 boxmean='sd'
             ))
@@ -198,3 +210,52 @@ def create_confidence_distribution(stats: Dict) -> go.Figure:
     )
     
     return fig
+
+
+def create_sentiment_timeline(stats: Dict, window: int = 300) -> Optional[go.Figure]:
+    """
+    Crée la courbe d'humeur : part de chaque sentiment au fil du temps
+    
+    Args:
+        stats: Statistiques de l'analyse (agrégats de stats['timeline'])
+        window: Fenêtre glissante en secondes (60, 300, 900...)
+        
+    Returns:
+        Figure Plotly, None sans commentaires horodatés
+    """
+    if not stats.get('timeline') or not stats['timeline']['counts']:
+        return None
+    
+    series = SentimentTimeline.from_dict(stats['timeline']).series(window=window)
+    times = [datetime.fromtimestamp(t) for t in series['time']]
+    
+    fig = go.Figure()
+    for sentiment, name, color in [('positive', 'Positif', '#2ecc71'),
+                                   ('neutral', 'Neutre', '#95a5a6'),
+                                   ('negative', 'Négatif', '#e74c3c')]:
+        fig.add_trace(go.Scatter(
+            x=times,
+            y=series['percentages'][sentiment],
+            name=name,
+            mode='lines',
+            line=dict(color=color, width=2),
+            customdata=list(zip(series['counts'][sentiment], series['total'], series['mean_confidence'][sentiment])),
+            hovertemplate="%{y:.1f}% (%{customdata[0]}/%{customdata[1]}) · confiance %{customdata[2]:.2f}"
+        ))
+    
+    fig.update_layout(
+        title={
+            'text': f"Évolution du Sentiment (fenêtres de {window // 60} min)",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 18, 'color': '#2c3e50'}
+        },
+        xaxis_title="Heure",
+        yaxis_title="% des commentaires",
+        yaxis=dict(range=[0, 100]),
+        hovermode='x unified',
+        height=400,
+        margin=dict(t=80, b=60, l=60, r=20)
+    )
+    
+    return fig
@@ -0,0 +1,149 @@
+"""
+Index de fréquences des mots pour les nuages de mots
+
+Construit une fois par analyse à partir des colonnes de SentimentResults :
+chaque texte distinct (magasin internalisé) est tokenisé une seule fois,
+puis ses mots sont comptés autant de fois qu'il apparaît, par sentiment.
+Les mots-outils français, anglais et darija (arabizi et graphie arabe),
+les rires et les liens sont écartés ; les emojis sont comptés à part
+(les polices de WordCloud ne savent pas les dessiner).
+
+Le nuage de mots est ensuite généré avec WordCloud.generate_from_frequencies,
+sans re-tokeniser un texte géant à chaque changement de filtre.
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .results import SentimentResults
+from .timeline import SENTIMENTS
+
+STOPWORDS_FR = frozenset("""
+a à ai aie ais ait alors as au aucun aussi autre aux avais avait avant avec avez avoir bien c ça ce cela
+celle celui ces cet cette ceux chez ci comme comment d dans de des deja déjà donc dont du elle elles en
+encore es est et étaient était été être eu eux fait faire fais font ici il ils j je jusqu l la le les
+leur leurs lui m ma mais me même mes moi mon n ne ni non nos notre nous on ont ou où par pas peu peut
+plus pour pourquoi qu quand que quel quelle qui s sa sans se ses si son sont sous suis sur t ta te tes
+toi ton tous tout toute toutes tres très tu un une vers vos votre vous y c'est cest
+""".split())
+
+STOPWORDS_EN = frozenset("""
+a about after all also am an and any are as at be been but by can could did do does dont for from
+get got had has have he her him his how i if im in into is it its just like me more my no not now of
+on one or our out so some than that the their them then there they this to too up us was we were what
+when which who why will with would you your
+""".split())
+
+# Darija : arabizi (chiffres pour certaines lettres) et graphie arabe
+STOPWORDS_DARIJA = frozenset("""
+ana nta nti howa hiya huma 7na ntoma dyal dial diyal li lli f fi w wa o ou had hada hadi hadou
+ma machi mashi gha ghir ghi kan kant kayn kayna kaynin wach wash bach 3la 3lih 3liha m3a ila ida
+walakin daba db hna tma chi shi kolchi kolshi ya rah raha rahom bla
+في من على و ما لا هذا هذه هاد هادي ديال اللي الي يا مع عن إلى الى كل غير هو هي انا أنا راه ولا او أو
+""".split())
+
+# Bruit propre aux commentaires YouTube
+STOPWORDS_NOISE = frozenset("http https www com youtube youtu be video vidéo".split())
+
+STOPWORDS = STOPWORDS_FR | STOPWORDS_EN | STOPWORDS_DARIJA | STOPWORDS_NOISE
+
+_URL = re.compile(r"https?://\S+|www\.\S+")
+_APOSTROPHE = re.compile(r"['’`]")
+_WORD = re.compile(r"[^\W_]+")
+_LAUGH = re.compile(r"^(?:h+|(?:ha)+h?|(?:ah)+a?|(?:he)+|x+d+|lo+l|mdr+|ptdr+|\d+)$")
+# Drapeaux (deux indicateurs régionaux, ex. 🇲🇦) puis emojis simples
+_EMOJI = re.compile(r"[\U0001F1E6-\U0001F1FF]{2}|[\U0001F300-\U0001FAFF\u2600-\u27BF\u2B50]")
+# Variantes, teintes de peau et liaisons : ignorées pour compter l'emoji de base
+_EMOJI_MODIFIERS = re.compile(r"[\uFE0F\u200D\U0001F3FB-\U0001F3FF]")
+
+
+def tokenize(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Mots et emojis d'un commentaire
+
+    Returns:
+        (mots sans mots-outils, emojis)
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = _URL.sub(" ", text)
+    emojis = _EMOJI.findall(_EMOJI_MODIFIERS.sub("", text))
+    words = [
+        word for word in _WORD.findall(_APOSTROPHE.sub(" ", text))
+        if len(word) > 1 and word not in STOPWORDS and not _LAUGH.match(word)
+    ]
+    return words, emojis
+
+
+class WordFrequencyIndex:
+    """Fréquences des mots et des emojis, par sentiment"""
+
+    def __init__(self, words: Optional[Dict[str, Counter]] = None, emojis: Optional[Dict[str, Counter]] = None):
+        self.words: Dict[str, Counter] = words or {sentiment: Counter() for sentiment in SENTIMENTS}
+        self.emojis: Dict[str, Counter] = emojis or {sentiment: Counter() for sentiment in SENTIMENTS}
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_results(cls, results: SentimentResults) -> 'WordFrequencyIndex':
+        """Index d'une analyse : un passage de tokenisation par texte distinct"""
+        index = cls()
+        tokens: Dict[int, Tuple[List[str], List[str]]] = {}
+        for code, sentiment in enumerate(SENTIMENTS):
+            occurrences = np.bincount(results.text_ids[results.labels == code], minlength=len(results.strings))
+            for text_id in np.flatnonzero(occurrences):
+                if text_id not in tokens:
+                    tokens[text_id] = tokenize(results.strings[text_id])
+                words, emojis = tokens[text_id]
+                times = int(occurrences[text_id])
+                for word in words:
+                    index.words[sentiment][word] += times
+                for emoji in emojis:
+                    index.emojis[sentiment][emoji] += times
+        return index
+
+    @classmethod
+    def from_comments(cls, comments: Iterable[Dict]) -> 'WordFrequencyIndex':
+        return cls.from_results(SentimentResults.from_comments(comments))
+
+    def frequencies(self, sentiment: Optional[str] = None, top: Optional[int] = None) -> Dict[str, int]:
+        """Mots les plus fréquents d'un sentiment (tous si None)"""
+        return dict(self._merged(self.words, sentiment).most_common(top))
+
+    def top_emojis(self, sentiment: Optional[str] = None, n: int = 10) -> List[Tuple[str, int]]:
+        return self._merged(self.emojis, sentiment).most_common(n)
+
+    @staticmethod
+    def _merged(counters: Dict[str, Counter], sentiment: Optional[str]) -> Counter:
+        if sentiment is not None:
+            return counters[sentiment]
+        merged = Counter()
+        for counter in counters.values():
+            merged.update(counter)
+        return merged
+
+    def fingerprint(self) -> str:
+        """Empreinte du contenu de l'index (clé du cache des images)"""
+        if self._fingerprint is None:
+            digest = hashlib.md5()
+            for sentiment in SENTIMENTS:
+                for word, count in sorted(self.words[sentiment].items()):
+                    digest.update(f"{sentiment}\t{word}\t{count}\n".encode('utf-8'))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def to_dict(self) -> Dict:
+        return {
+            'words': {sentiment: dict(counter) for sentiment, counter in self.words.items()},
+            'emojis': {sentiment: dict(counter) for sentiment, counter in self.emojis.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'WordFrequencyIndex':
+        return cls(
+            words={sentiment: Counter(counts) for sentiment, counts in data['words'].items()},
+            emojis={sentiment: Counter(counts) for sentiment, counts in data['emojis'].items()}
+        )
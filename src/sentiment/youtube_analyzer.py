@@ -4,30 +4,82 @@ Extrait les commentaires d'une vidéo YouTube et analyse le sentiment
 """
 
 from youtube_comment_downloader import YoutubeCommentDownloader
-from transformers import pipeline
 import re
-from typing import List, Dict, Tuple
+import threading
+import time
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import logging
 
+from .config import SentimentConfig
+from .inference import load_pipeline, model_id, run_pipeline
+from .inference_pool import InferencePool, get_shared_pool
+from .streaming import stream_classify
+from .sentiment_cache import SentimentCache, text_hash
+from .results import SentimentResults, sentiment_entries
+from .timeline import SentimentTimeline
+from .word_index import WordFrequencyIndex
+from .video_state import VideoStateStore, unseen
+from ..tracing import span, traced, set_attribute
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+NEUTRAL_DEFAULT = ('neutral', 0.5)
+PROGRESS_BATCHES = 8
+
+
 class YouTubeSentimentAnalyzer:
     """Analyseur de sentiment pour YouTube"""
     
-    def __init__(self):
-        """Initialise l'analyseur avec un modèle multilingue"""
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        config: SentimentConfig = None,
+        cache: Optional[SentimentCache] = None,
+        pool: Optional[InferencePool] = None,
+        backend: Optional[str] = None,
+        inference_slots: Optional[int] = None
+    ):
+        """
+        Initialise l'analyseur avec un modèle multilingue
+        
+        Args:
+            batch_size: Commentaires par passe du modèle (défaut: SentimentConfig.BATCH_SIZE)
+            config: Configuration (défaut: SentimentConfig)
+            cache: Cache des sentiments (défaut: CACHE_DB si CACHE_ENABLED)
+            pool: Workers d'inférence (défaut: pool partagé si POOL_WORKERS > 0)
+            backend: "float32" ou "int8" quantifié, plus rapide sur CPU (défaut: SentimentConfig.BACKEND)
+            inference_slots: Passes du modèle simultanées, toutes analyses confondues
+                (défaut: SentimentConfig.INFERENCE_SLOTS, sinon max(STREAM_WORKERS, workers du pool))
+        """
         logger.info("🔄 Initialisation du modèle de sentiment...")
         
-        # Modèle plus précis pour l'analyse de sentiment (FR/EN/AR)
-        # cardiffnlp/twitter-xlm-roberta-base-sentiment est plus précis que nlptown
-        self.sentiment_analyzer = pipeline(
-            "sentiment-analysis",
-            model="cardiffnlp/twitter-xlm-roberta-base-sentiment-multilingual",
-            truncation=True,
-            max_length=512
+        self.config = config or SentimentConfig
+        self.batch_size = batch_size or self.config.BATCH_SIZE
+        self.backend = pool.backend if pool else (backend or self.config.BACKEND)
+        
+        # Avec un pool, le modèle est chargé dans les workers et non ici
+        if pool is None and self.config.POOL_WORKERS > 0:
+            pool = get_shared_pool(self.config, self.backend)
+        self.pool = pool
+        self.sentiment_analyzer = None if pool else load_pipeline(self.config, self.backend)
+        
+        if cache is None and self.config.CACHE_ENABLED:
+            cache = SentimentCache(self.config.CACHE_DB, model_id=model_id(self.config, self.backend))
+        self.cache = cache
+        
+        # Plusieurs analyses simultanées (job_queue.py) se partagent le modèle
+        inference_slots = inference_slots or self.config.INFERENCE_SLOTS or max(
+            self.config.STREAM_WORKERS, pool.workers if pool else 1
         )
+        self._inference_slots = threading.BoundedSemaphore(inference_slots)
+        
+        # Compteurs de l'analyse en cours (doublons, cache, inférence)
+        self._counts_lock = threading.Lock()
+        self._run_counts = self._new_run_counts()
         
         logger.info("✅ Modèle de sentiment initialisé")
     
@@ -54,51 +106,68 @@ class YouTubeSentimentAnalyzer:
         
         raise ValueError("URL YouTube invalide")
     
-    def download_comments(self, video_id: str, max_comments: int = 500) -> List[Dict]:
+    def iter_comments(self, video_id: str, max_comments: Optional[int] = 500) -> Iterator[Dict]:
         """
-        Télécharge les commentaires d'une vidéo YouTube
+        Récupère les commentaires d'une vidéo YouTube au fil du téléchargement
+        (du plus récent au plus ancien)
         
         Args:
             video_id: ID de la vidéo YouTube
-            max_comments: Nombre maximum de commentaires à récupérer
+            max_comments: Nombre maximum de commentaires à récupérer (None: sans limite)
             
-        Returns:
-            Liste de dictionnaires avec les commentaires
+        Yields:
+            Dictionnaires {cid, text, author, likes, time, time_parsed}
         """
-        logger.info(f"📥 Téléchargement des commentaires (max: {max_comments})...")
+        logger.info(f"📥 Téléchargement des commentaires (max: {max_comments or '∞'})...")
         
         downloader = YoutubeCommentDownloader()
-        comments = []
+        count = 0
         
         try:
-            for idx, comment in enumerate(downloader.get_comments_from_url(
+            for comment in downloader.get_comments_from_url(
                 f"https://www.youtube.com/watch?v={video_id}",
                 sort_by=1  # 0 = top, 1 = newest (sort_by parameter)
-            )):
-                if idx >= max_comments:
+            ):
+                if max_comments is not None and count >= max_comments:
                     break
                 
-                comments.append({
+                count += 1
+                yield {
+                    'cid': comment.get('cid'),
                     'text': comment['text'],
                     'author': comment.get('author', 'Anonyme'),
                     'likes': comment.get('votes', 0),
-                    'time': comment.get('time', '')
-                })
+                    'time': comment.get('time', ''),
+                    'time_parsed': comment.get('time_parsed')
+                }
                 
-                if (idx + 1) % 50 == 0:
-                    logger.info(f"  ⏳ {idx + 1} commentaires téléchargés...")
-            
-            logger.info(f"✅ {len(comments)} commentaires téléchargés")
+                if count % 50 == 0:
+                    logger.info(f"  ⏳ {count} commentaires téléchargés...")
             
-            # Trier par likes après téléchargement pour avoir les plus populaires
-            comments.sort(key=lambda x: x['likes'], reverse=True)
-            
-            return comments
+            logger.info(f"✅ {count} commentaires téléchargés")
             
         except Exception as e:
             logger.error(f"❌ Erreur téléchargement: {e}")
             raise
     
+    def download_comments(self, video_id: str, max_comments: int = 500) -> List[Dict]:
+        """
+        Télécharge les commentaires d'une vidéo YouTube
+        
+        Args:
+            video_id: ID de la vidéo YouTube
+            max_comments: Nombre maximum de commentaires à récupérer
+            
+        Returns:
+            Liste de dictionnaires avec les commentaires
+        """
+        comments = list(self.iter_comments(video_id, max_comments))
+        
+        # Trier par likes après téléchargement pour avoir les plus populaires
+        comments.sort(key=lambda x: x['likes'], reverse=True)
+        
+        return comments
+    
     def analyze_sentiment(self, text: str) -> Tuple[str, float]:
         """
         Analyse le sentiment d'un texte
@@ -109,25 +178,85 @@ class YouTubeSentimentAnalyzer:
         Returns:
             Tuple (sentiment, confidence) où sentiment est 'positive', 'negative' ou 'neutral'
         """
-        if not text or len(text.strip()) < 3:
-            return ('neutral', 0.5)
+        return self.classify_texts([text])[0]
+    
+    def classify_texts(self, texts: List[str], batch_size: Optional[int] = None,
+                       counts: Optional[Dict[str, int]] = None) -> List[Tuple[str, float]]:
+        """
+        Classifie une liste de textes par lots
         
-        try:
-            result = self.sentiment_analyzer(text[:512])[0]
-            label = result['label'].lower()
-            score = result['score']
-            
-            # Le modèle cardiffnlp retourne directement: positive, negative, neutral
-            if label == 'positive':
-                return ('positive', score)
-            elif label == 'negative':
-                return ('negative', score)
-            else:
-                return ('neutral', score)
-                
-        except Exception as e:
-            logger.debug(f"⚠️ Erreur analyse: {e}")
-            return ('neutral', 0.5)
+        Les textes identiques (après normalisation) ne sont classifiés qu'une
+        fois, ceux déjà présents dans le cache ne passent pas par le modèle.
+        Les autres sont triés par nombre de tokens puis envoyés au modèle par
+        lots de longueurs voisines (peu de padding). Les résultats sont remis
+        dans l'ordre d'entrée.
+        
+        Args:
+            texts: Textes à analyser
+            batch_size: Textes par passe du modèle (défaut: self.batch_size)
+            counts: Compteurs de l'analyse à incrémenter (défaut: ceux de l'analyseur)
+            
+        Returns:
+            Liste de tuples (sentiment, confidence), un par texte
+        """
+        results: List[Tuple[str, float]] = [NEUTRAL_DEFAULT] * len(texts)
+        
+        # Textes trop courts : neutres sans passer par le modèle
+        # Doublons : un seul passage par texte normalisé
+        positions: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if text and len(text.strip()) >= 3:
+                positions.setdefault(text_hash(text), []).append(i)
+        if not positions:
+            return results
+        
+        known = self.cache.get_many(positions) if self.cache is not None else {}
+        pending = [h for h in positions if h not in known]
+        predictions = self._infer([texts[positions[h][0]] for h in pending], batch_size)
+        
+        computed = [(h, p) for h, p in zip(pending, predictions) if p is not None]
+        if self.cache is not None:
+            self.cache.set_many(computed)
+        known.update(computed)
+        
+        for h, indices in positions.items():
+            for i in indices:
+                results[i] = known.get(h, NEUTRAL_DEFAULT)
+        
+        counts = self._run_counts if counts is None else counts
+        with self._counts_lock:
+            counts['texts'] += sum(len(indices) for indices in positions.values())
+            counts['unique'] += len(positions)
+            counts['cache_hits'] += len(positions) - len(pending)
+            counts['inferred'] += len(pending)
+        
+        return results
+    
+    def _infer(self, texts: List[str], batch_size: Optional[int] = None) -> List[Optional[Tuple[str, float]]]:
+        """Passe du modèle, dans le processus ou sur le pool (None pour un lot en erreur)"""
+        batch_size = batch_size or self.batch_size
+        if not texts:
+            return []
+        with self._inference_slots:
+            if self.pool:
+                return self.pool.classify(texts, batch_size)
+            return run_pipeline(self.sentiment_analyzer, texts, batch_size, self.config)
+    
+    @staticmethod
+    def _new_run_counts() -> Dict[str, int]:
+        return {'texts': 0, 'unique': 0, 'cache_hits': 0, 'inferred': 0}
+    
+    def _reset_run_counts(self):
+        with self._counts_lock:
+            self._run_counts = self._new_run_counts()
+    
+    def _run_cache_stats(self, counts: Optional[Dict[str, int]] = None) -> Dict:
+        """Doublons et cache de l'analyse en cours"""
+        with self._counts_lock:
+            counts = dict(self._run_counts if counts is None else counts)
+        counts['duplicates'] = counts['texts'] - counts['unique']
+        counts['hit_rate'] = round(counts['cache_hits'] / counts['unique'] * 100, 1) if counts['unique'] else 0.0
+        return counts
     
     def analyze_comments(self, comments: List[Dict]) -> Dict:
         """
@@ -141,48 +270,70 @@ class YouTubeSentimentAnalyzer:
         """
         logger.info(f"🔍 Analyse de {len(comments)} commentaires...")
         
-        results = {
-            'positive': [],
-            'negative': [],
-            'neutral': []
-        }
+        classified = []
         
-        for idx, comment in enumerate(comments):
-            sentiment, confidence = self.analyze_sentiment(comment['text'])
-            
-            comment_result = {
-                **comment,
-                'sentiment': sentiment,
-                'confidence': confidence
-            }
+        self._reset_run_counts()
+        
+        # Progression journalisée tous les PROGRESS_BATCHES lots
+        chunk_size = self.batch_size * PROGRESS_BATCHES
+        start = time.perf_counter()
+        for offset in range(0, len(comments), chunk_size):
+            chunk = comments[offset:offset + chunk_size]
+            predictions = self.classify_texts([comment['text'] for comment in chunk])
             
-            results[sentiment].append(comment_result)
+            for comment, (sentiment, confidence) in zip(chunk, predictions):
+                classified.append({
+                    **comment,
+                    'sentiment': sentiment,
+                    'confidence': confidence
+                })
             
-            if (idx + 1) % 50 == 0:
-                logger.info(f"  ⏳ {idx + 1}/{len(comments)} commentaires analysés...")
+            logger.info(f"  ⏳ {offset + len(chunk)}/{len(comments)} commentaires analysés...")
+        duration = time.perf_counter() - start
+        
+        return self._build_stats(SentimentResults.from_comments(classified), duration)
+    
+    def _build_stats(self, results: SentimentResults, duration: float, processed: Optional[int] = None,
+                     counts: Optional[Dict[str, int]] = None, timeline: Optional[SentimentTimeline] = None) -> Dict:
+        """
+        Statistiques par sentiment à partir des commentaires classifiés
         
-        # Statistiques
-        total = len(comments)
+        stats['results'] garde les colonnes ; stats['positive'|'negative'|'neutral']
+        donnent count et percentage, et 'comments' n'est construit qu'au premier accès.
+        
+        Args:
+            results: Commentaires classifiés (colonnes)
+            duration: Durée de l'analyse en secondes
+            processed: Commentaires classifiés pendant cette durée (défaut: tous)
+            counts: Compteurs de cache de l'analyse (défaut: ceux de l'analyseur)
+            timeline: Agrégats temporels déjà tenus à jour (défaut: calculés depuis results)
+        """
+        total = len(results)
+        processed = total if processed is None else processed
+        comments_per_s = processed / duration if duration > 0 else 0.0
         stats = {
             'total_comments': total,
-            'positive': {
-                'count': len(results['positive']),
-                'percentage': (len(results['positive']) / total * 100) if total > 0 else 0,
-                'comments': results['positive']
-            },
-            'negative': {
-                'count': len(results['negative']),
-                'percentage': (len(results['negative']) / total * 100) if total > 0 else 0,
-                'comments': results['negative']
+            **sentiment_entries(results),
+            'results': results,
+            'throughput': {
+                'duration_s': round(duration, 3),
+                'comments_per_s': round(comments_per_s, 1),
+                'batch_size': self.batch_size,
+                'backend': self.backend
             },
-            'neutral': {
-                'count': len(results['neutral']),
-                'percentage': (len(results['neutral']) / total * 100) if total > 0 else 0,
-                'comments': results['neutral']
-            }
+            'cache': self._run_cache_stats(counts)
         }
+        if timeline is None:
+            timeline = SentimentTimeline()
+            timeline.add_codes(results.times, results.labels, results.confidences)
+        stats['timeline'] = timeline.to_dict()
+        # Fréquences des mots pour les nuages de mots, calculées une fois par analyse
+        stats['words'] = WordFrequencyIndex.from_results(results)
+        if self.pool:
+            stats['pool'] = self.pool.get_stats()
         
-        logger.info("✅ Analyse terminée")
+        logger.info(f"✅ Analyse terminée ({comments_per_s:.0f} commentaires/s, "
+                    f"cache: {stats['cache']['hit_rate']:.0f}%)")
         logger.info(f"   😊 Positif: {stats['positive']['percentage']:.1f}%")
         logger.info(f"   😐 Neutre:  {stats['neutral']['percentage']:.1f}%")
         logger.info(f"   😢 Négatif: {stats['negative']['percentage']:.1f}%")
@@ -205,13 +356,28 @@ class YouTubeSentimentAnalyzer:
         sorted_comments = sorted(filtered, key=lambda x: x.get('likes', 0), reverse=True)
         return sorted_comments[:n]
     
-    def analyze_video(self, url: str, max_comments: int = 500) -> Dict:
+    @traced("sentiment.analyze_video")
+    def analyze_video(
+        self,
+        url: str,
+        max_comments: int = 500,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        incremental: bool = False
+    ) -> Dict:
         """
         Analyse complète d'une vidéo YouTube
         
+        Les commentaires sont classifiés par micro-lots pendant leur
+        téléchargement (voir streaming.py). En mode incrémental, seuls les
+        commentaires publiés depuis la dernière analyse de la vidéo sont
+        téléchargés et classifiés, puis fusionnés avec les précédents
+        (voir video_state.py).
+        
         Args:
             url: URL de la vidéo YouTube
-            max_comments: Nombre maximum de commentaires à analyser
+            max_comments: Nombre maximum de commentaires (nouveaux en mode incrémental) à analyser
+            progress_callback: Appelé avec {fetched, classified, counts, percentages, done}
+            incremental: Réutiliser l'état de la précédente analyse
             
         Returns:
             Statistiques complètes de l'analyse
@@ -220,25 +386,60 @@ class YouTubeSentimentAnalyzer:
             # Extraire l'ID de la vidéo
             video_id = self.extract_video_id(url)
             logger.info(f"🎬 Vidéo ID: {video_id}")
+            set_attribute("video_id", video_id)
+            
+            if incremental:
+                store = VideoStateStore(self.config.VIDEO_STATE_DIR)
+                state = store.load(video_id)
+                # Du plus récent au plus ancien : arrêt sur les commentaires déjà vus
+                comments = islice(
+                    unseen(self.iter_comments(video_id, None), state, self.config.STOP_AFTER_SEEN),
+                    max_comments
+                )
+            else:
+                comments = self.iter_comments(video_id, max_comments)
+            
+            # Télécharger et analyser en parallèle
+            # Compteurs propres à cette analyse (plusieurs vidéos peuvent tourner en même temps)
+            counts = self._new_run_counts()
+            start = time.perf_counter()
+            with span("sentiment.stream", max_comments=max_comments, incremental=incremental) as stream_span:
+                classified = stream_classify(
+                    comments,
+                    partial(self.classify_texts, counts=counts),
+                    micro_batch=self.batch_size,
+                    queue_size=self.config.STREAM_QUEUE_SIZE,
+                    # Avec un pool, un micro-lot en cours par worker
+                    workers=max(self.config.STREAM_WORKERS, self.pool.workers if self.pool else 0),
+                    batch_timeout=self.config.STREAM_BATCH_TIMEOUT,
+                    on_progress=progress_callback
+                )
+                stream_span.set_attribute("comments", len(classified))
+            duration = time.perf_counter() - start
             
-            # Télécharger les commentaires
-            comments = self.download_comments(video_id, max_comments)
+            if incremental:
+                # Relu et fusionné sous verrou : une analyse concurrente a pu enregistrer entre-temps
+                state, added = store.update(video_id, classified)
+                known = len(state.comments) - added
+                logger.info(f"🔁 {len(classified)} nouveaux commentaires ({known} déjà analysés)")
+            results = SentimentResults.from_comments(state.comments if incremental else classified)
             
-            if not comments:
+            stats = self._build_stats(results, duration, processed=len(classified), counts=counts,
+                                      timeline=state.timeline if incremental else None)
+            if not stats['total_comments']:
                 raise ValueError("Aucun commentaire trouvé pour cette vidéo")
             
-            # Analyser les sentiments
-            stats = self.analyze_comments(comments)
+            if incremental:
+                stats['incremental'] = {
+                    'new_comments': len(classified),
+                    'known_comments': known,
+                    'runs': state.runs,
+                    'latest_time': state.latest_time
+                }
             
             # Ajouter les top commentaires
-            all_comments = (
-                stats['positive']['comments'] +
-                stats['negative']['comments'] +
-                stats['neutral']['comments']
-            )
-            
-            stats['top_positive'] = self.get_top_comments(all_comments, 'positive', 5)
-            stats['top_negative'] = self.get_top_comments(all_comments, 'negative', 5)
+            stats['top_positive'] = results.top('positive', 5)
+            stats['top_negative'] = results.top('negative', 5)
             
             stats['video_url'] = url
             stats['video_id'] = video_id
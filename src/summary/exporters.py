@@ -17,6 +17,8 @@ import io
 import os
 import logging
 
+from ..tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +59,7 @@ class PDFExporter:
             fontName='Helvetica'
         )
     
+    @traced("export.pdf")
     def export_single_summary(self, summary: Dict, filepath: str):
         """
         Exporte un résumé unique en PDF
@@ -116,6 +119,7 @@ class PDFExporter:
             logger.error(f"❌ Erreur création PDF: {e}")
             raise
     
+    @traced("export.pdf_digest")
     def export_multiple_summaries(self, summaries: List[Dict], filepath: str, title: str = "Résumés de Matchs"):
         """
         Exporte plusieurs résumés en un seul PDF
@@ -195,6 +199,7 @@ class ImageExporter:
         self.white = (255, 255, 255)
         self.light_gray = (245, 245, 245)
     
+    @traced("export.social_card")
     def create_social_card(self, summary: Dict, filepath: str, size: tuple = (1080, 1080)):
         """
         Crée une carte visuelle 1080x1080 pour Instagram/Facebook
@@ -305,6 +310,7 @@ class ImageExporter:
             logger.error(f"❌ Erreur création carte: {e}")
             raise
     
+    @traced("export.story_card")
     def create_story_card(self, summary: Dict, filepath: str):
         """
         Crée une carte verticale 1080x1920 pour Instagram Stories
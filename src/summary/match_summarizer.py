@@ -11,6 +11,8 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import logging
 
+from ..tracing import span, traced, set_attribute
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -71,6 +73,7 @@ class MatchSummarizer:
         
         return info
     
+    @traced("summary.generate")
     def generate_summary(
         self,
         text: str,
@@ -137,22 +140,31 @@ CONTRAINTE: Maximum {max_words} mots au total."""
         try:
             logger.info(f"🔄 Génération du résumé ({length}, {language})...")
             
+            set_attribute("length", length)
+            set_attribute("language", language)
+            set_attribute("text_chars", len(text))
+            
             # Appel à Groq
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Tu es un expert en résumé de matchs de football. Tu génères des résumés structurés, précis et concis."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=800,
-            )
+            with span("summary.groq", model=self.model) as groq_span:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Tu es un expert en résumé de matchs de football. Tu génères des résumés structurés, précis et concis."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.3,
+                    max_tokens=800,
+                )
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    groq_span.set_attributes(prompt_tokens=usage.prompt_tokens,
+                                             completion_tokens=usage.completion_tokens)
             
             summary_text = response.choices[0].message.content
             
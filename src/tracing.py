@@ -0,0 +1,276 @@
+"""
+Traçage structuré des requêtes : spans imbriqués, identifiants de trace, puits JSONL
+
+Un span mesure une opération (durée, attributs, erreur). Les spans ouverts
+pendant un autre span en deviennent les enfants et partagent son trace_id,
+propagé par contextvars (sûr entre threads et tâches asyncio). Quand le span
+racine se termine, toute la trace est écrite d'un bloc dans le fichier JSONL :
+
+    with span("chatbot.ask", question_chars=len(question)) as s:
+        with span("chatbot.search"):
+            ...
+        s.set_attribute("num_sources", 5)
+
+    @traced("export.pdf")
+    def export_single_summary(...): ...
+
+Variables d'environnement :
+- TRACING_ENABLED=1 active l'écriture (sinon les spans mesurent seulement la durée)
+- TRACE_FILE : fichier JSONL (défaut: data/logs/traces.jsonl)
+
+Usage:
+    TRACING_ENABLED=1 streamlit run src/app.py
+    python -m src.tracing summary [--file F] [--prefix chatbot.] [--since 2025-12-21]
+    python -m src.tracing show TRACE_ID
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE = Path(os.getenv("TRACE_FILE", Path(__file__).parent.parent / "data" / "logs" / "traces.jsonl"))
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_write_lock = threading.Lock()
+
+
+class Span:
+    """Opération mesurée d'une trace"""
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.started_at = datetime.now().isoformat()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        # Spans terminés de la trace, écrits quand la racine se termine
+        self._finished: List[Dict[str, Any]] = parent._finished if parent else []
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self._finished.append(self.to_dict())
+        if self.parent is None:
+            _write_trace(self._finished)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent.span_id if self.parent else None,
+            'name': self.name,
+            'started_at': self.started_at,
+            'duration_ms': self.duration_ms,
+            'status': 'error' if self.error else 'ok',
+            'error': self.error,
+            'attributes': self.attributes
+        }
+
+
+class span:
+    """
+    Ouvrir un span (gestionnaire de contexte) ou tracer une fonction (décorateur)
+
+    Args:
+        name: Nom de l'opération (ex: "chatbot.search")
+        **attributes: Attributs initiaux (nombres, chaînes, booléens)
+    """
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self._tokens = []
+
+    def __enter__(self) -> Span:
+        current = Span(self.name, parent=_current_span.get(), attributes=self.attributes)
+        self._tokens.append((_current_span.set(current), current))
+        return current
+
+    def __exit__(self, exc_type, exc, tb):
+        token, current = self._tokens.pop()
+        _current_span.reset(token)
+        current.finish(exc)
+        return False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(self.name, **self.attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def traced(name: Optional[str] = None, **attributes):
+    """Décorateur : un span par appel (nom par défaut : module.fonction)"""
+    def decorator(func):
+        return span(name or f"{func.__module__}.{func.__qualname__}", **attributes)(func)
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Identifiant de la trace en cours (pour corréler les logs)"""
+    current = _current_span.get()
+    return current.trace_id if current else None
+
+
+def set_attribute(key: str, value: Any):
+    """Ajouter un attribut au span en cours (sans effet hors trace)"""
+    current = _current_span.get()
+    if current is not None:
+        current.set_attribute(key, value)
+
+
+def _write_trace(spans: List[Dict[str, Any]]):
+    if not TRACING_ENABLED:
+        return
+    lines = "".join(json.dumps(s, ensure_ascii=False, default=str) + "\n" for s in spans)
+    try:
+        with _write_lock:
+            TRACE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(TRACE_FILE, 'a', encoding='utf-8') as f:
+                f.write(lines)
+    except OSError as e:
+        logger.warning(f"⚠️ Trace non écrite : {e}")
+
+
+def iter_spans(path: Path = None) -> Iterator[Dict[str, Any]]:
+    """Spans du fichier JSONL (lignes invalides ignorées)"""
+    path = Path(path or TRACE_FILE)
+    if not path.exists():
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 2)
+
+
+def summarize(spans: Iterator[Dict[str, Any]], prefix: str = "", since: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Latences par nom de span
+
+    Returns:
+        {nom: {count, errors, p50, p95, p99, max, total_ms}}
+    """
+    durations: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for s in spans:
+        if not s['name'].startswith(prefix) or (since and s['started_at'] < since):
+            continue
+        durations.setdefault(s['name'], []).append(s['duration_ms'])
+        errors[s['name']] = errors.get(s['name'], 0) + (s['status'] == 'error')
+
+    stats = {}
+    for name, values in durations.items():
+        ordered = sorted(values)
+        stats[name] = {
+            'count': len(ordered),
+            'errors': errors[name],
+            'p50': _percentile(ordered, 0.50),
+            'p95': _percentile(ordered, 0.95),
+            'p99': _percentile(ordered, 0.99),
+            'max': round(ordered[-1], 2),
+            'total_ms': round(sum(ordered), 2)
+        }
+    return stats
+
+
+def format_summary(stats: Dict[str, Dict[str, Any]]) -> str:
+    """Tableau des latences, trié par temps cumulé décroissant"""
+    lines = [
+        f"{'Span':<34}{'Appels':>8}{'Erreurs':>9}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}{'max (ms)':>11}",
+        "-" * 95
+    ]
+    for name, s in sorted(stats.items(), key=lambda item: -item[1]['total_ms']):
+        lines.append(
+            f"{name:<34}{s['count']:>8}{s['errors']:>9}{s['p50']:>11}{s['p95']:>11}{s['p99']:>11}{s['max']:>11}"
+        )
+    return "\n".join(lines)
+
+
+def format_trace(spans: List[Dict[str, Any]]) -> str:
+    """Arbre des spans d'une trace"""
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        children.setdefault(s['parent_id'], []).append(s)
+
+    lines = []
+
+    def walk(parent_id, depth):
+        for s in sorted(children.get(parent_id, []), key=lambda s: s['started_at']):
+            status = "❌" if s['status'] == 'error' else "✓"
+            attrs = ", ".join(f"{k}={v}" for k, v in s['attributes'].items())
+            lines.append(f"{'  ' * depth}{status} {s['name']} {s['duration_ms']:.1f} ms" + (f"  [{attrs}]" if attrs else ""))
+            if s['error']:
+                lines.append(f"{'  ' * (depth + 1)}{s['error']}")
+            walk(s['span_id'], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def main():
+    """Résumé des latences par span ou détail d'une trace"""
+    parser = argparse.ArgumentParser(description="Analyse des traces CAN 2025")
+    parser.add_argument('--file', type=Path, default=TRACE_FILE, help="Fichier JSONL des traces")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    summary_parser = subparsers.add_parser('summary', help="Percentiles de latence par nom de span")
+    summary_parser.add_argument('--prefix', default="", help="Filtrer par préfixe (ex: chatbot.)")
+    summary_parser.add_argument('--since', default=None, help="Date ISO minimale (ex: 2025-12-21)")
+
+    show_parser = subparsers.add_parser('show', help="Arbre des spans d'une trace")
+    show_parser.add_argument('trace_id')
+
+    args = parser.parse_args()
+
+    if args.command == 'summary':
+        stats = summarize(iter_spans(args.file), prefix=args.prefix, since=args.since)
+        if not stats:
+            print(f"⚠️ Aucun span dans {args.file}")
+            return
+        print(format_summary(stats))
+    else:
+        spans = [s for s in iter_spans(args.file) if s['trace_id'].startswith(args.trace_id)]
+        if not spans:
+            print(f"⚠️ Trace introuvable : {args.trace_id}")
+            return
+        print(f"🔎 Trace {spans[0]['trace_id']} ({len(spans)} spans)\n")
+        print(format_trace(spans))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Fixtures partagées des tests
+"""
+
+import random
+
+import pytest
+
+COMMENT_TEXTS = ["Dima Maroc 🇲🇦", "quel match !", "arbitre nul", "bravo les lions"]
+
+
+@pytest.fixture
+def make_comments():
+    """Fixture: Fabrique de commentaires classifiés reproductibles (même graine, mêmes commentaires)"""
+    def make(n, seed=0, texts=COMMENT_TEXTS, start=1_700_000_040):
+        # 4 textes, 7 auteurs et une date affichée : chaînes répétées d'un commentaire à l'autre
+        rng = random.Random(seed)
+        return [
+            {'cid': f"c{i}", 'text': rng.choice(texts), 'author': f"@fan{i % 7}", 'likes': rng.randint(0, 50),
+             'time': "il y a 2 minutes", 'time_parsed': float(start + rng.randint(0, 3600)),
+             'sentiment': rng.choice(['positive', 'negative', 'neutral']), 'confidence': round(rng.random(), 3)}
+            for i in range(n)
+        ]
+    return make
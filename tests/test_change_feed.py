@@ -0,0 +1,55 @@
+"""
+Tests unitaires pour le flux de changements (CDC)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.change_feed import ChangeFeed, FeedCursor, FeedGapError, diff_hashes
+
+
+class TestChangeFeed:
+    """Tests du journal de changements"""
+
+    @pytest.fixture
+    def feed(self, tmp_path):
+        """Fixture: Flux vide avec une petite rétention"""
+        return ChangeFeed(tmp_path / "feed.jsonl", retention=3)
+
+    def test_append_and_read_after_cursor(self, feed):
+        """Test: Lecture des seuls événements postérieurs au curseur"""
+        feed.append([{"op": "upsert", "id": "a", "hash": "h1"}], source="transform")
+        feed.append([{"op": "delete", "id": "b"}, {"op": "upsert", "id": "c", "hash": "h2"}], source="enrich")
+
+        assert feed.head == 3
+        events = list(feed.read(after=1))
+        assert [e['id'] for e in events] == ["b", "c"]
+        assert events[0]['source'] == "enrich"
+        assert list(feed.read(after=3)) == []
+
+    def test_truncate_and_gap(self, feed):
+        """Test: Un curseur antérieur à la troncature est détecté"""
+        feed.append(({"op": "upsert", "id": str(i), "hash": "h"} for i in range(7)), source="transform")
+
+        assert feed.head == 4 + 3  # seq continue après troncature
+        with pytest.raises(FeedGapError):
+            list(feed.read(after=0))
+        assert [e['seq'] for e in feed.read(after=4)] == [5, 6, 7]
+
+    def test_cursor(self, tmp_path):
+        """Test: Le curseur persiste sa position"""
+        cursor = FeedCursor(tmp_path / "cursor.json")
+        assert cursor.position is None
+        cursor.commit(12)
+        assert FeedCursor(tmp_path / "cursor.json").position == 12
+
+
+def test_diff_hashes():
+    """Test: Ajouts, modifications et suppressions entre deux états"""
+    events = diff_hashes({"a": "1", "b": "2", "c": "3"}, {"a": "1", "b": "20", "d": "4"})
+
+    assert {(e['op'], e['id']) for e in events} == {("upsert", "b"), ("upsert", "d"), ("delete", "c")}
@@ -0,0 +1,134 @@
+"""
+Tests unitaires pour le démon du pipeline
+"""
+
+import json
+import os
+import pytest
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.config import DAEMON_MATCH_INTERVAL, DAEMON_IDLE_INTERVAL, DAEMON_MAX_BACKOFF
+from src.pipeline.daemon import MatchSchedule, PipelineDaemon, RunLock
+
+
+class TestRunLock:
+    """Tests du verrou fichier"""
+
+    def test_second_holder_rejected(self, tmp_path):
+        """Test: Le verrou O_EXCL refuse un second détenteur jusqu'à sa libération"""
+        first, second = RunLock(tmp_path / "daemon.lock"), RunLock(tmp_path / "daemon.lock")
+
+        assert first.acquire()
+        assert not second.acquire()
+        first.release()
+        assert second.acquire()
+        second.release()
+        assert not (tmp_path / "daemon.lock").exists()
+
+    def test_stale_lock_taken_over(self, tmp_path):
+        """Test: Un verrou abandonné plus vieux que stale_after est repris"""
+        path = tmp_path / "daemon.lock"
+        path.write_text('{"pid": 0}', encoding='utf-8')
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        assert not RunLock(path, stale_after=3600).acquire()
+        lock = RunLock(path, stale_after=60)
+        assert lock.acquire()
+        assert json.loads(path.read_text(encoding='utf-8'))['pid'] == os.getpid()
+        lock.release()
+
+    def test_heartbeat_keeps_long_run_locked(self, tmp_path):
+        """Test: Un détenteur actif plus long que stale_after garde son verrou"""
+        holder = RunLock(tmp_path / "daemon.lock", stale_after=0.2)
+        assert holder.acquire()
+        time.sleep(0.5)
+
+        assert not RunLock(tmp_path / "daemon.lock", stale_after=0.2).acquire()
+        holder.release()
+        assert not (tmp_path / "daemon.lock").exists()
+
+
+class TestAutoPipelineLock:
+    """Tests du verrou partagé entre l'application et le démon"""
+
+    def test_ensure_ready_waits_for_daemon_cycle(self, tmp_path):
+        """Test: ensure_ready ne lance pas le DAG tant qu'un cycle du démon détient le verrou"""
+        from src.pipeline.auto_pipeline import AutoPipeline
+
+        runs = []
+        pipeline = AutoPipeline()
+        pipeline.dag = SimpleNamespace(run=lambda **_: runs.append(1) or {'success': True, 'stages': {}},
+                                       stages={})
+        pipeline.lock = RunLock(tmp_path / "daemon.lock")
+        pipeline.lock_timeout = 0.2
+        daemon_cycle = RunLock(tmp_path / "daemon.lock")
+        assert daemon_cycle.acquire()
+
+        assert pipeline.ensure_ready() == (False, "Pipeline déjà en cours d'exécution par un autre processus")
+        assert runs == []
+
+        daemon_cycle.release()
+        assert pipeline.ensure_ready() == (True, "Données prêtes")
+        assert runs == [1]
+        assert not (tmp_path / "daemon.lock").exists()
+
+
+class TestMatchSchedule:
+    """Tests du calendrier des matchs"""
+
+    def test_interval_follows_match_window(self, tmp_path):
+        """Test: Intervalle court autour d'un coup d'envoi, long sinon"""
+        schedule_file = tmp_path / "match_schedule.json"
+        schedule_file.write_text(json.dumps({"matches": [{"kickoff": "2026-01-18T20:00:00"}]}), encoding='utf-8')
+        daemon = PipelineDaemon(pipeline=SimpleNamespace(), schedule=MatchSchedule(schedule_file),
+                                run_log=tmp_path / "runs.jsonl", state_file=tmp_path / "state.json")
+
+        assert daemon.next_interval(datetime(2026, 1, 18, 21, 0)) == DAEMON_MATCH_INTERVAL
+        assert daemon.next_interval(datetime(2026, 1, 18, 10, 0)) == DAEMON_IDLE_INTERVAL
+
+
+class TestPipelineDaemon:
+    """Tests du cycle et du backoff"""
+
+    @pytest.fixture
+    def daemon(self, tmp_path):
+        """Fixture: Démon sur un pipeline factice, hors période de match"""
+        dag = SimpleNamespace(run=lambda: {'success': True, 'stages': {}, 'failed_stage': None})
+        pipeline = SimpleNamespace(dag=dag, config=SimpleNamespace(DOCUMENT_STORE_DIR=tmp_path / "store"))
+        schedule = MatchSchedule(tmp_path / "no_schedule.json")
+        schedule.is_match_time = lambda now=None: False
+        daemon = PipelineDaemon(pipeline=pipeline, schedule=schedule,
+                                run_log=tmp_path / "runs.jsonl", state_file=tmp_path / "state.json")
+        daemon.lock = RunLock(tmp_path / "daemon.lock")
+        return daemon
+
+    def test_backoff_grows_then_resets(self, daemon):
+        """Test: Le délai double à chaque fetch en échec puis revient à la normale"""
+        daemon.fetch = lambda: {'articles': 0, 'new_file': False, 'fallback_used': True}
+        intervals = []
+        for _ in range(3):
+            assert daemon.run_once()['status'] == 'degraded'
+            intervals.append(daemon.next_interval())
+        assert intervals == [min(DAEMON_IDLE_INTERVAL * 2 ** n, DAEMON_MAX_BACKOFF) for n in (1, 2, 3)]
+
+        daemon.fetch = lambda: {'articles': 5, 'new_file': True, 'fallback_used': False}
+        assert daemon.run_once()['status'] == 'success'
+        assert daemon.next_interval() == DAEMON_IDLE_INTERVAL
+        assert daemon.state['consecutive_failures'] == 0
+
+    def test_cycle_skipped_while_locked(self, daemon, tmp_path):
+        """Test: Un cycle est ignoré si un autre détient le verrou"""
+        daemon.fetch = lambda: pytest.fail("fetch ne doit pas être appelé")
+        holder = RunLock(tmp_path / "daemon.lock")
+        assert holder.acquire()
+
+        assert daemon.run_once()['status'] == 'skipped_locked'
+        holder.release()
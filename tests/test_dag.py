@@ -0,0 +1,109 @@
+"""
+Tests unitaires pour l'exécuteur DAG du pipeline
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.dag import PipelineDAG, PipelineStage
+
+
+class TestPipelineDAG:
+    """Tests du saut des étapes à jour"""
+
+    @pytest.fixture
+    def pipeline(self, tmp_path):
+        """Fixture: DAG transform → index sur des fichiers de tmp_path"""
+        raw = tmp_path / "raw.json"
+        raw.write_text('{"articles": []}', encoding='utf-8')
+        store = tmp_path / "store.json"
+        index = tmp_path / "index.json"
+        calls = []
+
+        def stage(name, output):
+            def run():
+                calls.append(name)
+                output.write_text(name, encoding='utf-8')
+                return True
+            return run
+
+        def build():
+            dag = PipelineDAG(tmp_path / "state.json")
+            dag.add_stage(PipelineStage("transform", stage("transform", store), inputs=[raw], outputs=[store]))
+            dag.add_stage(PipelineStage("index", stage("index", index), inputs=[store], outputs=[index],
+                                        depends_on=["transform"]))
+            return dag
+
+        build().run()
+        calls.clear()
+        return build, raw, index, calls
+
+    def test_up_to_date_stages_skipped(self, pipeline):
+        """Test: Un second run sans changement ne relance rien (état relu depuis le disque)"""
+        build, _, _, calls = pipeline
+        report = build().run()
+
+        assert calls == []
+        assert {name: s['status'] for name, s in report['stages'].items()} == {'transform': 'skipped', 'index': 'skipped'}
+
+    @pytest.mark.parametrize("change", ["mtime", "size"])
+    def test_changed_input_reruns_downstream(self, pipeline, change):
+        """Test: Une entrée modifiée (mtime ou taille) relance l'étape et ses étapes aval"""
+        build, raw, _, calls = pipeline
+        if change == "mtime":
+            stat = raw.stat()
+            os.utime(raw, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        else:
+            raw.write_text('{"articles": [1]}', encoding='utf-8')
+
+        report = build().run()
+
+        assert calls == ["transform", "index"]
+        assert report['stages']['transform']['reason'] == "entrées modifiées"
+
+    def test_missing_output_reruns_stage(self, pipeline):
+        """Test: Une sortie supprimée relance l'étape même si ses entrées n'ont pas changé"""
+        build, _, index, calls = pipeline
+        index.unlink()
+
+        report = build().run()
+
+        assert calls == ["index"]
+        assert report['stages']['index']['reason'].startswith("sortie manquante")
+
+    def test_force_runs_everything(self, pipeline):
+        """Test: force=True relance toutes les étapes"""
+        build, _, _, calls = pipeline
+        report = build().run(force=True)
+
+        assert calls == ["transform", "index"]
+        assert all(s['status'] == 'ran' for s in report['stages'].values())
+
+    def test_rerun_stage_and_downstream(self, pipeline):
+        """Test: Une étape à relancer tourne même à jour, suivie de ses étapes aval"""
+        build, _, _, calls = pipeline
+        report = build().run(rerun=["transform"])
+
+        assert calls == ["transform", "index"]
+        assert report['stages']['transform']['reason'] == "relance demandée"
+
+    def test_any_of_outputs(self, tmp_path):
+        """Test: Une liste de sorties est présente si l'une des alternatives l'est"""
+        raw = tmp_path / "raw"
+        (raw / "date=2026-01-05" / "source=caf").mkdir(parents=True)
+        (raw / "date=2026-01-05" / "source=caf" / "part-00000.jsonl").write_text("{}\n", encoding='utf-8')
+        calls = []
+
+        dag = PipelineDAG(tmp_path / "state.json")
+        dag.add_stage(PipelineStage(
+            "extract", lambda: calls.append("extract") or True,
+            outputs=[[(raw, "*.json"), (raw, "date=*/source=*/part-*.jsonl")]]
+        ))
+
+        assert dag.run()['stages']['extract']['status'] == 'skipped'
+        assert calls == []
@@ -0,0 +1,56 @@
+"""
+Tests unitaires pour la détection de quasi-doublons (MinHash/LSH)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.dedup import NearDuplicateDetector
+
+
+BASE_TEXT = (
+    "Le Maroc a battu les Comores deux buts à zéro au stade Prince Moulay Abdellah "
+    "de Rabat lors du match d'ouverture de la Coupe d'Afrique des Nations 2025. "
+    "Brahim Díaz a ouvert le score avant qu'Ayoub El Kaabi ne double la mise "
+    "devant plus de soixante mille supporters venus encourager les Lions de l'Atlas."
+)
+
+
+class TestNearDuplicateDetector:
+    """Tests du détecteur MinHash/LSH"""
+
+    @pytest.fixture
+    def detector(self, tmp_path):
+        """Fixture: Créer un détecteur avec état persistant"""
+        return NearDuplicateDetector(state_file=tmp_path / "signatures.json")
+
+    def test_near_duplicate_detected(self, detector):
+        """Test: Une version légèrement modifiée est un doublon de la première"""
+        assert detector.check("new", BASE_TEXT) is None
+        assert detector.check("old", BASE_TEXT.replace("soixante", "60")) == "new"
+
+    def test_different_documents_kept(self, detector):
+        """Test: Des textes différents ne sont pas regroupés"""
+        assert detector.check("a", BASE_TEXT) is None
+        assert detector.check("b", "Mohamed Salah offre la victoire à l'Égypte contre le Zimbabwe à Agadir") is None
+
+    def test_dedup_ratio(self, detector):
+        """Test: Le ratio de dédoublonnage est rapporté"""
+        detector.check("a", BASE_TEXT)
+        detector.check("b", BASE_TEXT)
+        stats = detector.get_stats()
+        assert stats['duplicates_removed'] == 1
+        assert stats['dedup_ratio'] == 0.5
+
+    def test_signatures_persisted(self, detector, tmp_path):
+        """Test: Les signatures sont réutilisées au run suivant"""
+        detector.check("a", BASE_TEXT)
+        detector.save()
+
+        next_run = NearDuplicateDetector(state_file=tmp_path / "signatures.json")
+        next_run.check("a", BASE_TEXT)
+        assert next_run.get_stats()['signature_cache_hits'] == 1
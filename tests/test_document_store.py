@@ -0,0 +1,115 @@
+"""
+Tests unitaires pour le store documentaire JSONL
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.document_store import DocumentStore, document_id
+
+
+def make_doc(doc_id, text="Texte", category="news"):
+    return {"id": doc_id, "text": text, "metadata": {"category": category}}
+
+
+class TestDocumentStore:
+    """Tests du store JSONL"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Fixture: Créer un store vide avec de petits shards"""
+        return DocumentStore(tmp_path / "store", shard_size=3)
+
+    def test_append_and_iterate(self, store):
+        """Test: Les documents ajoutés sont itérés dans l'ordre"""
+        written = store.append(make_doc(f"doc_{i}") for i in range(7))
+
+        assert written == 7
+        assert len(store) == 7
+        assert [d['id'] for d in store.iter_documents()] == [f"doc_{i}" for i in range(7)]
+        assert len(store.header['shards']) == 3
+
+    def test_random_access(self, store):
+        """Test: Accès direct par ID, y compris après réouverture"""
+        store.append(make_doc(f"doc_{i}", text=f"Texte {i}") for i in range(5))
+
+        reopened = DocumentStore(store.root)
+        assert reopened.get("doc_4")['text'] == "Texte 4"
+        assert reopened.get("absent") is None
+        assert "doc_2" in reopened
+
+    def test_upsert_and_delete(self, store):
+        """Test: Le dernier enregistrement gagne et les suppressions sont masquées"""
+        store.append([make_doc("a"), make_doc("b"), make_doc("c")])
+        store.append([make_doc("b", text="Nouveau texte")])
+        store.delete(["c"])
+
+        docs = {d['id']: d for d in store.iter_documents()}
+        assert set(docs) == {"a", "b"}
+        assert docs["b"]['text'] == "Nouveau texte"
+        assert len(store) == 2
+
+    def test_delete_duplicate_ids(self, store):
+        """Test: Un ID répété n'est supprimé qu'une fois"""
+        store.append([make_doc("a"), make_doc("b")])
+
+        assert store.delete(["a", "a", "absent", "a"]) == 1
+        assert len(store) == 1
+        assert len(DocumentStore(store.root)) == 1
+        assert [d['id'] for d in store.iter_documents()] == ["b"]
+
+    def test_unchanged_document_is_skipped(self, store):
+        """Test: Un document identique n'est pas réécrit"""
+        store.append([make_doc("a")])
+        assert store.append([make_doc("a")]) == 0
+        assert store.header['dead_records'] == 0
+
+    def test_compact(self, store):
+        """Test: La compaction ne garde que les documents vivants"""
+        store.append(make_doc(f"doc_{i}") for i in range(4))
+        store.append([make_doc("doc_0", text="v2")])
+        store.delete(["doc_1"])
+
+        removed = store.compact()
+
+        assert removed > 0
+        assert store.header['dead_records'] == 0
+        assert [d['id'] for d in store.iter_documents()] == ["doc_2", "doc_3", "doc_0"]
+        assert store.get("doc_0")['text'] == "v2"
+
+    def test_migration_from_json(self, tmp_path):
+        """Test: Migration de l'ancien combined_dataset.json"""
+        legacy = tmp_path / "combined_dataset.json"
+        legacy.write_text(json.dumps({
+            "metadata": {"description": "test"},
+            "documents": [
+                {"text": "Article sans ID", "metadata": {"id": "", "category": "news"}},
+                make_doc("joueur_001")
+            ]
+        }), encoding='utf-8')
+
+        store = DocumentStore.open(tmp_path / "store", legacy_json=legacy)
+
+        assert len(store) == 2
+        assert store.metadata['description'] == "test"
+        assert store.get("joueur_001") is not None
+
+
+class TestDocumentId:
+    """Tests de l'identifiant des documents"""
+
+    def test_id_locations(self):
+        """Test: L'ID est lu à la racine ou dans les métadonnées"""
+        assert document_id({"id": "x"}) == "x"
+        assert document_id({"metadata": {"id": "y"}}) == "y"
+
+    def test_fallback_id_is_stable(self):
+        """Test: Sans ID, l'identifiant dépend uniquement du texte"""
+        doc = {"text": "Même texte", "metadata": {"id": ""}}
+        assert document_id(doc) == document_id(dict(doc))
+        assert document_id(doc).startswith("doc_")
@@ -0,0 +1,103 @@
+"""
+Tests unitaires pour le journal des deltas d'enrichissement
+"""
+
+import time
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.document_store import DocumentStore
+from src.pipeline.enrichment_journal import EnrichmentJournal
+
+
+def make_doc(doc_id, text):
+    return {"id": doc_id, "text": text, "metadata": {"category": "historique"}}
+
+
+def apply(store, journal, changes):
+    """Écrire les changements dans le journal puis dans le store"""
+    journal.record(changes)
+    store.append(c['doc'] for c in changes if c['op'] != 'remove')
+    store.delete(c['id'] for c in changes if c['op'] == 'remove')
+
+
+def checkpoint():
+    """Horodatage strictement entre deux runs"""
+    time.sleep(0.01)
+    ts = datetime.now()
+    time.sleep(0.01)
+    return ts
+
+
+def texts(store):
+    return {doc['id']: doc['text'] for doc in store.iter_documents()}
+
+
+class TestEnrichmentJournal:
+    """Tests du journal append-only"""
+
+    @pytest.fixture
+    def env(self, tmp_path):
+        """Fixture: Store avec un document antérieur au journal"""
+        store = DocumentStore(tmp_path / "store")
+        store.append([make_doc("base", "v0")])
+        return store, EnrichmentJournal(tmp_path / "journal")
+
+    def test_restore_replays_journal(self, env):
+        """Test: Restauration à plusieurs dates successives"""
+        store, journal = env
+        before = checkpoint()
+        apply(store, journal, [
+            {'op': 'add', 'id': 'a', 'doc': make_doc("a", "1")},
+            {'op': 'change', 'id': 'base', 'doc': make_doc("base", "v1"), 'prev': make_doc("base", "v0")}
+        ])
+        middle = checkpoint()
+        apply(store, journal, [{'op': 'remove', 'id': 'a'}])
+
+        journal.restore(store, middle)
+        assert texts(store) == {"a": "1", "base": "v1"}
+
+        journal.restore(store, before)
+        assert texts(store) == {"base": "v0"}
+
+    def test_tracked_ids(self, env):
+        """Test: Les IDs supprimés restent connus du journal"""
+        store, journal = env
+        apply(store, journal, [{'op': 'add', 'id': 'a', 'doc': make_doc("a", "1")}])
+        apply(store, journal, [{'op': 'remove', 'id': 'a'}])
+
+        assert journal.tracked_ids() == {"a": False}
+        assert len(journal) == 2
+
+    def test_compaction(self, env):
+        """Test: La compaction fusionne les entrées et fixe l'horizon de restauration"""
+        store, journal = env
+        before = checkpoint()
+        apply(store, journal, [{'op': 'change', 'id': 'base', 'doc': make_doc("base", "v1"), 'prev': make_doc("base", "v0")}])
+        apply(store, journal, [{'op': 'change', 'id': 'base', 'doc': make_doc("base", "v2")}])
+
+        assert journal.compact(datetime.now()) == 1
+        assert len(journal) == 1
+
+        with pytest.raises(ValueError):
+            journal.state_at(before)
+
+        # L'état d'origine reste connu après compaction
+        entry = next(journal.iter_entries())
+        assert entry['prev']['text'] == "v0"
+        assert entry['doc']['text'] == "v2"
+
+    def test_rewrite_of_journaled_state_not_recorded(self, env):
+        """Test: Un document réécrit à l'identique n'ajoute pas d'entrée"""
+        store, journal = env
+        apply(store, journal, [{'op': 'add', 'id': 'a', 'doc': make_doc("a", "1")}])
+        store.delete(["a"])  # document perdu hors enrichissement
+
+        assert journal.record([{'op': 'add', 'id': 'a', 'doc': make_doc("a", "1")}]) == 0
+        assert journal.record([{'op': 'change', 'id': 'a', 'doc': make_doc("a", "2")}]) == 1
+        assert len(journal) == 2
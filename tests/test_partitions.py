@@ -0,0 +1,91 @@
+"""
+Tests unitaires pour le stockage partitionné date=/source=
+"""
+
+import json
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.partitions import (
+    PartitionedDataset, source_slug, run_time, migrate_flat_files
+)
+
+
+class TestPartitionedDataset:
+    """Tests du jeu de données partitionné"""
+
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        """Fixture: Deux jours, deux sources"""
+        dataset = PartitionedDataset(tmp_path / "daily_fetch")
+        dataset.write_run([
+            {"source": "BBC Sport", "title": "a"},
+            {"source": "Wikipédia FR", "title": "b"},
+        ], datetime(2026, 1, 5, 10, 0, 0))
+        dataset.write_run([
+            {"source": "BBC Sport", "title": "c"},
+        ], datetime(2026, 1, 6, 10, 0, 0))
+        return dataset
+
+    def test_source_slug(self):
+        """Test: Noms de partitions ASCII"""
+        assert source_slug("Wikipédia FR") == "wikipedia-fr"
+        assert source_slug(None) == "unknown"
+
+    def test_prune_by_date_and_source(self, dataset):
+        """Test: Seules les partitions demandées sont lues"""
+        assert [r['title'] for r in dataset.read(start="2026-01-06")] == ["c"]
+        assert [r['title'] for r in dataset.read(sources=["Wikipédia FR"])] == ["b"]
+        assert len(dataset.files()) == 3
+
+    def test_part_numbering_and_run_time(self, dataset):
+        """Test: Un nouveau part par run, ordonné par l'heure du run"""
+        later = datetime(2026, 1, 5, 18, 0, 0)
+        path = dataset.write([{"source": "BBC Sport", "title": "d"}], later, "BBC Sport", run_at=later)
+
+        assert path.name == "part-00001.jsonl"
+        assert run_time(path) == later
+
+
+class TestMigration:
+    """Tests de la migration des fichiers plats"""
+
+    def test_ingest_and_migrate_is_idempotent(self, tmp_path):
+        """Test: Une seconde migration ne duplique pas les données"""
+        flat = tmp_path / "can2025_real_data_2026-01-05_10-00-00.json"
+        flat.write_text(json.dumps({
+            "metadata": {},
+            "articles": [{"source": "CAF", "title": "x"}, {"source": "CAF", "title": "y"}]
+        }), encoding='utf-8')
+        dataset = PartitionedDataset(tmp_path / "partitions")
+
+        stats = migrate_flat_files([flat], dataset, 'articles')
+        again = migrate_flat_files([flat], dataset, 'articles')
+
+        assert stats['records'] == 2 and stats['parts'] == 1
+        assert again['skipped'] == 1
+        parts = dataset.files()
+        assert len(parts) == 1
+        assert parts[0].parent.parent.name == "date=2026-01-05"
+        assert [r['title'] for r in dataset.read()] == ["x", "y"]
+
+    def test_migrated_flat_files_not_read_twice(self, tmp_path):
+        """Test: Après migration sur place, ni l'original ni le manifeste ne sont relus"""
+        root = tmp_path / "daily_fetch"
+        root.mkdir()
+        flat = root / "can2025_real_data_2026-01-05_10-00-00.json"
+        flat.write_text(json.dumps({"metadata": {}, "articles": [{"source": "CAF", "title": "x"}]}), encoding='utf-8')
+        dataset = PartitionedDataset(root)
+
+        migrate_flat_files(dataset.legacy_files(), dataset, 'articles')
+        again = migrate_flat_files(sorted(root.glob("*.json")), dataset, 'articles')
+
+        assert again == {'files': 0, 'records': 0, 'parts': 0, 'skipped': 1}
+        assert dataset.legacy_files() == []
+        assert dataset.has_data()
+        assert [r['title'] for r in dataset.read()] == ["x"]
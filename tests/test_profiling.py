@@ -0,0 +1,81 @@
+"""
+Tests unitaires pour le profilage des étapes du pipeline
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.profiling import PipelineProfiler, profiled, count_items, compare_reports, format_summary
+
+
+@profiled("outer", items=len)
+def _outer(n):
+    return [_inner(i) for i in range(n)]
+
+
+@profiled("inner")
+def _inner(i):
+    count_items(2)
+    return i
+
+
+class TestPipelineProfiler:
+    """Tests de la session de profilage"""
+
+    def test_inactive_by_default(self):
+        """Test: Sans session, les étapes décorées ne sont pas mesurées"""
+        with PipelineProfiler() as profiler:
+            pass
+        assert _outer(3) == [0, 1, 2]
+        assert profiler.stages == []
+
+    def test_records_nested_stages(self, tmp_path):
+        """Test: Durée, éléments et étape parente enregistrés"""
+        with PipelineProfiler(label="v1", reports_dir=tmp_path) as profiler:
+            _outer(2)
+
+        report = json.loads(profiler.save().read_text(encoding='utf-8'))
+        stages = {s['stage']: s for s in report['stages'] if s['parent'] is None}
+        assert stages['outer']['items'] == 2
+        inner = [s for s in report['stages'] if s['stage'] == "inner"]
+        assert [s['items'] for s in inner] == [2, 2]
+        assert all(s['parent'] == "outer" for s in inner)
+        assert report['totals']['wall_s'] == stages['outer']['wall_s']
+        assert "outer" in format_summary(report)
+
+    def test_compare_flags_regressions(self):
+        """Test: Une étape deux fois plus lente est signalée"""
+        old = {'stages': [{'stage': 'transform', 'wall_s': 1.0, 'peak_rss_mb': 100, 'items_per_s': 50}]}
+        new = {'stages': [{'stage': 'transform', 'wall_s': 2.0, 'peak_rss_mb': 105, 'items_per_s': 25}]}
+
+        flagged = {row['metric'] for row in compare_reports(old, new) if row['regression']}
+        assert flagged == {'wall_s', 'items_per_s'}
+
+    def test_run_command_records_stages(self, tmp_path, monkeypatch):
+        """Test: `python -m src.pipeline.profiling run` mesure les étapes décorées"""
+        import runpy
+        import warnings
+        from src.pipeline import auto_pipeline
+
+        class FakePipeline:
+            def __init__(self):
+                self.dag = self
+
+            def run(self, force=False):
+                _outer(2)
+
+        reports = []
+        monkeypatch.setattr(auto_pipeline, "AutoPipeline", FakePipeline)
+        monkeypatch.setattr(PipelineProfiler, "save",
+                            lambda self, path=None: reports.append(self.report()) or tmp_path / "report.json")
+        monkeypatch.setattr(sys, "argv", ["profiling", "run"])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # module déjà importé, relancé comme __main__
+            runpy.run_module("src.pipeline.profiling", run_name="__main__")
+
+        assert [s['stage'] for s in reports[0]['stages'] if s['parent'] is None] == ["outer"]
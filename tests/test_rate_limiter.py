@@ -0,0 +1,109 @@
+"""
+Tests unitaires pour la limitation de débit et le disjoncteur du scraping
+"""
+
+import pytest
+import sys
+from types import SimpleNamespace
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.config import BREAKER_FAILURE_THRESHOLD
+from src.pipeline.rate_limiter import (
+    AdaptiveTokenBucket, CircuitBreaker, CircuitOpenError, PoliteSession, parse_retry_after
+)
+
+
+class FakeClock:
+    """Horloge contrôlée par le test"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptiveTokenBucket:
+    """Tests du seau à jetons adaptatif"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_spacing_at_initial_rate(self, clock):
+        """Test: Les requêtes sont espacées selon le débit"""
+        bucket = AdaptiveTokenBucket(rate=0.5, capacity=1, clock=clock)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(2.0)
+
+    def test_throttle_halves_rate_and_honours_retry_after(self, clock):
+        """Test: 429 divise le débit et bloque jusqu'à Retry-After"""
+        bucket = AdaptiveTokenBucket(rate=1.0, capacity=5, clock=clock)
+        bucket.on_throttle(retry_after=30)
+
+        assert bucket.rate == 0.5
+        assert bucket.reserve() == pytest.approx(30.0)
+
+    def test_fast_responses_increase_rate(self, clock):
+        """Test: Le débit augmente sans dépasser le maximum"""
+        bucket = AdaptiveTokenBucket(rate=1.0, max_rate=1.5, latency_target=1.0, clock=clock)
+        for _ in range(20):
+            bucket.on_success(latency=0.2)
+        assert bucket.rate == 1.5
+
+        bucket.on_success(latency=5.0)
+        assert bucket.rate < 1.5
+
+
+class TestCircuitBreaker:
+    """Tests du disjoncteur"""
+
+    def test_open_half_open_close(self):
+        """Test: Ouverture après N échecs, essai après le délai, fermeture sur succès"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60, clock=clock)
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now = 61
+        assert breaker.state == "half-open"
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now = 200
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestPoliteSession:
+    """Tests de la session par domaine"""
+
+    def test_always_throttled_source_trips_breaker(self):
+        """Test: Une source en 503 permanent finit par être ignorée"""
+        clock = FakeClock()
+        session = PoliteSession(max_retries=2, sleep=lambda seconds: None, clock=clock)
+        calls = []
+        session.session = SimpleNamespace(get=lambda url, **_: calls.append(url) or SimpleNamespace(
+            status_code=503, headers={'Retry-After': "1"}))
+
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            assert session.get("https://example.com/news").status_code == 503
+        with pytest.raises(CircuitOpenError):
+            session.get("https://example.com/news")
+
+        assert len(calls) == BREAKER_FAILURE_THRESHOLD * 3
+        assert session.stats()["example.com"]['circuit'] == "open"
+
+
+def test_parse_retry_after():
+    """Test: Retry-After en secondes ou en date HTTP"""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480.0) == pytest.approx(30.0)
+    assert parse_retry_after(None) is None
@@ -0,0 +1,59 @@
+"""
+Tests unitaires pour l'évaluation de la recherche
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.rag.retrieval_eval import (
+    BM25Index, recall_at_k, reciprocal_rank, reciprocal_rank_fusion, chroma_filter
+)
+
+
+class TestMetrics:
+    """Tests des métriques de rappel et de rang"""
+
+    def test_recall_and_mrr(self):
+        """Test: recall@k et rang réciproque"""
+        retrieved = ["a", "b", "c", "d"]
+        assert recall_at_k(retrieved, ["b", "d"], k=2) == 0.5
+        assert recall_at_k(retrieved, ["b", "d"], k=4) == 1.0
+        assert reciprocal_rank(retrieved, ["c"]) == pytest.approx(1 / 3)
+        assert reciprocal_rank(retrieved, ["z"]) == 0.0
+
+    def test_rank_fusion_prefers_consensus(self):
+        """Test: Un document bien classé par les deux listes passe devant"""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "a"]])
+        assert fused[0] == "b"
+
+    def test_chroma_filter(self):
+        """Test: Plusieurs clés sont combinées par $and"""
+        assert chroma_filter(None) is None
+        assert chroma_filter({"category": "x"}) == {"category": "x"}
+        assert chroma_filter({"a": 1, "b": 2}) == {"$and": [{"a": 1}, {"b": 2}]}
+
+
+class TestBM25Index:
+    """Tests de l'index lexical"""
+
+    @pytest.fixture
+    def index(self):
+        """Fixture: Trois documents courts"""
+        return BM25Index([
+            ("hakimi", "Achraf Hakimi est le latéral droit du Maroc", {"category": "joueurs_maroc"}),
+            ("salah", "Mohamed Salah est l'attaquant star de l'Égypte", {"category": "joueurs_stars"}),
+            ("stades", "Les stades de la CAN 2025 au Maroc", {"category": "infrastructures"}),
+        ])
+
+    def test_search_ignores_accents_and_case(self, index):
+        """Test: « egypte » retrouve « Égypte »"""
+        assert index.search("egypte", k=3) == ["salah"]
+
+    def test_search_with_filter(self, index):
+        """Test: Le filtre de métadonnées exclut les autres catégories"""
+        assert set(index.search("Maroc", k=3)) == {"hakimi", "stades"}
+        assert index.search("Maroc", k=3, where={"category": "infrastructures"}) == ["stades"]
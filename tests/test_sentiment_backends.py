@@ -0,0 +1,70 @@
+"""
+Tests des backends d'inférence du sentiment (float32 / int8) sur un modèle local minuscule
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("youtube_comment_downloader")
+
+from src.sentiment.config import SentimentConfig
+from src.sentiment.inference import load_pipeline, model_id, model_size_bytes, run_pipeline
+
+WORDS = ["dima", "maroc", "quel", "match", "arbitre", "nul", "bravo", "lions", "défaite", "victoire"]
+TEXTS = ["Dima Maroc bravo lions", "arbitre nul", "quel match", "victoire victoire victoire", "défaite"]
+
+
+@pytest.fixture(scope="module")
+def tiny_config(tmp_path_factory):
+    """Fixture: Classifieur BERT minuscule (3 labels) sauvegardé localement, sans téléchargement"""
+    model_dir = tmp_path_factory.mktemp("tiny_sentiment_model")
+    vocab_file = model_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS), encoding="utf-8")
+
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=5 + len(WORDS), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, max_position_embeddings=64,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2}
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(model_dir)
+    transformers.BertTokenizer(str(vocab_file)).save_pretrained(model_dir)
+    return type("TinySentimentConfig", (SentimentConfig,), {'MODEL_NAME': str(model_dir), 'MAX_LENGTH': 64})
+
+
+class TestBackends:
+    """Tests float32 vs int8 quantifié"""
+
+    def test_int8_quantizes_linear_layers(self, tiny_config):
+        """Test: Couches linéaires quantifiées, poids plus légers"""
+        float_model = load_pipeline(tiny_config, "float32").model
+        int8_model = load_pipeline(tiny_config, "int8").model
+
+        quantized = [m for m in int8_model.modules() if "quantized" in type(m).__module__]
+        assert quantized
+        assert not any(isinstance(m, torch.nn.Linear) for m in int8_model.modules())
+        assert model_size_bytes(int8_model) < model_size_bytes(float_model)
+
+    def test_backends_classify_in_order(self, tiny_config):
+        """Test: Les deux backends renvoient un label valide par texte"""
+        for backend in ("float32", "int8"):
+            classifier = load_pipeline(tiny_config, backend)
+            predictions = run_pipeline(classifier, TEXTS, batch_size=2, config=tiny_config)
+            assert len(predictions) == len(TEXTS)
+            assert all(label in ("positive", "negative", "neutral") and 0 <= score <= 1
+                       for label, score in predictions)
+            # Un texte seul donne le même résultat que dans un lot
+            assert run_pipeline(classifier, [TEXTS[3]], 1, tiny_config)[0][0] == predictions[3][0]
+
+    def test_backend_in_cache_key(self, tiny_config):
+        """Test: Clé de cache distincte par backend, backend inconnu refusé"""
+        assert model_id(tiny_config, "float32") != model_id(tiny_config, "int8")
+        with pytest.raises(ValueError):
+            load_pipeline(tiny_config, "fp4")
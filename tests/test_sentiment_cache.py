@@ -0,0 +1,58 @@
+"""
+Tests unitaires pour le cache persistant des sentiments
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.sentiment_cache import SentimentCache, normalize_text, text_hash
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture: Cache SQLite temporaire"""
+    cache = SentimentCache(tmp_path / "cache.db", model_id="model-a")
+    yield cache
+    cache.close()
+
+
+class TestSentimentCache:
+    """Tests du cache (modèle, hash du texte) -> sentiment"""
+
+    def test_normalized_duplicates_share_hash(self):
+        """Test: Casse et espaces ignorés, emojis conservés"""
+        assert normalize_text("  Dima   MAGHRIB 🇲🇦 ") == "dima maghrib 🇲🇦"
+        assert text_hash("Dima Maghrib 🇲🇦") == text_hash("dima  maghrib 🇲🇦")
+        assert text_hash("Dima Maghrib 🇲🇦") != text_hash("Dima Maghrib")
+
+    def test_bulk_roundtrip_and_hit_rate(self, cache):
+        """Test: Écriture groupée, lecture groupée et taux de hit"""
+        entries = [(text_hash(f"commentaire {i}"), ('positive', 0.9)) for i in range(600)]
+        cache.set_many(entries)
+
+        wanted = [h for h, _ in entries] + [text_hash("inconnu")]
+        found = cache.get_many(wanted)
+        assert len(found) == 600
+        assert found[entries[0][0]] == ('positive', 0.9)
+
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (600, 1, 600)
+
+    def test_persistent_and_scoped_by_model(self, cache, tmp_path):
+        """Test: Les entrées survivent à la réouverture, par modèle"""
+        h = text_hash("Quel match !")
+        cache.set_many([(h, ('positive', 0.8))])
+        cache.close()
+
+        reopened = SentimentCache(tmp_path / "cache.db", model_id="model-a")
+        other_model = SentimentCache(tmp_path / "cache.db", model_id="model-b")
+        assert reopened.get_many([h]) == {h: ('positive', 0.8)}
+        assert other_model.get_many([h]) == {}
+        reopened.clear()
+        assert len(reopened) == 0
+        reopened.close()
+        other_model.close()
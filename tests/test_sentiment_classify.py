@@ -0,0 +1,139 @@
+"""
+Tests de la classification par lots sans modèle (classifieur factice)
+"""
+
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("transformers")
+pytest.importorskip("youtube_comment_downloader")
+
+from src.sentiment import inference_pool
+from src.sentiment.inference import run_pipeline
+from src.sentiment.inference_pool import InferencePool
+from src.sentiment.sentiment_cache import SentimentCache
+from src.sentiment.youtube_analyzer import YouTubeSentimentAnalyzer
+
+
+class FakeClassifier:
+    """Pipeline factice : longueur = nombre de mots, échoue sur les textes contenant 'boom'"""
+
+    def __init__(self):
+        self.batches = []
+        self.tokenizer = lambda texts, **_: {'input_ids': [text.split() for text in texts]}
+
+    def __call__(self, texts, batch_size):
+        self.batches.append(list(texts))
+        if any("boom" in text for text in texts):
+            raise RuntimeError("entrée invalide")
+        return [{'label': "POSITIVE" if "bravo" in text else "neutral", 'score': 0.9} for text in texts]
+
+
+class TestRunPipeline:
+    """Tests des passes du modèle par lots"""
+
+    def test_failed_batch_retried_text_by_text(self):
+        """Test: Un lot en erreur est repris texte par texte, seul le texte fautif reste sans résultat"""
+        classifier = FakeClassifier()
+        texts = ["bravo les lions", "boom boom boom", "quel match ici", "bravo"]
+
+        results = run_pipeline(classifier, texts, batch_size=3)
+
+        assert results == [('positive', 0.9), None, ('neutral', 0.9), ('positive', 0.9)]
+        assert [len(batch) for batch in classifier.batches] == [3, 1, 1, 1, 1]
+
+
+class FakePool:
+    """Pool d'inférence factice : enregistre les textes reçus, échoue sur 'boom'"""
+
+    backend = "float32"
+    workers = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def classify(self, texts, batch_size):
+        self.calls.append(list(texts))
+        return [None if "boom" in text else ('positive' if "bravo" in text.lower() else 'negative', 0.8)
+                for text in texts]
+
+
+class TestClassifyTexts:
+    """Tests du dédoublonnage, du cache et de l'ordre des résultats"""
+
+    @pytest.fixture
+    def analyzer(self, tmp_path):
+        """Fixture: Analyseur sur un pool factice et un cache SQLite temporaire"""
+        pool = FakePool()
+        cache = SentimentCache(tmp_path / "cache.db", model_id="fake")
+        return YouTubeSentimentAnalyzer(pool=pool, cache=cache), pool, cache
+
+    def test_order_duplicates_and_short_texts(self, analyzer):
+        """Test: Résultats dans l'ordre d'entrée, doublons classifiés une fois, textes courts neutres"""
+        analyzer, pool, _ = analyzer
+        texts = ["Bravo les Lions", "ok", "arbitre nul", "  bravo   les lions ", "", "arbitre nul"]
+
+        results = analyzer.classify_texts(texts)
+
+        assert results == [('positive', 0.8), ('neutral', 0.5), ('negative', 0.8),
+                           ('positive', 0.8), ('neutral', 0.5), ('negative', 0.8)]
+        assert pool.calls == [["Bravo les Lions", "arbitre nul"]]
+
+    def test_cache_hits_skip_model(self, analyzer):
+        """Test: Un texte déjà classifié est servi par le cache, sans passer par le modèle"""
+        analyzer, pool, _ = analyzer
+        analyzer.classify_texts(["arbitre nul"])
+        results = analyzer.classify_texts(["bravo les lions", "Arbitre  nul"])
+
+        assert results == [('positive', 0.8), ('negative', 0.8)]
+        assert pool.calls == [["arbitre nul"], ["bravo les lions"]]
+
+    def test_failed_predictions_not_cached(self, analyzer):
+        """Test: Un texte en erreur reste neutre et sera réessayé à l'analyse suivante"""
+        analyzer, pool, cache = analyzer
+        assert analyzer.classify_texts(["boom boom", "bravo"]) == [('neutral', 0.5), ('positive', 0.8)]
+        assert len(cache) == 1
+
+        analyzer.classify_texts(["boom boom"])
+        assert pool.calls[-1] == ["boom boom"]
+
+
+class TestInferencePool:
+    """Tests du réassemblage des lots du pool (workers remplacés par des threads)"""
+
+    @pytest.fixture
+    def pool(self, monkeypatch):
+        """Fixture: Pool dont les lots sont classifiés par une fonction factice, sans torch"""
+        def fake_classify_batch(texts, batch_size):
+            pid = 1 if len(texts) == batch_size else 2  # le dernier lot, incomplet, sur un autre « worker »
+            return pid, [('positive' if "bravo" in text else 'negative', len(text) / 100) for text in texts], 0.5
+
+        monkeypatch.setattr(inference_pool, "_classify_batch", fake_classify_batch)
+        pool = InferencePool(2, threads_per_worker=1)
+        pool._executor.shutdown()  # jamais démarré : aucun processus lancé
+        pool._executor = ThreadPoolExecutor(max_workers=2)
+        yield pool
+        pool.shutdown()
+
+    def test_results_in_input_order(self, pool):
+        """Test: Lots triés par longueur, résultats remis dans l'ordre d'entrée"""
+        texts = ["bravo les lions de l'atlas", "nul", "bravo", "arbitre vraiment nul", "quel match"]
+
+        results = pool.classify(texts, batch_size=2)
+
+        assert results == [('positive' if "bravo" in text else 'negative', len(text) / 100) for text in texts]
+
+    def test_stats_per_worker(self, pool):
+        """Test: Lots, textes et débit comptés par worker"""
+        pool.classify(["a" * n for n in range(1, 6)], batch_size=2)
+
+        stats = pool.get_stats()
+        assert stats['texts'] == 5
+        assert stats['per_worker'][1] == {'batches': 2, 'texts': 4, 'busy_s': 1.0, 'texts_per_s': 4.0}
+        assert stats['per_worker'][2] == {'batches': 1, 'texts': 1, 'busy_s': 0.5, 'texts_per_s': 2.0}
+        assert (stats['workers'], stats['threads_per_worker']) == (2, 1)
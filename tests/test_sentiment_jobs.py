@@ -0,0 +1,122 @@
+"""
+Tests unitaires pour la file de jobs d'analyse multi-vidéos
+"""
+
+import pytest
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.job_queue import SentimentJobQueue
+
+
+class FakeAnalyzer:
+    """Analyseur minimal : même interface qu'analyze_video, sans modèle ni téléchargement"""
+
+    def __init__(self, delay=0.05, fail=(), gate=None, blocked=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.gate = gate
+        self.blocked = set(blocked)
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def extract_video_id(self, url):
+        if "v=" not in url:
+            raise ValueError("URL YouTube invalide")
+        return url.split("v=")[1]
+
+    def analyze_video(self, url, max_comments=500, progress_callback=None, incremental=False):
+        video_id = self.extract_video_id(url)
+        with self.lock:
+            self.calls.append(video_id)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if video_id in self.blocked:
+                self.gate.wait(5)
+            progress_callback({'fetched': 10, 'classified': 10, 'counts': {},
+                               'percentages': {'positive': 50.0, 'neutral': 30.0, 'negative': 20.0}})
+            time.sleep(self.delay)
+            if video_id in self.fail:
+                raise ValueError("Aucun commentaire trouvé pour cette vidéo")
+            return {
+                'video_id': video_id, 'total_comments': 10,
+                'positive': {'count': 5, 'percentage': 50.0}, 'neutral': {'count': 3, 'percentage': 30.0},
+                'negative': {'count': 2, 'percentage': 20.0}, 'throughput': {'comments_per_s': 100.0}
+            }
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def _wait(queue, job_id, status="done", timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get_job(job_id)
+        if job['status'] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job toujours {queue.get_job(job_id)['status']}")
+
+
+def _urls(n):
+    return [f"https://www.youtube.com/watch?v=vid{i}" for i in range(n)]
+
+
+class TestSentimentJobQueue:
+    """Tests de l'exécution, des échecs et de la reprise des jobs"""
+
+    def test_runs_videos_with_bounded_concurrency(self, tmp_path):
+        """Test: Toutes les vidéos analysées, jamais plus de download_workers à la fois"""
+        analyzer = FakeAnalyzer()
+        queue = SentimentJobQueue(analyzer, jobs_dir=tmp_path, download_workers=2)
+        job_id = queue.submit(_urls(6) + [_urls(1)[0]])
+
+        job = _wait(queue, job_id)
+        queue.shutdown()
+        assert len(job['videos']) == 6  # doublon ignoré
+        assert all(v['status'] == "done" and v['summary']['total_comments'] == 10 for v in job['videos'])
+        assert analyzer.max_running == 2
+        assert queue.get_result(job_id, "vid3")['video_id'] == "vid3"
+
+    def test_failures_are_isolated(self, tmp_path):
+        """Test: Une vidéo en échec ou une URL invalide n'arrête pas le job"""
+        queue = SentimentJobQueue(FakeAnalyzer(fail={"vid1"}), jobs_dir=tmp_path, download_workers=2)
+        job_id = queue.submit(_urls(3) + ["https://example.com/pas-youtube"])
+
+        job = _wait(queue, job_id)
+        queue.shutdown()
+        statuses = [v['status'] for v in job['videos']]
+        assert statuses == ["done", "failed", "done", "failed"]
+        assert "commentaire" in job['videos'][1]['error']
+        assert queue.get_result(job_id, "vid1") is None
+
+    def test_resume_after_restart(self, tmp_path):
+        """Test: Un job repris depuis son checkpoint ne relance que les vidéos non terminées"""
+        gate = threading.Event()
+        first = SentimentJobQueue(FakeAnalyzer(delay=0, gate=gate, blocked={"vid1"}),
+                                  jobs_dir=tmp_path / "live", download_workers=1)
+        job_id = first.submit(_urls(3))
+        # Checkpoint pendant l'analyse de la deuxième vidéo (processus « arrêté » ici)
+        deadline = time.monotonic() + 5
+        while first.get_job(job_id)['videos'][1]['status'] != "running" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        shutil.copytree(tmp_path / "live", tmp_path / "restart")
+        gate.set()
+        first.shutdown()
+
+        analyzer = FakeAnalyzer(delay=0)
+        restarted = SentimentJobQueue(analyzer, jobs_dir=tmp_path / "restart", download_workers=2)
+        job = _wait(restarted, job_id)
+        restarted.shutdown()
+        assert all(v['status'] == "done" for v in job['videos'])
+        assert sorted(analyzer.calls) == ["vid1", "vid2"]
+        assert restarted.list_jobs()[0]['job_id'] == job_id
@@ -0,0 +1,61 @@
+"""
+Tests unitaires pour les résultats de sentiment en colonnes
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.results import SentimentResults, sentiment_entries
+
+
+class TestSentimentResults:
+    """Tests des agrégats en colonnes et de la vue dictionnaire"""
+
+    def test_columns_roundtrip_and_interning(self, make_comments):
+        """Test: Commentaires reconstruits à l'identique, chaînes répétées stockées une fois"""
+        comments = make_comments(300)
+        results = SentimentResults.from_comments(comments)
+
+        assert len(results) == 300
+        assert len(results.strings) == 4 + 7 + 1  # textes + auteurs + date affichée
+        rebuilt = results.comment(42)
+        assert rebuilt == comments[42]
+
+        restored = SentimentResults.from_dict(json.loads(json.dumps(results.to_dict())))
+        assert restored.comments('negative') == results.comments('negative')
+
+    def test_aggregates_match_python_reference(self, make_comments):
+        """Test: Pourcentages, top N par likes et histogrammes identiques au calcul sur les dictionnaires"""
+        comments = make_comments(500, seed=3)
+        results = SentimentResults.from_comments(comments)
+        positives = [c for c in comments if c['sentiment'] == 'positive']
+
+        assert results.counts()['positive'] == len(positives)
+        assert results.percentages()['positive'] == pytest.approx(len(positives) / 5)
+        expected_likes = sorted((c['likes'] for c in positives), reverse=True)[:5]
+        assert [c['likes'] for c in results.top('positive', 5)] == expected_likes
+        assert len(results.top('positive', 10_000)) == len(positives)
+
+        histogram = results.confidence_histogram(bins=4)
+        assert histogram['positive'].sum() == len(positives)
+        assert histogram['positive'][0] == sum(c['confidence'] < 0.25 for c in positives)
+
+    def test_comment_lists_built_on_access(self, make_comments):
+        """Test: stats[sentiment]['comments'] construit à la demande, count/percentage directs"""
+        results = SentimentResults.from_comments(make_comments(100, seed=5))
+        entries = sentiment_entries(results)
+        negative = entries['negative']
+
+        assert 'comments' not in negative
+        assert negative['count'] == results.counts()['negative']
+        comments = negative['comments']
+        assert 'comments' in negative and negative['comments'] is comments
+        likes = [c['likes'] for c in comments]
+        assert likes == sorted(likes, reverse=True)
+        with pytest.raises(KeyError):
+            negative['autre']
@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour le téléchargement et la classification en flux
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.streaming import stream_classify
+
+
+def _classify(texts):
+    """Classifieur déterministe : le sentiment dépend du dernier chiffre du texte"""
+    labels = ['positive', 'negative', 'neutral']
+    return [(labels[int(text[-1]) % 3], 0.9) for text in texts]
+
+
+def _comments(n, delay=0.0):
+    for i in range(n):
+        if delay:
+            time.sleep(delay)
+        yield {'text': f"commentaire {i}", 'likes': i}
+
+
+class TestStreamClassify:
+    """Tests du pipeline producteur/consommateur"""
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_results_in_fetch_order(self, workers):
+        """Test: Chaque commentaire reçoit son sentiment, dans l'ordre de récupération"""
+        results = stream_classify(_comments(250), _classify, micro_batch=16, queue_size=8, workers=workers)
+        assert [r['likes'] for r in results] == list(range(250))
+        assert all(r['sentiment'] == _classify([r['text']])[0][0] for r in results)
+
+    def test_micro_batches_and_progress(self):
+        """Test: Lots bornés par micro_batch, progression croissante puis finale"""
+        batch_sizes = []
+        updates = []
+
+        def classify(texts):
+            batch_sizes.append(len(texts))
+            return _classify(texts)
+
+        stream_classify(_comments(100), classify, micro_batch=10, on_progress=updates.append)
+        assert max(batch_sizes) <= 10 and sum(batch_sizes) == 100
+        classified = [u['classified'] for u in updates]
+        assert classified == sorted(classified)
+        assert updates[-1]['done'] and updates[-1]['fetched'] == 100
+        assert sum(updates[-1]['counts'].values()) == 100
+        assert sum(updates[-1]['percentages'].values()) == pytest.approx(100.0)
+
+    def test_progress_called_from_caller_thread(self):
+        """Test: Le callback s'exécute dans le thread appelant"""
+        threads = set()
+        stream_classify(_comments(50, delay=0.001), _classify, micro_batch=8,
+                        on_progress=lambda p: threads.add(threading.get_ident()))
+        assert threads == {threading.get_ident()}
+
+    def test_errors_propagate(self):
+        """Test: Une erreur de téléchargement ou de classification est relancée"""
+        def failing_source():
+            yield {'text': "commentaire 1"}
+            raise ConnectionError("YouTube indisponible")
+
+        with pytest.raises(ConnectionError):
+            stream_classify(failing_source(), _classify)
+
+        def failing_classify(texts):
+            raise RuntimeError("modèle indisponible")
+
+        with pytest.raises(RuntimeError):
+            stream_classify(_comments(500), failing_classify, queue_size=4, workers=2)
@@ -0,0 +1,85 @@
+"""
+Tests unitaires pour l'agrégation temporelle du sentiment (courbe d'humeur)
+"""
+
+import json
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.timeline import SentimentTimeline
+from src.sentiment.video_state import VideoState, VideoStateStore
+
+START = 1_700_000_040  # début d'une minute
+
+
+class TestSentimentTimeline:
+    """Tests des fenêtres glissantes et de la persistance des agrégats"""
+
+    def test_rolling_window_matches_full_scan(self, make_comments):
+        """Test: Fenêtre de 5 min identique à un recomptage complet des commentaires"""
+        comments = make_comments(2000, start=START)
+        timeline = SentimentTimeline()
+        for offset in range(0, len(comments), 300):
+            timeline.add_comments(comments[offset:offset + 300])
+
+        series = timeline.series(window=300)
+        assert len(timeline) == 2000
+        for row in (0, 10, len(series['time']) - 1):
+            end = series['time'][row] + 60
+            in_window = [c for c in comments if end - 300 <= c['time_parsed'] < end]
+            positives = [c for c in in_window if c['sentiment'] == 'positive']
+            assert series['total'][row] == len(in_window)
+            assert series['counts']['positive'][row] == len(positives)
+            assert series['mean_confidence']['positive'][row] == pytest.approx(
+                sum(c['confidence'] for c in positives) / len(positives))
+
+    def test_out_of_order_and_tumbling_windows(self):
+        """Test: Commentaires plus anciens que l'origine, fenêtres disjointes de 15 min"""
+        timeline = SentimentTimeline()
+        timeline.add([START + 1800, None], ['positive', 'negative'], [0.9, 0.9])
+        timeline.add([START], ['negative'], [0.6])
+
+        assert timeline.origin * 60 == START
+        assert timeline.buckets == 31
+        series = timeline.series(window=900, rolling=False)
+        assert list(series['time']) == [START, START + 900, START + 1800]
+        assert list(series['total']) == [1, 0, 1]
+        assert series['percentages']['negative'][0] == 100.0
+
+    def test_video_state_keeps_timeline(self, tmp_path, make_comments):
+        """Test: L'état d'une vidéo met à jour et persiste ses agrégats temporels"""
+        comments = make_comments(500, seed=1, start=START)
+        state = VideoState("abc")
+        state.merge(comments[:200])
+        state.merge(comments[150:])
+
+        store = VideoStateStore(tmp_path)
+        store.save(state)
+        reloaded = store.load("abc")
+        expected = SentimentTimeline.from_comments(comments).to_dict()
+        actual = reloaded.timeline.to_dict()
+        assert (actual['origin'], actual['counts']) == (expected['origin'], expected['counts'])
+        assert np.allclose(actual['confidence_sums'], expected['confidence_sums'], atol=1e-3)
+        assert len(reloaded.timeline) == 500
+
+    def test_old_comment_does_not_stretch_timeline(self, make_comments):
+        """Test: Un commentaire vieux d'un an est ignoré, les tableaux restent bornés par l'horizon"""
+        comments = make_comments(499, start=START)
+        comments.append(dict(comments[0], cid="old", time_parsed=START - 365 * 24 * 3600))
+        timeline = SentimentTimeline.from_comments(comments)
+
+        assert timeline.buckets <= timeline.max_buckets
+        assert len(timeline) == 499
+        assert len(json.dumps(timeline.to_dict())) < 100_000
+
+        # Un commentaire bien plus récent fait glisser l'horizon
+        timeline.add([START + timeline.horizon + 7200], ['positive'], [0.9])
+        assert timeline.buckets == timeline.max_buckets
+        assert len(timeline) == 1
+        restored = SentimentTimeline.from_dict(json.loads(json.dumps(timeline.to_dict())))
+        assert (restored.origin, restored.buckets, len(restored)) == (timeline.origin, timeline.buckets, 1)
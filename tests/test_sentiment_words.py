@@ -0,0 +1,74 @@
+"""
+Tests unitaires pour l'index de fréquences des mots (nuages de mots)
+"""
+
+import pytest
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.results import SentimentResults
+from src.sentiment.word_index import WordFrequencyIndex, tokenize
+
+TEXTS = [
+    "Dima Maroc 🇲🇦🇲🇦 l'équipe est très forte 👏🏽",
+    "wach had l'arbitre 3ndo chi mochkil?? 😡",
+    "ما شاء الله على المنتخب المغربي ❤️",
+    "The lions played so well hhhhh https://youtu.be/abc",
+]
+
+
+class TestTokenize:
+    """Tests de la tokenisation multilingue"""
+
+    def test_stopwords_laughs_links_and_emojis(self):
+        """Test: Mots-outils FR/EN/darija, rires et liens écartés, emojis comptés à part"""
+        assert tokenize(TEXTS[0]) == (['dima', 'maroc', 'équipe', 'forte'], ['🇲🇦', '🇲🇦', '👏'])
+        assert tokenize(TEXTS[1]) == (['arbitre', '3ndo', 'mochkil'], ['😡'])
+        assert tokenize(TEXTS[2]) == (['شاء', 'الله', 'المنتخب', 'المغربي'], ['❤'])
+        assert tokenize(TEXTS[3]) == (['lions', 'played', 'well'], [])
+
+
+class TestWordFrequencyIndex:
+    """Tests de l'index par sentiment"""
+
+    def test_counts_match_per_comment_tokenization(self, make_comments):
+        """Test: Chaque texte distinct tokenisé une fois, comptes pondérés par ses occurrences"""
+        comments = make_comments(400, texts=TEXTS)
+        index = WordFrequencyIndex.from_results(SentimentResults.from_comments(comments))
+
+        expected_words, expected_emojis = Counter(), Counter()
+        for comment in comments:
+            if comment['sentiment'] == 'negative':
+                words, emojis = tokenize(comment['text'])
+                expected_words.update(words)
+                expected_emojis.update(emojis)
+        assert index.frequencies('negative') == dict(expected_words)
+        assert dict(index.top_emojis('negative', 100)) == dict(expected_emojis)
+        assert sum(index.frequencies().values()) == sum(
+            sum(index.frequencies(s).values()) for s in ('positive', 'negative', 'neutral'))
+        assert list(index.frequencies(top=1)) == [max(index.frequencies(), key=index.frequencies().get)]
+
+    def test_roundtrip_keeps_fingerprint(self, make_comments):
+        """Test: L'index sérialisé garde la même empreinte (même clé de cache d'images)"""
+        index = WordFrequencyIndex.from_comments(make_comments(100, seed=2, texts=TEXTS))
+        restored = WordFrequencyIndex.from_dict(index.to_dict())
+
+        assert restored.fingerprint() == index.fingerprint()
+        other = WordFrequencyIndex.from_comments(make_comments(100, seed=3, texts=TEXTS))
+        assert other.fingerprint() != index.fingerprint()
+
+    def test_wordcloud_images_cached(self, make_comments):
+        """Test: Une image par (analyse, sentiment), réutilisée au changement de filtre"""
+        pytest.importorskip("wordcloud")
+        pytest.importorskip("plotly")
+        from src.sentiment.visualizer import create_wordcloud
+
+        index = WordFrequencyIndex.from_comments(make_comments(50, texts=TEXTS))
+        image = create_wordcloud(index, 'positive')
+        assert image.startswith("data:image/png;base64,")
+        assert create_wordcloud(index, 'positive') is image
+        assert create_wordcloud(WordFrequencyIndex(), None) is None
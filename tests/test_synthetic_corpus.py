@@ -0,0 +1,50 @@
+"""
+Tests unitaires pour le générateur de corpus synthétique des benchmarks
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_corpus import SyntheticCorpus, SyntheticWorkspace
+from src.pipeline.document_store import DocumentStore
+from src.pipeline.transform import DataTransformer
+
+
+class TestSyntheticCorpus:
+    """Tests du déterminisme et du passage par le vrai pipeline"""
+
+    def test_same_seed_same_corpus(self):
+        """Test: Même graine, mêmes articles ; autre graine, autres articles"""
+        articles = list(SyntheticCorpus(seed=7).iter_articles(50))
+
+        assert len(articles) == 50
+        assert articles == list(SyntheticCorpus(seed=7).iter_articles(50))
+        assert articles != list(SyntheticCorpus(seed=8).iter_articles(50))
+        assert {article['language'] for article in articles} <= {'fr', 'en', 'ar'}
+
+    def test_documents_are_transformed_articles(self):
+        """Test: Les documents combinés sont ceux produits par DataTransformer"""
+        corpus = SyntheticCorpus(seed=7)
+        expected = DataTransformer(deduplicate=False).transform_articles(list(corpus.iter_articles(30)))
+
+        assert list(corpus.iter_documents(30, batch_size=8)) == expected
+        assert len(expected) == 30
+
+    @pytest.mark.parametrize("ratio", [0.0, 0.2])
+    def test_near_duplicate_ratio_through_dedup(self, tmp_path, ratio):
+        """Test: Les partitions passent la transformation, le dédoublonnage retire ~duplicate_ratio des articles"""
+        n = 300
+        workspace = SyntheticWorkspace(tmp_path)
+        SyntheticCorpus(seed=7, duplicate_ratio=ratio).write_raw_partitions(workspace.raw_dir, n)
+
+        transformer = workspace.transformer()
+        assert transformer.transform_all_files(workers=1)
+        transformer.create_combined_dataset()
+
+        removed = transformer.last_dedup_stats['duplicates_removed']
+        assert len(DocumentStore(workspace.store_dir)) == n - removed
+        assert removed / n == pytest.approx(ratio, abs=0.05)
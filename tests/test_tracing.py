@@ -0,0 +1,94 @@
+"""
+Tests unitaires pour le traçage structuré (spans et résumé des latences)
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import tracing
+from src.tracing import span, traced, set_attribute, current_trace_id, iter_spans, summarize
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    """Traces écrites dans un fichier temporaire"""
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "TRACE_FILE", path)
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    return path
+
+
+@traced("test.work")
+def _work(fail=False):
+    set_attribute("fail", fail)
+    with span("test.step"):
+        if fail:
+            raise ValueError("boom")
+    return current_trace_id()
+
+
+class TestSpans:
+    """Tests des spans imbriqués et du puits JSONL"""
+
+    def test_nested_spans_share_trace(self, trace_file):
+        """Test: Les enfants héritent du trace_id et pointent vers leur parent"""
+        trace_id = _work()
+        spans = {s['name']: s for s in iter_spans(trace_file)}
+
+        assert set(spans) == {"test.work", "test.step"}
+        assert spans["test.work"]['trace_id'] == spans["test.step"]['trace_id'] == trace_id
+        assert spans["test.step"]['parent_id'] == spans["test.work"]['span_id']
+        assert spans["test.work"]['parent_id'] is None
+        assert spans["test.work"]['attributes'] == {"fail": False}
+        assert spans["test.work"]['duration_ms'] >= spans["test.step"]['duration_ms']
+
+    def test_error_recorded_and_raised(self, trace_file):
+        """Test: L'exception est propagée et marquée sur les spans traversés"""
+        with pytest.raises(ValueError):
+            _work(fail=True)
+        statuses = {s['name']: (s['status'], s['error']) for s in iter_spans(trace_file)}
+        assert statuses["test.step"] == ("error", "ValueError: boom")
+        assert statuses["test.work"][0] == "error"
+
+    def test_threads_get_separate_traces(self, trace_file):
+        """Test: Chaque thread démarre sa propre trace"""
+        trace_ids = []
+        threads = [threading.Thread(target=lambda: trace_ids.append(_work())) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(trace_ids)) == 4
+        assert sum(1 for _ in iter_spans(trace_file)) == 8
+
+    def test_disabled_writes_nothing(self, trace_file, monkeypatch):
+        """Test: Sans TRACING_ENABLED, la durée est mesurée mais rien n'est écrit"""
+        monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+        with span("test.silent") as s:
+            pass
+        assert s.duration_ms is not None
+        assert not trace_file.exists()
+
+
+class TestSummary:
+    """Tests du résumé des latences par nom de span"""
+
+    def test_percentiles_per_name(self):
+        """Test: Percentiles, erreurs et filtre par préfixe"""
+        spans = [
+            {'name': 'chatbot.llm', 'started_at': '2025-12-21T10:00:00', 'duration_ms': float(ms),
+             'status': 'error' if ms == 100 else 'ok'}
+            for ms in range(1, 101)
+        ] + [{'name': 'avatar.tts', 'started_at': '2025-12-21T10:00:00', 'duration_ms': 5.0, 'status': 'ok'}]
+
+        stats = summarize(spans, prefix="chatbot.")
+        assert list(stats) == ["chatbot.llm"]
+        llm = stats["chatbot.llm"]
+        assert (llm['count'], llm['errors']) == (100, 1)
+        assert (llm['p50'], llm['p95'], llm['p99'], llm['max']) == (50.0, 95.0, 99.0, 100.0)
+        assert summarize(spans, since="2025-12-22") == {}
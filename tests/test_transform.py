@@ -0,0 +1,156 @@
+"""
+Tests unitaires pour la transformation et le dataset combiné
+"""
+
+import json
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pipeline.change_feed import ChangeFeed
+from src.pipeline.document_store import DocumentStore
+from src.pipeline.enrich_database import DatabaseEnricher
+from src.pipeline.enrichment_journal import EnrichmentJournal
+from src.pipeline.partitions import PartitionedDataset
+from src.pipeline.transform import DataTransformer
+
+
+def write_json(path, documents):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"metadata": {}, "documents": documents}, f, ensure_ascii=False)
+
+
+def transformed_doc(doc_id, text):
+    return {"text": text, "metadata": {"id": doc_id, "title": doc_id}, "original_content": text}
+
+
+class TestCombinedDataset:
+    """Tests du store combiné partagé entre transformation et enrichissement"""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        """Fixture: Transformateur et enrichisseur pointés sur tmp_path"""
+        transformed_dir = tmp_path / "transformed"
+        feed = ChangeFeed(transformed_dir / "change_feed.jsonl")
+
+        transformer = DataTransformer(deduplicate=False)
+        transformer.raw_data_dir = tmp_path / "daily_fetch"
+        transformer.transformed_dir = transformed_dir
+        transformer.store_dir = transformed_dir / "combined_dataset"
+        transformer.owned_ids_file = transformed_dir / "transform_ids.json"
+        transformer.change_feed = feed
+
+        enricher = DatabaseEnricher()
+        enricher.enrichment_dir = tmp_path / "enrichment"
+        enricher.transformed_dir = transformed_dir
+        enricher.combined_file = transformed_dir / "combined_dataset.json"
+        enricher.store_dir = transformer.store_dir
+        enricher.journal = EnrichmentJournal(transformed_dir / "enrichment_journal")
+        enricher.change_feed = feed
+
+        write_json(transformed_dir / "transformed_2025-12-21_10-00-00.json",
+                   [transformed_doc("art1", "Le Maroc bat les Comores"), transformed_doc("art2", "Victoire du Mali")])
+        write_json(enricher.enrichment_dir / "historique.json",
+                   [{"id": "hist1", "text": "Le Maroc a remporté la CAN 1976", "metadata": {}}])
+        return transformer, enricher, feed
+
+    def test_enrichment_survives_transform(self, workspace):
+        """Test: Un nouveau run de transformation ne supprime pas les documents enrichis"""
+        transformer, enricher, feed = workspace
+        transformer.create_combined_dataset()
+        enricher.merge_and_save()
+        head = feed.head
+
+        transformer.create_combined_dataset()
+        enricher.merge_and_save()
+
+        store = DocumentStore(transformer.store_dir)
+        assert sorted(store.ids()) == ["art1", "art2", "hist1"]
+        assert feed.head == head  # rien n'a changé : aucun événement publié
+        assert len(enricher.journal) == 1
+
+    def test_only_vanished_transform_documents_deleted(self, workspace):
+        """Test: Seuls les documents produits par la transformation et disparus sont supprimés"""
+        transformer, enricher, feed = workspace
+        transformer.create_combined_dataset()
+        enricher.merge_and_save()
+
+        write_json(transformer.transformed_dir / "transformed_2025-12-21_10-00-00.json",
+                   [transformed_doc("art1", "Le Maroc bat les Comores 2-0")])
+        head = feed.head
+        transformer.create_combined_dataset()
+
+        store = DocumentStore(transformer.store_dir)
+        assert sorted(store.ids()) == ["art1", "hist1"]
+        assert {(e['op'], e['id']) for e in feed.read(after=head)} == {("upsert", "art1"), ("delete", "art2")}
+
+    def test_unreadable_enrichment_file_keeps_its_documents(self, workspace):
+        """Test: Un fichier illisible ou un dossier absent ne supprime pas les documents enrichis"""
+        transformer, enricher, feed = workspace
+        write_json(enricher.enrichment_dir / "palmares.json",
+                   [{"id": "pal1", "text": "L'Égypte compte sept titres", "metadata": {}}])
+        transformer.create_combined_dataset()
+        enricher.merge_and_save()
+
+        (enricher.enrichment_dir / "palmares.json").write_text('{"documents": [{"id": "pal', encoding='utf-8')
+        write_json(enricher.enrichment_dir / "historique.json", [])
+        head = feed.head
+        enricher.merge_and_save()
+
+        store = DocumentStore(transformer.store_dir)
+        assert sorted(store.ids()) == ["art1", "art2", "pal1"]  # hist1 retiré d'un fichier relu
+        assert [(e['op'], e['id']) for e in feed.read(after=head)] == [("delete", "hist1")]
+
+        enricher.enrichment_dir = enricher.enrichment_dir.parent / "absent"
+        enricher.merge_and_save()
+        assert "pal1" in DocumentStore(transformer.store_dir)
+
+
+class TestParallelTransform:
+    """Tests de la transformation en pool de processus"""
+
+    @pytest.fixture
+    def raw_dir(self, tmp_path):
+        """Fixture: Deux runs partitionnés (deux sources) et un ancien fichier plat"""
+        raw_dir = tmp_path / "daily_fetch"
+        dataset = PartitionedDataset(raw_dir)
+        for day in (5, 6):
+            dataset.write_run([
+                {"id": f"{source}-{day}-{i}", "source": source, "title": f"Article {i} du {day}",
+                 "content": f"Contenu {i} {source} {day}", "date": f"2026-01-0{day}"}
+                for source in ("BBC Sport", "CAF") for i in range(7)
+            ], datetime(2026, 1, day, 10, 0, 0))
+        with open(raw_dir / "can2025_real_data_2026-01-04_10-00-00.json", 'w', encoding='utf-8') as f:
+            json.dump({"metadata": {}, "articles": [{"id": "flat-1", "source": "CAF", "title": "Ancien"}]}, f)
+        return raw_dir
+
+    def _combined(self, raw_dir, out_dir, **options):
+        transformer = DataTransformer(deduplicate=False)
+        transformer.raw_data_dir = raw_dir
+        transformer.transformed_dir = out_dir
+        transformer.store_dir = out_dir / "combined_dataset"
+        transformer.owned_ids_file = out_dir / "transform_ids.json"
+        transformer.change_feed = ChangeFeed(out_dir / "change_feed.jsonl")
+
+        outputs = transformer.transform_all_files(**options)
+        transformer.create_combined_dataset()
+        documents = list(DocumentStore(transformer.store_dir).iter_documents())
+        return [path.relative_to(out_dir) for path in outputs], documents
+
+    @pytest.mark.parametrize("mode", ["file", "shard"])
+    def test_pool_matches_sequential(self, raw_dir, tmp_path, monkeypatch, mode):
+        """Test: workers=N produit le même dataset combiné, dans le même ordre, que workers=1"""
+        from src.pipeline import transform
+        monkeypatch.setattr(transform, "TRANSFORM_SHARD_SIZE", 3)  # plusieurs shards par fichier
+
+        sequential_files, sequential_docs = self._combined(raw_dir, tmp_path / "sequential", workers=1)
+        parallel_files, parallel_docs = self._combined(raw_dir, tmp_path / "parallel", workers=3, mode=mode)
+
+        assert parallel_files == sequential_files
+        assert len(sequential_docs) == 2 * 2 * 7 + 1
+        assert parallel_docs == sequential_docs
@@ -0,0 +1,120 @@
+"""
+Tests unitaires pour la gestion des versions du vectorstore
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.rag.vectorstore_versions import VectorstoreVersions
+
+
+class TestVectorstoreVersions:
+    """Tests des versions blue/green"""
+
+    @pytest.fixture
+    def versions(self, tmp_path):
+        """Fixture: Gestionnaire avec un ancien chroma_db"""
+        legacy = tmp_path / "chroma_db"
+        legacy.mkdir()
+        return VectorstoreVersions(tmp_path / "versions", legacy_dir=legacy, retention=2)
+
+    def test_legacy_fallback(self, versions):
+        """Test: Sans version, l'ancien répertoire reste actif"""
+        assert versions.current_version() is None
+        assert versions.current_dir() == versions.legacy_dir
+
+    def test_activate_and_rollback(self, versions):
+        """Test: Bascule puis retour à la version précédente"""
+        first = versions.new_version_dir().name
+        second = versions.new_version_dir().name
+        versions.activate(first)
+        versions.activate(second)
+
+        assert versions.current_dir() == versions.root / second
+        assert versions.rollback() == first
+        assert versions.current_version() == first
+
+    def test_rollback_without_previous_version(self, versions):
+        """Test: Pas de rollback possible depuis la plus ancienne version"""
+        versions.activate(versions.new_version_dir().name)
+        with pytest.raises(ValueError):
+            versions.rollback()
+
+    def test_prune_keeps_active_version(self, versions):
+        """Test: La rétention supprime les anciennes versions sauf l'active"""
+        names = [versions.new_version_dir().name for _ in range(4)]
+        versions.activate(names[0])
+
+        removed = versions.prune()
+
+        assert removed == [names[1]]
+        assert versions.list_versions() == [names[0], names[2], names[3]]
+
+    def test_clone_leaves_active_version_untouched(self, versions):
+        """Test: La copie d'une version est modifiable sans toucher à la version active"""
+        active = versions.new_version_dir()
+        (active / "chroma.sqlite3").write_text("v1", encoding='utf-8')
+        versions.activate(active.name)
+
+        copy = versions.clone(active.name)
+        (copy / "chroma.sqlite3").write_text("v2", encoding='utf-8')
+
+        assert versions.current_version() == active.name
+        assert (active / "chroma.sqlite3").read_text(encoding='utf-8') == "v1"
+        assert copy.name in versions.list_versions()
+
+
+class TestVectorstoreRefresher:
+    """Tests de la bascule de version"""
+
+    def test_previous_version_kept_until_chatbots_notified(self, tmp_path):
+        """Test: Les chatbots sont prévenus avant la rétention, qui garde la version qu'ils lisaient"""
+        from types import SimpleNamespace
+        from src.rag.refresher import VectorstoreRefresher
+
+        versions = VectorstoreVersions(tmp_path / "versions", retention=1)
+        old = versions.new_version_dir().name
+        versions.activate(old)
+        refresher = VectorstoreRefresher(config=SimpleNamespace(vectorstore_versions=lambda: versions))
+        refresher._build_version = versions.new_version_dir
+        seen = []
+        refresher.add_listener(lambda version_dir: seen.append((version_dir.name, versions.list_versions())))
+
+        new = refresher.refresh()
+
+        assert seen == [(new, [old, new])]
+        assert versions.list_versions() == [old, new]
+        assert versions.current_version() == new
+
+    def test_no_rebuild_when_pipeline_already_vectorized(self, tmp_path):
+        """Test: Après la préparation, une version à jour avec le flux est activée sans reconstruction"""
+        from types import SimpleNamespace
+        from src.pipeline.change_feed import ChangeFeed, FeedCursor
+        from src.rag.refresher import VectorstoreRefresher
+
+        versions = VectorstoreVersions(tmp_path / "versions")
+        feed = ChangeFeed(tmp_path / "change_feed.jsonl")
+        versions.activate(versions.new_version_dir().name)
+
+        def prepare():
+            # Le pipeline publie des changements puis les vectorise dans une nouvelle version
+            feed.append([{'op': 'upsert', 'id': "a", 'hash': "h"}], source="transform")
+            synced = versions.new_version_dir()
+            FeedCursor(synced / "feed_cursor.json").commit(feed.head)
+            versions.activate(synced.name)
+
+        config = SimpleNamespace(vectorstore_versions=lambda: versions, CHANGE_FEED_FILE=feed.path)
+        refresher = VectorstoreRefresher(config=config, prepare=prepare)
+        refresher._build_version = lambda: pytest.fail("reconstruction inutile")
+        reloaded = []
+        refresher.add_listener(reloaded.append)
+
+        assert not refresher.is_current()
+        version = refresher.refresh()
+
+        assert refresher.is_current()
+        assert reloaded == [versions.root / version]
@@ -0,0 +1,82 @@
+"""
+Tests unitaires pour l'état persistant par vidéo (ré-analyse incrémentale)
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sentiment.video_state import VideoState, VideoStateStore, unseen
+
+
+def _comment(i, sentiment='positive'):
+    return {'cid': f"c{i}", 'text': f"commentaire {i}", 'likes': i,
+            'time_parsed': 1_700_000_000 + i, 'sentiment': sentiment, 'confidence': 0.9}
+
+
+class TestVideoState:
+    """Tests de la fusion et de la persistance de l'état"""
+
+    def test_merge_updates_aggregates(self):
+        """Test: Compteurs, identifiants et horodatage mis à jour, doublons ignorés"""
+        state = VideoState("abc")
+        assert state.merge([_comment(1), _comment(2, 'negative')]) == 2
+        assert state.merge([_comment(2, 'negative'), _comment(3, 'neutral')]) == 1
+
+        assert state.counts == {'positive': 1, 'negative': 1, 'neutral': 1}
+        assert state.latest_time == 1_700_000_003
+        assert state.runs == 2
+        assert [c['cid'] for c in state.by_sentiment()['positive']] == ["c1"]
+
+    def test_store_roundtrip(self, tmp_path):
+        """Test: L'état rechargé est identique (compteurs recalculés)"""
+        store = VideoStateStore(tmp_path)
+        state = VideoState("abc")
+        state.merge([_comment(i) for i in range(5)])
+        store.save(state)
+
+        loaded = store.load("abc")
+        assert loaded.to_dict() == state.to_dict()
+        assert loaded.is_seen(_comment(3)) and not loaded.is_seen(_comment(9))
+        assert store.load("inconnue").comments == []
+
+    def test_concurrent_updates_keep_all_comments(self, tmp_path):
+        """Test: Deux analyses concurrentes de la même vidéo cumulent leurs commentaires"""
+        first, second = VideoStateStore(tmp_path), VideoStateStore(tmp_path)
+        first.update("abc", [_comment(0)])
+
+        # Commentaires en partie communs, enregistrés en même temps par deux instances
+        threads = [
+            threading.Thread(target=store.update, args=("abc", [_comment(i) for i in ids]))
+            for store, ids in ((first, range(1, 40)), (second, range(20, 60)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        state = VideoStateStore(tmp_path).load("abc")
+        assert sorted(state.seen_ids) == sorted(f"c{i}" for i in range(60))
+        assert state.counts['positive'] == 60
+        assert state.runs == 3
+
+    def test_unseen_stops_after_known_comments(self):
+        """Test: Nouveaux commentaires seulement, arrêt après N déjà vus consécutifs"""
+        state = VideoState("abc")
+        state.merge([_comment(i) for i in range(10)])
+
+        consumed = []
+
+        def newest_first():
+            # Commentaire épinglé déjà vu, puis 3 nouveaux, puis l'historique
+            for i in [0, 12, 11, 10] + list(range(9, -1, -1)):
+                consumed.append(i)
+                yield _comment(i)
+
+        fresh = list(unseen(newest_first(), state, stop_after_seen=3))
+        assert [c['cid'] for c in fresh] == ["c12", "c11", "c10"]
+        assert consumed == [0, 12, 11, 10, 9, 8, 7]